@@ -22,9 +22,23 @@ class AsyncResult(object):
         self._result = result
 
     def result(self):
-        """Result method on an asyc object."""
+        """Result method on an asyc object.
+
+        If the stored result is an exception, it is raised instead (as it
+        would be for a failed request).
+        """
+        if isinstance(self._result, Exception):
+            raise self._result
         return self._result
 
+    def add_done_callback(self, func):
+        """Adds a callback for when the request completes.
+
+        The mock request has already completed, so the callback is called
+        immediately.
+        """
+        func(self)
+
 
 class MethodMock(object):
     """Mock for :class:`grpc.framework.alpha._reexport._UnaryUnarySyncAsync`.
@@ -20,26 +20,75 @@ protobuf objects.
 
 
 import datetime
+import httplib2
+import importlib
+import logging
 import pytz
 import six
+import threading
+import time
 
-from gcloud_bigtable._generated import (
-    bigtable_cluster_service_messages_pb2 as messages_pb2)
-from gcloud_bigtable._generated import bigtable_cluster_data_pb2 as data_pb2
 from gcloud_bigtable._generated import duration_pb2
 
 
+class _LazyImport(object):
+    """Imports a module (or one of its attributes) on first use.
+
+    Attribute lookups and calls are forwarded to the imported object, so
+    an instance can stand in for a module (or class / function) which is
+    only needed by some code paths, e.g. the Admin API protobufs or
+    optional credentials, without loading it on import.
+
+    :type module_name: str
+    :param module_name: The absolute name of the module.
+
+    :type attr_name: str
+    :param attr_name: (Optional) The name of an attribute of the module to
+                      stand in for, rather than the module itself.
+    """
+
+    def __init__(self, module_name, attr_name=None):
+        self._module_name = module_name
+        self._attr_name = attr_name
+        self._value = None
+
+    def _load(self):
+        """Imports the module (if needed).
+
+        :rtype: object
+        :returns: The module or its attribute.
+        :raises: :class:`ImportError <exceptions.ImportError>` if the
+                 module can't be imported.
+        """
+        if self._value is None:
+            value = importlib.import_module(self._module_name)
+            if self._attr_name is not None:
+                value = getattr(value, self._attr_name)
+            self._value = value
+        return self._value
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+
+_CLUSTER_DATA_PB2 = 'gcloud_bigtable._generated.bigtable_cluster_data_pb2'
+_CLUSTER_MESSAGES_PB2 = (
+    'gcloud_bigtable._generated.bigtable_cluster_service_messages_pb2')
 _TYPE_URL_BASE = 'type.googleapis.com/google.bigtable.'
 _ADMIN_TYPE_URL_BASE = _TYPE_URL_BASE + 'admin.cluster.v1.'
 _CLUSTER_TYPE_URL = _ADMIN_TYPE_URL_BASE + 'Cluster'
 _CLUSTER_CREATE_METADATA = _ADMIN_TYPE_URL_BASE + 'CreateClusterMetadata'
 _TYPE_URL_MAP = {
-    _CLUSTER_TYPE_URL: data_pb2.Cluster,
-    _CLUSTER_CREATE_METADATA: messages_pb2.CreateClusterMetadata,
-    _ADMIN_TYPE_URL_BASE + 'UndeleteClusterMetadata': (
-        messages_pb2.UndeleteClusterMetadata),
-    _ADMIN_TYPE_URL_BASE + 'UpdateClusterMetadata': (
-        messages_pb2.UpdateClusterMetadata),
+    _CLUSTER_TYPE_URL: _LazyImport(_CLUSTER_DATA_PB2, 'Cluster'),
+    _CLUSTER_CREATE_METADATA: _LazyImport(_CLUSTER_MESSAGES_PB2,
+                                          'CreateClusterMetadata'),
+    _ADMIN_TYPE_URL_BASE + 'UndeleteClusterMetadata': _LazyImport(
+        _CLUSTER_MESSAGES_PB2, 'UndeleteClusterMetadata'),
+    _ADMIN_TYPE_URL_BASE + 'UpdateClusterMetadata': _LazyImport(
+        _CLUSTER_MESSAGES_PB2, 'UpdateClusterMetadata'),
 }
 
 EPOCH = datetime.datetime.utcfromtimestamp(0).replace(tzinfo=pytz.utc)
@@ -47,26 +96,167 @@ EPOCH = datetime.datetime.utcfromtimestamp(0).replace(tzinfo=pytz.utc)
 # for appropriate values on other systems.
 SSL_CERT_FILE = '/etc/ssl/certs/ca-certificates.crt'
 
+LOGGER = logging.getLogger('gcloud_bigtable._helpers')
+
+DEFAULT_REFRESH_MARGIN = 300
+"""Default number of seconds before its expiry that a token is refreshed."""
+# Cached metadata is not used in the last seconds of the token lifetime,
+# to allow for clock skew and the time a request is in flight.
+_EXPIRY_SAFETY_SECONDS = 10
+# Number of seconds a token is cached when its expiry is unknown.
+_UNKNOWN_EXPIRY_SECONDS = 60
+# The refresh margin is capped to this fraction of the token lifetime, so
+# short-lived tokens are not refreshed continuously.
+_MAX_MARGIN_FRACTION = 0.5
+# Minimum number of seconds between two attempts of the refresher thread.
+_MIN_REFRESH_INTERVAL = 1.0
+# Maximum number of seconds between attempts after failed refreshes.
+_MAX_RETRY_INTERVAL = 60.0
+
 
 class MetadataTransformer(object):
     """Callable class to transform metadata for gRPC requests.
 
+    The access token and the metadata built from it are cached until shortly
+    before the token expires, so requests do not go through the credentials
+    each time. Once :meth:`start_refresher` is called, a daemon thread
+    refreshes the token ahead of its expiry, so requests never wait for an
+    OAuth round trip.
+
     :type client: :class:`.client.Client`
     :param client: The client that owns the cluster. Provides authorization and
                    user agent.
+
+    :type refresh_margin: int
+    :param refresh_margin: (Optional) Number of seconds before the expiry of
+                           the token at which the refresher thread gets a
+                           new one (at most half the lifetime of the token).
+                           Defaults to :const:`DEFAULT_REFRESH_MARGIN`.
     """
 
-    def __init__(self, client):
+    def __init__(self, client, refresh_margin=DEFAULT_REFRESH_MARGIN):
         self._credentials = client.credentials
         self._user_agent = client.user_agent
+        self.refresh_margin = refresh_margin
+        self._metadata = None
+        # The time (in seconds since the epoch) after which the cached
+        # metadata is not used anymore.
+        self._expires_at = None
+        # The time at which the refresher thread gets a new token.
+        self._refresh_at = None
+        # Tokens of unknown expiry are not refreshed explicitly: the
+        # credentials refresh them when they become invalid.
+        self._expiry_known = False
+        self._lock = threading.Lock()
+        self._refresher = None
+        self._refresher_stopped = threading.Event()
+
+    def _refresh(self, force):
+        """Gets an access token and caches the metadata built from it.
+
+        Assumes the lock is held.
+
+        :type force: bool
+        :param force: Flag indicating if a new token should be requested,
+                      even if the credentials consider theirs still valid.
+        """
+        if force:
+            self._credentials.refresh(httplib2.Http())
+        token_info = self._credentials.get_access_token()
+        now = time.time()
+        expires_in = token_info.expires_in
+        self._expiry_known = expires_in is not None
+        if expires_in is None:
+            # The token is just read again from the credentials periodically.
+            self._expires_at = now + _UNKNOWN_EXPIRY_SECONDS
+            self._refresh_at = now + _UNKNOWN_EXPIRY_SECONDS / 2.0
+        else:
+            margin = min(self.refresh_margin,
+                         expires_in * _MAX_MARGIN_FRACTION)
+            self._expires_at = (now + expires_in -
+                                min(_EXPIRY_SAFETY_SECONDS, margin))
+            self._refresh_at = now + expires_in - margin
+        self._metadata = [
+            ('Authorization', 'Bearer ' + token_info.access_token),
+            ('User-agent', self._user_agent),
+        ]
 
     def __call__(self, ignored_val):
         """Adds authorization header to request metadata."""
-        access_token = self._credentials.get_access_token().access_token
-        return [
-            ('Authorization', 'Bearer ' + access_token),
-            ('User-agent', self._user_agent),
-        ]
+        metadata = self._metadata
+        if metadata is None or time.time() >= self._expires_at:
+            with self._lock:
+                # Another thread may have refreshed while we waited.
+                if self._metadata is None:
+                    self._refresh(force=False)
+                elif time.time() >= self._expires_at:
+                    self._refresh(force=self._expiry_known)
+                metadata = self._metadata
+        return metadata
+
+    def _seconds_until_refresh(self):
+        """Gets the number of seconds until the token should be refreshed.
+
+        :rtype: float
+        :returns: The number of seconds until the refresh margin before the
+                  expiry of the cached token (at least
+                  :data:`_MIN_REFRESH_INTERVAL`), or 0 if no token is cached.
+        """
+        if self._metadata is None:
+            return 0
+        return max(self._refresh_at - time.time(), _MIN_REFRESH_INTERVAL)
+
+    def _refresh_loop(self):
+        """Refreshes the token ahead of its expiry.
+
+        Runs in the refresher thread until :meth:`stop_refresher` is called.
+        A failed refresh is retried with exponential backoff (requests
+        refresh the token themselves if it does expire).
+        """
+        failures = 0
+        while True:
+            if failures:
+                delay = min(_MIN_REFRESH_INTERVAL * 2 ** failures,
+                            _MAX_RETRY_INTERVAL)
+            else:
+                delay = self._seconds_until_refresh()
+            if self._refresher_stopped.wait(delay):
+                break
+            with self._lock:
+                try:
+                    self._refresh(force=(self._metadata is not None and
+                                         self._expiry_known))
+                except Exception as exc:  # pylint: disable=broad-except
+                    failures += 1
+                    if failures == 1:
+                        LOGGER.exception('Failed to refresh the access '
+                                         'token.')
+                    else:
+                        LOGGER.warning('Failed to refresh the access token '
+                                       '(%d attempts): %s', failures, exc)
+                else:
+                    failures = 0
+
+    def start_refresher(self):
+        """Starts a daemon thread which refreshes the token proactively.
+
+        :raises: :class:`ValueError <exceptions.ValueError>` if the refresher
+                 is already running.
+        """
+        if self._refresher is not None:
+            raise ValueError('The refresher is already running')
+
+        self._refresher_stopped.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop)
+        self._refresher.daemon = True
+        self._refresher.start()
+
+    def stop_refresher(self):
+        """Stops the refresher thread (if one was started)."""
+        if self._refresher is not None:
+            self._refresher_stopped.set()
+            self._refresher.join()
+            self._refresher = None
 
 
 class AuthInfo(object):
@@ -271,7 +461,7 @@ def get_certs():
     return AuthInfo.ROOT_CERTIFICATES
 
 
-def make_stub(client, stub_factory, host, port):
+def make_stub(client, stub_factory, host, port, metadata_transformer=None):
     """Makes a stub for the an API.
 
     :type client: :class:`.client.Client`
@@ -288,13 +478,21 @@ def make_stub(client, stub_factory, host, port):
     :type port: int
     :param port: The port for the service.
 
+    :type metadata_transformer: :class:`MetadataTransformer`
+    :param metadata_transformer: (Optional) The transformer adding the
+                                 authorization header to requests, so it
+                                 (and its cached token) can be shared by
+                                 several stubs. If not passed, a new one is
+                                 created for ``client``.
+
     :rtype: :class:`grpc.early_adopter.implementations._Stub`
     :returns: The stub object used to make gRPC requests to the
               Data API.
     """
-    custom_metadata_transformer = MetadataTransformer(client)
+    if metadata_transformer is None:
+        metadata_transformer = MetadataTransformer(client)
     return stub_factory(host, port,
-                        metadata_transformer=custom_metadata_transformer,
+                        metadata_transformer=metadata_transformer,
                         secure=True,
                         root_certificates=get_certs())
 
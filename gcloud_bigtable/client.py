@@ -28,39 +28,45 @@ In the hierarchy of API concepts
 
 
 import copy
+import itertools
 import os
 import six
 import socket
+import threading
 
-from oauth2client.client import GoogleCredentials
-from oauth2client.client import SignedJwtAssertionCredentials
-from oauth2client.client import _get_application_default_credential_from_file
-
-try:
-    from google.appengine.api import app_identity
-except ImportError:
-    app_identity = None
-
-from gcloud_bigtable._generated import bigtable_cluster_data_pb2 as data_pb2
-from gcloud_bigtable._generated import (
-    bigtable_cluster_service_messages_pb2 as messages_pb2)
-from gcloud_bigtable._generated import bigtable_cluster_service_pb2
 from gcloud_bigtable._generated import bigtable_service_pb2
-from gcloud_bigtable._generated import bigtable_table_service_pb2
-from gcloud_bigtable._generated import operations_pb2
+from gcloud_bigtable._helpers import MetadataTransformer
+from gcloud_bigtable._helpers import _LazyImport
 from gcloud_bigtable._helpers import make_stub
 from gcloud_bigtable.cluster import Cluster
 
 
-TABLE_STUB_FACTORY = (bigtable_table_service_pb2.
-                      early_adopter_create_BigtableTableService_stub)
+# Only needed for some credentials and the Admin APIs, so they are not
+# loaded until they are used (see ``_helpers._LazyImport``). In
+# particular, importing ``oauth2client.client`` loads its crypto libraries.
+# pylint: disable=invalid-name
+GoogleCredentials = _LazyImport('oauth2client.client', 'GoogleCredentials')
+SignedJwtAssertionCredentials = _LazyImport('oauth2client.client',
+                                            'SignedJwtAssertionCredentials')
+_get_application_default_credential_from_file = _LazyImport(
+    'oauth2client.client', '_get_application_default_credential_from_file')
+app_identity = _LazyImport('google.appengine.api.app_identity')
+data_pb2 = _LazyImport('gcloud_bigtable._generated.bigtable_cluster_data_pb2')
+messages_pb2 = _LazyImport(
+    'gcloud_bigtable._generated.bigtable_cluster_service_messages_pb2')
+# pylint: enable=invalid-name
+
+TABLE_STUB_FACTORY = _LazyImport(
+    'gcloud_bigtable._generated.bigtable_table_service_pb2',
+    'early_adopter_create_BigtableTableService_stub')
 TABLE_ADMIN_HOST = 'bigtabletableadmin.googleapis.com'
 """Table Admin API request host."""
 TABLE_ADMIN_PORT = 443
 """Table Admin API request port."""
 
-CLUSTER_STUB_FACTORY = (bigtable_cluster_service_pb2.
-                        early_adopter_create_BigtableClusterService_stub)
+CLUSTER_STUB_FACTORY = _LazyImport(
+    'gcloud_bigtable._generated.bigtable_cluster_service_pb2',
+    'early_adopter_create_BigtableClusterService_stub')
 CLUSTER_ADMIN_HOST = 'bigtableclusteradmin.googleapis.com'
 """Cluster Admin API request host."""
 CLUSTER_ADMIN_PORT = 443
@@ -73,7 +79,9 @@ DATA_API_HOST = 'bigtable.googleapis.com'
 DATA_API_PORT = 443
 """Data API request port."""
 
-OPERATIONS_STUB_FACTORY = operations_pb2.early_adopter_create_Operations_stub
+OPERATIONS_STUB_FACTORY = _LazyImport(
+    'gcloud_bigtable._generated.operations_pb2',
+    'early_adopter_create_Operations_stub')
 
 ADMIN_SCOPE = 'https://www.googleapis.com/auth/cloud-bigtable.admin'
 """Scope for interacting with the Cluster Admin and Table Admin APIs."""
@@ -109,11 +117,11 @@ def _project_id_from_app_engine():
     :returns: App Engine application ID if running in App Engine,
               else :data:`None`.
     """
-    if app_identity is None:
+    try:
+        return app_identity.get_application_id()
+    except ImportError:
         return None
 
-    return app_identity.get_application_id()
-
 
 def _project_id_from_compute_engine():
     """Gets the Compute Engine project ID if it can be inferred.
@@ -217,16 +225,47 @@ class Client(object):
                             passed, defaults to
                             :const:`DEFAULT_TIMEOUT_SECONDS`.
 
+    :type retry_policy: :class:`.RetryPolicy`
+    :param retry_policy: (Optional) The policy used to retry idempotent data
+                         requests. If not passed, requests are not retried
+                         (unless a policy is set on a table or request).
+
+    :type rate_limiter: :class:`.RateLimiter`
+    :param rate_limiter: (Optional) Limits the rate of data requests (and
+                         bytes) sent by this client. It is shared with
+                         copies of the client. If not passed, requests are
+                         not limited.
+
+    :type hotspot_detector: :class:`.HotKeyDetector`
+    :param hotspot_detector: (Optional) Records the row key of each write
+                             request sent by this client, to report hot
+                             keys (see :meth:`hot_keys`). It is shared with
+                             copies of the client.
+
+    :type channel_pool_size: int
+    :param channel_pool_size: (Optional) The number of Data API stubs (each
+                              with its own channel) created by
+                              :meth:`start`. Data requests are spread over
+                              the stubs in round-robin order, so they are
+                              not limited by the concurrent streams and
+                              flow control of a single connection. Defaults
+                              to 1.
+
     :raises: :class:`ValueError <exceptions.ValueError>` if both ``read_only``
-             and ``admin`` are :data:`True`
+             and ``admin`` are :data:`True` or if ``channel_pool_size`` is
+             not positive.
     """
 
     def __init__(self, credentials=None, project_id=None,
                  read_only=False, admin=False, user_agent=DEFAULT_USER_AGENT,
-                 timeout_seconds=DEFAULT_TIMEOUT_SECONDS):
+                 timeout_seconds=DEFAULT_TIMEOUT_SECONDS, retry_policy=None,
+                 rate_limiter=None, hotspot_detector=None,
+                 channel_pool_size=1):
         if read_only and admin:
             raise ValueError('A read-only client cannot also perform'
                              'administrative actions.')
+        if channel_pool_size <= 0:
+            raise ValueError('channel_pool_size must be positive')
 
         if credentials is None:
             credentials = GoogleCredentials.get_application_default()
@@ -245,12 +284,24 @@ class Client(object):
         self._project_id = _determine_project_id(project_id)
         self.user_agent = user_agent
         self.timeout_seconds = timeout_seconds
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.hotspot_detector = hotspot_detector
+        self.channel_pool_size = channel_pool_size
 
-        # These will be set in start().
+        # The data stubs will be set in start(), the admin stubs on first
+        # use.
         self._data_stub = None
+        # All the data stubs (including ``_data_stub``) when there is more
+        # than one.
+        self._data_stubs = []
+        self._next_data_stub = itertools.count()
         self._cluster_stub = None
         self._operations_stub = None
         self._table_stub = None
+        # Shared by all the stubs, so they share a cached access token.
+        self._metadata_transformer = None
+        self._stub_lock = threading.Lock()
 
     @classmethod
     def from_service_account_json(cls, json_credentials_path, project_id=None,
@@ -335,25 +386,68 @@ class Client(object):
 
         Copies the local data stored as simple types but does not copy the
         current state of any open connections with the Cloud Bigtable API.
+        The rate limiter and hotspot detector (if any) are shared with the
+        copy, rather than copied, so both clients use the same budgets and
+        report the same hot keys.
 
         :rtype: :class:`.Client`
         :returns: A copy of the current client.
         """
         data_stub = self._data_stub
+        data_stubs = self._data_stubs
         cluster_stub = self._cluster_stub
         operations_stub = self._operations_stub
         table_stub = self._table_stub
+        metadata_transformer = self._metadata_transformer
+        stub_lock = self._stub_lock
+        rate_limiter = self.rate_limiter
+        hotspot_detector = self.hotspot_detector
         try:
             self._data_stub = None
+            self._data_stubs = []
             self._cluster_stub = None
             self._operations_stub = None
             self._table_stub = None
-            return copy.deepcopy(self)
+            self._metadata_transformer = None
+            self._stub_lock = None
+            self.rate_limiter = None
+            self.hotspot_detector = None
+            result = copy.deepcopy(self)
         finally:
             self._data_stub = data_stub
+            self._data_stubs = data_stubs
             self._cluster_stub = cluster_stub
             self._operations_stub = operations_stub
             self._table_stub = table_stub
+            self._metadata_transformer = metadata_transformer
+            self._stub_lock = stub_lock
+            self.rate_limiter = rate_limiter
+            self.hotspot_detector = hotspot_detector
+        result._stub_lock = threading.Lock()
+        result.rate_limiter = rate_limiter
+        result.hotspot_detector = hotspot_detector
+        return result
+
+    def hot_keys(self, limit=None, prefixes=False):
+        """Reports the row keys most written by this client.
+
+        :type limit: int
+        :param limit: (Optional) The maximum number of keys to return. If
+                      not passed, all the tracked keys are returned.
+
+        :type prefixes: bool
+        :param prefixes: (Optional) Flag indicating if key prefixes should
+                         be reported instead of row keys.
+
+        :rtype: list
+        :returns: Triples of the key, its estimated number of writes and its
+                  estimated share of all writes, hottest first (see
+                  :meth:`.HotKeyDetector.hot_keys`). Empty if no hotspot
+                  detector is set on the client.
+        """
+        if self.hotspot_detector is None:
+            return []
+        return self.hotspot_detector.hot_keys(limit=limit, prefixes=prefixes)
 
     @property
     def credentials(self):
@@ -396,6 +490,10 @@ class Client(object):
     def data_stub(self):
         """Getter for the gRPC stub used for the Data API.
 
+        If the client has a pool of stubs, each access returns the next stub
+        of the pool (in round-robin order), so the stub should be retrieved
+        for each request rather than kept.
+
         :rtype: :class:`grpc.early_adopter.implementations._Stub`
         :returns: A gRPC stub object.
         :raises: :class:`ValueError <exceptions.ValueError>` if the current
@@ -403,44 +501,62 @@ class Client(object):
         """
         if self._data_stub is None:
             raise ValueError('Client has not been started.')
-        return self._data_stub
+        data_stubs = self._data_stubs
+        if len(data_stubs) < 2:
+            return self._data_stub
+        return data_stubs[next(self._next_data_stub) % len(data_stubs)]
 
     @property
     def cluster_stub(self):
         """Getter for the gRPC stub used for the Cluster Admin API.
 
+        The stub is created (and opened) on first use.
+
         :rtype: :class:`grpc.early_adopter.implementations._Stub`
         :returns: A gRPC stub object.
         :raises: :class:`ValueError <exceptions.ValueError>` if the current
                  client is not an admin client or if it has not been
                  :meth:`start`-ed.
         """
-        if not self._admin:
-            raise ValueError('Client is not an admin client.')
-        if self._cluster_stub is None:
-            raise ValueError('Client has not been started.')
-        return self._cluster_stub
+        return self._admin_stub('_cluster_stub', self._make_cluster_stub)
 
     @property
     def operations_stub(self):
         """Getter for the gRPC stub used for the Operations API.
 
+        The stub is created (and opened) on first use.
+
         :rtype: :class:`grpc.early_adopter.implementations._Stub`
         :returns: A gRPC stub object.
         :raises: :class:`ValueError <exceptions.ValueError>` if the current
                  client is not an admin client or if it has not been
                  :meth:`start`-ed.
         """
-        if not self._admin:
-            raise ValueError('Client is not an admin client.')
-        if self._operations_stub is None:
-            raise ValueError('Client has not been started.')
-        return self._operations_stub
+        return self._admin_stub('_operations_stub', self._make_operations_stub)
 
     @property
     def table_stub(self):
         """Getter for the gRPC stub used for the Table Admin API.
 
+        The stub is created (and opened) on first use.
+
+        :rtype: :class:`grpc.early_adopter.implementations._Stub`
+        :returns: A gRPC stub object.
+        :raises: :class:`ValueError <exceptions.ValueError>` if the current
+                 client is not an admin client or if it has not been
+                 :meth:`start`-ed.
+        """
+        return self._admin_stub('_table_stub', self._make_table_stub)
+
+    def _admin_stub(self, attr_name, make_stub_method):
+        """Gets an admin stub, creating and opening it if needed.
+
+        :type attr_name: str
+        :param attr_name: The name of the attribute holding the stub.
+
+        :type make_stub_method: callable
+        :param make_stub_method: Creates the stub.
+
         :rtype: :class:`grpc.early_adopter.implementations._Stub`
         :returns: A gRPC stub object.
         :raises: :class:`ValueError <exceptions.ValueError>` if the current
@@ -449,9 +565,17 @@ class Client(object):
         """
         if not self._admin:
             raise ValueError('Client is not an admin client.')
-        if self._table_stub is None:
-            raise ValueError('Client has not been started.')
-        return self._table_stub
+        stub = getattr(self, attr_name)
+        if stub is None:
+            with self._stub_lock:
+                stub = getattr(self, attr_name)
+                if stub is None:
+                    if not self.is_started():
+                        raise ValueError('Client has not been started.')
+                    stub = make_stub_method()
+                    stub.__enter__()
+                    setattr(self, attr_name, stub)
+        return stub
 
     def _make_data_stub(self):
         """Creates gRPC stub to make requests to the Data API.
@@ -460,7 +584,8 @@ class Client(object):
         :returns: A gRPC stub object.
         """
         return make_stub(self, DATA_STUB_FACTORY,
-                         DATA_API_HOST, DATA_API_PORT)
+                         DATA_API_HOST, DATA_API_PORT,
+                         metadata_transformer=self._metadata_transformer)
 
     def _make_cluster_stub(self):
         """Creates gRPC stub to make requests to the Cluster Admin API.
@@ -469,7 +594,8 @@ class Client(object):
         :returns: A gRPC stub object.
         """
         return make_stub(self, CLUSTER_STUB_FACTORY,
-                         CLUSTER_ADMIN_HOST, CLUSTER_ADMIN_PORT)
+                         CLUSTER_ADMIN_HOST, CLUSTER_ADMIN_PORT,
+                         metadata_transformer=self._metadata_transformer)
 
     def _make_operations_stub(self):
         """Creates gRPC stub to make requests to the Operations API.
@@ -481,7 +607,8 @@ class Client(object):
         :returns: A gRPC stub object.
         """
         return make_stub(self, OPERATIONS_STUB_FACTORY,
-                         CLUSTER_ADMIN_HOST, CLUSTER_ADMIN_PORT)
+                         CLUSTER_ADMIN_HOST, CLUSTER_ADMIN_PORT,
+                         metadata_transformer=self._metadata_transformer)
 
     def _make_table_stub(self):
         """Creates gRPC stub to make requests to the Table Admin API.
@@ -490,7 +617,8 @@ class Client(object):
         :returns: A gRPC stub object.
         """
         return make_stub(self, TABLE_STUB_FACTORY,
-                         TABLE_ADMIN_HOST, TABLE_ADMIN_PORT)
+                         TABLE_ADMIN_HOST, TABLE_ADMIN_PORT,
+                         metadata_transformer=self._metadata_transformer)
 
     def is_started(self):
         """Check if the client has been started.
@@ -503,22 +631,23 @@ class Client(object):
     def start(self):
         """Prepare the client to make requests.
 
-        Activates gRPC contexts for making requests to the Bigtable
-        Service(s).
+        Activates gRPC contexts for making requests to the Data API and
+        starts refreshing the access token shared by the stubs in the
+        background. The stubs of the admin APIs are only created when they
+        are first used.
         """
         if self.is_started():
             return
 
-        self._data_stub = self._make_data_stub()
-        self._data_stub.__enter__()
-        if self._admin:
-            self._cluster_stub = self._make_cluster_stub()
-            self._operations_stub = self._make_operations_stub()
-            self._table_stub = self._make_table_stub()
-
-            self._cluster_stub.__enter__()
-            self._operations_stub.__enter__()
-            self._table_stub.__enter__()
+        self._metadata_transformer = MetadataTransformer(self)
+        self._metadata_transformer.start_refresher()
+        data_stubs = [self._make_data_stub()
+                      for _ in range(self.channel_pool_size)]
+        for data_stub in data_stubs:
+            data_stub.__enter__()
+        self._data_stub = data_stubs[0]
+        if len(data_stubs) > 1:
+            self._data_stubs = data_stubs
 
     def stop(self):
         """Closes all the open gRPC clients."""
@@ -527,16 +656,22 @@ class Client(object):
 
         # When exit-ing, we pass None as the exception type, value and
         # traceback to __exit__.
-        self._data_stub.__exit__(None, None, None)
-        if self._admin:
-            self._cluster_stub.__exit__(None, None, None)
-            self._operations_stub.__exit__(None, None, None)
-            self._table_stub.__exit__(None, None, None)
+        with self._stub_lock:
+            # Only the admin stubs which were used have been opened.
+            admin_stubs = [stub for stub in (self._cluster_stub,
+                                             self._operations_stub,
+                                             self._table_stub)
+                           if stub is not None]
+            for stub in (self._data_stubs or [self._data_stub]) + admin_stubs:
+                stub.__exit__(None, None, None)
+            self._metadata_transformer.stop_refresher()
 
-        self._data_stub = None
-        self._cluster_stub = None
-        self._operations_stub = None
-        self._table_stub = None
+            self._data_stub = None
+            self._data_stubs = []
+            self._cluster_stub = None
+            self._operations_stub = None
+            self._table_stub = None
+            self._metadata_transformer = None
 
     def cluster(self, zone, cluster_id, display_name=None, serve_nodes=3):
         """Factory to create a cluster associated with this client.
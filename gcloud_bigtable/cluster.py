@@ -17,18 +17,23 @@
 
 import re
 
-from gcloud_bigtable._generated import bigtable_cluster_data_pb2 as data_pb2
-from gcloud_bigtable._generated import (
-    bigtable_cluster_service_messages_pb2 as messages_pb2)
-from gcloud_bigtable._generated import (
-    bigtable_table_service_messages_pb2 as table_messages_pb2)
-from gcloud_bigtable._generated import operations_pb2
+from gcloud_bigtable._helpers import _LazyImport
 from gcloud_bigtable._helpers import _parse_pb_any_to_native
 from gcloud_bigtable._helpers import _pb_timestamp_to_datetime
 from gcloud_bigtable._helpers import _require_pb_property
 from gcloud_bigtable.table import Table
 
 
+# The Admin API protobufs are loaded when they are first used.
+# pylint: disable=invalid-name
+data_pb2 = _LazyImport('gcloud_bigtable._generated.bigtable_cluster_data_pb2')
+messages_pb2 = _LazyImport(
+    'gcloud_bigtable._generated.bigtable_cluster_service_messages_pb2')
+table_messages_pb2 = _LazyImport(
+    'gcloud_bigtable._generated.bigtable_table_service_messages_pb2')
+operations_pb2 = _LazyImport('gcloud_bigtable._generated.operations_pb2')
+# pylint: enable=invalid-name
+
 _CLUSTER_NAME_RE = re.compile(r'^projects/(?P<project_id>[^/]+)/'
                               r'zones/(?P<zone>[^/]+)/clusters/'
                               r'(?P<cluster_id>[a-z][-a-z0-9]*)$')
@@ -229,16 +234,21 @@ class Cluster(object):
         return (self.client.project_name + '/zones/' + self.zone +
                 '/clusters/' + self.cluster_id)
 
-    def table(self, table_id):
+    def table(self, table_id, retry_policy=None):
         """Factory to create a table associated with this cluster.
 
         :type table_id: str
         :param table_id: The ID of the table.
 
+        :type retry_policy: :class:`.RetryPolicy`
+        :param retry_policy: (Optional) The policy used to retry idempotent
+                             data requests on the table. If not passed,
+                             defaults to the policy of the client.
+
         :rtype: :class:`Table <gcloud_bigtable.table.Table>`
         :returns: The table owned by this cluster.
         """
-        return Table(table_id, self)
+        return Table(table_id, self, retry_policy=retry_policy)
 
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
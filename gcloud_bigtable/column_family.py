@@ -15,13 +15,19 @@
 """User friendly container for Google Cloud Bigtable Column Family."""
 
 
-from gcloud_bigtable._generated import bigtable_table_data_pb2 as data_pb2
-from gcloud_bigtable._generated import (
-    bigtable_table_service_messages_pb2 as messages_pb2)
+from gcloud_bigtable._helpers import _LazyImport
 from gcloud_bigtable._helpers import _duration_pb_to_timedelta
 from gcloud_bigtable._helpers import _timedelta_to_duration_pb
 
 
+# The Table Admin API protobufs are loaded when they are first used.
+# pylint: disable=invalid-name
+data_pb2 = _LazyImport('gcloud_bigtable._generated.bigtable_table_data_pb2')
+messages_pb2 = _LazyImport(
+    'gcloud_bigtable._generated.bigtable_table_service_messages_pb2')
+# pylint: enable=invalid-name
+
+
 class GarbageCollectionRule(object):
     """Table garbage collection rule.
 
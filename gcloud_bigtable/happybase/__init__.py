@@ -126,6 +126,9 @@ API Behavior Changes
   mutated row in the batch. This should not be noticeable since gRPC
   uses HTTP/2. However, some of the requests may fail part way through and
   the process of applying all mutations cannot be rolled back.
+  The rows are committed concurrently (see the ``max_inflight`` argument)
+  and any rows which fail are reported together in a
+  :class:`.BatchSendError`.
 * :meth:`Table.scan() <gcloud_bigtable.happybase.table.Table.scan>` no longer
   accepts the following arguments (which will result in a
   :class:`ValueError <exceptions.ValueError>`):
@@ -145,9 +148,16 @@ API Behavior Changes
   a ``timestamp``. This is because the Cloud Bigtable API uses the
   ``DeleteFromFamily`` and ``DeleteFromRow`` mutations for these deletes, and
   neither of these mutations support a timestamp.
+* Row keys and column qualifiers used to select data (e.g. the ``rows`` and
+  ``columns`` arguments of
+  :meth:`Table.rows() <gcloud_bigtable.happybase.table.Table.rows>`) are
+  matched exactly, rather than as regular expressions. In addition, columns
+  of the form ``fam:prefix*`` can be used to select every column in ``fam``
+  with a qualifier beginning with ``prefix``.
 """
 
 from gcloud_bigtable.happybase.batch import Batch
+from gcloud_bigtable.happybase.batch import BatchSendError
 from gcloud_bigtable.happybase.connection import Connection
 from gcloud_bigtable.happybase.connection import DEFAULT_HOST
 from gcloud_bigtable.happybase.connection import DEFAULT_PORT
@@ -15,18 +15,83 @@
 """Google Cloud Bigtable HappyBase batch module."""
 
 
+import collections
 import datetime
+import logging
 import six
+import struct
+import threading
 
 from gcloud_bigtable._helpers import _microseconds_to_timestamp
+from gcloud_bigtable._helpers import _to_bytes
+from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_INFLIGHT
+from gcloud_bigtable.mutation_batcher import _now
+from gcloud_bigtable.rate_limiter import BATCH
 from gcloud_bigtable.row import TimestampRange
+from gcloud_bigtable.row import _PACK_I64
 
 
+LOGGER = logging.getLogger('gcloud_bigtable.happybase.batch')
+_UNPACK_I64 = struct.Struct('>q').unpack
 _WAL_SENTINEL = object()
+DEFAULT_MAX_COUNTERS = 1000
+"""Default number of pending counters which triggers a flush."""
 # Assumed granularity of timestamps in Cloud Bigtable.
 _ONE_MILLISECOND = datetime.timedelta(microseconds=1000)
 
 
+class BatchSendError(RuntimeError):
+    """Exception raised when some rows in a batch could not be committed.
+
+    Mutations for the remaining rows in the batch have still been applied.
+
+    :type errors: list
+    :param errors: Pairs of the row key and the exception raised, for each
+                   row which could not be committed.
+    """
+
+    def __init__(self, errors):
+        super(BatchSendError, self).__init__(
+            '%d row(s) could not be committed' % (len(errors),))
+        self.errors = errors
+
+    @property
+    def row_keys(self):
+        """Getter for the keys of the rows which could not be committed.
+
+        :rtype: list
+        :returns: The row keys, in the order the rows were committed.
+        """
+        return [row_key for row_key, _ in self.errors]
+
+
+class CounterBatchError(BatchSendError):
+    """Exception raised when some rows of a counter batch could not be sent.
+
+    ``ReadModifyWriteRow`` requests are not idempotent and a failed request
+    may still have been applied, so the increments of the failed rows are
+    dropped from the batch rather than sent again. The remaining rows in the
+    batch have still been sent.
+
+    :type errors: list
+    :param errors: Pairs of the row key and the exception raised, for each
+                   row which could not be sent.
+
+    :type increments: dict
+    :param increments: The dropped increments (whose outcome is unknown),
+                       keyed by ``(row, column)``.
+
+    :type totals: dict
+    :param totals: The value of each counter of the rows which were sent,
+                   keyed by ``(row, column)``.
+    """
+
+    def __init__(self, errors, increments, totals):
+        super(CounterBatchError, self).__init__(errors)
+        self.increments = increments
+        self.totals = totals
+
+
 def _get_column_pairs(columns, require_qualifier=False):
     """Turns a list of column or column families in parsed pairs.
 
@@ -102,20 +167,83 @@ class Batch(object):
                 Provided for compatibility with HappyBase, but irrelevant for
                 Cloud Bigtable since it does not have a Write Ahead Log.
 
-    :raises: :class:`TypeError <exceptions.TypeError>` if ``batch_size``
-             is set and ``transaction=True``.
+    :type max_bytes: int
+    :param max_bytes: (Optional) The maximum (approximate) size, in bytes,
+                      of mutations to allow to accumulate before committing
+                      them. The size counts the column families, qualifiers
+                      and values used by the mutations.
+
+    :type max_inflight: int
+    :param max_inflight: (Optional) The maximum number of rows being
+                         committed at once when the batch is sent.
+
+    :type flush_interval: float
+    :param flush_interval: (Optional) The maximum age (in seconds) of
+                           accumulated mutations. If set, a daemon thread
+                           sends the batch once the oldest mutation reaches
+                           this age. The thread is started when a mutation
+                           is added and stopped when the batch is sent, so
+                           it only runs while mutations are pending. Rows
+                           which fail to commit in the background are
+                           reported by the next call to :meth:`send`. If the
+                           batch is not used as a context manager, call
+                           :meth:`close` once done with it.
+
+    :type coalesce: bool
+    :param coalesce: (Optional) Flag indicating if masked and redundant
+                     mutations for each row (e.g. repeated puts of the same
+                     column) should be dropped before sending.
+
+    :type controller: :class:`.AdaptiveController`
+    :param controller: (Optional) Adapts the batch size and the number of
+                       rows being committed at once to the observed latency
+                       of requests. If set, its :attr:`mutation_limit
+                       <.AdaptiveController.mutation_limit>` is used as the
+                       batch size (unless ``batch_size`` is set) and its
+                       :attr:`inflight_limit
+                       <.AdaptiveController.inflight_limit>` replaces
+                       ``max_inflight``. The same controller can be passed
+                       to several batches, so they adapt together.
+
+    :type spool: :class:`.WriteSpool`
+    :param spool: (Optional) Rows which fail to commit with an error that
+                  the spool considers retryable (e.g. during a brief outage
+                  of the backend) are appended to the spool, to be replayed
+                  later, instead of being reported as failed by
+                  :meth:`send`.
+
+    :type priority: str
+    :param priority: (Optional) The lane of the client's
+                     :class:`.RateLimiter` used to commit the rows (if the
+                     client has one). Defaults to :data:`.rate_limiter.BATCH`.
+
+    :raises: :class:`TypeError <exceptions.TypeError>` if ``batch_size``,
+             ``max_bytes``, ``flush_interval`` or ``controller`` is set and
+             ``transaction=True``.
              :class:`ValueError <exceptions.ValueError>` if ``batch_size``
              is not positive.
+             :class:`ValueError <exceptions.ValueError>` if ``max_bytes``
+             is not positive.
              :class:`ValueError <exceptions.ValueError>` if ``wal``
              is used.
+             :class:`ValueError <exceptions.ValueError>` if ``max_inflight``
+             is not positive.
+             :class:`ValueError <exceptions.ValueError>` if
+             ``flush_interval`` is not positive.
     """
 
     def __init__(self, table, timestamp=None, batch_size=None,
-                 transaction=False, wal=_WAL_SENTINEL):
+                 transaction=False, wal=_WAL_SENTINEL, max_bytes=None,
+                 max_inflight=DEFAULT_MAX_INFLIGHT, flush_interval=None,
+                 coalesce=False, controller=None, spool=None,
+                 priority=BATCH):
         if wal is not _WAL_SENTINEL:
             raise ValueError('The wal argument cannot be used with '
                              'Cloud Bigtable.')
 
+        if max_inflight <= 0:
+            raise ValueError('max_inflight must be positive')
+
         if batch_size is not None:
             if transaction:
                 raise TypeError('When batch_size is set, a Batch cannot be '
@@ -123,8 +251,27 @@ class Batch(object):
             if batch_size <= 0:
                 raise ValueError('batch_size must be positive')
 
+        if max_bytes is not None:
+            if transaction:
+                raise TypeError('When max_bytes is set, a Batch cannot be '
+                                'transactional')
+            if max_bytes <= 0:
+                raise ValueError('max_bytes must be positive')
+
+        if flush_interval is not None:
+            if transaction:
+                raise TypeError('When flush_interval is set, a Batch cannot '
+                                'be transactional')
+            if flush_interval <= 0:
+                raise ValueError('flush_interval must be positive')
+
+        if controller is not None and transaction:
+            raise TypeError('When controller is set, a Batch cannot be '
+                            'transactional')
+
         self._table = table
         self._batch_size = batch_size
+        self._max_bytes = max_bytes
         # Timestamp is in milliseconds, convert to microseconds.
         self._timestamp = self._delete_range = None
         if timestamp is not None:
@@ -137,23 +284,165 @@ class Batch(object):
             next_timestamp = self._timestamp + _ONE_MILLISECOND
             self._delete_range = TimestampRange(end=next_timestamp)
         self._transaction = transaction
+        self._max_inflight = max_inflight
+        self._flush_interval = flush_interval
+        self._coalesce = coalesce
+        self._controller = controller
+        self._spool = spool
+        self._priority = priority
 
         # Internal state for tracking mutations.
         self._row_map = {}
         self._mutation_count = 0
+        self._byte_count = 0
+        self._oldest_mutation_time = None
+        # Guards the mutation state, which the flusher thread also sends.
+        self._lock = threading.RLock()
+
+        # Internal state for the flusher thread (only running while there
+        # are mutations).
+        self._flusher = None
+        self._flusher_stopped = None
+        self._flusher_errors = []
 
     def send(self):
-        """Send / commit the batch of mutations to the server."""
-        for row in self._row_map.values():
-            # commit() does nothing if row hasn't accumulated any mutations.
-            row.commit()
+        """Send / commit the batch of mutations to the server.
 
-        self._row_map.clear()
-        self._mutation_count = 0
+        The rows in the batch are committed concurrently, with at most
+        ``max_inflight`` of them in flight at once. This method returns
+        once every row has been committed or has failed.
+
+        Also stops the flusher thread (if one is running), since the batch
+        is now empty.
+
+        :raises: :class:`BatchSendError` if any of the rows could not be
+                 committed (including rows which failed when sent by the
+                 flusher thread). The mutations for those rows are
+                 discarded.
+        """
+        with self._lock:
+            low_level_table = self._table._low_level_table
+            batcher = low_level_table.mutation_batcher(
+                max_inflight=self._max_inflight, coalesce=self._coalesce,
+                controller=self._controller, spool=self._spool,
+                priority=self._priority)
+            for row in six.itervalues(self._row_map):
+                # mutate() does nothing if row hasn't accumulated any
+                # mutations.
+                batcher.mutate(row)
+            errors = batcher.flush()
+
+            self._row_map.clear()
+            self._mutation_count = 0
+            self._byte_count = 0
+            self._oldest_mutation_time = None
+
+            errors = self._flusher_errors + errors
+            self._flusher_errors = []
+            self._signal_flusher()
+
+        if errors:
+            raise BatchSendError(errors)
+
+    def close(self):
+        """Sends the pending mutations and stops the flusher thread.
+
+        Not needed when the batch is used as a context manager.
+
+        :raises: :class:`BatchSendError` if any of the rows could not be
+                 committed.
+        """
+        self._stop_flusher()
+        self.send()
+
+    def _flush_loop(self, stopped):
+        """Sends the batch whenever the oldest mutation is too old.
+
+        Runs in the flusher thread until ``stopped`` is set (by
+        :meth:`send` or :meth:`_stop_flusher`). Rows that fail to commit
+        are kept until the next :meth:`send` and other errors are logged.
+
+        :type stopped: :class:`threading.Event`
+        :param stopped: The event which stops the thread.
+        """
+        wait_seconds = self._flush_interval
+        while not stopped.wait(wait_seconds):
+            with self._lock:
+                wait_seconds = self._flush_interval
+                if self._oldest_mutation_time is None:
+                    continue
+
+                age = _now() - self._oldest_mutation_time
+                if age < self._flush_interval:
+                    wait_seconds = self._flush_interval - age
+                    continue
+
+                try:
+                    self.send()
+                except BatchSendError as exc:
+                    self._flusher_errors.extend(exc.errors)
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.exception('Sending the batch failed.')
+
+    def _start_flusher(self):
+        """Starts the flusher thread, if needed and not already running.
+
+        Must be called while holding the lock.
+        """
+        if self._flush_interval is not None and self._flusher is None:
+            self._flusher_stopped = threading.Event()
+            self._flusher = threading.Thread(target=self._flush_loop,
+                                             args=(self._flusher_stopped,))
+            self._flusher.daemon = True
+            self._flusher.start()
+
+    def _signal_flusher(self):
+        """Tells the flusher thread (if one is running) to stop.
+
+        Must be called while holding the lock. Does not wait for the thread,
+        which may be the current one.
+
+        :rtype: :class:`threading.Thread`
+        :returns: The flusher thread, if one was running.
+        """
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            self._flusher_stopped.set()
+        return flusher
+
+    def _stop_flusher(self):
+        """Stops the flusher thread (if one is running) and waits for it."""
+        with self._lock:
+            flusher = self._signal_flusher()
+        if flusher is not None:
+            flusher.join()
+
+    def _add_mutation_count(self, num_mutations):
+        """Records the number of mutations added to the batch.
+
+        Also records the time of the oldest mutation and starts the flusher
+        thread (if needed) to send it in time.
+
+        :type num_mutations: int
+        :param num_mutations: The number of mutations added.
+        """
+        self._mutation_count += num_mutations
+        if num_mutations and self._oldest_mutation_time is None:
+            self._oldest_mutation_time = _now()
+            self._start_flusher()
 
     def _try_send(self):
-        """Send / commit the batch if mutations have exceeded batch size."""
-        if self._batch_size and self._mutation_count >= self._batch_size:
+        """Send / commit the batch if mutations have exceeded a threshold.
+
+        The batch is sent if either the number of mutations has reached the
+        batch size or the size of the mutations has reached ``max_bytes``.
+        """
+        batch_size = self._batch_size
+        if batch_size is None and self._controller is not None:
+            batch_size = self._controller.mutation_limit
+        if batch_size and self._mutation_count >= batch_size:
+            self.send()
+        elif self._max_bytes and self._byte_count >= self._max_bytes:
             self.send()
 
     def _get_row(self, row_key):
@@ -198,18 +487,27 @@ class Batch(object):
             raise ValueError('The wal argument cannot be used with '
                              'Cloud Bigtable.')
 
-        row_object = self._get_row(row)
         # Make sure all the keys are valid before beginning
         # to add mutations.
         column_pairs = _get_column_pairs(six.iterkeys(data),
                                          require_qualifier=True)
-        for column_family_id, column_qualifier in column_pairs:
-            value = data[column_family_id + ':' + column_qualifier]
-            row_object.set_cell(column_family_id, column_qualifier,
-                                value, timestamp=self._timestamp)
-
-        self._mutation_count += len(data)
-        self._try_send()
+        with self._lock:
+            row_object = self._get_row(row)
+            for column_family_id, column_qualifier in column_pairs:
+                value = data[column_family_id + ':' + column_qualifier]
+                # Convert the value first, so its size is counted as sent.
+                if isinstance(value, six.integer_types):
+                    value = _PACK_I64(value)
+                value = _to_bytes(value)
+                row_object.set_cell(column_family_id, column_qualifier,
+                                    value, timestamp=self._timestamp)
+                # Counted for each cell, so the counts still match the row
+                # if a later cell fails.
+                self._byte_count += (len(column_family_id) +
+                                     len(column_qualifier) + len(value))
+                self._add_mutation_count(1)
+
+            self._try_send()
 
     def _delete_columns(self, columns, row_object):
         """Adds delete mutations for a list of columns and column families.
@@ -237,10 +535,13 @@ class Batch(object):
                                      '"DeleteFromFamily" ')
                 row_object.delete_cells(column_family_id,
                                         columns=row_object.ALL_COLUMNS)
+                self._byte_count += len(column_family_id)
             else:
                 row_object.delete_cell(column_family_id,
                                        column_qualifier,
                                        time_range=self._delete_range)
+                self._byte_count += (len(column_family_id) +
+                                     len(column_qualifier))
 
     def delete(self, row, columns=None, wal=_WAL_SENTINEL):
         """Delete data from a row in the table owned by this batch.
@@ -271,28 +572,29 @@ class Batch(object):
             raise ValueError('The wal argument cannot be used with '
                              'Cloud Bigtable.')
 
-        row_object = self._get_row(row)
+        with self._lock:
+            row_object = self._get_row(row)
 
-        if columns is None:
-            # Delete entire row.
-            if self._delete_range is not None:
-                raise ValueError('The Cloud Bigtable API does not support '
-                                 'adding a timestamp to "DeleteFromRow" '
-                                 'mutations')
-            row_object.delete()
-            self._mutation_count += 1
-        else:
-            self._delete_columns(columns, row_object)
-            self._mutation_count += len(columns)
+            if columns is None:
+                # Delete entire row.
+                if self._delete_range is not None:
+                    raise ValueError('The Cloud Bigtable API does not '
+                                     'support adding a timestamp to '
+                                     '"DeleteFromRow" mutations')
+                row_object.delete()
+                self._add_mutation_count(1)
+            else:
+                self._delete_columns(columns, row_object)
+                self._add_mutation_count(len(columns))
 
-        self._try_send()
+            self._try_send()
 
     def __enter__(self):
         """Enter context manager, no set-up required."""
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        """Exit context manager, no set-up required.
+        """Exit context manager, stopping the flusher thread if needed.
 
         :type exc_type: type
         :param exc_type: The type of the exception if one occurred while the
@@ -307,6 +609,8 @@ class Batch(object):
         :param traceback: The traceback where the exception occurred (if one
                           did occur). Otherwise, :data:`None`.
         """
+        self._stop_flusher()
+
         # If the context manager encountered an exception and the batch is
         # transactional, we don't commit the mutations.
         if self._transaction and exc_type is not None:
@@ -315,3 +619,319 @@ class Batch(object):
         # NOTE: For non-transactional batches, this will even commit mutations
         #       if an error occurred during the context manager.
         self.send()
+
+
+class CounterBatch(object):
+    """Batch class for aggregating counter increments.
+
+    Increments of the same counter (``row`` and ``column``) are summed in
+    memory instead of each being sent as a ``ReadModifyWriteRow`` request.
+    When the batch is flushed, a single request is sent for each row, with
+    one increment rule for each of its counters.
+
+    .. note::
+
+        Pending increments are not visible to readers (e.g.
+        :meth:`Table.counter_get
+        <gcloud_bigtable.happybase.table.Table.counter_get>`) until the batch
+        is flushed, and are lost if the process stops before then.
+
+    :type table: :class:`Table <gcloud_bigtable.happybase.table.Table>`
+    :param table: The table where the counters are stored.
+
+    :type max_counters: int
+    :param max_counters: (Optional) The number of distinct pending counters
+                         that triggers a flush. Defaults to
+                         :data:`DEFAULT_MAX_COUNTERS`.
+
+    :type flush_interval: float
+    :param flush_interval: (Optional) The maximum age (in seconds) of pending
+                           increments. If set, a daemon thread flushes the
+                           batch once the oldest increment reaches this age.
+                           The thread is only running while there are
+                           pending increments, and is stopped by
+                           :meth:`close` (or when the batch is used as a
+                           context manager and the context exits). Rows
+                           which fail to be sent by the thread are logged
+                           and reported by the next :meth:`flush`.
+
+    :type flush_callback: callable
+    :param flush_callback: (Optional) Called with the totals returned by
+                           :meth:`flush` after each flush made by the batch
+                           itself (when ``max_counters`` is reached, by the
+                           flusher thread, by :meth:`close` or when the
+                           context manager exits).
+
+    :raises: :class:`ValueError <exceptions.ValueError>` if ``max_counters``
+             or ``flush_interval`` is not positive.
+    """
+
+    def __init__(self, table, max_counters=DEFAULT_MAX_COUNTERS,
+                 flush_interval=None, flush_callback=None):
+        if max_counters <= 0:
+            raise ValueError('max_counters must be positive')
+        if flush_interval is not None and flush_interval <= 0:
+            raise ValueError('flush_interval must be positive')
+
+        self._table = table
+        self._max_counters = max_counters
+        self._flush_interval = flush_interval
+        self._flush_callback = flush_callback
+
+        # Internal state for tracking increments, keyed by row key and then
+        # by column.
+        self._pending = collections.OrderedDict()
+        self._num_counters = 0
+        self._oldest_increment_time = None
+        # Guards the pending increments, which the flusher thread also sends.
+        self._lock = threading.RLock()
+
+        # Internal state for the flusher thread (only running while there
+        # are pending increments).
+        self._flusher = None
+        self._flusher_stopped = None
+        self._flusher_errors = []
+        self._flusher_increments = {}
+
+    def counter_inc(self, row, column, value=1):
+        """Adds an increment of a counter column to the batch.
+
+        :type row: str
+        :param row: Row key for the row we are incrementing a counter in.
+
+        :type column: str
+        :param column: Column we are incrementing a value in; of the
+                       form ``fam:col``.
+
+        :type value: int
+        :param value: Amount to increment the counter by. (If negative,
+                      this is equivalent to decrement.)
+        """
+        with self._lock:
+            columns = self._pending.setdefault(row, collections.OrderedDict())
+            if column not in columns:
+                columns[column] = 0
+                self._num_counters += 1
+            columns[column] += value
+            if self._oldest_increment_time is None:
+                self._oldest_increment_time = _now()
+                self._start_flusher()
+
+            if self._num_counters >= self._max_counters:
+                self._flush_and_report()
+
+    def counter_dec(self, row, column, value=1):
+        """Adds a decrement of a counter column to the batch.
+
+        :type row: str
+        :param row: Row key for the row we are decrementing a counter in.
+
+        :type column: str
+        :param column: Column we are decrementing a value in; of the
+                       form ``fam:col``.
+
+        :type value: int
+        :param value: Amount to decrement the counter by. (If negative,
+                      this is equivalent to increment.)
+        """
+        self.counter_inc(row, column, -value)
+
+    def flush(self):
+        """Sends the pending increments.
+
+        One ``ReadModifyWriteRow`` request is sent per row, in the order the
+        rows were first incremented. The increments of a row are removed
+        from the batch before its request is sent, so they are never sent
+        twice.
+
+        Also stops the flusher thread (if one is running), since the batch
+        is now empty.
+
+        :rtype: dict
+        :returns: The value of each flushed counter after its (summed)
+                  increment was applied, keyed by ``(row, column)``.
+        :raises: :class:`CounterBatchError` if the request for any of the
+                 rows failed (including rows which failed when sent by the
+                 flusher thread), or if the server did not return one
+                 modified cell for each of its counters. The increments of
+                 those rows are dropped, since they may have been applied.
+        """
+        totals = {}
+        with self._lock:
+            errors, self._flusher_errors = self._flusher_errors, []
+            increments, self._flusher_increments = (
+                self._flusher_increments, {})
+            low_level_table = self._table._low_level_table
+            while self._pending:
+                row_key, columns = self._pending.popitem(last=False)
+                self._num_counters -= len(columns)
+                try:
+                    totals.update(self._flush_row(low_level_table,
+                                                  row_key, columns))
+                except Exception as exc:  # pylint: disable=broad-except
+                    errors.append((row_key, exc))
+                    for column, value in six.iteritems(columns):
+                        key = (row_key, column)
+                        increments[key] = increments.get(key, 0) + value
+
+            self._oldest_increment_time = None
+            self._signal_flusher()
+        if errors:
+            raise CounterBatchError(errors, increments, totals)
+        return totals
+
+    @staticmethod
+    def _flush_row(low_level_table, row_key, columns):
+        """Sends the increments of a single row.
+
+        :type low_level_table: :class:`Table <gcloud_bigtable.table.Table>`
+        :param low_level_table: The table where the counters are stored.
+
+        :type row_key: str
+        :param row_key: The key of the row being incremented.
+
+        :type columns: dict
+        :param columns: The summed increments of the row, keyed by column.
+
+        :rtype: dict
+        :returns: The value of each counter in the row after its increment
+                  was applied, keyed by ``(row, column)``.
+        :raises: :class:`ValueError <exceptions.ValueError>` if the server
+                 does not return one modified cell for a counter.
+        """
+        row = low_level_table.row(row_key)
+        column_pairs = []
+        for column, value in six.iteritems(columns):
+            column_family_id, column_qualifier = column.split(':')
+            row.increment_cell_value(column_family_id, column_qualifier, value)
+            column_pairs.append((column, column_family_id, column_qualifier))
+        modified_cells = row.commit_modifications()
+
+        totals = {}
+        for column, column_family_id, column_qualifier in column_pairs:
+            column_cells = modified_cells[column_family_id][
+                _to_bytes(column_qualifier)]
+            if len(column_cells) != 1:
+                raise ValueError('Expected server to return one modified '
+                                 'cell.')
+            totals[row_key, column], = _UNPACK_I64(column_cells[0][0])
+        return totals
+
+    def _flush_and_report(self):
+        """Flushes the batch and passes the totals to the callback.
+
+        If some rows fail, the totals of the rows which were sent are still
+        passed to the callback before the error is raised.
+        """
+        try:
+            totals = self.flush()
+        except CounterBatchError as exc:
+            if self._flush_callback is not None:
+                self._flush_callback(exc.totals)
+            raise
+        if self._flush_callback is not None:
+            self._flush_callback(totals)
+
+    def close(self):
+        """Flushes the pending increments and stops the flusher thread.
+
+        The totals are passed to ``flush_callback`` (if set). Not needed
+        when the batch is used as a context manager.
+
+        :raises: :class:`CounterBatchError` if the request for any of the
+                 rows failed.
+        """
+        self._stop_flusher()
+        self._flush_and_report()
+
+    def _flush_loop(self, stopped):
+        """Flushes the batch whenever the oldest increment is too old.
+
+        Runs in the flusher thread until ``stopped`` is set (by
+        :meth:`flush` or :meth:`_stop_flusher`). Rows which fail to be sent
+        are logged and kept until the next :meth:`flush`.
+
+        :type stopped: :class:`threading.Event`
+        :param stopped: The event which stops the thread.
+        """
+        wait_seconds = self._flush_interval
+        while not stopped.wait(wait_seconds):
+            with self._lock:
+                wait_seconds = self._flush_interval
+                if self._oldest_increment_time is None:
+                    continue
+
+                age = _now() - self._oldest_increment_time
+                if age < self._flush_interval:
+                    wait_seconds = self._flush_interval - age
+                    continue
+
+                try:
+                    self._flush_and_report()
+                except CounterBatchError as exc:
+                    LOGGER.warning('Dropped the increments of %d row(s) '
+                                   'which failed to be sent: %r',
+                                   len(exc.errors), exc.errors)
+                    # The errors (including any from previous flushes by
+                    # the thread) are reported by the next flush().
+                    self._flusher_errors = exc.errors
+                    self._flusher_increments = exc.increments
+                except Exception:  # pylint: disable=broad-except
+                    LOGGER.exception('Flushing the counter batch failed.')
+
+    def _start_flusher(self):
+        """Starts the flusher thread, if needed and not already running.
+
+        Must be called while holding the lock.
+        """
+        if self._flush_interval is not None and self._flusher is None:
+            self._flusher_stopped = threading.Event()
+            self._flusher = threading.Thread(target=self._flush_loop,
+                                             args=(self._flusher_stopped,))
+            self._flusher.daemon = True
+            self._flusher.start()
+
+    def _signal_flusher(self):
+        """Tells the flusher thread (if one is running) to stop.
+
+        Must be called while holding the lock. Does not wait for the thread,
+        which may be the current one.
+
+        :rtype: :class:`threading.Thread`
+        :returns: The flusher thread, if one was running.
+        """
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            self._flusher_stopped.set()
+        return flusher
+
+    def _stop_flusher(self):
+        """Stops the flusher thread (if one is running) and waits for it."""
+        with self._lock:
+            flusher = self._signal_flusher()
+        if flusher is not None:
+            flusher.join()
+
+    def __enter__(self):
+        """Enter context manager, no set-up required."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit context manager, flushing the pending increments.
+
+        Also stops the flusher thread (see :meth:`close`).
+
+        :type exc_type: type
+        :param exc_type: The type of the exception if one occurred while the
+                         context manager was active. Otherwise, :data:`None`.
+
+        :type exc_value: :class:`Exception <exceptions.Exception>`
+        :param exc_value: An instance of ``exc_type`` if an exception occurred
+                          while the context was active.
+                          Otherwise, :data:`None`.
+
+        :type traceback: ``traceback`` type
+        :param traceback: The traceback where the exception occurred (if one
+                          did occur). Otherwise, :data:`None`.
+        """
+        self.close()
@@ -24,8 +24,16 @@ from gcloud_bigtable._helpers import _to_bytes
 from gcloud_bigtable.column_family import GarbageCollectionRule
 from gcloud_bigtable.column_family import GarbageCollectionRuleIntersection
 from gcloud_bigtable.happybase.batch import Batch
+from gcloud_bigtable.happybase.batch import CounterBatch
+from gcloud_bigtable.happybase.batch import DEFAULT_MAX_COUNTERS
+from gcloud_bigtable.happybase.batch import _UNPACK_I64
 from gcloud_bigtable.happybase.batch import _WAL_SENTINEL
 from gcloud_bigtable.happybase.batch import _get_column_pairs
+from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_INFLIGHT
+from gcloud_bigtable.rate_limiter import BATCH
+from gcloud_bigtable.rate_limiter import INTERACTIVE
+from gcloud_bigtable.row import ColumnRange
+from gcloud_bigtable.row import FrozenRowFilter
 from gcloud_bigtable.row import RowFilter
 from gcloud_bigtable.row import RowFilterChain
 from gcloud_bigtable.row import RowFilterUnion
@@ -33,10 +41,12 @@ from gcloud_bigtable.row import TimestampRange
 from gcloud_bigtable.table import Table as _LowLevelTable
 
 
-_UNPACK_I64 = struct.Struct('>q').unpack
 _DEFAULT_BATCH_SIZE = object()
 _DEFAULT_SCAN_BATCHING = object()
 _DEFAULT_SORTED_COLUMNS = object()
+_UNDERSCORE_ORD = ord('_')
+_INT64_SIZE = 8
+_MAX_FROZEN_FILTERS = 128
 
 
 def make_row(cell_map, include_timestamp):
@@ -189,6 +199,92 @@ def _cells_to_pairs(cells, include_timestamp=False):
     return result
 
 
+def _escape_regex(value):
+    """Escapes a value so it matches itself literally as an RE2 regex.
+
+    Follows the behavior of RE2's ``QuoteMeta``: every ASCII character other
+    than ``[A-Za-z0-9_]`` is escaped with a backslash, the null byte is
+    written as ``\\x00`` and (UTF-8) bytes above ``0x7F`` are left as is.
+
+    :type value: bytes or :func:`unicode <unicode>`
+    :param value: The value to be escaped.
+
+    :rtype: bytes or :func:`unicode <unicode>`
+    :returns: The escaped value (with the same type as ``value``).
+    """
+    if isinstance(value, six.text_type):
+        return _escape_regex(value.encode('utf-8')).decode('utf-8')
+
+    result = bytearray()
+    for ord_val in six.iterbytes(value):
+        if ord_val == 0:
+            result.extend(b'\\x00')
+        elif ord_val < 0x80 and not (chr(ord_val).isalnum() or
+                                     ord_val == _UNDERSCORE_ORD):
+            result.extend(b'\\')
+            result.append(ord_val)
+        else:
+            result.append(ord_val)
+    return bytes(result)
+
+
+def _column_family_filter(column_family_id):
+    """Creates a filter which matches every cell in a column family.
+
+    :type column_family_id: str
+    :param column_family_id: The column family to match (exactly).
+
+    :rtype: :class:`.RowFilter`
+    :returns: A family name filter for ``column_family_id``.
+    """
+    return RowFilter(family_name_regex_filter=_escape_regex(column_family_id))
+
+
+def _exact_column_filter(column_family_id, column_qualifier):
+    """Creates a filter which matches cells in exactly one column.
+
+    Uses a column range with inclusive bounds rather than a qualifier regex,
+    so special characters in ``column_qualifier`` are matched literally and
+    the server does not need to evaluate a regex.
+
+    :type column_family_id: str
+    :param column_family_id: The column family containing the column.
+
+    :type column_qualifier: bytes
+    :param column_qualifier: The qualifier of the column to match.
+
+    :rtype: :class:`.RowFilter`
+    :returns: A column range filter matching the single column.
+    """
+    column_range = ColumnRange(column_family_id,
+                               start_column=column_qualifier,
+                               end_column=column_qualifier)
+    return RowFilter(column_range_filter=column_range)
+
+
+def _column_prefix_filter(column_family_id, prefix):
+    """Creates a filter which matches cells in columns with a given prefix.
+
+    Uses the half-open column range ``[prefix, successor(prefix))``.
+
+    :type column_family_id: str
+    :param column_family_id: The column family containing the columns.
+
+    :type prefix: bytes
+    :param prefix: The prefix of the column qualifiers to match.
+
+    :rtype: :class:`.RowFilter`
+    :returns: A column range filter matching the columns.
+    """
+    end_column = _string_successor(prefix)
+    if end_column == b'':
+        # No upper bound, e.g. the prefix was empty.
+        end_column = None
+    column_range = ColumnRange(column_family_id, start_column=prefix,
+                               end_column=end_column, inclusive_end=False)
+    return RowFilter(column_range_filter=column_range)
+
+
 def _filter_chain_helper(column=None, versions=None, timestamp=None,
                          filters=None):
     """Create filter chain to limit a results set.
@@ -219,9 +315,8 @@ def _filter_chain_helper(column=None, versions=None, timestamp=None,
 
     if column is not None:
         column_family_id, column_qualifier = column.split(':')
-        fam_filter = RowFilter(family_name_regex_filter=column_family_id)
-        qual_filter = RowFilter(column_qualifier_regex_filter=column_qualifier)
-        filters.extend([fam_filter, qual_filter])
+        filters.append(_exact_column_filter(column_family_id,
+                                            column_qualifier))
     if versions is not None:
         filters.append(RowFilter(cells_per_column_limit_filter=versions))
     time_range = _convert_to_time_range(timestamp=timestamp)
@@ -246,6 +341,7 @@ def _columns_filter_helper(columns):
 
                       * an entire column family: ``fam`` or ``fam:``
                       * an single column: ``fam:col``
+                      * columns with a qualifier prefix: ``fam:prefix*``
 
     :rtype: :class:`.RowFilterUnion`, :class:`.RowFilter`
     :returns: The union filter created containing all of the matched columns.
@@ -254,16 +350,14 @@ def _columns_filter_helper(columns):
     """
     filters = []
     for column_family_id, column_qualifier in _get_column_pairs(columns):
-        if column_qualifier is not None:
-            fam_filter = RowFilter(family_name_regex_filter=column_family_id)
-            qual_filter = RowFilter(
-                column_qualifier_regex_filter=column_qualifier)
-            combined_filter = RowFilterChain(
-                filters=[fam_filter, qual_filter])
-            filters.append(combined_filter)
+        if column_qualifier is None:
+            filters.append(_column_family_filter(column_family_id))
+        elif column_qualifier.endswith('*'):
+            filters.append(_column_prefix_filter(column_family_id,
+                                                 column_qualifier[:-1]))
         else:
-            fam_filter = RowFilter(family_name_regex_filter=column_family_id)
-            filters.append(fam_filter)
+            filters.append(_exact_column_filter(column_family_id,
+                                                column_qualifier))
 
     num_filters = len(filters)
     if num_filters == 0:
@@ -287,7 +381,7 @@ def _row_keys_filter_helper(row_keys):
     """
     filters = []
     for row_key in row_keys:
-        filters.append(RowFilter(row_key_regex_filter=row_key))
+        filters.append(RowFilter(row_key_regex_filter=_escape_regex(row_key)))
 
     num_filters = len(filters)
     if num_filters == 0:
@@ -403,10 +497,54 @@ class Table(object):
         if self.connection is not None:
             self._low_level_table = _LowLevelTable(self.name,
                                                    self.connection._cluster)
+        self._frozen_filters = {}
 
     def __repr__(self):
         return '<table.Table name=%r>' % (self.name,)
 
+    def _frozen_filter(self, columns=None, column=None, versions=None,
+                       timestamp=None):
+        """Gets a frozen filter to limit a results set.
+
+        Reads of the same shape (e.g. repeated :meth:`row` calls for the
+        same ``columns``) share a :class:`.FrozenRowFilter`, so the filter
+        protobuf is only built the first time. At most
+        ``_MAX_FROZEN_FILTERS`` filters are kept; once that many have been
+        built the cache is started afresh.
+
+        :type columns: tuple
+        :param columns: (Optional) Column names to select, as accepted by
+                        :func:`_columns_filter_helper`.
+
+        :type column: str
+        :param column: (Optional) The column (``fam:col``) to select.
+
+        :type versions: int
+        :param versions: (Optional) The maximum number of cells to return.
+
+        :type timestamp: int
+        :param timestamp: (Optional) Timestamp (in milliseconds since the
+                          epoch). If specified, only cells returned before
+                          (or at) the timestamp will be matched.
+
+        :rtype: :class:`.FrozenRowFilter`
+        :returns: The frozen filter for the given arguments.
+        """
+        cache_key = (columns, column, versions, timestamp)
+        frozen_filter = self._frozen_filters.get(cache_key)
+        if frozen_filter is None:
+            filters = []
+            if columns is not None:
+                filters.append(_columns_filter_helper(columns))
+            filter_ = _filter_chain_helper(column=column, versions=versions,
+                                           timestamp=timestamp,
+                                           filters=filters)
+            if len(self._frozen_filters) >= _MAX_FROZEN_FILTERS:
+                self._frozen_filters.clear()
+            frozen_filter = FrozenRowFilter(filter_)
+            self._frozen_filters[cache_key] = frozen_filter
+        return frozen_filter
+
     def families(self):
         """Retrieve the column families for this table.
 
@@ -447,6 +585,7 @@ class Table(object):
 
                           * an entire column family: ``fam`` or ``fam:``
                           * an single column: ``fam:col``
+                          * columns with a qualifier prefix: ``fam:prefix*``
 
         :type timestamp: int
         :param timestamp: (Optional) Timestamp (in milliseconds since the
@@ -461,12 +600,11 @@ class Table(object):
         :returns: Dictionary containing all the latest column values in
                   the row.
         """
-        filters = []
         if columns is not None:
-            filters.append(_columns_filter_helper(columns))
+            columns = tuple(columns)
         # versions == 1 since we only want the latest.
-        filter_ = _filter_chain_helper(versions=1, timestamp=timestamp,
-                                       filters=filters)
+        filter_ = self._frozen_filter(columns=columns, versions=1,
+                                      timestamp=timestamp)
 
         partial_row_data = self._low_level_table.read_row(
             row, filter_=filter_)
@@ -492,6 +630,7 @@ class Table(object):
 
                           * an entire column family: ``fam`` or ``fam:``
                           * an single column: ``fam:col``
+                          * columns with a qualifier prefix: ``fam:prefix*``
 
         :type timestamp: int
         :param timestamp: (Optional) Timestamp (in milliseconds since the
@@ -510,13 +649,13 @@ class Table(object):
             # Avoid round-trip if the result is empty anyway
             return []
 
-        filters = []
         if columns is not None:
-            filters.append(_columns_filter_helper(columns))
-        filters.append(_row_keys_filter_helper(rows))
+            columns = tuple(columns)
         # versions == 1 since we only want the latest.
-        filter_ = _filter_chain_helper(versions=1, timestamp=timestamp,
-                                       filters=filters)
+        frozen_filter = self._frozen_filter(columns=columns, versions=1,
+                                            timestamp=timestamp)
+        filter_ = RowFilterChain(
+            filters=[frozen_filter, _row_keys_filter_helper(rows)])
 
         partial_rows_data = self._low_level_table.read_rows(filter_=filter_)
         # NOTE: We could use max_loops = 1000 or some similar value to ensure
@@ -561,8 +700,8 @@ class Table(object):
         :returns: List of values in the cell (with timestamps if
                   ``include_timestamp`` is :data:`True`).
         """
-        filter_ = _filter_chain_helper(column=column, versions=versions,
-                                       timestamp=timestamp)
+        filter_ = self._frozen_filter(column=column, versions=versions,
+                                      timestamp=timestamp)
         partial_row_data = self._low_level_table.read_row(row, filter_=filter_)
         if partial_row_data is None:
             return []
@@ -621,9 +760,11 @@ class Table(object):
 
                           * an entire column family: ``fam`` or ``fam:``
                           * an single column: ``fam:col``
+                          * columns with a qualifier prefix: ``fam:prefix*``
 
         :type filter: :class:`RowFilter`, :class:`RowFilterChain`,
-                      :class:`RowFilterUnion` or :class:`ConditionalRowFilter`
+                      :class:`RowFilterUnion`, :class:`ConditionalRowFilter`
+                      or :class:`FrozenRowFilter`
         :param filter: (Optional) An additional filter (beyond column and
                        row range filters supported here). HappyBase / HBase
                        users will have used this as an HBase filter string. See
@@ -686,19 +827,18 @@ class Table(object):
             row_start = row_prefix
             row_stop = _string_successor(row_prefix)
 
-        filters = []
         if isinstance(filter, six.string_types):
             raise TypeError('HBase filter strings not supported by Cloud '
                             'Bigtable. RowFilter\'s from row module may be '
                             'used instead.')
-        elif filter is not None:
-            filters.append(filter)
 
         if columns is not None:
-            filters.append(_columns_filter_helper(columns))
+            columns = tuple(columns)
         # versions == 1 since we only want the latest.
-        filter_ = _filter_chain_helper(versions=1, timestamp=timestamp,
-                                       filters=filters)
+        filter_ = self._frozen_filter(columns=columns, versions=1,
+                                      timestamp=timestamp)
+        if filter is not None:
+            filter_ = RowFilterChain(filters=[filter, filter_])
 
         partial_rows_data = self._low_level_table.read_rows(
             start_key=row_start, end_key=row_stop,
@@ -745,7 +885,8 @@ class Table(object):
                     for Cloud Bigtable since it does not have a Write Ahead
                     Log.
         """
-        with self.batch(timestamp=timestamp, wal=wal) as batch:
+        with self.batch(timestamp=timestamp, wal=wal,
+                        priority=INTERACTIVE) as batch:
             batch.put(row, data)
 
     def delete(self, row, columns=None, timestamp=None, wal=_WAL_SENTINEL):
@@ -781,11 +922,14 @@ class Table(object):
                     for Cloud Bigtable since it does not have a Write Ahead
                     Log.
         """
-        with self.batch(timestamp=timestamp, wal=wal) as batch:
+        with self.batch(timestamp=timestamp, wal=wal,
+                        priority=INTERACTIVE) as batch:
             batch.delete(row, columns)
 
     def batch(self, timestamp=None, batch_size=None, transaction=False,
-              wal=_WAL_SENTINEL):
+              wal=_WAL_SENTINEL, max_bytes=None,
+              max_inflight=DEFAULT_MAX_INFLIGHT, flush_interval=None,
+              coalesce=False, controller=None, spool=None, priority=BATCH):
         """Create a new batch operation for this table.
 
         This method returns a new :class:`.Batch` instance that can be used
@@ -812,15 +956,91 @@ class Table(object):
                     Provided for compatibility with HappyBase, but irrelevant
                     for Cloud Bigtable since it does not have a Write Ahead
                     Log.
+
+        :type max_bytes: int
+        :param max_bytes: (Optional) The maximum (approximate) size, in
+                          bytes, of mutations to allow to accumulate before
+                          committing them. If set, the mutation can't be
+                          transactional.
+
+        :type max_inflight: int
+        :param max_inflight: (Optional) The maximum number of rows being
+                             committed at once when the batch is sent.
+
+        :type flush_interval: float
+        :param flush_interval: (Optional) The maximum age (in seconds) of
+                               accumulated mutations. If set, a daemon thread
+                               commits the batch once its oldest mutation
+                               reaches this age. The thread only runs while
+                               mutations are pending; call
+                               :meth:`Batch.close <.Batch.close>` (or use the
+                               batch as a context manager) once done. If set,
+                               the mutation can't be transactional.
+
+        :type coalesce: bool
+        :param coalesce: (Optional) Flag indicating if masked and redundant
+                         mutations for each row (e.g. repeated puts of the
+                         same column) should be dropped before sending.
+
+        :type controller: :class:`.AdaptiveController`
+        :param controller: (Optional) Adapts the batch size and the number of
+                           rows being committed at once to the observed
+                           latency of requests.
+
+        :type spool: :class:`.WriteSpool`
+        :param spool: (Optional) Holds rows which fail to commit with a
+                      retryable error, to be replayed later.
+
+        :type priority: str
+        :param priority: (Optional) The lane of the client's
+                         :class:`.RateLimiter` used to commit the rows.
+                         Defaults to :data:`.rate_limiter.BATCH`.
+
+        :rtype: :class:`Batch <gcloud_bigtable.happybase.batch.Batch>`
+        :returns: A batch bound to this table.
         """
         return Batch(self, timestamp=timestamp, batch_size=batch_size,
-                     transaction=transaction, wal=wal)
+                     transaction=transaction, wal=wal, max_bytes=max_bytes,
+                     max_inflight=max_inflight, flush_interval=flush_interval,
+                     coalesce=coalesce, controller=controller, spool=spool,
+                     priority=priority)
+
+    def counter_batch(self, max_counters=DEFAULT_MAX_COUNTERS,
+                      flush_interval=None, flush_callback=None):
+        """Create a new batch of counter increments for this table.
+
+        Increments of the same counter are summed in memory, and a single
+        ``ReadModifyWriteRow`` request is sent per row when the batch is
+        flushed (rather than one request per call to :meth:`counter_inc`).
+
+        :type max_counters: int
+        :param max_counters: (Optional) The number of distinct pending
+                             counters that triggers a flush.
+
+        :type flush_interval: float
+        :param flush_interval: (Optional) The maximum age (in seconds) of
+                               pending increments. If set, a daemon thread
+                               flushes the batch once its oldest increment
+                               reaches this age.
+
+        :type flush_callback: callable
+        :param flush_callback: (Optional) Called with the counter totals
+                               after each flush made by the batch itself.
+
+        :rtype: :class:`.CounterBatch`
+        :returns: A counter batch bound to this table.
+        """
+        return CounterBatch(self, max_counters=max_counters,
+                            flush_interval=flush_interval,
+                            flush_callback=flush_callback)
 
     def counter_get(self, row, column):
         """Retrieve the current value of a counter column.
 
         This method retrieves the current value of a counter column. If the
         counter column does not exist, this function initializes it to ``0``.
+        To read counters without writing to them, use
+        :meth:`counter_get_many`.
 
         .. note::
 
@@ -841,6 +1061,66 @@ class Table(object):
         # is correctly initialised if didn't exist yet.
         return self.counter_inc(row, column, value=0)
 
+    def counter_get_many(self, rows, column):
+        """Retrieve the current values of a counter column in many rows.
+
+        Unlike :meth:`counter_get`, this only reads the counters (in a single
+        ``ReadRows`` request): it does not write a new version of each
+        counter cell, and counters which do not exist are not initialized.
+        The request only scans the range of keys from the smallest to the
+        largest of ``rows``, so it is cheapest when they are close together.
+
+        :type rows: list
+        :param rows: Iterable of the row keys for the rows we are reading
+                     counters from.
+
+        :type column: str
+        :param column: Column we are reading counters from; of the form
+                       ``fam:col``.
+
+        :rtype: dict
+        :returns: Dictionary mapping each row key to the counter value in
+                  that row (``0`` if the counter does not exist).
+        :raises: :class:`ValueError <exceptions.ValueError>` if a counter
+                 cell does not hold a 64-bit integer.
+        """
+        row_keys = list(rows)
+        if not row_keys:
+            # Avoid round-trip if the result is empty anyway
+            return {}
+
+        # versions == 1 since we only want the latest.
+        frozen_filter = self._frozen_filter(column=column, versions=1)
+        filter_ = RowFilterChain(
+            filters=[_row_keys_filter_helper(row_keys), frozen_filter])
+        # Bound the scan by the requested keys, rather than filtering every
+        # row of the table.
+        partial_rows_data = self._low_level_table.read_rows(
+            start_key=min(row_keys),
+            end_key=_string_successor(max(row_keys)), filter_=filter_)
+        partial_rows_data.consume_all()
+
+        column_key = _to_bytes(column)
+        found_keys = []
+        bytes_values = []
+        for row_key in row_keys:
+            if row_key not in partial_rows_data.rows:
+                continue
+            cells = partial_rows_data.rows[row_key].to_dict()[column_key]
+            bytes_value = cells[0].value
+            if len(bytes_value) != _INT64_SIZE:
+                raise ValueError('Counter cell does not hold a 64-bit '
+                                 'integer.', row_key, bytes_value)
+            found_keys.append(row_key)
+            bytes_values.append(bytes_value)
+
+        result = dict.fromkeys(row_keys, 0)
+        # Decode all the (64-bit big-endian) counters in a single call.
+        int_values = struct.unpack('>%dq' % (len(bytes_values),),
+                                   b''.join(bytes_values))
+        result.update(zip(found_keys, int_values))
+        return result
+
     def counter_set(self, row, column, value=0):
         """Set a counter column to a specific value.
 
@@ -919,3 +1199,68 @@ class Table(object):
         :returns: Counter value after decrementing.
         """
         return self.counter_inc(row, column, -value)
+
+    def counter_inc_many(self, counters, max_inflight=DEFAULT_MAX_INFLIGHT):
+        """Atomically increment many counter columns in many rows.
+
+        The increments of each row are sent together in a single
+        ``ReadModifyWriteRow`` request, and the requests for different rows
+        are sent concurrently.
+
+        Each row is incremented atomically, but the increments in different
+        rows are not applied atomically: if a request fails, a
+        :class:`PartialCommitError <gcloud_bigtable.table.PartialCommitError>`
+        is raised, whose ``results`` hold the modified cells of the rows
+        which were incremented.
+
+        :type counters: dict
+        :param counters: Dictionary mapping each row key to a dictionary
+                         of the increments (amounts to increment by, which
+                         may be negative) in the row, keyed by column names
+                         of the form ``fam:col``.
+
+        :type max_inflight: int
+        :param max_inflight: (Optional) The maximum number of requests in
+                             flight at once.
+
+        :rtype: dict
+        :returns: Dictionary mapping each row key to a dictionary of the
+                  counter values (after incrementing) in the row, keyed by
+                  column names.
+        :raises: :class:`ValueError <exceptions.ValueError>` if the server
+                 does not return exactly one cell for each counter.
+        """
+        row_keys = []
+        rows = []
+        columns = []
+        for row_key, increments in six.iteritems(counters):
+            row = self._low_level_table.row(row_key)
+            for column, value in six.iteritems(increments):
+                column_family_id, column_qualifier = column.split(':')
+                row.increment_cell_value(column_family_id, column_qualifier,
+                                         value)
+                columns.append((row_key, column, column_family_id,
+                                _to_bytes(column_qualifier)))
+            row_keys.append(row_key)
+            rows.append(row)
+
+        modified_rows = dict(zip(
+            row_keys,
+            self._low_level_table.read_modify_write_many(
+                rows, max_inflight=max_inflight)))
+        bytes_values = []
+        for row_key, _, column_family_id, column_qualifier in columns:
+            column_cells = modified_rows[row_key][column_family_id][
+                column_qualifier]
+            if len(column_cells) != 1:
+                raise ValueError('Expected server to return one modified '
+                                 'cell.')
+            bytes_values.append(column_cells[0][0])
+
+        # Decode all the (64-bit big-endian) counters in a single call.
+        int_values = struct.unpack('>%dq' % (len(bytes_values),),
+                                   b''.join(bytes_values))
+        result = dict((row_key, {}) for row_key in row_keys)
+        for (row_key, column, _, _), int_value in zip(columns, int_values):
+            result[row_key][column] = int_value
+        return result
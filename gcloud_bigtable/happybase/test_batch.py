@@ -24,6 +24,28 @@ class _SendMixin(object):
         self._send_called = True
 
 
+class TestBatchSendError(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.happybase.batch import BatchSendError
+        return BatchSendError
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def test_constructor(self):
+        errors = [('row-key1', object()), ('row-key2', object())]
+        exc = self._makeOne(errors)
+        self.assertTrue(isinstance(exc, RuntimeError))
+        self.assertTrue(exc.errors is errors)
+        self.assertEqual(exc.args, ('2 row(s) could not be committed',))
+
+    def test_row_keys(self):
+        errors = [('row-key1', object()), ('row-key2', object())]
+        exc = self._makeOne(errors)
+        self.assertEqual(exc.row_keys, ['row-key1', 'row-key2'])
+
+
 class Test__get_column_pairs(unittest2.TestCase):
 
     def _callFUT(self, *args, **kwargs):
@@ -73,6 +95,8 @@ class TestBatch(unittest2.TestCase):
         return self._getTargetClass()(*args, **kwargs)
 
     def test_constructor_defaults(self):
+        from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_INFLIGHT
+
         table = object()
         batch = self._makeOne(table)
         self.assertEqual(batch._table, table)
@@ -80,6 +104,17 @@ class TestBatch(unittest2.TestCase):
         self.assertEqual(batch._timestamp, None)
         self.assertEqual(batch._delete_range, None)
         self.assertEqual(batch._transaction, False)
+        self.assertEqual(batch._max_bytes, None)
+        self.assertEqual(batch._max_inflight, DEFAULT_MAX_INFLIGHT)
+        self.assertEqual(batch._flush_interval, None)
+        self.assertEqual(batch._coalesce, False)
+        self.assertEqual(batch._controller, None)
+        self.assertEqual(batch._spool, None)
+        self.assertEqual(batch._priority, 'batch')
+        self.assertEqual(batch._byte_count, 0)
+        self.assertEqual(batch._oldest_mutation_time, None)
+        self.assertEqual(batch._flusher, None)
+        self.assertEqual(batch._flusher_errors, [])
 
     def test_constructor_explicit(self):
         from gcloud_bigtable._helpers import _microseconds_to_timestamp
@@ -89,10 +124,17 @@ class TestBatch(unittest2.TestCase):
         timestamp = 144185290431
         batch_size = 42
         transaction = False  # Must be False when batch_size is non-null
+        max_bytes = 1024
+        max_inflight = 3
 
         batch = self._makeOne(table, timestamp=timestamp,
-                              batch_size=batch_size, transaction=transaction)
+                              batch_size=batch_size, transaction=transaction,
+                              max_bytes=max_bytes, max_inflight=max_inflight,
+                              coalesce=True)
         self.assertEqual(batch._table, table)
+        self.assertEqual(batch._coalesce, True)
+        self.assertEqual(batch._max_bytes, max_bytes)
+        self.assertEqual(batch._max_inflight, max_inflight)
         self.assertEqual(batch._batch_size, batch_size)
         self.assertEqual(batch._timestamp,
                          _microseconds_to_timestamp(1000 * timestamp))
@@ -117,6 +159,83 @@ class TestBatch(unittest2.TestCase):
         with self.assertRaises(ValueError):
             self._makeOne(table, batch_size=batch_size)
 
+    def test_constructor_with_non_positive_max_bytes(self):
+        table = object()
+        with self.assertRaises(ValueError):
+            self._makeOne(table, max_bytes=0)
+
+    def test_constructor_with_max_bytes_and_transactional(self):
+        table = object()
+        with self.assertRaises(TypeError):
+            self._makeOne(table, max_bytes=1, transaction=True)
+
+    def test_constructor_with_flush_interval(self):
+        table = object()
+        flush_interval = 1000.0
+        batch = self._makeOne(table, flush_interval=flush_interval)
+        self.assertEqual(batch._flush_interval, flush_interval)
+        # The flusher thread is only started once there are mutations.
+        self.assertEqual(batch._flusher, None)
+
+    def test__start_flusher(self):
+        batch = self._makeOne(object(), flush_interval=1000.0)
+        batch._start_flusher()
+        flusher = batch._flusher
+        self.assertTrue(flusher.daemon)
+        self.assertTrue(flusher.is_alive())
+        # Starting again is a no-op.
+        batch._start_flusher()
+        self.assertTrue(batch._flusher is flusher)
+
+        batch._stop_flusher()
+        self.assertFalse(flusher.is_alive())
+        self.assertEqual(batch._flusher, None)
+        # Stopping again is a no-op.
+        batch._stop_flusher()
+
+    def test__start_flusher_without_flush_interval(self):
+        batch = self._makeOne(object())
+        batch._start_flusher()
+        self.assertEqual(batch._flusher, None)
+
+    def test_constructor_with_non_positive_flush_interval(self):
+        table = object()
+        with self.assertRaises(ValueError):
+            self._makeOne(table, flush_interval=0)
+
+    def test_constructor_with_flush_interval_and_transactional(self):
+        table = object()
+        with self.assertRaises(TypeError):
+            self._makeOne(table, flush_interval=1, transaction=True)
+
+    def test_constructor_with_controller(self):
+        table = object()
+        controller = object()
+        batch = self._makeOne(table, controller=controller)
+        self.assertTrue(batch._controller is controller)
+
+    def test_constructor_with_spool(self):
+        table = object()
+        spool = object()
+        batch = self._makeOne(table, spool=spool)
+        self.assertTrue(batch._spool is spool)
+
+    def test_constructor_with_priority(self):
+        from gcloud_bigtable.rate_limiter import INTERACTIVE
+
+        batch = self._makeOne(object(), priority=INTERACTIVE)
+        self.assertEqual(batch._priority, INTERACTIVE)
+
+    def test_constructor_with_controller_and_transactional(self):
+        table = object()
+        with self.assertRaises(TypeError):
+            self._makeOne(table, controller=object(), transaction=True)
+
+    def test_constructor_with_non_positive_max_inflight(self):
+        table = object()
+        with self.assertRaises(ValueError):
+            self._makeOne(table, max_inflight=0)
+
     def test_constructor_with_batch_size_and_transactional(self):
         table = object()
         batch_size = 1
@@ -125,27 +244,181 @@ class TestBatch(unittest2.TestCase):
             self._makeOne(table, batch_size=batch_size,
                           transaction=transaction)
 
-    def test_send(self):
-        table = object()
-        batch = self._makeOne(table)
+    def _send_helper(self, errors, flusher_errors=()):
+        low_level_table = _MockLowLevelTable()
+        low_level_table.mock_batcher = mock_batcher = _MockBatcher(errors)
+        table = _MockTable(low_level_table)
+        max_inflight = 3
+        batch = self._makeOne(table, max_inflight=max_inflight)
+        batch._flusher_errors = list(flusher_errors)
 
         batch._row_map = row_map = _MockRowMap()
         row_map['row-key1'] = row1 = _MockRow()
         row_map['row-key2'] = row2 = _MockRow()
         batch._mutation_count = 1337
+        batch._byte_count = 4096
+        batch._oldest_mutation_time = 123.0
 
         self.assertEqual(row_map.clear_count, 0)
-        self.assertEqual(row1.commits, 0)
-        self.assertEqual(row2.commits, 0)
         self.assertNotEqual(batch._mutation_count, 0)
         self.assertNotEqual(row_map, {})
 
+        try:
+            batch.send()
+        finally:
+            self.assertEqual(low_level_table.batcher_kwargs,
+                             [{'max_inflight': max_inflight,
+                               'coalesce': False, 'controller': None,
+                               'spool': None, 'priority': 'batch'}])
+            self.assertEqual(sorted(mock_batcher.rows, key=id),
+                             sorted([row1, row2], key=id))
+            self.assertEqual(mock_batcher.flushes, 1)
+            self.assertEqual(row_map.clear_count, 1)
+            self.assertEqual(batch._mutation_count, 0)
+            self.assertEqual(batch._byte_count, 0)
+            self.assertEqual(batch._oldest_mutation_time, None)
+            self.assertEqual(row_map, {})
+            self.assertEqual(batch._flusher_errors, [])
+
+    def test_send(self):
+        self._send_helper([])
+
+    def test_send_failure(self):
+        from gcloud_bigtable.happybase.batch import BatchSendError
+
+        errors = [('row-key2', RuntimeError('Failed'))]
+        with self.assertRaises(BatchSendError) as exc_info:
+            self._send_helper(errors)
+        self.assertEqual(exc_info.exception.errors, errors)
+
+    def test_send_stops_flusher(self):
+        low_level_table = _MockLowLevelTable()
+        low_level_table.mock_batcher = _MockBatcher([])
+        batch = self._makeOne(_MockTable(low_level_table),
+                              flush_interval=1000.0)
+        batch._start_flusher()
+        flusher = batch._flusher
+
         batch.send()
-        self.assertEqual(row_map.clear_count, 1)
-        self.assertEqual(row1.commits, 1)
-        self.assertEqual(row2.commits, 1)
-        self.assertEqual(batch._mutation_count, 0)
-        self.assertEqual(row_map, {})
+        self.assertEqual(batch._flusher, None)
+        flusher.join()
+        self.assertFalse(flusher.is_alive())
+
+    def test_close(self):
+        low_level_table = _MockLowLevelTable()
+        low_level_table.mock_batcher = mock_batcher = _MockBatcher([])
+        batch = self._makeOne(_MockTable(low_level_table),
+                              flush_interval=1000.0)
+        batch._start_flusher()
+        flusher = batch._flusher
+
+        batch.close()
+        self.assertFalse(flusher.is_alive())
+        self.assertEqual(batch._flusher, None)
+        self.assertEqual(mock_batcher.flushes, 1)
+
+    def test_send_with_flusher_errors(self):
+        from gcloud_bigtable.happybase.batch import BatchSendError
+
+        flusher_errors = [('row-key0', RuntimeError('Failed'))]
+        errors = [('row-key2', RuntimeError('Failed'))]
+        with self.assertRaises(BatchSendError) as exc_info:
+            self._send_helper(errors, flusher_errors=flusher_errors)
+        self.assertEqual(exc_info.exception.errors, flusher_errors + errors)
+
+    def _flush_loop_helper(self, oldest_times, now, send_error=None,
+                           logger=None):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable.happybase import batch as MUT
+
+        klass = self._getTargetClass()
+
+        class BatchWithSend(klass):
+
+            send_calls = 0
+
+            def send(self):
+                self.send_calls += 1
+                self._oldest_mutation_time = None
+                if send_error is not None:
+                    raise send_error
+
+        table = object()
+        flush_interval = 10.0
+        batch = BatchWithSend(table)
+        batch._flush_interval = flush_interval
+        event = _MockEvent(len(oldest_times))
+
+        def set_oldest_time():
+            batch._oldest_mutation_time = oldest_times.pop(0)
+            return now
+
+        event.callback = set_oldest_time
+        with _Monkey(MUT, _now=lambda: now, LOGGER=logger or _MockLogger()):
+            batch._flush_loop(event)
+        return batch, event
+
+    def test__flush_loop_no_mutations(self):
+        batch, event = self._flush_loop_helper([None, None], 100.0)
+        self.assertEqual(batch.send_calls, 0)
+        self.assertEqual(event.timeouts, [10.0, 10.0, 10.0])
+
+    def test__flush_loop_mutations_too_new(self):
+        batch, event = self._flush_loop_helper([96.0, 96.0], 100.0)
+        self.assertEqual(batch.send_calls, 0)
+        self.assertEqual(event.timeouts, [10.0, 6.0, 6.0])
+
+    def test__flush_loop_send(self):
+        batch, event = self._flush_loop_helper([90.0, 85.0], 100.0)
+        self.assertEqual(batch.send_calls, 2)
+        self.assertEqual(event.timeouts, [10.0, 10.0, 10.0])
+        self.assertEqual(batch._flusher_errors, [])
+
+    def test__flush_loop_send_failure(self):
+        from gcloud_bigtable.happybase.batch import BatchSendError
+
+        errors = [('row-key', RuntimeError('Failed'))]
+        batch, _ = self._flush_loop_helper([90.0, 85.0], 100.0,
+                                           BatchSendError(errors))
+        self.assertEqual(batch.send_calls, 2)
+        self.assertEqual(batch._flusher_errors, errors + errors)
+
+    def test__flush_loop_send_unexpected_failure(self):
+        logger = _MockLogger()
+        batch, _ = self._flush_loop_helper([90.0, 85.0], 100.0,
+                                           RuntimeError('Failed'),
+                                           logger=logger)
+        # The thread keeps running and logs the errors.
+        self.assertEqual(batch.send_calls, 2)
+        self.assertEqual(len(logger.exceptions), 2)
+        self.assertEqual(batch._flusher_errors, [])
+
+    def test__add_mutation_count(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable.happybase import batch as MUT
+
+        table = object()
+        batch = self._makeOne(table)
+        times = [1.0, 2.0]
+        with _Monkey(MUT, _now=lambda: times.pop(0)):
+            batch._add_mutation_count(0)
+            self.assertEqual(batch._oldest_mutation_time, None)
+            batch._add_mutation_count(2)
+            batch._add_mutation_count(3)
+        self.assertEqual(batch._mutation_count, 5)
+        self.assertEqual(batch._oldest_mutation_time, 1.0)
+        self.assertEqual(times, [2.0])
+        self.assertEqual(batch._flusher, None)
+
+    def test__add_mutation_count_starts_flusher(self):
+        batch = self._makeOne(object(), flush_interval=1000.0)
+        batch._add_mutation_count(1)
+        flusher = batch._flusher
+        self.assertTrue(flusher.is_alive())
+        batch._add_mutation_count(1)
+        self.assertTrue(batch._flusher is flusher)
+        batch._stop_flusher()
+        self.assertFalse(flusher.is_alive())
 
     def test__try_send_no_batch_size(self):
         klass = self._getTargetClass()
@@ -197,6 +470,58 @@ class TestBatch(unittest2.TestCase):
         batch._try_send()
         self.assertTrue(batch._send_called)
 
+    def _try_send_controller_helper(self, mutation_count, batch_size=None):
+        klass = self._getTargetClass()
+
+        class BatchWithSend(_SendMixin, klass):
+            pass
+
+        table = object()
+        controller = _MockController(mutation_limit=10)
+        batch = BatchWithSend(table, batch_size=batch_size,
+                              controller=controller)
+        batch._mutation_count = mutation_count
+        batch._try_send()
+        return batch._send_called
+
+    def test__try_send_controller_too_few_mutations(self):
+        self.assertFalse(self._try_send_controller_helper(9))
+
+    def test__try_send_controller_actual_send(self):
+        self.assertTrue(self._try_send_controller_helper(10))
+
+    def test__try_send_controller_with_batch_size(self):
+        # An explicit batch size takes precedence over the controller.
+        self.assertFalse(self._try_send_controller_helper(10, batch_size=20))
+
+    def test__try_send_too_few_bytes(self):
+        klass = self._getTargetClass()
+
+        class BatchWithSend(_SendMixin, klass):
+            pass
+
+        table = object()
+        max_bytes = 100
+        batch = BatchWithSend(table, max_bytes=max_bytes)
+
+        batch._byte_count = 99
+        batch._try_send()
+        self.assertFalse(batch._send_called)
+
+    def test__try_send_max_bytes(self):
+        klass = self._getTargetClass()
+
+        class BatchWithSend(_SendMixin, klass):
+            pass
+
+        table = object()
+        max_bytes = 100
+        batch = BatchWithSend(table, max_bytes=max_bytes)
+
+        batch._byte_count = 100
+        batch._try_send()
+        self.assertTrue(batch._send_called)
+
     def test__get_row_exists(self):
         table = object()
         batch = self._makeOne(table)
@@ -262,9 +587,11 @@ class TestBatch(unittest2.TestCase):
                 col2_fam + ':' + col2_qual: value2}
 
         self.assertEqual(batch._mutation_count, 0)
+        self.assertEqual(batch._byte_count, 0)
         self.assertEqual(row.set_cell_calls, [])
         batch.put(row_key, data)
         self.assertEqual(batch._mutation_count, 2)
+        self.assertEqual(batch._byte_count, 2 * (3 + 5 + 6))
         # Since the calls depend on data.keys(), the order
         # is non-deterministic.
         first_elt = operator.itemgetter(0)
@@ -279,6 +606,33 @@ class TestBatch(unittest2.TestCase):
             (cell2_args, cell2_kwargs),
         ])
 
+    def test_put_int_value(self):
+        from gcloud_bigtable.row import _PACK_I64
+
+        table = object()
+        batch = self._makeOne(table)
+        row_key = 'row-key'
+        batch._row_map[row_key] = row = _MockRow()
+        batch.put(row_key, {'cf:qual': 1337})
+        self.assertEqual(batch._mutation_count, 1)
+        # The packed 8-byte value is counted.
+        self.assertEqual(batch._byte_count, 2 + 4 + 8)
+        self.assertEqual(row.set_cell_calls, [
+            (('cf', 'qual', _PACK_I64(1337)), {'timestamp': None}),
+        ])
+
+    def test_put_bad_value(self):
+        table = object()
+        batch = self._makeOne(table)
+        row_key = 'row-key'
+        batch._row_map[row_key] = row = _MockRow()
+        with self.assertRaises(TypeError):
+            batch.put(row_key, {'cf:qual': object()})
+        # Nothing is added to the row or counted.
+        self.assertEqual(row.set_cell_calls, [])
+        self.assertEqual(batch._mutation_count, 0)
+        self.assertEqual(batch._byte_count, 0)
+
     def test_put_call_try_send(self):
         klass = self._getTargetClass()
 
@@ -315,6 +669,8 @@ class TestBatch(unittest2.TestCase):
 
         batch._delete_columns(columns, row_object)
         self.assertEqual(row_object.commits, 0)
+        self.assertEqual(batch._byte_count,
+                         len(col1_fam) + len(col2_fam) + len(col2_qual))
 
         cell_deleted_args = (col2_fam, col2_qual)
         cell_deleted_kwargs = {'time_range': time_range}
@@ -438,6 +794,24 @@ class TestBatch(unittest2.TestCase):
 
         self.assertTrue(batch._send_called)
 
+    def test_context_manager_stops_flusher(self):
+        klass = self._getTargetClass()
+
+        class BatchWithSend(_SendMixin, klass):
+            pass
+
+        table = object()
+        batch = BatchWithSend(table, flush_interval=1000.0)
+
+        with batch:
+            batch._start_flusher()
+            flusher = batch._flusher
+            self.assertTrue(flusher.is_alive())
+
+        self.assertFalse(flusher.is_alive())
+        self.assertEqual(batch._flusher, None)
+        self.assertTrue(batch._send_called)
+
     def test_context_manager_with_exception_non_transactional(self):
         klass = self._getTargetClass()
 
@@ -475,6 +849,402 @@ class TestBatch(unittest2.TestCase):
         self.assertTrue(batch._send_called)
 
 
+class TestCounterBatch(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.happybase.batch import CounterBatch
+        return CounterBatch
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def _makeTable(self, counters=None, failures=None):
+        low_level_table = _MockCounterLowLevelTable(counters, failures)
+        return _MockTable(low_level_table), low_level_table
+
+    def test_constructor_defaults(self):
+        from gcloud_bigtable.happybase.batch import DEFAULT_MAX_COUNTERS
+
+        table = object()
+        batch = self._makeOne(table)
+        self.assertTrue(batch._table is table)
+        self.assertEqual(batch._max_counters, DEFAULT_MAX_COUNTERS)
+        self.assertEqual(batch._flush_interval, None)
+        self.assertEqual(batch._flush_callback, None)
+        self.assertEqual(batch._pending, {})
+        self.assertEqual(batch._num_counters, 0)
+        self.assertEqual(batch._oldest_increment_time, None)
+        self.assertEqual(batch._flusher, None)
+
+    def test_constructor_with_flush_interval(self):
+        table = object()
+        flush_callback = object()
+        batch = self._makeOne(table, max_counters=10, flush_interval=1000.0,
+                              flush_callback=flush_callback)
+        self.assertEqual(batch._max_counters, 10)
+        self.assertEqual(batch._flush_interval, 1000.0)
+        self.assertTrue(batch._flush_callback is flush_callback)
+        # The flusher thread is only started once there are increments.
+        self.assertEqual(batch._flusher, None)
+
+    def test__start_flusher(self):
+        batch = self._makeOne(object(), flush_interval=1000.0)
+        batch._start_flusher()
+        flusher = batch._flusher
+        self.assertTrue(flusher.daemon)
+        self.assertTrue(flusher.is_alive())
+        # Starting again is a no-op.
+        batch._start_flusher()
+        self.assertTrue(batch._flusher is flusher)
+
+        batch._stop_flusher()
+        self.assertFalse(flusher.is_alive())
+        self.assertEqual(batch._flusher, None)
+        # Stopping again is a no-op.
+        batch._stop_flusher()
+
+    def test__start_flusher_without_flush_interval(self):
+        batch = self._makeOne(object())
+        batch._start_flusher()
+        self.assertEqual(batch._flusher, None)
+
+    def test_constructor_with_non_positive_max_counters(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(object(), max_counters=0)
+
+    def test_constructor_with_non_positive_flush_interval(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(object(), flush_interval=0)
+
+    def test_counter_inc_and_dec(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable.happybase import batch as MUT
+
+        table, low_level_table = self._makeTable()
+        batch = self._makeOne(table)
+        times = [10.0, 20.0]
+        with _Monkey(MUT, _now=lambda: times.pop(0)):
+            batch.counter_inc('row-key1', 'fam:col1')
+            batch.counter_inc('row-key1', 'fam:col1', value=2)
+            batch.counter_inc('row-key1', 'fam:col2', value=5)
+            batch.counter_dec('row-key2', 'fam:col1', value=4)
+
+        self.assertEqual(batch._pending, {
+            'row-key1': {'fam:col1': 3, 'fam:col2': 5},
+            'row-key2': {'fam:col1': -4},
+        })
+        self.assertEqual(batch._num_counters, 3)
+        self.assertEqual(batch._oldest_increment_time, 10.0)
+        # Nothing is sent until the batch is flushed.
+        self.assertEqual(low_level_table.rows_made, [])
+
+    def test_flush(self):
+        table, low_level_table = self._makeTable(
+            counters={('row-key1', 'fam', b'col1'): 10})
+        batch = self._makeOne(table)
+        batch.counter_inc('row-key2', 'fam:col1', value=7)
+        batch.counter_inc('row-key1', 'fam:col1')
+        batch.counter_inc('row-key2', 'fam:col1', value=-2)
+        batch.counter_inc('row-key1', 'fam:col2', value=3)
+
+        totals = batch.flush()
+        self.assertEqual(totals, {
+            ('row-key1', 'fam:col1'): 11,
+            ('row-key1', 'fam:col2'): 3,
+            ('row-key2', 'fam:col1'): 5,
+        })
+        # One request per row, with one rule per counter.
+        self.assertEqual(low_level_table.rows_made, ['row-key2', 'row-key1'])
+        self.assertEqual(low_level_table.increments, [
+            [('fam', 'col1', 5)],
+            [('fam', 'col1', 1), ('fam', 'col2', 3)],
+        ])
+        self.assertEqual(batch._pending, {})
+        self.assertEqual(batch._num_counters, 0)
+        self.assertEqual(batch._oldest_increment_time, None)
+        self.assertEqual(batch.flush(), {})
+
+    def test_flush_failure(self):
+        from gcloud_bigtable.happybase.batch import CounterBatchError
+
+        error = RuntimeError('Failed')
+        table, low_level_table = self._makeTable(
+            failures={'row-key2': error})
+        batch = self._makeOne(table)
+        batch.counter_inc('row-key1', 'fam:col1')
+        batch.counter_inc('row-key2', 'fam:col1', value=2)
+        batch.counter_inc('row-key2', 'fam:col2', value=4)
+        batch.counter_inc('row-key3', 'fam:col1', value=3)
+
+        with self.assertRaises(CounterBatchError) as exc_info:
+            batch.flush()
+        exc = exc_info.exception
+        self.assertEqual(exc.errors, [('row-key2', error)])
+        self.assertEqual(exc.row_keys, ['row-key2'])
+        self.assertEqual(exc.increments, {
+            ('row-key2', 'fam:col1'): 2,
+            ('row-key2', 'fam:col2'): 4,
+        })
+        self.assertEqual(exc.totals, {
+            ('row-key1', 'fam:col1'): 1,
+            ('row-key3', 'fam:col1'): 3,
+        })
+        # The rows after the failed one are still sent and the increments
+        # of the failed row are dropped rather than sent again.
+        self.assertEqual(low_level_table.rows_made,
+                         ['row-key1', 'row-key2', 'row-key3'])
+        self.assertEqual(batch._pending, {})
+        self.assertEqual(batch._num_counters, 0)
+        self.assertEqual(batch.flush(), {})
+        self.assertEqual(low_level_table.rows_made,
+                         ['row-key1', 'row-key2', 'row-key3'])
+
+    def test_flush_bad_response(self):
+        from gcloud_bigtable.happybase.batch import CounterBatchError
+
+        table, low_level_table = self._makeTable()
+        low_level_table.num_cells = 2
+        batch = self._makeOne(table)
+        batch.counter_inc('row-key1', 'fam:col1')
+        with self.assertRaises(CounterBatchError) as exc_info:
+            batch.flush()
+        exc = exc_info.exception
+        (row_key, error), = exc.errors
+        self.assertEqual(row_key, 'row-key1')
+        self.assertTrue(isinstance(error, ValueError))
+        self.assertEqual(exc.increments, {('row-key1', 'fam:col1'): 1})
+        self.assertEqual(exc.totals, {})
+
+    def test_counter_inc_starts_flusher(self):
+        table, _ = self._makeTable()
+        batch = self._makeOne(table, flush_interval=1000.0)
+        batch.counter_inc('row-key1', 'fam:col1')
+        flusher = batch._flusher
+        self.assertTrue(flusher.is_alive())
+        batch.counter_inc('row-key1', 'fam:col2')
+        self.assertTrue(batch._flusher is flusher)
+        batch._stop_flusher()
+        self.assertFalse(flusher.is_alive())
+
+    def test_flush_stops_flusher(self):
+        table, _ = self._makeTable()
+        batch = self._makeOne(table, flush_interval=1000.0)
+        batch.counter_inc('row-key1', 'fam:col1')
+        flusher = batch._flusher
+
+        batch.flush()
+        self.assertEqual(batch._flusher, None)
+        flusher.join()
+        self.assertFalse(flusher.is_alive())
+
+    def test_close(self):
+        table, low_level_table = self._makeTable()
+        reported = []
+        batch = self._makeOne(table, flush_interval=1000.0,
+                              flush_callback=reported.append)
+        batch.counter_inc('row-key1', 'fam:col1', value=4)
+        flusher = batch._flusher
+
+        batch.close()
+        self.assertFalse(flusher.is_alive())
+        self.assertEqual(batch._flusher, None)
+        self.assertEqual(low_level_table.rows_made, ['row-key1'])
+        self.assertEqual(reported, [{('row-key1', 'fam:col1'): 4}])
+
+    def test_flush_with_flusher_errors(self):
+        from gcloud_bigtable.happybase.batch import CounterBatchError
+
+        error = RuntimeError('Failed')
+        table, _ = self._makeTable(failures={'row-key1': error})
+        batch = self._makeOne(table)
+        batch._flusher_errors = [('row-key1', error)]
+        batch._flusher_increments = {('row-key1', 'fam:col1'): 5}
+        batch.counter_inc('row-key2', 'fam:col1')
+        batch.counter_inc('row-key1', 'fam:col1', value=2)
+
+        with self.assertRaises(CounterBatchError) as exc_info:
+            batch.flush()
+        exc = exc_info.exception
+        self.assertEqual(exc.errors,
+                         [('row-key1', error), ('row-key1', error)])
+        # The dropped increments of the same counter are summed.
+        self.assertEqual(exc.increments, {('row-key1', 'fam:col1'): 7})
+        self.assertEqual(exc.totals, {('row-key2', 'fam:col1'): 1})
+        # The errors are only reported once.
+        self.assertEqual(batch._flusher_errors, [])
+        self.assertEqual(batch._flusher_increments, {})
+        self.assertEqual(batch.flush(), {})
+
+    def test_counter_inc_max_counters_failure(self):
+        from gcloud_bigtable.happybase.batch import CounterBatchError
+
+        error = RuntimeError('Failed')
+        table, _ = self._makeTable(failures={'row-key1': error})
+        reported = []
+        batch = self._makeOne(table, max_counters=2,
+                              flush_callback=reported.append)
+        batch.counter_inc('row-key1', 'fam:col1')
+        with self.assertRaises(CounterBatchError):
+            batch.counter_inc('row-key2', 'fam:col1')
+        # The totals of the rows which were sent are still reported.
+        self.assertEqual(reported, [{('row-key2', 'fam:col1'): 1}])
+
+    def test_counter_inc_max_counters(self):
+        table, low_level_table = self._makeTable()
+        reported = []
+        batch = self._makeOne(table, max_counters=2,
+                              flush_callback=reported.append)
+        batch.counter_inc('row-key1', 'fam:col1')
+        batch.counter_inc('row-key1', 'fam:col1')
+        self.assertEqual(low_level_table.rows_made, [])
+        batch.counter_inc('row-key2', 'fam:col1')
+        self.assertEqual(low_level_table.rows_made, ['row-key1', 'row-key2'])
+        self.assertEqual(reported, [{
+            ('row-key1', 'fam:col1'): 2,
+            ('row-key2', 'fam:col1'): 1,
+        }])
+
+    def test_counter_inc_max_counters_without_callback(self):
+        table, low_level_table = self._makeTable()
+        batch = self._makeOne(table, max_counters=1)
+        batch.counter_inc('row-key1', 'fam:col1')
+        self.assertEqual(low_level_table.rows_made, ['row-key1'])
+        self.assertEqual(batch._pending, {})
+
+    def _flush_loop_helper(self, oldest_times, now, flush_error=None,
+                           logger=None):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable.happybase import batch as MUT
+
+        klass = self._getTargetClass()
+
+        class BatchWithFlush(klass):
+
+            flush_calls = 0
+
+            def flush(self):
+                self.flush_calls += 1
+                if flush_error is not None:
+                    raise flush_error
+                self._oldest_increment_time = None
+                return {}
+
+        reported = []
+        batch = BatchWithFlush(object(), flush_callback=reported.append)
+        batch._flush_interval = 10.0
+        event = _MockEvent(len(oldest_times))
+
+        def set_oldest_time():
+            batch._oldest_increment_time = oldest_times.pop(0)
+
+        event.callback = set_oldest_time
+        with _Monkey(MUT, _now=lambda: now, LOGGER=logger or _MockLogger()):
+            batch._flush_loop(event)
+        return batch, event, reported
+
+    def test__flush_loop_no_increments(self):
+        batch, event, _ = self._flush_loop_helper([None, None], 100.0)
+        self.assertEqual(batch.flush_calls, 0)
+        self.assertEqual(event.timeouts, [10.0, 10.0, 10.0])
+
+    def test__flush_loop_increments_too_new(self):
+        batch, event, _ = self._flush_loop_helper([96.0, 96.0], 100.0)
+        self.assertEqual(batch.flush_calls, 0)
+        self.assertEqual(event.timeouts, [10.0, 6.0, 6.0])
+
+    def test__flush_loop_flush(self):
+        batch, event, reported = self._flush_loop_helper([90.0, 85.0], 100.0)
+        self.assertEqual(batch.flush_calls, 2)
+        self.assertEqual(event.timeouts, [10.0, 10.0, 10.0])
+        self.assertEqual(reported, [{}, {}])
+
+    def test__flush_loop_flush_failure(self):
+        logger = _MockLogger()
+        batch, _, reported = self._flush_loop_helper(
+            [90.0, 85.0], 100.0, flush_error=RuntimeError('Failed'),
+            logger=logger)
+        # The failures don't stop the flusher thread.
+        self.assertEqual(batch.flush_calls, 2)
+        self.assertEqual(reported, [])
+        self.assertEqual(len(logger.exceptions), 2)
+        self.assertEqual(batch._flusher_errors, [])
+
+    def test__flush_loop_flush_row_failure(self):
+        from gcloud_bigtable.happybase.batch import CounterBatchError
+
+        errors = [('row-key1', RuntimeError('Failed'))]
+        increments = {('row-key1', 'fam:col1'): 3}
+        totals = {('row-key2', 'fam:col1'): 1}
+        logger = _MockLogger()
+        batch, _, reported = self._flush_loop_helper(
+            [90.0, 85.0], 100.0,
+            flush_error=CounterBatchError(errors, increments, totals),
+            logger=logger)
+        self.assertEqual(batch.flush_calls, 2)
+        # The totals of the rows which were sent are reported, the failed
+        # rows are logged and kept for the next flush.
+        self.assertEqual(reported, [totals, totals])
+        self.assertEqual(len(logger.warnings), 2)
+        self.assertEqual(logger.exceptions, [])
+        self.assertEqual(batch._flusher_errors, errors)
+        self.assertEqual(batch._flusher_increments, increments)
+
+    def test_context_manager(self):
+        table, low_level_table = self._makeTable()
+        reported = []
+        batch = self._makeOne(table, flush_interval=1000.0,
+                              flush_callback=reported.append)
+
+        with batch as entered:
+            self.assertTrue(entered is batch)
+            batch.counter_inc('row-key1', 'fam:col1', value=4)
+            flusher = batch._flusher
+            self.assertTrue(flusher.is_alive())
+
+        self.assertFalse(flusher.is_alive())
+        self.assertEqual(batch._flusher, None)
+        self.assertEqual(low_level_table.rows_made, ['row-key1'])
+        self.assertEqual(reported, [{('row-key1', 'fam:col1'): 4}])
+
+    def test_context_manager_failure(self):
+        from gcloud_bigtable.happybase.batch import CounterBatchError
+
+        error = RuntimeError('Failed')
+        table, _ = self._makeTable(failures={'row-key1': error})
+        with self.assertRaises(CounterBatchError) as exc_info:
+            with self._makeOne(table) as batch:
+                batch.counter_inc('row-key1', 'fam:col1', value=4)
+        self.assertEqual(exc_info.exception.errors, [('row-key1', error)])
+
+
+class _MockEvent(object):
+
+    def __init__(self, num_waits):
+        self.num_waits = num_waits
+        self.timeouts = []
+        self.callback = None
+
+    def wait(self, timeout):
+        self.timeouts.append(timeout)
+        if len(self.timeouts) > self.num_waits:
+            return True
+        self.callback()
+        return False
+
+
+class _MockLogger(object):
+
+    def __init__(self):
+        self.warnings = []
+        self.exceptions = []
+
+    def warning(self, msg, *args):
+        self.warnings.append(msg % args)
+
+    def exception(self, msg, *args):
+        self.exceptions.append(msg % args)
+
+
 class _MockRowMap(dict):
 
     clear_count = 0
@@ -495,9 +1265,6 @@ class _MockRow(object):
         self.delete_cell_calls = []
         self.delete_cells_calls = []
 
-    def commit(self):
-        self.commits += 1
-
     def delete(self):
         self.deletes += 1
 
@@ -511,6 +1278,21 @@ class _MockRow(object):
         self.delete_cells_calls.append((args, kwargs))
 
 
+class _MockBatcher(object):
+
+    def __init__(self, errors):
+        self.errors = errors
+        self.rows = []
+        self.flushes = 0
+
+    def mutate(self, row):
+        self.rows.append(row)
+
+    def flush(self):
+        self.flushes += 1
+        return self.errors
+
+
 class _MockTable(object):
 
     def __init__(self, low_level_table):
@@ -524,7 +1306,60 @@ class _MockLowLevelTable(object):
         self.kwargs = kwargs
         self.rows_made = []
         self.mock_row = None
+        self.batcher_kwargs = []
+        self.mock_batcher = None
 
     def row(self, row_key):
         self.rows_made.append(row_key)
         return self.mock_row
+
+    def mutation_batcher(self, **kwargs):
+        self.batcher_kwargs.append(kwargs)
+        return self.mock_batcher
+
+
+class _MockController(object):
+
+    def __init__(self, mutation_limit):
+        self.mutation_limit = mutation_limit
+
+
+class _MockCounterLowLevelTable(object):
+
+    def __init__(self, counters=None, failures=None):
+        self.counters = dict(counters or {})
+        self.failures = failures or {}
+        self.num_cells = 1
+        self.rows_made = []
+        self.increments = []
+
+    def row(self, row_key):
+        self.rows_made.append(row_key)
+        return _MockCounterRow(self, row_key)
+
+
+class _MockCounterRow(object):
+
+    def __init__(self, table, row_key):
+        self.table = table
+        self.row_key = row_key
+        self.increments = []
+        table.increments.append(self.increments)
+
+    def increment_cell_value(self, column_family_id, column, int_value):
+        self.increments.append((column_family_id, column, int_value))
+
+    def commit_modifications(self):
+        import struct
+
+        if self.row_key in self.table.failures:
+            raise self.table.failures[self.row_key]
+        result = {}
+        for column_family_id, column, int_value in self.increments:
+            key = (self.row_key, column_family_id, column.encode('ascii'))
+            value = self.table.counters.get(key, 0) + int_value
+            self.table.counters[key] = value
+            cell = (struct.pack('>q', value), None)
+            result.setdefault(column_family_id, {})[key[2]] = (
+                [cell] * self.table.num_cells)
+        return result
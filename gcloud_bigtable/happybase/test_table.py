@@ -194,6 +194,31 @@ class Test__cells_to_pairs(unittest2.TestCase):
                          [(value1, ts1_millis), (value2, ts2_millis)])
 
 
+class Test__escape_regex(unittest2.TestCase):
+
+    def _callFUT(self, *args, **kwargs):
+        from gcloud_bigtable.happybase.table import _escape_regex
+        return _escape_regex(*args, **kwargs)
+
+    def test_word_characters(self):
+        self.assertEqual(self._callFUT(b'abc_XYZ_019'), b'abc_XYZ_019')
+
+    def test_special_characters(self):
+        self.assertEqual(self._callFUT(b'a.b+c*(d)'),
+                         b'a\\.b\\+c\\*\\(d\\)')
+
+    def test_null_byte(self):
+        self.assertEqual(self._callFUT(b'a\x00b'), b'a\\x00b')
+
+    def test_high_bytes(self):
+        self.assertEqual(self._callFUT(b'a\xff\x80'), b'a\xff\x80')
+
+    def test_unicode(self):
+        result = self._callFUT(u'cf.1\u2603')
+        self.assertEqual(result, u'cf\\.1\u2603')
+        self.assertTrue(isinstance(result, type(u'')))
+
+
 class Test__filter_chain_helper(unittest2.TestCase):
 
     def _callFUT(self, *args, **kwargs):
@@ -229,6 +254,7 @@ class Test__filter_chain_helper(unittest2.TestCase):
         self.assertEqual(result.cells_per_column_limit_filter, versions)
 
     def _column_helper(self, num_filters, versions=None, timestamp=None):
+        from gcloud_bigtable.row import ColumnRange
         from gcloud_bigtable.row import RowFilter
         from gcloud_bigtable.row import RowFilterChain
 
@@ -236,31 +262,41 @@ class Test__filter_chain_helper(unittest2.TestCase):
         qual = 'qual'
         column = col_fam + ':' + qual
         result = self._callFUT(column, versions=versions, timestamp=timestamp)
-        self.assertTrue(isinstance(result, RowFilterChain))
+        if num_filters == 1:
+            column_filter = result
+        else:
+            self.assertTrue(isinstance(result, RowFilterChain))
+            self.assertEqual(len(result.filters), num_filters)
+            column_filter = result.filters[0]
 
-        self.assertEqual(len(result.filters), num_filters)
-        fam_filter = result.filters[0]
-        qual_filter = result.filters[1]
-        self.assertTrue(isinstance(fam_filter, RowFilter))
-        self.assertTrue(isinstance(qual_filter, RowFilter))
-
-        # Relies on the fact that RowFilter instances can
-        # only have one value set.
-        self.assertEqual(fam_filter.family_name_regex_filter, col_fam)
-        self.assertEqual(qual_filter.column_qualifier_regex_filter, qual)
+        column_range = ColumnRange(col_fam, start_column=qual,
+                                   end_column=qual)
+        expected_filter = RowFilter(column_range_filter=column_range)
+        self.assertEqual(column_filter, expected_filter)
 
         return result
 
     def test_column_only(self):
-        self._column_helper(num_filters=2)
+        self._column_helper(num_filters=1)
+
+    def test_column_with_special_characters(self):
+        from gcloud_bigtable.row import ColumnRange
+        from gcloud_bigtable.row import RowFilter
+
+        col_fam = 'cf1'
+        qual = 'qu.al+'
+        result = self._callFUT(col_fam + ':' + qual)
+        column_range = ColumnRange(col_fam, start_column=qual,
+                                   end_column=qual)
+        self.assertEqual(result, RowFilter(column_range_filter=column_range))
 
     def test_with_versions(self):
         from gcloud_bigtable.row import RowFilter
 
         versions = 11
-        result = self._column_helper(num_filters=3, versions=versions)
+        result = self._column_helper(num_filters=2, versions=versions)
 
-        version_filter = result.filters[2]
+        version_filter = result.filters[1]
         self.assertTrue(isinstance(version_filter, RowFilter))
         # Relies on the fact that RowFilter instances can
         # only have one value set.
@@ -273,9 +309,9 @@ class Test__filter_chain_helper(unittest2.TestCase):
         from gcloud_bigtable.row import TimestampRange
 
         timestamp = 1441928298571
-        result = self._column_helper(num_filters=3, timestamp=timestamp)
+        result = self._column_helper(num_filters=2, timestamp=timestamp)
 
-        range_filter = result.filters[2]
+        range_filter = result.filters[1]
         self.assertTrue(isinstance(range_filter, RowFilter))
         # Relies on the fact that RowFilter instances can
         # only have one value set.
@@ -288,7 +324,7 @@ class Test__filter_chain_helper(unittest2.TestCase):
     def test_with_all_options(self):
         versions = 11
         timestamp = 1441928298571
-        self._column_helper(num_filters=4, versions=versions,
+        self._column_helper(num_filters=3, versions=versions,
                             timestamp=timestamp)
 
 
@@ -312,9 +348,18 @@ class Test__columns_filter_helper(unittest2.TestCase):
         expected_result = RowFilter(family_name_regex_filter=col_fam)
         self.assertEqual(result, expected_result)
 
+    def test_single_column_family_escaped(self):
+        from gcloud_bigtable.row import RowFilter
+
+        col_fam = 'cf-1.x'
+        columns = [col_fam]
+        result = self._callFUT(columns)
+        expected_result = RowFilter(family_name_regex_filter='cf\\-1\\.x')
+        self.assertEqual(result, expected_result)
+
     def test_column_and_column_familieis(self):
+        from gcloud_bigtable.row import ColumnRange
         from gcloud_bigtable.row import RowFilter
-        from gcloud_bigtable.row import RowFilterChain
         from gcloud_bigtable.row import RowFilterUnion
 
         col_fam1 = 'cf1'
@@ -331,12 +376,31 @@ class Test__columns_filter_helper(unittest2.TestCase):
         self.assertTrue(isinstance(filter1, RowFilter))
         self.assertEqual(filter1.family_name_regex_filter, col_fam1)
 
-        self.assertTrue(isinstance(filter2, RowFilterChain))
-        filter2a, filter2b = filter2.filters
-        self.assertTrue(isinstance(filter2a, RowFilter))
-        self.assertEqual(filter2a.family_name_regex_filter, col_fam2)
-        self.assertTrue(isinstance(filter2b, RowFilter))
-        self.assertEqual(filter2b.column_qualifier_regex_filter, col_qual2)
+        column_range = ColumnRange(col_fam2, start_column=col_qual2,
+                                   end_column=col_qual2)
+        self.assertEqual(filter2, RowFilter(column_range_filter=column_range))
+
+    def test_column_prefix(self):
+        from gcloud_bigtable.row import ColumnRange
+        from gcloud_bigtable.row import RowFilter
+
+        col_fam = 'cf1'
+        columns = [col_fam + ':pre*']
+        result = self._callFUT(columns)
+        column_range = ColumnRange(col_fam, start_column='pre',
+                                   end_column=b'prf', inclusive_end=False)
+        self.assertEqual(result, RowFilter(column_range_filter=column_range))
+
+    def test_column_prefix_unbounded(self):
+        from gcloud_bigtable.row import ColumnRange
+        from gcloud_bigtable.row import RowFilter
+
+        col_fam = 'cf1'
+        columns = [col_fam + ':*']
+        result = self._callFUT(columns)
+        column_range = ColumnRange(col_fam, start_column='',
+                                   inclusive_end=False)
+        self.assertEqual(result, RowFilter(column_range_filter=column_range))
 
 
 class Test__row_keys_filter_helper(unittest2.TestCase):
@@ -356,22 +420,22 @@ class Test__row_keys_filter_helper(unittest2.TestCase):
         row_key = b'row-key'
         row_keys = [row_key]
         result = self._callFUT(row_keys)
-        expected_result = RowFilter(row_key_regex_filter=row_key)
+        expected_result = RowFilter(row_key_regex_filter=b'row\\-key')
         self.assertEqual(result, expected_result)
 
     def test_many_rows(self):
         from gcloud_bigtable.row import RowFilter
         from gcloud_bigtable.row import RowFilterUnion
 
-        row_key1 = b'row-key1'
-        row_key2 = b'row-key2'
-        row_key3 = b'row-key3'
+        row_key1 = b'row_key1'
+        row_key2 = b'row.key2'
+        row_key3 = b'row+key3'
         row_keys = [row_key1, row_key2, row_key3]
         result = self._callFUT(row_keys)
 
-        filter1 = RowFilter(row_key_regex_filter=row_key1)
-        filter2 = RowFilter(row_key_regex_filter=row_key2)
-        filter3 = RowFilter(row_key_regex_filter=row_key3)
+        filter1 = RowFilter(row_key_regex_filter=b'row_key1')
+        filter2 = RowFilter(row_key_regex_filter=b'row\\.key2')
+        filter3 = RowFilter(row_key_regex_filter=b'row\\+key3')
         expected_result = RowFilterUnion(filters=[filter1, filter2, filter3])
         self.assertEqual(result, expected_result)
 
@@ -482,6 +546,48 @@ class TestTable(unittest2.TestCase):
         with self.assertRaises(NotImplementedError):
             table.regions()
 
+    def test__frozen_filter(self):
+        from gcloud_bigtable.row import FrozenRowFilter
+        from gcloud_bigtable.row import RowFilter
+        from gcloud_bigtable.row import RowFilterChain
+
+        name = 'table-name'
+        connection = None
+        table = self._makeOne(name, connection)
+
+        frozen_filter = table._frozen_filter(columns=('fam',), versions=1)
+        self.assertTrue(isinstance(frozen_filter, FrozenRowFilter))
+        expected_filter = RowFilterChain(filters=[
+            RowFilter(family_name_regex_filter='fam'),
+            RowFilter(cells_per_column_limit_filter=1),
+        ])
+        self.assertEqual(frozen_filter.to_pb(), expected_filter.to_pb())
+        # The same arguments re-use the frozen filter.
+        self.assertTrue(
+            table._frozen_filter(columns=('fam',), versions=1) is
+            frozen_filter)
+        self.assertFalse(
+            table._frozen_filter(columns=('fam',), versions=2) is
+            frozen_filter)
+
+    def test__frozen_filter_cache_full(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable.happybase import table as MUT
+
+        name = 'table-name'
+        connection = None
+        table = self._makeOne(name, connection)
+
+        with _Monkey(MUT, _MAX_FROZEN_FILTERS=2):
+            frozen_filter1 = table._frozen_filter(versions=1)
+            table._frozen_filter(versions=2)
+            self.assertEqual(len(table._frozen_filters), 2)
+            table._frozen_filter(versions=3)
+            self.assertEqual(len(table._frozen_filters), 1)
+            # The first filter was dropped, so it is frozen again.
+            self.assertFalse(table._frozen_filter(versions=1) is
+                             frozen_filter1)
+
     def test_row_empty_row(self):
         from gcloud_bigtable._testing import _MockCalled
         from gcloud_bigtable._testing import _Monkey
@@ -498,19 +604,21 @@ class TestTable(unittest2.TestCase):
 
         row_key = 'row-key'
         timestamp = object()
-        with _Monkey(MUT, _filter_chain_helper=mock_filter_chain_helper):
+        with _Monkey(MUT, _filter_chain_helper=mock_filter_chain_helper,
+                     FrozenRowFilter=_MockFrozenFilter):
             result = table.row(row_key, timestamp=timestamp)
 
         # read_row_result == None --> No results.
         self.assertEqual(result, {})
 
         read_row_args = (row_key,)
-        read_row_kwargs = {'filter_': fake_filter}
+        read_row_kwargs = {'filter_': _MockFrozenFilter(fake_filter)}
         self.assertEqual(table._low_level_table.read_row_calls, [
             (read_row_args, read_row_kwargs),
         ])
 
         expected_kwargs = {
+            'column': None,
             'filters': [],
             'versions': 1,
             'timestamp': timestamp,
@@ -534,22 +642,24 @@ class TestTable(unittest2.TestCase):
         mock_filter_chain_helper = _MockCalled(fake_filter)
 
         row_key = 'row-key'
-        columns = object()
+        columns = ['fam:col']
         with _Monkey(MUT, _filter_chain_helper=mock_filter_chain_helper,
-                     _columns_filter_helper=mock_columns_filter_helper):
+                     _columns_filter_helper=mock_columns_filter_helper,
+                     FrozenRowFilter=_MockFrozenFilter):
             result = table.row(row_key, columns=columns)
 
         # read_row_result == None --> No results.
         self.assertEqual(result, {})
 
         read_row_args = (row_key,)
-        read_row_kwargs = {'filter_': fake_filter}
+        read_row_kwargs = {'filter_': _MockFrozenFilter(fake_filter)}
         self.assertEqual(table._low_level_table.read_row_calls, [
             (read_row_args, read_row_kwargs),
         ])
 
-        mock_columns_filter_helper.check_called(self, [(columns,)])
+        mock_columns_filter_helper.check_called(self, [(tuple(columns),)])
         expected_kwargs = {
+            'column': None,
             'filters': [fake_col_filter],
             'versions': 1,
             'timestamp': None,
@@ -581,7 +691,8 @@ class TestTable(unittest2.TestCase):
         partial_row._cells = {col_fam: {qual: fake_cells}}
         include_timestamp = object()
         with _Monkey(MUT, _filter_chain_helper=mock_filter_chain_helper,
-                     _cells_to_pairs=mock_cells_to_pairs):
+                     _cells_to_pairs=mock_cells_to_pairs,
+                     FrozenRowFilter=_MockFrozenFilter):
             result = table.row(row_key, include_timestamp=include_timestamp)
 
         # The results come from _cells_to_pairs.
@@ -589,12 +700,13 @@ class TestTable(unittest2.TestCase):
         self.assertEqual(result, expected_result)
 
         read_row_args = (row_key,)
-        read_row_kwargs = {'filter_': fake_filter}
+        read_row_kwargs = {'filter_': _MockFrozenFilter(fake_filter)}
         self.assertEqual(table._low_level_table.read_row_calls, [
             (read_row_args, read_row_kwargs),
         ])
 
         expected_kwargs = {
+            'column': None,
             'filters': [],
             'versions': 1,
             'timestamp': None,
@@ -616,6 +728,7 @@ class TestTable(unittest2.TestCase):
         from gcloud_bigtable._testing import _MockCalled
         from gcloud_bigtable._testing import _Monkey
         from gcloud_bigtable.happybase import table as MUT
+        from gcloud_bigtable.row import RowFilterChain
 
         name = 'table-name'
         connection = None
@@ -633,26 +746,30 @@ class TestTable(unittest2.TestCase):
         mock_filter_chain_helper = _MockCalled(fake_filter)
 
         rows = ['row-key']
-        columns = object()
+        columns = ['fam:col']
         with _Monkey(MUT, _filter_chain_helper=mock_filter_chain_helper,
                      _row_keys_filter_helper=mock_row_keys_filter_helper,
-                     _columns_filter_helper=mock_columns_filter_helper):
+                     _columns_filter_helper=mock_columns_filter_helper,
+                     FrozenRowFilter=_MockFrozenFilter):
             result = table.rows(rows, columns=columns)
 
         # read_rows_result == Empty PartialRowsData --> No results.
         self.assertEqual(result, [])
 
         read_rows_args = ()
-        read_rows_kwargs = {'filter_': fake_filter}
+        filter_ = RowFilterChain(
+            filters=[_MockFrozenFilter(fake_filter), fake_rows_filter])
+        read_rows_kwargs = {'filter_': filter_}
         self.assertEqual(table._low_level_table.read_rows_calls, [
             (read_rows_args, read_rows_kwargs),
         ])
         self.assertEqual(rr_result.consume_all_calls, 1)
 
-        mock_columns_filter_helper.check_called(self, [(columns,)])
+        mock_columns_filter_helper.check_called(self, [(tuple(columns),)])
         mock_row_keys_filter_helper.check_called(self, [(rows,)])
         expected_kwargs = {
-            'filters': [fake_col_filter, fake_rows_filter],
+            'column': None,
+            'filters': [fake_col_filter],
             'versions': 1,
             'timestamp': None,
         }
@@ -662,6 +779,7 @@ class TestTable(unittest2.TestCase):
         from gcloud_bigtable._testing import _MockCalled
         from gcloud_bigtable._testing import _Monkey
         from gcloud_bigtable.happybase import table as MUT
+        from gcloud_bigtable.row import RowFilterChain
         from gcloud_bigtable.row_data import PartialRowData
 
         row_key1 = 'row-key1'
@@ -692,7 +810,8 @@ class TestTable(unittest2.TestCase):
         include_timestamp = object()
         with _Monkey(MUT, _row_keys_filter_helper=mock_row_keys_filter_helper,
                      _filter_chain_helper=mock_filter_chain_helper,
-                     _cells_to_pairs=mock_cells_to_pairs):
+                     _cells_to_pairs=mock_cells_to_pairs,
+                     FrozenRowFilter=_MockFrozenFilter):
             result = table.rows(rows, include_timestamp=include_timestamp)
 
         # read_rows_result == PartialRowsData with row_key1
@@ -700,7 +819,9 @@ class TestTable(unittest2.TestCase):
         self.assertEqual(result, [(row_key1, expected_result)])
 
         read_rows_args = ()
-        read_rows_kwargs = {'filter_': fake_filter}
+        filter_ = RowFilterChain(
+            filters=[_MockFrozenFilter(fake_filter), fake_rows_filter])
+        read_rows_kwargs = {'filter_': filter_}
         self.assertEqual(table._low_level_table.read_rows_calls, [
             (read_rows_args, read_rows_kwargs),
         ])
@@ -708,7 +829,8 @@ class TestTable(unittest2.TestCase):
 
         mock_row_keys_filter_helper.check_called(self, [(rows,)])
         expected_kwargs = {
-            'filters': [fake_rows_filter],
+            'column': None,
+            'filters': [],
             'versions': 1,
             'timestamp': None,
         }
@@ -733,20 +855,22 @@ class TestTable(unittest2.TestCase):
 
         row_key = 'row-key'
         column = 'fam:col1'
-        with _Monkey(MUT, _filter_chain_helper=mock_filter_chain_helper):
+        with _Monkey(MUT, _filter_chain_helper=mock_filter_chain_helper,
+                     FrozenRowFilter=_MockFrozenFilter):
             result = table.cells(row_key, column)
 
         # read_row_result == None --> No results.
         self.assertEqual(result, [])
 
         read_row_args = (row_key,)
-        read_row_kwargs = {'filter_': fake_filter}
+        read_row_kwargs = {'filter_': _MockFrozenFilter(fake_filter)}
         self.assertEqual(table._low_level_table.read_row_calls, [
             (read_row_args, read_row_kwargs),
         ])
 
         expected_kwargs = {
             'column': column,
+            'filters': [],
             'versions': None,
             'timestamp': None,
         }
@@ -782,7 +906,8 @@ class TestTable(unittest2.TestCase):
         partial_row._cells = {col_fam: {qual: fake_cells}}
         column = col_fam + ':' + qual
         with _Monkey(MUT, _filter_chain_helper=mock_filter_chain_helper,
-                     _cells_to_pairs=mock_cells_to_pairs):
+                     _cells_to_pairs=mock_cells_to_pairs,
+                     FrozenRowFilter=_MockFrozenFilter):
             result = table.cells(row_key, column, versions=versions,
                                  timestamp=timestamp,
                                  include_timestamp=include_timestamp)
@@ -790,13 +915,14 @@ class TestTable(unittest2.TestCase):
         self.assertEqual(result, fake_result)
 
         read_row_args = (row_key,)
-        read_row_kwargs = {'filter_': fake_filter}
+        read_row_kwargs = {'filter_': _MockFrozenFilter(fake_filter)}
         self.assertEqual(table._low_level_table.read_row_calls, [
             (read_row_args, read_row_kwargs),
         ])
 
         filter_kwargs = {
             'column': column,
+            'filters': [],
             'versions': versions,
             'timestamp': timestamp,
         }
@@ -855,6 +981,7 @@ class TestTable(unittest2.TestCase):
         from gcloud_bigtable._testing import _MockCalled
         from gcloud_bigtable._testing import _Monkey
         from gcloud_bigtable.happybase import table as MUT
+        from gcloud_bigtable.row import RowFilterChain
 
         name = 'table-name'
         connection = None
@@ -870,7 +997,8 @@ class TestTable(unittest2.TestCase):
         mock_filter_chain_helper = _MockCalled(fake_filter)
 
         with _Monkey(MUT, _filter_chain_helper=mock_filter_chain_helper,
-                     _columns_filter_helper=mock_columns_filter_helper):
+                     _columns_filter_helper=mock_columns_filter_helper,
+                     FrozenRowFilter=_MockFrozenFilter):
             result = table.scan(row_start=row_start, row_stop=row_stop,
                                 row_prefix=row_prefix, columns=columns,
                                 filter=filter_, timestamp=timestamp,
@@ -886,9 +1014,13 @@ class TestTable(unittest2.TestCase):
         if row_prefix:
             row_start = row_prefix
             row_stop = MUT._string_successor(row_prefix)
+        expected_filter = _MockFrozenFilter(fake_filter)
+        if filter_ is not None:
+            expected_filter = RowFilterChain(
+                filters=[filter_, expected_filter])
         read_rows_kwargs = {
             'end_key': row_stop,
-            'filter_': fake_filter,
+            'filter_': expected_filter,
             'limit': limit,
             'start_key': row_start,
         }
@@ -899,16 +1031,15 @@ class TestTable(unittest2.TestCase):
                          rr_result.iterations + 1)
 
         if columns is not None:
-            mock_columns_filter_helper.check_called(self, [(columns,)])
+            mock_columns_filter_helper.check_called(self, [(tuple(columns),)])
         else:
             mock_columns_filter_helper.check_called(self, [])
 
         filters = []
-        if filter_ is not None:
-            filters.append(filter_)
         if columns:
             filters.append(fake_col_filter)
         expected_kwargs = {
+            'column': None,
             'filters': filters,
             'versions': 1,
             'timestamp': timestamp,
@@ -916,7 +1047,7 @@ class TestTable(unittest2.TestCase):
         mock_filter_chain_helper.check_called(self, [()], [expected_kwargs])
 
     def test_scan_with_columns(self):
-        columns = object()
+        columns = ['fam:col']
         self._scan_test_helper(columns=columns)
 
     def test_scan_with_row_start_and_stop(self):
@@ -954,6 +1085,7 @@ class TestTable(unittest2.TestCase):
         from gcloud_bigtable._testing import _Monkey
         from gcloud_bigtable.happybase import table as MUT
         from gcloud_bigtable.happybase.table import _WAL_SENTINEL
+        from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_INFLIGHT
 
         name = 'table-name'
         connection = None
@@ -983,6 +1115,13 @@ class TestTable(unittest2.TestCase):
             'batch_size': None,
             'transaction': False,
             'wal': _WAL_SENTINEL,
+            'max_bytes': None,
+            'max_inflight': DEFAULT_MAX_INFLIGHT,
+            'flush_interval': None,
+            'coalesce': False,
+            'controller': None,
+            'spool': None,
+            'priority': 'interactive',
         }
         self.assertEqual(batch.kwargs, expected_kwargs)
         # Make sure it was a successful context manager
@@ -994,6 +1133,7 @@ class TestTable(unittest2.TestCase):
         from gcloud_bigtable._testing import _Monkey
         from gcloud_bigtable.happybase import table as MUT
         from gcloud_bigtable.happybase.table import _WAL_SENTINEL
+        from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_INFLIGHT
 
         name = 'table-name'
         connection = None
@@ -1023,6 +1163,13 @@ class TestTable(unittest2.TestCase):
             'batch_size': None,
             'transaction': False,
             'wal': _WAL_SENTINEL,
+            'max_bytes': None,
+            'max_inflight': DEFAULT_MAX_INFLIGHT,
+            'flush_interval': None,
+            'coalesce': False,
+            'controller': None,
+            'spool': None,
+            'priority': 'interactive',
         }
         self.assertEqual(batch.kwargs, expected_kwargs)
         # Make sure it was a successful context manager
@@ -1042,10 +1189,20 @@ class TestTable(unittest2.TestCase):
         batch_size = 42
         transaction = False  # Must be False when batch_size is non-null
         wal = object()
+        max_bytes = 1024
+        max_inflight = 3
+        flush_interval = 2.5
+        controller = object()
+        spool = object()
 
         with _Monkey(MUT, Batch=_MockBatch):
             result = table.batch(timestamp=timestamp, batch_size=batch_size,
-                                 transaction=transaction, wal=wal)
+                                 transaction=transaction, wal=wal,
+                                 max_bytes=max_bytes,
+                                 max_inflight=max_inflight,
+                                 flush_interval=flush_interval,
+                                 coalesce=True, controller=controller,
+                                 spool=spool, priority='interactive')
 
         self.assertTrue(isinstance(result, _MockBatch))
         self.assertEqual(result.args, (table,))
@@ -1054,9 +1211,35 @@ class TestTable(unittest2.TestCase):
             'batch_size': batch_size,
             'transaction': transaction,
             'wal': wal,
+            'max_bytes': max_bytes,
+            'max_inflight': max_inflight,
+            'flush_interval': flush_interval,
+            'coalesce': True,
+            'controller': controller,
+            'spool': spool,
+            'priority': 'interactive',
         }
         self.assertEqual(result.kwargs, expected_kwargs)
 
+    def test_counter_batch(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable.happybase import table as MUT
+
+        table = self._makeOne('table-name', None)
+        flush_callback = object()
+        with _Monkey(MUT, CounterBatch=_MockBatch):
+            result = table.counter_batch(max_counters=10,
+                                         flush_interval=2.5,
+                                         flush_callback=flush_callback)
+
+        self.assertTrue(isinstance(result, _MockBatch))
+        self.assertEqual(result.args, (table,))
+        self.assertEqual(result.kwargs, {
+            'max_counters': 10,
+            'flush_interval': 2.5,
+            'flush_callback': flush_callback,
+        })
+
     def test_counter_get(self):
         klass = self._getTargetClass()
         counter_value = 1337
@@ -1082,6 +1265,91 @@ class TestTable(unittest2.TestCase):
         self.assertEqual(result, counter_value)
         self.assertEqual(TableWithInc.incremented, [(row, column, 0)])
 
+    def _counter_get_many_helper(self, rows, row_data, start_key, end_key):
+        from gcloud_bigtable._testing import _MockCalled
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable.happybase import table as MUT
+        from gcloud_bigtable.row import RowFilterChain
+
+        name = 'table-name'
+        connection = None
+        table = self._makeOne(name, connection)
+        table._low_level_table = _MockLowLevelTable()
+        rr_result = _MockPartialRowsData(rows=row_data)
+        table._low_level_table.read_rows_result = rr_result
+
+        fake_rows_filter = object()
+        mock_row_keys_filter_helper = _MockCalled(fake_rows_filter)
+        fake_filter = object()
+        mock_filter_chain_helper = _MockCalled(fake_filter)
+
+        column = 'fam:col1'
+        with _Monkey(MUT, _filter_chain_helper=mock_filter_chain_helper,
+                     _row_keys_filter_helper=mock_row_keys_filter_helper,
+                     FrozenRowFilter=_MockFrozenFilter):
+            result = table.counter_get_many(iter(rows), column)
+
+        filter_ = RowFilterChain(
+            filters=[fake_rows_filter, _MockFrozenFilter(fake_filter)])
+        self.assertEqual(table._low_level_table.read_rows_calls, [
+            ((), {
+                'start_key': start_key,
+                'end_key': end_key,
+                'filter_': filter_,
+            }),
+        ])
+        self.assertEqual(rr_result.consume_all_calls, 1)
+        mock_row_keys_filter_helper.check_called(self, [(rows,)])
+        expected_kwargs = {
+            'column': column,
+            'filters': [],
+            'timestamp': None,
+            'versions': 1,
+        }
+        mock_filter_chain_helper.check_called(self, [()], [expected_kwargs])
+        return result
+
+    def _makeCounterRow(self, row_key, value):
+        from gcloud_bigtable.row_data import Cell
+        from gcloud_bigtable.row_data import PartialRowData
+
+        row_data = PartialRowData(row_key)
+        row_data._cells = {u'fam': {b'col1': [Cell(value, None)]}}
+        return row_data
+
+    def test_counter_get_many(self):
+        import struct
+
+        row_data = {
+            'row-key1': self._makeCounterRow('row-key1',
+                                             struct.pack('>q', 42)),
+            'row-key3': self._makeCounterRow('row-key3',
+                                             struct.pack('>q', -1)),
+        }
+        rows = ['row-key2', 'row-key3', 'row-key1']
+        result = self._counter_get_many_helper(rows, row_data,
+                                               'row-key1', b'row-key4')
+        # Counters which don't exist are 0.
+        self.assertEqual(result, {
+            'row-key1': 42,
+            'row-key2': 0,
+            'row-key3': -1,
+        })
+
+    def test_counter_get_many_bad_value(self):
+        row_data = {'row-key1': self._makeCounterRow('row-key1', b'abc')}
+        with self.assertRaises(ValueError):
+            self._counter_get_many_helper(['row-key1'], row_data,
+                                          'row-key1', b'row-key2')
+
+    def test_counter_get_many_empty(self):
+        name = 'table-name'
+        connection = None
+        table = self._makeOne(name, connection)
+        table._low_level_table = _MockLowLevelTable()
+        self.assertEqual(table.counter_get_many([], 'fam:col1'), {})
+        self.assertEqual(table._low_level_table.read_rows_calls, [])
+
     def test_counter_set(self):
         name = 'table-name'
         connection = None
@@ -1119,6 +1387,60 @@ class TestTable(unittest2.TestCase):
         self.assertEqual(result, counter_value - dec_value)
         self.assertEqual(TableWithInc.incremented, [(row, column, -dec_value)])
 
+    def _counter_inc_many_helper(self, commit_results):
+        name = 'table-name'
+        connection = None
+        table = self._makeOne(name, connection)
+        table._low_level_table = _MockLowLevelTable()
+        table._low_level_table.row_values = dict(
+            (row_key, _MockLowLevelRow(row_key, commit_result=commit_result))
+            for row_key, commit_result in commit_results.items())
+
+        counters = {
+            'row-key1': {'fam:col1': 2, 'fam:col2': -3},
+            'row-key2': {'fam:col1': 5},
+        }
+        result = table.counter_inc_many(counters, max_inflight=7)
+
+        rows = table._low_level_table.read_modify_write_many_calls[0][0]
+        self.assertEqual(table._low_level_table.read_modify_write_many_calls,
+                         [(rows, 7)])
+        self.assertEqual(sorted(row.row_key for row in rows),
+                         ['row-key1', 'row-key2'])
+        row_values = table._low_level_table.row_values
+        self.assertEqual(row_values['row-key1'].counts,
+                         {('fam', 'col1'): 2, ('fam', 'col2'): -3})
+        self.assertEqual(row_values['row-key2'].counts, {('fam', 'col1'): 5})
+        return result
+
+    def test_counter_inc_many(self):
+        import struct
+
+        def cell(value):
+            return [(struct.pack('>q', value), None)]
+
+        commit_results = {
+            'row-key1': {'fam': {b'col1': cell(12), b'col2': cell(-3)}},
+            'row-key2': {'fam': {b'col1': cell(5)}},
+        }
+        result = self._counter_inc_many_helper(commit_results)
+        self.assertEqual(result, {
+            'row-key1': {'fam:col1': 12, 'fam:col2': -3},
+            'row-key2': {'fam:col1': 5},
+        })
+
+    def test_counter_inc_many_bad_result(self):
+        import struct
+
+        value = struct.pack('>q', 1)
+        commit_results = {
+            'row-key1': {'fam': {b'col1': [(value, None)],
+                                 b'col2': [(value, None)]}},
+            'row-key2': {'fam': {b'col1': [(value, None), (value, None)]}},
+        }
+        with self.assertRaises(ValueError):
+            self._counter_inc_many_helper(commit_results)
+
     def _counter_inc_helper(self, row, column, value, commit_result):
         name = 'table-name'
         connection = None
@@ -1217,6 +1539,7 @@ class _MockLowLevelTable(object):
         self.read_row_result = None
         self.read_rows_calls = []
         self.read_rows_result = None
+        self.read_modify_write_many_calls = []
 
     def list_column_families(self):
         self.list_column_families_calls += 1
@@ -1233,6 +1556,19 @@ class _MockLowLevelTable(object):
         self.read_rows_calls.append((args, kwargs))
         return self.read_rows_result
 
+    def read_modify_write_many(self, rows, max_inflight):
+        self.read_modify_write_many_calls.append((rows, max_inflight))
+        return [row.commit_result for row in rows]
+
+
+class _MockFrozenFilter(object):
+
+    def __init__(self, row_filter):
+        self.row_filter = row_filter
+
+    def __eq__(self, other):
+        return other.row_filter == self.row_filter
+
 
 class _MockLowLevelColumnFamily(object):
 
@@ -0,0 +1,282 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Client-side detection of hot row keys from written rows."""
+
+
+import logging
+import threading
+import time
+
+
+LOGGER = logging.getLogger('gcloud_bigtable.hotspot')
+
+DEFAULT_WIDTH = 2048
+"""Default number of counters in each row of the sketch."""
+DEFAULT_DEPTH = 4
+"""Default number of rows (hash functions) of the sketch."""
+DEFAULT_NUM_KEYS = 20
+"""Default number of heavy-hitter candidates tracked (for keys and
+prefixes each)."""
+DEFAULT_THRESHOLD = 0.1
+"""Default share of writes above which a key is logged as hot."""
+DEFAULT_MIN_WRITES = 1000
+"""Default number of writes recorded before any key is logged as hot."""
+DEFAULT_DECAY_INTERVAL = 60.0
+"""Default number of seconds after which all the counts are halved."""
+
+_KEYS = 'keys'
+_PREFIXES = 'prefixes'
+
+
+class HotKeyDetector(object):
+    """Tracks the most written row keys (and key prefixes) of a client.
+
+    Each written row key is counted in a count-min sketch, which estimates
+    the number of writes of any key in constant memory (never
+    underestimating it), and the keys with the highest estimates are kept
+    as heavy-hitter candidates for :meth:`hot_keys`.
+
+    Every ``decay_interval`` seconds, all the counts (and the total) are
+    halved, so that the estimates follow the recent writes: a key which was
+    hot an hour ago but is not written anymore cools down.
+
+    When a key reaches ``threshold`` of all recorded writes (once at least
+    ``min_writes`` have been recorded), a warning is logged. It is logged
+    once per key, until the key cools down below ``threshold`` or the
+    detector is :meth:`reset`.
+
+    Set it on a :class:`.Client` to record every ``MutateRow``,
+    ``CheckAndMutateRow`` and ``ReadModifyWriteRow`` request sent by the
+    client.
+
+    :type width: int
+    :param width: (Optional) The number of counters in each row of the
+                  sketch. Estimates exceed the real count by at most about
+                  ``2 / width`` of all writes (with high probability).
+
+    :type depth: int
+    :param depth: (Optional) The number of rows (hash functions) of the
+                  sketch.
+
+    :type num_keys: int
+    :param num_keys: (Optional) The number of hot keys (and of hot prefixes)
+                     tracked.
+
+    :type prefix_length: int
+    :param prefix_length: (Optional) If set, the first ``prefix_length``
+                          bytes of each row key (at least that long) are
+                          tracked as well, to find hot key ranges (e.g. keys
+                          starting with a timestamp or a sequential ID).
+
+    :type threshold: float
+    :param threshold: (Optional) The share of all writes (between 0 and 1)
+                      above which a key or prefix is logged as hot. If
+                      :data:`None`, nothing is logged.
+
+    :type min_writes: int
+    :param min_writes: (Optional) The number of writes which must be
+                       recorded before anything is logged.
+
+    :type decay_interval: float
+    :param decay_interval: (Optional) The number of seconds after which all
+                           the counts are halved. If :data:`None`, the
+                           counts never decay.
+
+    :raises: :class:`ValueError <exceptions.ValueError>` if ``width``,
+             ``depth``, ``num_keys``, ``prefix_length`` or
+             ``decay_interval`` is not positive, or if ``threshold`` is not
+             between 0 and 1.
+    """
+
+    def __init__(self, width=DEFAULT_WIDTH, depth=DEFAULT_DEPTH,
+                 num_keys=DEFAULT_NUM_KEYS, prefix_length=None,
+                 threshold=DEFAULT_THRESHOLD, min_writes=DEFAULT_MIN_WRITES,
+                 decay_interval=DEFAULT_DECAY_INTERVAL):
+        if width <= 0 or depth <= 0 or num_keys <= 0:
+            raise ValueError('width, depth and num_keys must be positive')
+        if prefix_length is not None and prefix_length <= 0:
+            raise ValueError('prefix_length must be positive')
+        if threshold is not None and not 0 < threshold <= 1:
+            raise ValueError('threshold must be between 0 and 1')
+        if decay_interval is not None and decay_interval <= 0:
+            raise ValueError('decay_interval must be positive')
+
+        self.width = width
+        self.depth = depth
+        self.num_keys = num_keys
+        self.prefix_length = prefix_length
+        self.threshold = threshold
+        self.min_writes = min_writes
+        self.decay_interval = decay_interval
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forgets all the recorded writes."""
+        self._sketch = [[0] * self.width for _ in range(self.depth)]
+        self._total = 0
+        self._candidates = {_KEYS: {}, _PREFIXES: {}}
+        self._reported = set()
+        self._decayed_at = time.time()
+
+    def _decay(self):
+        """Halves the counts once for each decay interval which has passed.
+
+        Assumes the lock is held. Candidates whose estimate drops to zero
+        are forgotten, and keys which are no longer hot can be logged again.
+        """
+        if self.decay_interval is None:
+            return
+        halvings = int((time.time() - self._decayed_at) //
+                       self.decay_interval)
+        if halvings <= 0:
+            return
+        self._decayed_at += halvings * self.decay_interval
+
+        for counters in self._sketch:
+            for column, count in enumerate(counters):
+                counters[column] = count >> halvings
+        self._total >>= halvings
+        for candidates in self._candidates.values():
+            for key, estimate in list(candidates.items()):
+                if estimate >> halvings:
+                    candidates[key] = estimate >> halvings
+                else:
+                    del candidates[key]
+
+        # Only keys which are still hot stay reported (nothing is reported
+        # without a threshold).
+        self._reported = set(
+            (kind, key) for kind, key in self._reported
+            if key in self._candidates[kind] and
+            self._candidates[kind][key] >= self.threshold * self._total)
+
+    @property
+    def total(self):
+        """Getter for the number of recorded writes.
+
+        :rtype: int
+        :returns: The number of row keys recorded since the last reset.
+        """
+        return self._total
+
+    def _add(self, kind, key):
+        """Counts a key in the sketch and updates the candidates.
+
+        Assumes the lock is held.
+
+        :type kind: str
+        :param kind: The kind of key, ``'keys'`` or ``'prefixes'``.
+
+        :type key: bytes
+        :param key: The row key or prefix.
+
+        :rtype: int
+        :returns: The estimated number of writes of the key.
+        """
+        estimate = None
+        for index, counters in enumerate(self._sketch):
+            column = hash((index, kind, key)) % self.width
+            counters[column] += 1
+            if estimate is None or counters[column] < estimate:
+                estimate = counters[column]
+
+        candidates = self._candidates[kind]
+        if key in candidates or len(candidates) < self.num_keys:
+            candidates[key] = estimate
+        else:
+            coldest = min(candidates, key=candidates.get)
+            if candidates[coldest] < estimate:
+                del candidates[coldest]
+                candidates[key] = estimate
+        return estimate
+
+    def _check(self, kind, key, estimate):
+        """Logs a key if it is hot (and was not logged yet).
+
+        Assumes the lock is held.
+
+        :type kind: str
+        :param kind: The kind of key, ``'keys'`` or ``'prefixes'``.
+
+        :type key: bytes
+        :param key: The row key or prefix.
+
+        :type estimate: int
+        :param estimate: The estimated number of writes of the key.
+        """
+        if (self.threshold is None or self._total < self.min_writes or
+                estimate < self.threshold * self._total or
+                (kind, key) in self._reported):
+            return
+        self._reported.add((kind, key))
+        LOGGER.warning('Hot row %s %r: about %d of %d writes '
+                       '(%.1f%%).', 'key' if kind == _KEYS else 'key prefix',
+                       key, estimate, self._total,
+                       100.0 * estimate / self._total)
+
+    def record(self, row_key):
+        """Records a write of a row.
+
+        :type row_key: bytes
+        :param row_key: The key of the written row.
+        """
+        with self._lock:
+            self._decay()
+            self._total += 1
+            estimate = self._add(_KEYS, row_key)
+            self._check(_KEYS, row_key, estimate)
+            if (self.prefix_length is not None and
+                    len(row_key) >= self.prefix_length):
+                prefix = row_key[:self.prefix_length]
+                estimate = self._add(_PREFIXES, prefix)
+                self._check(_PREFIXES, prefix, estimate)
+
+    def hot_keys(self, limit=None, prefixes=False):
+        """Reports the most written row keys (or prefixes).
+
+        :type limit: int
+        :param limit: (Optional) The maximum number of keys to return. If
+                      not passed, all the tracked keys are returned.
+
+        :type prefixes: bool
+        :param prefixes: (Optional) Flag indicating if key prefixes should
+                         be reported instead of row keys.
+
+        :rtype: list
+        :returns: Triples of the key, its estimated number of writes and its
+                  estimated share of all writes, hottest first.
+        """
+        kind = _PREFIXES if prefixes else _KEYS
+        with self._lock:
+            self._decay()
+            total = self._total
+            report = sorted(self._candidates[kind].items(),
+                            key=lambda item: (-item[1], item[0]))
+        return [(key, estimate, float(estimate) / total)
+                for key, estimate in report[:limit]]
+
+
+def _record_write(detector, row_key):
+    """Records a written row key, if a detector is set.
+
+    :type detector: :class:`HotKeyDetector`
+    :param detector: (Optional) The hot key detector of a client.
+
+    :type row_key: bytes
+    :param row_key: The key of the written row.
+    """
+    if detector is not None:
+        detector.record(row_key)
@@ -0,0 +1,548 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bulk writer for mutations across many rows in a Cloud Bigtable Table."""
+
+
+import collections
+import functools
+import six
+import threading
+import time
+
+from gcloud_bigtable._generated import (
+    bigtable_service_messages_pb2 as messages_pb2)
+from gcloud_bigtable.hotspot import _record_write
+from gcloud_bigtable.rate_limiter import BATCH
+from gcloud_bigtable.rate_limiter import WRITE
+from gcloud_bigtable.rate_limiter import _acquire
+from gcloud_bigtable.row import _MAX_MUTATIONS
+from gcloud_bigtable.row import _coalesce_mutations
+from gcloud_bigtable.row import _mutations_idempotent
+from gcloud_bigtable.row import _wait_for_mutate_row
+
+
+DEFAULT_MAX_MUTATIONS = 1000
+"""Default number of buffered mutations that triggers sending requests."""
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+"""Default size (in bytes) of buffered mutations that triggers sending."""
+DEFAULT_MAX_INFLIGHT = 10
+"""Default number of ``MutateRow`` requests allowed in flight at once."""
+DEFAULT_DECREASE_FACTOR = 0.5
+"""Default factor the limits of an :class:`AdaptiveController` are cut by."""
+
+
+def _now():
+    """Get the current time, in seconds since the epoch.
+
+    This is just implemented so we can stub out while testing.
+
+    :rtype: float
+    :returns: The current time.
+    """
+    return time.time()
+
+
+def _record_done(done_times, unused_future):
+    """Records the time a request completed.
+
+    Meant to be bound (with :func:`functools.partial`) to the list of a
+    single request and used as the done callback of its future.
+
+    :type done_times: list
+    :param done_times: The list the completion time is appended to.
+
+    :type unused_future: :class:`grpc.framework.alpha._reexport._Future`
+    :param unused_future: The future of the completed request.
+    """
+    done_times.append(_now())
+
+
+class MutationBatchError(RuntimeError):
+    """Exception raised when some rows of a :class:`MutationBatcher` failed.
+
+    Mutations for the remaining rows have still been applied.
+
+    :type errors: list
+    :param errors: Pairs of the row key and the exception raised, for each
+                   ``MutateRow`` request that failed.
+    """
+
+    def __init__(self, errors):
+        super(MutationBatchError, self).__init__(
+            '%d row(s) could not be mutated' % (len(errors),))
+        self.errors = errors
+
+    @property
+    def row_keys(self):
+        """Getter for the keys of the rows which could not be mutated.
+
+        :rtype: list
+        :returns: The row keys, in the order the requests completed.
+        """
+        return [row_key for row_key, _ in self.errors]
+
+
+class AdaptiveController(object):
+    """Adapts the concurrency and batch size of writes to observed latency.
+
+    Uses additive increase / multiplicative decrease (AIMD), as in TCP
+    congestion control. While requests succeed within ``target_latency``,
+    the limits grow additively (by about ``inflight_increment`` and
+    ``mutations_increment`` for each round of ``inflight_limit``
+    requests). When a request fails or is slower than ``target_latency``,
+    both limits are multiplied by ``decrease_factor``. Requests sent before
+    the last decrease don't cause another one, since they reflect the old
+    limits.
+
+    The limits start at :data:`DEFAULT_MAX_INFLIGHT` and
+    :data:`DEFAULT_MAX_MUTATIONS` (kept within the bounds). A controller
+    can be shared by several writers (and threads), which then adapt to the
+    load they generate together.
+
+    :type target_latency: float
+    :param target_latency: The latency (in seconds) of a ``MutateRow``
+                           request above which the cluster is considered
+                           overloaded.
+
+    :type min_inflight: int
+    :param min_inflight: (Optional) Lower bound for :attr:`inflight_limit`.
+
+    :type max_inflight: int
+    :param max_inflight: (Optional) Upper bound for :attr:`inflight_limit`.
+
+    :type min_mutations: int
+    :param min_mutations: (Optional) Lower bound for :attr:`mutation_limit`.
+
+    :type max_mutations: int
+    :param max_mutations: (Optional) Upper bound for :attr:`mutation_limit`.
+
+    :type inflight_increment: float
+    :param inflight_increment: (Optional) Additive increase of
+                               :attr:`inflight_limit` per round of requests.
+
+    :type mutations_increment: float
+    :param mutations_increment: (Optional) Additive increase of
+                                :attr:`mutation_limit` per round of
+                                requests.
+
+    :type decrease_factor: float
+    :param decrease_factor: (Optional) Multiplicative decrease of the limits.
+                            Defaults to :data:`DEFAULT_DECREASE_FACTOR`.
+
+    :raises: :class:`ValueError <exceptions.ValueError>` if
+             ``target_latency`` or an increment is not positive, if a lower
+             bound is less than one or greater than its upper bound or if
+             ``decrease_factor`` is not in ``(0, 1)``.
+    """
+
+    def __init__(self, target_latency, min_inflight=1, max_inflight=100,
+                 min_mutations=100, max_mutations=10 * DEFAULT_MAX_MUTATIONS,
+                 inflight_increment=1, mutations_increment=100,
+                 decrease_factor=DEFAULT_DECREASE_FACTOR):
+        if target_latency <= 0:
+            raise ValueError('target_latency must be positive')
+        if not 1 <= min_inflight <= max_inflight:
+            raise ValueError('Invalid bounds for the number of requests in '
+                             'flight', min_inflight, max_inflight)
+        if not 1 <= min_mutations <= max_mutations:
+            raise ValueError('Invalid bounds for the number of mutations',
+                             min_mutations, max_mutations)
+        if inflight_increment <= 0 or mutations_increment <= 0:
+            raise ValueError('Increments must be positive')
+        if not 0 < decrease_factor < 1:
+            raise ValueError('decrease_factor must be in (0, 1)')
+
+        self.target_latency = target_latency
+        self.min_inflight = min_inflight
+        self.max_inflight = max_inflight
+        self.min_mutations = min_mutations
+        self.max_mutations = max_mutations
+        self.inflight_increment = inflight_increment
+        self.mutations_increment = mutations_increment
+        self.decrease_factor = decrease_factor
+
+        self._inflight_limit = float(
+            min(max(DEFAULT_MAX_INFLIGHT, min_inflight), max_inflight))
+        self._mutation_limit = float(
+            min(max(DEFAULT_MAX_MUTATIONS, min_mutations), max_mutations))
+        self._last_decrease_time = None
+        self._lock = threading.Lock()
+
+    @property
+    def inflight_limit(self):
+        """Getter for the current limit on requests in flight.
+
+        :rtype: int
+        :returns: The number of ``MutateRow`` requests allowed in flight.
+        """
+        return int(self._inflight_limit)
+
+    @property
+    def mutation_limit(self):
+        """Getter for the current batch size.
+
+        :rtype: int
+        :returns: The number of buffered mutations that triggers sending
+                  requests.
+        """
+        return int(self._mutation_limit)
+
+    def record(self, sent_time, latency, success):
+        """Records the outcome of a request and adapts the limits.
+
+        :type sent_time: float
+        :param sent_time: The time (in seconds since the epoch) the request
+                          was sent.
+
+        :type latency: float
+        :param latency: The number of seconds the request took.
+
+        :type success: bool
+        :param success: Flag indicating if the request succeeded.
+        """
+        with self._lock:
+            if success and latency <= self.target_latency:
+                # Grow by (about) one increment for each round of requests.
+                round_fraction = 1.0 / self._inflight_limit
+                self._inflight_limit = min(
+                    self.max_inflight,
+                    self._inflight_limit +
+                    self.inflight_increment * round_fraction)
+                self._mutation_limit = min(
+                    self.max_mutations,
+                    self._mutation_limit +
+                    self.mutations_increment * round_fraction)
+            elif (self._last_decrease_time is None or
+                  sent_time >= self._last_decrease_time):
+                self._inflight_limit = max(
+                    self.min_inflight,
+                    self._inflight_limit * self.decrease_factor)
+                self._mutation_limit = max(
+                    self.min_mutations,
+                    self._mutation_limit * self.decrease_factor)
+                self._last_decrease_time = _now()
+
+
+class MutationBatcher(object):
+    """Accumulates mutations for many rows and sends them concurrently.
+
+    Mutations from each :class:`Row <gcloud_bigtable.row.Row>` passed to
+    :meth:`mutate` are moved into a buffer (keyed by row key). Once the
+    buffer holds ``max_mutations`` mutations or ``max_bytes`` bytes of
+    mutations, a ``MutateRow`` request is started for each buffered row.
+    The requests are not waited on individually, but at most
+    ``max_inflight`` of them are allowed to be in flight at once.
+
+    Call :meth:`flush` to send any buffered mutations and wait for every
+    request to complete. It returns the rows which failed, so they can be
+    retried or reported. When the batcher is used as a context manager, the
+    rows which failed are raised in a :class:`MutationBatchError` when the
+    context exits.
+
+    .. note::
+
+        Mutations for different rows are not applied atomically with
+        respect to one another and may be applied in any order.
+
+    .. note::
+
+        No background thread is used, so an idle batcher keeps its buffered
+        mutations until :meth:`flush` is called. (To bound how long
+        mutations are buffered, use :class:`Batch
+        <gcloud_bigtable.happybase.batch.Batch>` with a ``flush_interval``.)
+        A :class:`MutationBatcher` should not be shared between threads.
+
+    :type table: :class:`Table <gcloud_bigtable.table.Table>`
+    :param table: The table that mutations will be applied to.
+
+    :type max_mutations: int
+    :param max_mutations: (Optional) The number of buffered mutations that
+                          triggers sending requests. Defaults to
+                          :data:`DEFAULT_MAX_MUTATIONS`.
+
+    :type max_bytes: int
+    :param max_bytes: (Optional) The (serialized) size of buffered mutations
+                      that triggers sending requests. Defaults to
+                      :data:`DEFAULT_MAX_BYTES`.
+
+    :type max_inflight: int
+    :param max_inflight: (Optional) The maximum number of ``MutateRow``
+                         requests in flight at once. Defaults to
+                         :data:`DEFAULT_MAX_INFLIGHT`.
+
+    :type timeout_seconds: int
+    :param timeout_seconds: (Optional) Number of seconds for request
+                            time-out. If not passed, defaults to value set on
+                            table.
+
+    :type retry_policy: :class:`.RetryPolicy`
+    :param retry_policy: (Optional) The policy used to retry failed requests.
+                         If not passed, defaults to the policy of the table.
+                         A request is only retried if every ``SetCell``
+                         mutation in it has an explicit timestamp. Retries
+                         are sent (and waited on) one at a time.
+
+    :type coalesce: bool
+    :param coalesce: (Optional) Flag indicating if masked and redundant
+                     mutations for each row should be dropped before sending
+                     (see :meth:`Row.commit <gcloud_bigtable.row.Row.commit>`).
+                     Useful when the same rows are mutated repeatedly.
+
+    :type priority: str
+    :param priority: (Optional) The lane of the client's
+                     :class:`.RateLimiter` used for requests (if the client
+                     has one). Defaults to :data:`.rate_limiter.BATCH`.
+
+    :type controller: :class:`AdaptiveController`
+    :param controller: (Optional) Adapts the limits on buffered mutations
+                       and requests in flight to the observed latency of
+                       requests. If set, its :attr:`mutation_limit
+                       <AdaptiveController.mutation_limit>` and
+                       :attr:`inflight_limit
+                       <AdaptiveController.inflight_limit>` are used instead
+                       of ``max_mutations`` and ``max_inflight``. The
+                       latency of a request is measured from when it is
+                       sent until it completes (not until the batcher gets
+                       to its response).
+
+    :type spool: :class:`.WriteSpool`
+    :param spool: (Optional) Requests which fail (after any retries) with an
+                  error that the spool considers retryable are appended to
+                  the spool (to be replayed later) instead of being returned
+                  by :meth:`flush`, unless they have a ``SetCell`` with a
+                  server-assigned timestamp (which replaying could apply
+                  twice). Rows for which the spool already holds requests
+                  are appended to it without being sent.
+
+    :raises: :class:`ValueError <exceptions.ValueError>` if any of
+             ``max_mutations``, ``max_bytes`` or ``max_inflight`` is not
+             positive.
+    """
+
+    def __init__(self, table, max_mutations=DEFAULT_MAX_MUTATIONS,
+                 max_bytes=DEFAULT_MAX_BYTES,
+                 max_inflight=DEFAULT_MAX_INFLIGHT, timeout_seconds=None,
+                 retry_policy=None, coalesce=False, priority=BATCH,
+                 controller=None, spool=None):
+        if max_mutations <= 0:
+            raise ValueError('max_mutations must be positive')
+        if max_bytes <= 0:
+            raise ValueError('max_bytes must be positive')
+        if max_inflight <= 0:
+            raise ValueError('max_inflight must be positive')
+
+        self._table = table
+        # The table name is re-used for every request.
+        self._table_name = table.name
+        self._max_mutations = max_mutations
+        self._max_bytes = max_bytes
+        self._max_inflight = max_inflight
+        self._timeout_seconds = timeout_seconds or table.timeout_seconds
+        self._retry_policy = retry_policy or table.retry_policy
+        self._coalesce = coalesce
+        self._priority = priority
+        self._controller = controller
+        self._spool = spool
+
+        # Internal state for buffered mutations.
+        self._row_mutations = collections.OrderedDict()
+        self._mutation_count = 0
+        self._byte_count = 0
+        # Internal state for requests which have been sent.
+        self._inflight = collections.deque()
+        self._errors = []
+
+    @property
+    def table(self):
+        """Getter for batcher's table.
+
+        :rtype: :class:`Table <gcloud_bigtable.table.Table>`
+        :returns: The table stored on the batcher.
+        """
+        return self._table
+
+    def mutate(self, row):
+        """Moves the mutations accumulated on a row into the batcher.
+
+        After the mutations have been added, the row has no accumulated
+        mutations (as if it had been :meth:`commit
+        <gcloud_bigtable.row.Row.commit>`-ed) and can be re-used.
+
+        May send requests, if the buffered mutations exceed one of the
+        thresholds set on the batcher.
+
+        :type row: :class:`Row <gcloud_bigtable.row.Row>`
+        :param row: A row with (unconditional) mutations.
+
+        :raises: :class:`ValueError <exceptions.ValueError>` if the row has
+                 a filter set or if the number of mutations on the row
+                 exceeds the ``_MAX_MUTATIONS``.
+        """
+        mutations = list(row._get_mutations(None))
+        num_mutations = len(mutations)
+        if num_mutations == 0:
+            return
+        if num_mutations > _MAX_MUTATIONS:
+            raise ValueError('%d total mutations exceed the maximum allowable '
+                             '%d.' % (num_mutations, _MAX_MUTATIONS))
+
+        row_key = row.row_key
+        # Make sure a single request never exceeds the maximum.
+        pending = self._row_mutations.get(row_key, ())
+        if len(pending) + num_mutations > _MAX_MUTATIONS:
+            self._send()
+
+        self._row_mutations.setdefault(row_key, []).extend(mutations)
+        self._mutation_count += num_mutations
+        self._byte_count += sum(mutation_pb.ByteSize()
+                                for mutation_pb in mutations)
+        row.clear_mutations()
+
+        if self._should_send():
+            self._send()
+
+    def _should_send(self):
+        """Checks if the buffered mutations have exceeded a threshold.
+
+        :rtype: bool
+        :returns: Boolean indicating if the buffered mutations should be
+                  sent.
+        """
+        max_mutations = self._max_mutations
+        if self._controller is not None:
+            max_mutations = self._controller.mutation_limit
+        if self._mutation_count >= max_mutations:
+            return True
+        return self._byte_count >= self._max_bytes
+
+    def _wait_for_oldest(self):
+        """Waits for the oldest request in flight to complete.
+
+        If the request failed, it is retried (if possible). If it still
+        fails, the row key and the error are recorded, to be returned by
+        :meth:`flush`.
+        """
+        (row_key, request_pb, future,
+         sent_time, done_times) = self._inflight.popleft()
+        error = _wait_for_mutate_row(self._table.client.data_stub,
+                                     request_pb, future, sent_time,
+                                     self._timeout_seconds,
+                                     self._retry_policy)
+        if self._controller is not None:
+            # The done callback may not have run yet if the request just
+            # completed.
+            done_time = done_times[0] if done_times else _now()
+            self._controller.record(sent_time, done_time - sent_time,
+                                    error is None)
+        if error is not None:
+            # The failed request may have been applied, so it is only
+            # spooled if replaying it can't write a cell twice.
+            if (self._spool is not None and
+                    self._spool.is_retryable(error) and
+                    _mutations_idempotent(request_pb.mutations)):
+                self._spool.append(request_pb)
+            else:
+                self._errors.append((row_key, error))
+
+    def _send(self):
+        """Starts a ``MutateRow`` request for each buffered row.
+
+        Blocks only while ``max_inflight`` requests are already in flight.
+        """
+        client = self._table.client
+        rate_limiter = client.rate_limiter
+        hotspot_detector = client.hotspot_detector
+        max_inflight = self._max_inflight
+        for row_key, mutations in six.iteritems(self._row_mutations):
+            if self._coalesce:
+                mutations = _coalesce_mutations(mutations)
+            request_pb = messages_pb2.MutateRowRequest(
+                table_name=self._table_name,
+                row_key=row_key,
+                mutations=mutations,
+            )
+            if self._spool is not None and self._spool.has_pending(row_key):
+                # Queued behind the spooled requests for the row, so that
+                # they can't overwrite it when they are replayed.
+                self._spool.append(request_pb)
+                continue
+            if self._controller is not None:
+                max_inflight = self._controller.inflight_limit
+            while len(self._inflight) >= max_inflight:
+                self._wait_for_oldest()
+            _acquire(rate_limiter, WRITE, request_pb.ByteSize(),
+                     priority=self._priority)
+            _record_write(hotspot_detector, row_key)
+            sent_time = _now()
+            # Each row may use a different stub (of the client's pool).
+            future = client.data_stub.MutateRow.async(request_pb,
+                                                      self._timeout_seconds)
+            # Filled with the time the request completes, so its latency
+            # doesn't include the time before it is waited on.
+            done_times = []
+            if self._controller is not None:
+                future.add_done_callback(
+                    functools.partial(_record_done, done_times))
+            self._inflight.append(
+                (row_key, request_pb, future, sent_time, done_times))
+
+        self._row_mutations.clear()
+        self._mutation_count = 0
+        self._byte_count = 0
+
+    def flush(self):
+        """Sends all buffered mutations and waits for every request.
+
+        :rtype: list
+        :returns: Pairs of the row key and the exception raised, for each
+                  ``MutateRow`` request that failed since the last
+                  :meth:`flush`. Empty if every request succeeded.
+        """
+        self._send()
+        while self._inflight:
+            self._wait_for_oldest()
+
+        errors, self._errors = self._errors, []
+        return errors
+
+    def __enter__(self):
+        """Enter context manager, no set-up required."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Exit context manager, flushing all buffered mutations.
+
+        If an exception is already propagating, it is not replaced by the
+        rows which failed to be mutated.
+
+        :type exc_type: type
+        :param exc_type: The type of the exception if one occurred while the
+                         context manager was active. Otherwise, :data:`None`.
+
+        :type exc_value: :class:`Exception <exceptions.Exception>`
+        :param exc_value: An instance of ``exc_type`` if an exception occurred
+                          while the context was active.
+                          Otherwise, :data:`None`.
+
+        :type traceback: ``traceback`` type
+        :param traceback: The traceback where the exception occurred (if one
+                          did occur). Otherwise, :data:`None`.
+
+        :raises: :class:`MutationBatchError` if any of the rows could not be
+                 mutated.
+        """
+        errors = self.flush()
+        if errors and exc_type is None:
+            raise MutationBatchError(errors)
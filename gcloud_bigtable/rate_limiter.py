@@ -0,0 +1,293 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Client-side rate limiting for Google Cloud Bigtable data requests."""
+
+
+import threading
+import time
+
+
+READ = 'read'
+"""Kind of request which reads data."""
+WRITE = 'write'
+"""Kind of request which writes data."""
+INTERACTIVE = 'interactive'
+"""Priority lane for latency sensitive (e.g. serving) requests."""
+BATCH = 'batch'
+"""Priority lane for background (e.g. bulk loading) requests."""
+DEFAULT_BATCH_SHARE = 0.5
+"""Default fraction of each budget which the batch lane can use."""
+
+_REQUESTS = 'requests'
+_BYTES = 'bytes'
+
+
+class TokenBucket(object):
+    """A thread-safe token bucket.
+
+    Tokens are added at a constant ``rate`` (per second), up to
+    ``capacity``. Taking tokens never blocks: the bucket can go into debt
+    and instead the time to wait for the tokens to be available is returned.
+    This way, waiters are served in the order they arrived and a request
+    larger than ``capacity`` is allowed (once the bucket is full).
+
+    :type rate: float
+    :param rate: The number of tokens added per second.
+
+    :type capacity: float
+    :param capacity: (Optional) The maximum number of tokens in the bucket,
+                     i.e. the largest burst allowed. Defaults to ``rate``
+                     (one second worth of tokens).
+
+    :raises: :class:`ValueError <exceptions.ValueError>` if ``rate`` or
+             ``capacity`` is not positive.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        if capacity is None:
+            capacity = rate
+        if capacity <= 0:
+            raise ValueError('capacity must be positive')
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.time()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens):
+        """Takes tokens from the bucket.
+
+        :type tokens: float
+        :param tokens: The number of tokens to take.
+
+        :rtype: float
+        :returns: The number of seconds to wait before using the tokens.
+        """
+        with self._lock:
+            now = time.time()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+
+            needed = min(tokens, self.capacity)
+            wait_seconds = max(0.0, (needed - self._tokens) / self.rate)
+            self._tokens -= tokens
+            return wait_seconds
+
+
+class RateLimiter(object):
+    """Limits the rate of data requests sent by a client.
+
+    Requests per second (QPS) and bytes per second are budgeted separately
+    for reads and writes. Any budget which is not set is unlimited.
+
+    Each request is sent in a priority lane. Requests in the
+    :data:`INTERACTIVE` lane can use the whole of each budget, while
+    requests in the :data:`BATCH` lane can use at most ``batch_share`` of
+    it. As a result, background work (such as a bulk load with a
+    :class:`.MutationBatcher`) can't starve latency sensitive requests in
+    the same process.
+
+    A limiter is set on a :class:`Client <gcloud_bigtable.client.Client>`
+    and is shared by all of its tables (and copies).
+
+    :type read_qps: float
+    :param read_qps: (Optional) The maximum number of read requests per
+                     second.
+
+    :type read_bytes_per_second: float
+    :param read_bytes_per_second: (Optional) The maximum number of bytes read
+                                  per second. Since the size of a response is
+                                  not known in advance, bytes are counted as
+                                  they are received and delay later requests.
+
+    :type write_qps: float
+    :param write_qps: (Optional) The maximum number of write requests per
+                      second.
+
+    :type write_bytes_per_second: float
+    :param write_bytes_per_second: (Optional) The maximum number of bytes of
+                                   write requests per second.
+
+    :type batch_share: float
+    :param batch_share: (Optional) The fraction of each budget which can be
+                        used by the batch lane. Defaults to
+                        :data:`DEFAULT_BATCH_SHARE`.
+
+    :raises: :class:`ValueError <exceptions.ValueError>` if ``batch_share``
+             is not in ``(0, 1]`` or if a budget is not positive.
+    """
+
+    def __init__(self, read_qps=None, read_bytes_per_second=None,
+                 write_qps=None, write_bytes_per_second=None,
+                 batch_share=DEFAULT_BATCH_SHARE):
+        if not 0 < batch_share <= 1:
+            raise ValueError('batch_share must be in (0, 1]')
+
+        self.batch_share = batch_share
+        # Maps (kind, unit) to the buckets for all requests and for the
+        # batch lane.
+        self._buckets = {}
+        budgets = (
+            (READ, _REQUESTS, read_qps),
+            (READ, _BYTES, read_bytes_per_second),
+            (WRITE, _REQUESTS, write_qps),
+            (WRITE, _BYTES, write_bytes_per_second),
+        )
+        for kind, unit, rate in budgets:
+            if rate is not None:
+                self._buckets[kind, unit] = (
+                    TokenBucket(rate), TokenBucket(rate * batch_share))
+
+    def _reserve(self, kind, unit, amount, batch_lane=False):
+        """Takes from one of the buckets for a budget.
+
+        :type kind: str
+        :param kind: The kind of request, :data:`READ` or :data:`WRITE`.
+
+        :type unit: str
+        :param unit: The unit of the budget (requests or bytes).
+
+        :type amount: int
+        :param amount: The amount to take from the budget.
+
+        :type batch_lane: bool
+        :param batch_lane: (Optional) Flag indicating if the amount should be
+                           taken from the batch lane's share of the budget,
+                           rather than from the budget for all requests.
+
+        :rtype: float
+        :returns: The number of seconds to wait before sending the request.
+        """
+        buckets = self._buckets.get((kind, unit))
+        if buckets is None:
+            return 0.0
+        all_bucket, batch_bucket = buckets
+        if batch_lane:
+            return batch_bucket.reserve(amount)
+        return all_bucket.reserve(amount)
+
+    def _wait(self, kind, num_bytes, batch_lane=False):
+        """Waits until a request can be sent within one set of budgets.
+
+        :type kind: str
+        :param kind: The kind of request, :data:`READ` or :data:`WRITE`.
+
+        :type num_bytes: int
+        :param num_bytes: The size of the request.
+
+        :type batch_lane: bool
+        :param batch_lane: (Optional) Flag indicating if the batch lane's
+                           share of the budgets should be used, rather than
+                           the budgets for all requests.
+        """
+        wait_seconds = max(
+            self._reserve(kind, _REQUESTS, 1, batch_lane=batch_lane),
+            self._reserve(kind, _BYTES, num_bytes, batch_lane=batch_lane))
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+    def acquire(self, kind, num_bytes=0, priority=INTERACTIVE):
+        """Waits until a request can be sent within the budgets.
+
+        A request in the :data:`BATCH` lane first waits for the share of its
+        lane, and only then takes from the budgets for all requests. This
+        way, batch requests waiting for their lane don't put those budgets
+        into debt and delay interactive requests.
+
+        :type kind: str
+        :param kind: The kind of request, :data:`READ` or :data:`WRITE`.
+
+        :type num_bytes: int
+        :param num_bytes: (Optional) The size of the request, counted
+                          against the bytes per second budget.
+
+        :type priority: str
+        :param priority: (Optional) The lane of the request,
+                         :data:`INTERACTIVE` (the default) or :data:`BATCH`.
+
+        :raises: :class:`ValueError <exceptions.ValueError>` if ``kind`` or
+                 ``priority`` is not valid.
+        """
+        _check_request(kind, priority)
+        if priority == BATCH:
+            self._wait(kind, num_bytes, batch_lane=True)
+        self._wait(kind, num_bytes)
+
+    def charge(self, kind, num_bytes, priority=INTERACTIVE):
+        """Counts bytes against the budget without waiting.
+
+        Used for bytes which have already been transferred (e.g. a streamed
+        response), so that later requests are delayed instead.
+
+        :type kind: str
+        :param kind: The kind of request, :data:`READ` or :data:`WRITE`.
+
+        :type num_bytes: int
+        :param num_bytes: The number of bytes transferred.
+
+        :type priority: str
+        :param priority: (Optional) The lane of the request,
+                         :data:`INTERACTIVE` (the default) or :data:`BATCH`.
+
+        :raises: :class:`ValueError <exceptions.ValueError>` if ``kind`` or
+                 ``priority`` is not valid.
+        """
+        _check_request(kind, priority)
+        if priority == BATCH:
+            self._reserve(kind, _BYTES, num_bytes, batch_lane=True)
+        self._reserve(kind, _BYTES, num_bytes)
+
+
+def _check_request(kind, priority):
+    """Checks the kind and the priority of a request.
+
+    :type kind: str
+    :param kind: The kind of request, :data:`READ` or :data:`WRITE`.
+
+    :type priority: str
+    :param priority: The lane of the request, :data:`INTERACTIVE` or
+                     :data:`BATCH`.
+
+    :raises: :class:`ValueError <exceptions.ValueError>` if ``kind`` or
+             ``priority`` is not valid.
+    """
+    if kind not in (READ, WRITE):
+        raise ValueError('Invalid kind', kind)
+    if priority not in (INTERACTIVE, BATCH):
+        raise ValueError('Invalid priority', priority)
+
+
+def _acquire(rate_limiter, kind, num_bytes=0, priority=INTERACTIVE):
+    """Waits for a rate limiter, if one is set.
+
+    :type rate_limiter: :class:`RateLimiter`
+    :param rate_limiter: (Optional) The rate limiter of a client.
+
+    :type kind: str
+    :param kind: The kind of request, :data:`READ` or :data:`WRITE`.
+
+    :type num_bytes: int
+    :param num_bytes: (Optional) The size of the request.
+
+    :type priority: str
+    :param priority: (Optional) The lane of the request.
+    """
+    if rate_limiter is not None:
+        rate_limiter.acquire(kind, num_bytes=num_bytes, priority=priority)
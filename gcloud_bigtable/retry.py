@@ -0,0 +1,308 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Retry policies for idempotent Google Cloud Bigtable data requests."""
+
+
+import random
+import time
+
+
+DEFAULT_RETRYABLE_CODES = ('ABORTED', 'DEADLINE_EXCEEDED', 'UNAVAILABLE')
+"""Status codes (by name) of errors which are retried by default."""
+DEFAULT_MAX_ATTEMPTS = 5
+"""Default maximum number of attempts (including the first) for a request."""
+DEFAULT_INITIAL_BACKOFF = 0.1
+"""Default upper bound (in seconds) on the delay before the first retry."""
+DEFAULT_MAX_BACKOFF = 10.0
+"""Default upper bound (in seconds) on the delay before any retry."""
+DEFAULT_BACKOFF_MULTIPLIER = 2.0
+"""Default growth factor of the delay bound between retries."""
+
+
+def _get_status_code(exc):
+    """Gets the name of the status code of an error raised by a request.
+
+    Supports errors with a ``code`` attribute or a ``code()`` method. The
+    code may be an enum value (with a ``name``) or the name itself.
+
+    :type exc: :class:`Exception <exceptions.Exception>`
+    :param exc: The error raised.
+
+    :rtype: str
+    :returns: The name of the status code, or :data:`None` if the error
+              does not have a code.
+    """
+    code = getattr(exc, 'code', None)
+    if callable(code):
+        code = code()
+    return getattr(code, 'name', code)
+
+
+class RetryPolicy(object):
+    """Policy for retrying idempotent requests which failed transiently.
+
+    Failed attempts are retried after a random delay ("full jitter")
+    between zero and a bound which starts at ``initial_backoff`` and is
+    multiplied by ``backoff_multiplier`` after each attempt (up to
+    ``max_backoff``).
+
+    A policy can be set on a :class:`Client <gcloud_bigtable.client.Client>`
+    or a :class:`Table <gcloud_bigtable.table.Table>`, or passed to a single
+    request. Only idempotent requests are retried:
+
+    * ``ReadRows`` in :meth:`Table.read_row
+      <gcloud_bigtable.table.Table.read_row>`
+    * ``MutateRow``, but only when every ``SetCell`` mutation has an explicit
+      timestamp (otherwise a retry could write the cell twice)
+
+    ``ReadModifyWriteRow`` and ``CheckAndMutateRow`` are never retried.
+
+    .. warning::
+
+        ``retryable_codes`` only match errors which carry a status
+        ``code``. The errors raised by the (alpha) gRPC stubs used by this
+        library don't, so with the defaults **nothing is retried**. Pass
+        the transport's transient exception classes (e.g. the expiration
+        and network errors of the gRPC alpha API) as
+        ``retryable_exceptions``::
+
+            >>> from grpc.framework.alpha import exceptions
+            >>> policy = RetryPolicy(retryable_exceptions=(
+            ...     exceptions.ExpirationError, exceptions.NetworkError))
+
+    :type retryable_codes: tuple
+    :param retryable_codes: (Optional) Names of status codes which will be
+                            retried. Defaults to
+                            :data:`DEFAULT_RETRYABLE_CODES`.
+
+    :type retryable_exceptions: tuple
+    :param retryable_exceptions: (Optional) Exception classes which will be
+                                 retried, regardless of their status code.
+
+    :type max_attempts: int
+    :param max_attempts: (Optional) The maximum number of attempts for a
+                         request, including the first one.
+
+    :type initial_backoff: float
+    :param initial_backoff: (Optional) Upper bound (in seconds) on the delay
+                            before the first retry.
+
+    :type max_backoff: float
+    :param max_backoff: (Optional) Upper bound (in seconds) on the delay
+                        before any retry.
+
+    :type backoff_multiplier: float
+    :param backoff_multiplier: (Optional) Growth factor of the delay bound
+                               between retries.
+
+    :type deadline: float
+    :param deadline: (Optional) Overall time limit (in seconds) for a request,
+                     including retries. A retry is not attempted if its delay
+                     would end after the deadline (or if the deadline has
+                     passed once the delay is over), and the time-out of each
+                     attempt is cut down to the time left before it.
+
+    :raises: :class:`ValueError <exceptions.ValueError>` if ``max_attempts``
+             is less than one, ``initial_backoff`` or ``max_backoff`` is
+             negative, ``backoff_multiplier`` is less than one or
+             ``deadline`` is not positive.
+    """
+
+    def __init__(self, retryable_codes=DEFAULT_RETRYABLE_CODES,
+                 retryable_exceptions=(), max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 initial_backoff=DEFAULT_INITIAL_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF,
+                 backoff_multiplier=DEFAULT_BACKOFF_MULTIPLIER,
+                 deadline=None):
+        if max_attempts < 1:
+            raise ValueError('max_attempts must be at least 1')
+        if initial_backoff < 0 or max_backoff < 0:
+            raise ValueError('Backoff bounds cannot be negative')
+        if backoff_multiplier < 1:
+            raise ValueError('backoff_multiplier must be at least 1')
+        if deadline is not None and deadline <= 0:
+            raise ValueError('deadline must be positive')
+
+        self.retryable_codes = tuple(retryable_codes)
+        self.retryable_exceptions = tuple(retryable_exceptions)
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.backoff_multiplier = backoff_multiplier
+        self.deadline = deadline
+
+    def is_retryable(self, exc):
+        """Checks if an error raised by a request should be retried.
+
+        :type exc: :class:`Exception <exceptions.Exception>`
+        :param exc: The error raised.
+
+        :rtype: bool
+        :returns: Boolean indicating if the error is transient.
+        """
+        if isinstance(exc, self.retryable_exceptions):
+            return True
+        return _get_status_code(exc) in self.retryable_codes
+
+    def backoff_seconds(self, attempt):
+        """Computes a (random) delay before retrying.
+
+        :type attempt: int
+        :param attempt: The number of the attempt which failed (starting
+                        at 1).
+
+        :rtype: float
+        :returns: The number of seconds to wait before the next attempt.
+        """
+        bound = self.initial_backoff * (
+            self.backoff_multiplier ** (attempt - 1))
+        return random.uniform(0, min(bound, self.max_backoff))
+
+    def _seconds_left(self, start):
+        """Computes the time left before the deadline of a request.
+
+        :type start: float
+        :param start: The time (in seconds since the epoch) at which the
+                      request was first attempted.
+
+        :rtype: float
+        :returns: The number of seconds left (negative if the deadline has
+                  passed), or :data:`None` if the policy has no deadline.
+        """
+        if self.deadline is None:
+            return None
+        return self.deadline - (time.time() - start)
+
+    def _wait_to_retry(self, exc, attempt, start):
+        """Checks if a failed attempt can be retried and waits before it.
+
+        :type exc: :class:`Exception <exceptions.Exception>`
+        :param exc: The error raised by the attempt.
+
+        :type attempt: int
+        :param attempt: The number of the attempt which failed (starting
+                        at 1).
+
+        :type start: float
+        :param start: The time (in seconds since the epoch) at which the
+                      first attempt was made.
+
+        :rtype: bool
+        :returns: Boolean indicating if the request should be retried (after
+                  the delay, which has been waited for).
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(exc):
+            return False
+        delay = self.backoff_seconds(attempt)
+        seconds_left = self._seconds_left(start)
+        if seconds_left is not None and delay >= seconds_left:
+            return False
+        time.sleep(delay)
+        # The sleep may have overrun the deadline.
+        seconds_left = self._seconds_left(start)
+        return seconds_left is None or seconds_left > 0
+
+    def _call_from(self, attempt, start, func, args, kwargs):
+        """Makes attempts of a request, starting at a given attempt.
+
+        :type attempt: int
+        :param attempt: The number of the first attempt made (starting at 1).
+
+        :type start: float
+        :param start: The time (in seconds since the epoch) at which the
+                      first attempt of the request was made.
+
+        :type func: callable
+        :param func: The function making the request.
+
+        :type args: tuple
+        :param args: Positional arguments passed to ``func``.
+
+        :type kwargs: dict
+        :param kwargs: Keyword arguments passed to ``func``.
+
+        :rtype: object
+        :returns: The value returned by the first successful call.
+        """
+        timeout_seconds = kwargs.get('timeout_seconds')
+        while True:
+            seconds_left = self._seconds_left(start)
+            if seconds_left is not None and timeout_seconds is not None:
+                kwargs['timeout_seconds'] = min(timeout_seconds, seconds_left)
+            try:
+                return func(*args, **kwargs)
+            except Exception as exc:  # pylint: disable=broad-except
+                if not self._wait_to_retry(exc, attempt, start):
+                    raise
+            attempt += 1
+
+    def call(self, func, *args, **kwargs):
+        """Calls a function, retrying it according to this policy.
+
+        If the policy has a ``deadline`` and ``func`` is passed a
+        ``timeout_seconds`` keyword argument, each attempt is made with
+        the smaller of that time-out and the time left before the deadline.
+
+        :type func: callable
+        :param func: The function making the request. It must be safe to
+                     call more than once.
+
+        :type args: tuple
+        :param args: Positional arguments passed to ``func``.
+
+        :type kwargs: dict
+        :param kwargs: Keyword arguments passed to ``func``.
+
+        :rtype: object
+        :returns: The value returned by the first successful call.
+        :raises: The error from the last attempt, if it was not retryable or
+                 the attempts (or the deadline) were exhausted.
+        """
+        return self._call_from(1, time.time(), func, args, kwargs)
+
+    def retry(self, exc, start, func, *args, **kwargs):
+        """Retries a request whose first attempt was made elsewhere.
+
+        For requests which were sent asynchronously: the failed attempt
+        counts as the first one, so the next attempt waits for the first
+        delay, ``max_attempts`` includes the failed attempt and the
+        ``deadline`` runs from ``start``.
+
+        :type exc: :class:`Exception <exceptions.Exception>`
+        :param exc: The error raised by the first attempt.
+
+        :type start: float
+        :param start: The time (in seconds since the epoch) at which the
+                      first attempt was made.
+
+        :type func: callable
+        :param func: The function making the request again. It must be
+                     safe to call more than once.
+
+        :type args: tuple
+        :param args: Positional arguments passed to ``func``.
+
+        :type kwargs: dict
+        :param kwargs: Keyword arguments passed to ``func``.
+
+        :rtype: object
+        :returns: The value returned by the first successful call.
+        :raises: ``exc`` if it can't be retried, otherwise the error from
+                 the last attempt if the attempts (or the deadline) were
+                 exhausted.
+        """
+        if not self._wait_to_retry(exc, 1, start):
+            raise exc
+        return self._call_from(2, start, func, args, kwargs)
@@ -15,8 +15,10 @@
 """User friendly container for Google Cloud Bigtable Row."""
 
 
+import collections
 import six
 import struct
+import time
 
 from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
 from gcloud_bigtable._generated import (
@@ -24,10 +26,16 @@ from gcloud_bigtable._generated import (
 from gcloud_bigtable._helpers import _parse_family_pb
 from gcloud_bigtable._helpers import _timestamp_to_microseconds
 from gcloud_bigtable._helpers import _to_bytes
+from gcloud_bigtable.hotspot import _record_write
+from gcloud_bigtable.rate_limiter import BATCH
+from gcloud_bigtable.rate_limiter import WRITE
+from gcloud_bigtable.rate_limiter import _acquire
 
 
 _MAX_MUTATIONS = 100000
 _PACK_I64 = struct.Struct('>q').pack
+# Timestamp used by ``SetCell`` when the server should assign one.
+_SERVER_TIMESTAMP = -1
 
 
 class Row(object):
@@ -50,13 +58,16 @@ class Row(object):
     :param table: The table that owns the row.
 
     :type filter_: :class:`RowFilter`, :class:`RowFilterChain`,
-                   :class:`RowFilterUnion` or :class:`ConditionalRowFilter`
+                   :class:`RowFilterUnion`, :class:`ConditionalRowFilter` or
+                   :class:`FrozenRowFilter`
     :param filter_: (Optional) Filter to be used for conditional mutations.
                     If a filter is set, then the :class:`Row` will accumulate
                     mutations for either a :data:`True` or :data:`False` state.
                     When :meth:`commit`-ed, the mutations for the :data:`True`
                     state will be applied if the filter matches any cells in
-                    the row, otherwise the :data:`False` state will be.
+                    the row, otherwise the :data:`False` state will be. The
+                    filter is frozen (see :class:`FrozenRowFilter`) on the
+                    first commit, so later changes to it are not sent.
     """
 
     ALL_COLUMNS = object()
@@ -66,15 +77,28 @@ class Row(object):
         self._row_key = _to_bytes(row_key)
         self._table = table
         self._filter = filter_
+        self._frozen_filter = None
         self._rule_pb_list = []
+        self._reset_mutations()
+
+    def _reset_mutations(self):
+        """Allocates a new request to accumulate mutations in.
+
+        Mutations are built in place in the repeated field(s) of the request
+        (via ``add()``), so they are not copied when the request is sent.
+        """
         if self._filter is None:
-            self._pb_mutations = []
+            self._request_pb = messages_pb2.MutateRowRequest(
+                row_key=self._row_key)
+            self._pb_mutations = self._request_pb.mutations
             self._true_pb_mutations = None
             self._false_pb_mutations = None
         else:
+            self._request_pb = messages_pb2.CheckAndMutateRowRequest(
+                row_key=self._row_key)
             self._pb_mutations = None
-            self._true_pb_mutations = []
-            self._false_pb_mutations = []
+            self._true_pb_mutations = self._request_pb.true_mutations
+            self._false_pb_mutations = self._request_pb.false_mutations
 
     @property
     def table(self):
@@ -135,8 +159,10 @@ class Row(object):
                       applied in. Unset if the mutation is not conditional,
                       otherwise :data:`True` or :data:`False`.
 
-        :rtype: list
-        :returns: The list to add new mutations to (for the current state).
+        :rtype: :class:`list`-like repeated field of
+                :class:`data_pb2.Mutation`
+        :returns: The repeated field (of the accumulated request) to add new
+                  mutations to (for the current state).
         :raises: :class:`ValueError <exceptions.ValueError>`
         """
         if state is None:
@@ -197,18 +223,21 @@ class Row(object):
         value = _to_bytes(value)
         if timestamp is None:
             # Use -1 for current Bigtable server time.
-            timestamp_micros = -1
+            timestamp_micros = _SERVER_TIMESTAMP
         else:
             timestamp_micros = _timestamp_to_microseconds(timestamp)
 
-        mutation_val = data_pb2.Mutation.SetCell(
-            family_name=column_family_id,
-            column_qualifier=column,
-            timestamp_micros=timestamp_micros,
-            value=value,
-        )
-        mutation_pb = data_pb2.Mutation(set_cell=mutation_val)
-        self._get_mutations(state).append(mutation_pb)
+        mutations_list = self._get_mutations(state)
+        set_cell_pb = mutations_list.add().set_cell
+        try:
+            set_cell_pb.family_name = column_family_id
+        except Exception:  # pylint: disable=broad-except
+            # Don't leave an empty mutation behind.
+            del mutations_list[-1]
+            raise
+        set_cell_pb.column_qualifier = column
+        set_cell_pb.timestamp_micros = timestamp_micros
+        set_cell_pb.value = value
 
     def append_cell_value(self, column_family_id, column, value):
         """Appends a value to an existing cell.
@@ -292,9 +321,7 @@ class Row(object):
                       applied in. Unset if the mutation is not conditional,
                       otherwise :data:`True` or :data:`False`.
         """
-        mutation_val = data_pb2.Mutation.DeleteFromRow()
-        mutation_pb = data_pb2.Mutation(delete_from_row=mutation_val)
-        self._get_mutations(state).append(mutation_pb)
+        self._get_mutations(state).add().delete_from_row.SetInParent()
 
     def delete_cell(self, column_family_id, column, time_range=None,
                     state=None):
@@ -361,36 +388,33 @@ class Row(object):
         """
         mutations_list = self._get_mutations(state)
         if columns is self.ALL_COLUMNS:
-            mutation_val = data_pb2.Mutation.DeleteFromFamily(
-                family_name=column_family_id,
-            )
-            mutation_pb = data_pb2.Mutation(delete_from_family=mutation_val)
-            mutations_list.append(mutation_pb)
+            columns = None
         else:
-            delete_kwargs = {}
+            time_range_pb = None
             if time_range is not None:
-                delete_kwargs['time_range'] = time_range.to_pb()
-
-            to_append = []
-            for column in columns:
-                column = _to_bytes(column)
-                # time_range will never change if present, but the rest of
-                # delete_kwargs will
-                delete_kwargs.update(
-                    family_name=column_family_id,
-                    column_qualifier=column,
-                )
-                mutation_val = data_pb2.Mutation.DeleteFromColumn(
-                    **delete_kwargs)
-                mutation_pb = data_pb2.Mutation(
-                    delete_from_column=mutation_val)
-                to_append.append(mutation_pb)
-
-            # We don't add the mutations until all columns have been
-            # processed without error.
-            mutations_list.extend(to_append)
+                time_range_pb = time_range.to_pb()
+            columns = [_to_bytes(column) for column in columns]
 
-    def _commit_mutate(self, timeout_seconds=None, async=True):
+        # The mutations are built in place, so any added before an error
+        # (e.g. an invalid column family ID) are removed again.
+        num_mutations = len(mutations_list)
+        try:
+            if columns is None:
+                delete_pb = mutations_list.add().delete_from_family
+                delete_pb.family_name = column_family_id
+            else:
+                for column in columns:
+                    delete_pb = mutations_list.add().delete_from_column
+                    delete_pb.family_name = column_family_id
+                    delete_pb.column_qualifier = column
+                    if time_range_pb is not None:
+                        delete_pb.time_range.CopyFrom(time_range_pb)
+        except Exception:  # pylint: disable=broad-except
+            del mutations_list[num_mutations:]
+            raise
+
+    def _commit_mutate(self, timeout_seconds=None, async=True,
+                       retry_policy=None, coalesce=False, spool=None):
         """Makes a ``MutateRow`` API request.
 
         Assumes no filter is set on the :class:`Row` and is meant to be called
@@ -403,29 +427,108 @@ class Row(object):
         :type async: bytes
         :param async: Boolean indicating if the GRPC call should be done asynchronous
 
+        :type retry_policy: :class:`.RetryPolicy`
+        :param retry_policy: (Optional) The policy used to retry the request.
+                             If not passed, defaults to the policy of the
+                             table. The request is only retried if every
+                             ``SetCell`` mutation has an explicit timestamp.
+
+        :type coalesce: bool
+        :param coalesce: (Optional) Flag indicating if masked and redundant
+                         mutations should be dropped before sending (see
+                         :meth:`commit`).
+
+        :type spool: :class:`.WriteSpool`
+        :param spool: (Optional) The spool for the request if it fails with a
+                      retryable error (see :meth:`commit`).
+
         :raises: :class:`ValueError <exceptions.ValueError>` if the number of
                  mutations exceeds the ``_MAX_MUTATIONS``.
         """
         mutations_list = self._get_mutations(None)
+        # The mutations were built in the request, so it is sent as is.
+        request_pb = self._request_pb
+        if coalesce:
+            mutations_list = _coalesce_mutations(mutations_list)
+            request_pb = messages_pb2.MutateRowRequest(
+                row_key=self.row_key, mutations=mutations_list)
         num_mutations = len(mutations_list)
         if num_mutations == 0:
             return
         if num_mutations > _MAX_MUTATIONS:
             raise ValueError('%d total mutations exceed the maximum allowable '
                              '%d.' % (num_mutations, _MAX_MUTATIONS))
-        request_pb = messages_pb2.MutateRowRequest(
-            table_name=self.table.name,
-            row_key=self.row_key,
-            mutations=mutations_list,
-        )
+        request_pb.table_name = self.table.name
+        if spool is not None and spool.has_pending(self.row_key):
+            # Queued behind the spooled requests for the row, so that they
+            # can't overwrite it when they are replayed.
+            spool.append(request_pb)
+            return
         timeout_seconds = timeout_seconds or self.timeout_seconds
+        retry_policy = retry_policy or self._table.retry_policy
+        _acquire(self.client.rate_limiter, WRITE, request_pb.ByteSize())
+        _record_write(self.client.hotspot_detector, self.row_key)
         # We expect a `._generated.empty_pb2.Empty`.
-        if async:
-            self.client.data_stub.MutateRow.async(request_pb, timeout_seconds).result()
-        else:
-            self.client.data_stub.MutateRow(request_pb, timeout_seconds)
+        args = (self.client.data_stub.MutateRow, request_pb)
+        kwargs = {'timeout_seconds': timeout_seconds, 'async': async}
+        try:
+            if (retry_policy is not None and
+                    _mutations_idempotent(mutations_list)):
+                retry_policy.call(_call_data_method, *args, **kwargs)
+            else:
+                _call_data_method(*args, **kwargs)
+        except Exception as exc:  # pylint: disable=broad-except
+            # The failed request may have been applied, so it is only
+            # spooled if replaying it can't write a cell twice.
+            if (spool is None or not spool.is_retryable(exc) or
+                    not _mutations_idempotent(mutations_list)):
+                raise
+            spool.append(request_pb)
+
+    def _check_and_mutate_request(self, coalesce=False):
+        """Prepares the ``CheckAndMutateRow`` request for the row.
+
+        Assumes a filter is set on the :class:`Row`.
 
-    def _commit_check_and_mutate(self, timeout_seconds=None, async=True):
+        :type coalesce: bool
+        :param coalesce: (Optional) Flag indicating if masked and redundant
+                         mutations should be dropped (see :meth:`commit`).
+
+        :rtype: :class:`messages_pb2.CheckAndMutateRowRequest` or
+                :data:`NoneType <types.NoneType>`
+        :returns: The request to send, or :data:`None` if there are no
+                  mutations.
+        :raises: :class:`ValueError <exceptions.ValueError>` if the number of
+                 mutations exceeds the ``_MAX_MUTATIONS``.
+        """
+        true_mutations = self._get_mutations(True)
+        false_mutations = self._get_mutations(False)
+        request_pb = self._request_pb
+        if coalesce:
+            true_mutations = _coalesce_mutations(true_mutations)
+            false_mutations = _coalesce_mutations(false_mutations)
+            request_pb = messages_pb2.CheckAndMutateRowRequest(
+                row_key=self.row_key, true_mutations=true_mutations,
+                false_mutations=false_mutations)
+        num_true_mutations = len(true_mutations)
+        num_false_mutations = len(false_mutations)
+        if num_true_mutations == 0 and num_false_mutations == 0:
+            return None
+        if (num_true_mutations > _MAX_MUTATIONS or
+                num_false_mutations > _MAX_MUTATIONS):
+            raise ValueError(
+                'Exceed the maximum allowable mutations (%d). Had %s true '
+                'mutations and %d false mutations.' % (
+                    _MAX_MUTATIONS, num_true_mutations, num_false_mutations))
+
+        request_pb.table_name = self.table.name
+        if self._frozen_filter is None:
+            self._frozen_filter = FrozenRowFilter(self.filter)
+        request_pb.predicate_filter.CopyFrom(self._frozen_filter.to_pb())
+        return request_pb
+
+    def _commit_check_and_mutate(self, timeout_seconds=None, async=True,
+                                 coalesce=False):
         """Makes a ``CheckAndMutateRow`` API request.
 
         Assumes a filter is set on the :class:`Row` and is meant to be called
@@ -438,33 +541,23 @@ class Row(object):
         :type async: bool
         :param async: Boolean indicating if the GRPC call should be done asynchronously
 
+        :type coalesce: bool
+        :param coalesce: (Optional) Flag indicating if masked and redundant
+                         mutations should be dropped before sending (see
+                         :meth:`commit`).
+
         :rtype: bool
         :returns: Flag indicating if the filter was matched (which also
                   indicates which set of mutations were applied by the server).
         :raises: :class:`ValueError <exceptions.ValueError>` if the number of
                  mutations exceeds the ``_MAX_MUTATIONS``.
         """
-        true_mutations = self._get_mutations(True)
-        false_mutations = self._get_mutations(False)
-        num_true_mutations = len(true_mutations)
-        num_false_mutations = len(false_mutations)
-        if num_true_mutations == 0 and num_false_mutations == 0:
+        request_pb = self._check_and_mutate_request(coalesce=coalesce)
+        if request_pb is None:
             return
-        if (num_true_mutations > _MAX_MUTATIONS or
-                num_false_mutations > _MAX_MUTATIONS):
-            raise ValueError(
-                'Exceed the maximum allowable mutations (%d). Had %s true '
-                'mutations and %d false mutations.' % (
-                    _MAX_MUTATIONS, num_true_mutations, num_false_mutations))
-
-        request_pb = messages_pb2.CheckAndMutateRowRequest(
-            table_name=self.table.name,
-            row_key=self.row_key,
-            predicate_filter=self.filter.to_pb(),
-            true_mutations=true_mutations,
-            false_mutations=false_mutations,
-        )
         timeout_seconds = timeout_seconds or self.timeout_seconds
+        _acquire(self.client.rate_limiter, WRITE, request_pb.ByteSize())
+        _record_write(self.client.hotspot_detector, self.row_key)
         # We expect a `.messages_pb2.CheckAndMutateRowResponse`
         if async:
             response = self.client.data_stub.CheckAndMutateRow.async(request_pb, timeout_seconds)
@@ -476,13 +569,12 @@ class Row(object):
 
     def clear_mutations(self):
         """Removes all currently accumulated mutations on the current row."""
-        if self.filter is None:
-            self._pb_mutations[:] = []
-        else:
-            self._true_pb_mutations[:] = []
-            self._false_pb_mutations[:] = []
+        # A committed request may still be referenced, so it is replaced
+        # rather than cleared.
+        self._reset_mutations()
 
-    def commit(self, timeout_seconds=None, async=True):
+    def commit(self, timeout_seconds=None, async=True, retry_policy=None,
+               coalesce=False, spool=None):
         """Makes a ``MutateRow`` or ``CheckAndMutateRow`` API request.
 
         If no mutations have been created in the row, no request is made.
@@ -506,24 +598,183 @@ class Row(object):
         :type async: bool
         :param async: Boolean indicating if the GRPC call should be done asynchronously
 
+        :type retry_policy: :class:`.RetryPolicy`
+        :param retry_policy: (Optional) The policy used to retry a
+                             ``MutateRow`` request. If not passed, defaults to
+                             the policy of the table. The request is only
+                             retried if every ``SetCell`` mutation has an
+                             explicit timestamp. ``CheckAndMutateRow``
+                             requests are never retried.
+
+        :type coalesce: bool
+        :param coalesce: (Optional) Flag indicating if masked and redundant
+                         mutations should be dropped before sending. This
+                         drops mutations followed by a ``DeleteFromRow`` (or
+                         by a ``DeleteFromFamily`` for their family), all but
+                         the last server-timestamp ``SetCell`` for each
+                         column and repeated identical deletes. The result
+                         of the commit is unchanged, but the request is
+                         smaller. Defaults to :data:`False`.
+
+        :type spool: :class:`.WriteSpool`
+        :param spool: (Optional) If the ``MutateRow`` request fails (after
+                      any retries) with an error that the spool considers
+                      retryable, the request is appended to the spool (to
+                      be replayed later) instead of raising the error,
+                      unless it has a ``SetCell`` with a server-assigned
+                      timestamp (which replaying could apply twice). If
+                      the spool already holds requests for the row, the
+                      request is appended without being sent. Not used for
+                      ``CheckAndMutateRow`` requests.
+
         :rtype: :class:`bool` or :data:`NoneType <types.NoneType>`
         :returns: :data:`None` if there is no filter, otherwise a flag
                   indicating if the filter was matched (which also
                   indicates which set of mutations were applied by the server).
         :raises: :class:`ValueError <exceptions.ValueError>` if the number of
-                 mutations exceeds the ``_MAX_MUTATIONS``.
+                 mutations exceeds the ``_MAX_MUTATIONS`` (use
+                 :meth:`commit_chunks` to commit them non-atomically).
         """
         if self.filter is None:
-            result = self._commit_mutate(timeout_seconds=timeout_seconds, async=async)
+            result = self._commit_mutate(timeout_seconds=timeout_seconds,
+                                         async=async,
+                                         retry_policy=retry_policy,
+                                         coalesce=coalesce, spool=spool)
         else:
             result = self._commit_check_and_mutate(
-                timeout_seconds=timeout_seconds, async=async)
+                timeout_seconds=timeout_seconds, async=async,
+                coalesce=coalesce)
 
         # Reset mutations after commit-ing request.
         self.clear_mutations()
 
         return result
 
+    def commit_chunks(self, timeout_seconds=None, chunk_size=None,
+                      max_inflight=1, retry_policy=None,
+                      progress_callback=None):
+        """Commits the mutations as several (non-atomic) ``MutateRow`` calls.
+
+        Unlike :meth:`commit`, the number of mutations is not limited by
+        ``_MAX_MUTATIONS``: the accumulated mutations are split (in order)
+        into chunks of at most ``chunk_size`` mutations and a ``MutateRow``
+        request is sent for each chunk. This is useful for loading very wide
+        rows.
+
+        .. warning::
+
+            The mutations are **not** applied atomically: if a request fails,
+            the chunks committed before it remain applied. When
+            ``max_inflight`` is more than one, the chunks may also be applied
+            in any order, so this should only be used when mutations in
+            different chunks are independent (e.g. they set different
+            columns).
+
+        Once a request fails, no further chunks are sent. The mutations which
+        were not committed are kept on the row (in order), so calling this
+        method again resumes the commit. Otherwise, after committing all the
+        chunks, resets the local mutations to an empty list.
+
+        If the client has a :class:`.RateLimiter`, the requests are sent in
+        its batch lane.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: Number of seconds for the time-out of each
+                                request. If not passed, defaults to value set
+                                on row.
+
+        :type chunk_size: int
+        :param chunk_size: (Optional) The maximum number of mutations in each
+                           request. Defaults to (and can't exceed)
+                           ``_MAX_MUTATIONS``.
+
+        :type max_inflight: int
+        :param max_inflight: (Optional) The maximum number of requests in
+                             flight at once. Defaults to ``1``, i.e. the
+                             chunks are committed sequentially.
+
+        :type retry_policy: :class:`.RetryPolicy`
+        :param retry_policy: (Optional) The policy used to retry a failed
+                             request. If not passed, defaults to the policy
+                             of the table. A request is only retried if every
+                             ``SetCell`` mutation in it has an explicit
+                             timestamp.
+
+        :type progress_callback: callable
+        :param progress_callback: (Optional) Called after each chunk is
+                                  committed, with the number of mutations
+                                  committed so far and the total number of
+                                  mutations.
+
+        :raises: :class:`ValueError <exceptions.ValueError>` if a filter is
+                 set on the row or if ``chunk_size`` or ``max_inflight`` is
+                 invalid. If a request fails, the error from the (first)
+                 failed request is re-raised.
+        """
+        if self.filter is not None:
+            raise ValueError('Conditional mutations can\'t be committed in '
+                             'chunks.')
+        if chunk_size is None:
+            chunk_size = _MAX_MUTATIONS
+        if chunk_size <= 0 or chunk_size > _MAX_MUTATIONS:
+            raise ValueError('chunk_size must be between 1 and %d.' % (
+                _MAX_MUTATIONS,))
+        if max_inflight <= 0:
+            raise ValueError('max_inflight must be positive')
+
+        mutations = list(self._pb_mutations)
+        num_mutations = len(mutations)
+        timeout_seconds = timeout_seconds or self.timeout_seconds
+        retry_policy = retry_policy or self._table.retry_policy
+        rate_limiter = self.client.rate_limiter
+        hotspot_detector = self.client.hotspot_detector
+
+        inflight = collections.deque()
+        uncommitted = []
+        num_committed = 0
+        first_error = None
+        next_start = 0
+        while next_start < num_mutations or inflight:
+            if (first_error is None and next_start < num_mutations and
+                    len(inflight) < max_inflight):
+                chunk = mutations[next_start:next_start + chunk_size]
+                next_start += len(chunk)
+                request_pb = messages_pb2.MutateRowRequest(
+                    table_name=self.table.name,
+                    row_key=self.row_key,
+                    mutations=chunk,
+                )
+                _acquire(rate_limiter, WRITE, request_pb.ByteSize(),
+                         priority=BATCH)
+                _record_write(hotspot_detector, self.row_key)
+                # Each chunk may use a different stub (of the pool).
+                sent_time = time.time()
+                future = self.client.data_stub.MutateRow.async(
+                    request_pb, timeout_seconds)
+                inflight.append((request_pb, future, sent_time))
+                continue
+
+            if not inflight:
+                # A request failed, so the remaining chunks are not sent.
+                break
+            request_pb, future, sent_time = inflight.popleft()
+            error = _wait_for_mutate_row(self.client.data_stub, request_pb,
+                                         future, sent_time, timeout_seconds,
+                                         retry_policy)
+            if error is None:
+                num_committed += len(request_pb.mutations)
+                if progress_callback is not None:
+                    progress_callback(num_committed, num_mutations)
+            else:
+                uncommitted.extend(request_pb.mutations)
+                if first_error is None:
+                    first_error = error
+
+        self.clear_mutations()
+        self._pb_mutations.extend(uncommitted + mutations[next_start:])
+        if first_error is not None:
+            raise first_error
+
     def clear_modification_rules(self):
         """Removes all currently accumulated modifications on current row."""
         self._rule_pb_list[:] = []
@@ -582,6 +833,8 @@ class Row(object):
             rules=self._rule_pb_list,
         )
         timeout_seconds = timeout_seconds or self.timeout_seconds
+        _acquire(self.client.rate_limiter, WRITE, request_pb.ByteSize())
+        _record_write(self.client.hotspot_detector, self.row_key)
 
         # We expect a `.data_pb2.Row`
         if async:
@@ -1128,6 +1381,59 @@ class ConditionalRowFilter(object):
         return data_pb2.RowFilter(condition=condition)
 
 
+class FrozenRowFilter(object):
+    """Immutable row filter with a memoized protobuf.
+
+    The other filter classes build a new protobuf (recursively, for chains,
+    unions and conditions) every time :meth:`to_pb` is called, i.e. once per
+    request they are used in. A :class:`FrozenRowFilter` converts a filter
+    exactly once, when it is created, and then re-uses the protobuf for
+    every request.
+
+    Since the filter can't change, instances are hashable and can be used
+    as dictionary keys or set members.
+
+    .. note::
+
+        Changes made to ``row_filter`` after it has been frozen are **not**
+        reflected in the frozen filter.
+
+    :type row_filter: :class:`RowFilter`, :class:`RowFilterChain`,
+                      :class:`RowFilterUnion`, :class:`ConditionalRowFilter`
+                      or :class:`FrozenRowFilter`
+    :param row_filter: The filter to freeze.
+    """
+
+    def __init__(self, row_filter):
+        self._filter_pb = row_filter.to_pb()
+        # Only used to compare and hash frozen filters.
+        self._serialized_pb = self._filter_pb.SerializeToString()
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return False
+        return other._serialized_pb == self._serialized_pb
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self._serialized_pb)
+
+    def to_pb(self):
+        """Gets the memoized protobuf for the :class:`FrozenRowFilter`.
+
+        .. note::
+
+            The same protobuf instance is returned on every call, so it
+            must not be modified by the caller.
+
+        :rtype: :class:`.data_pb2.RowFilter`
+        :returns: The protobuf computed when the filter was frozen.
+        """
+        return self._filter_pb
+
+
 def _parse_rmw_row_response(row_response):
     """Parses the response to a ``ReadModifyWriteRow`` request.
 
@@ -1166,3 +1472,155 @@ def _parse_rmw_row_response(row_response):
         column_family_id, curr_family = _parse_family_pb(column_family)
         result[column_family_id] = curr_family
     return result
+
+
+def _call_data_method(method, request_pb, timeout_seconds, async):
+    """Calls a unary method of the data API stub.
+
+    :type method: :class:`grpc.framework.alpha._reexport._UnaryUnarySyncAsync`
+    :param method: The stub method to call.
+
+    :type request_pb: :class:`google.protobuf.message.Message`
+    :param request_pb: The request to send.
+
+    :type timeout_seconds: int
+    :param timeout_seconds: Number of seconds for request time-out.
+
+    :type async: bool
+    :param async: Boolean indicating if the GRPC call should be done
+                  asynchronously (and then waited on).
+
+    :rtype: :class:`google.protobuf.message.Message`
+    :returns: The response from the method.
+    """
+    if async:
+        return method.async(request_pb, timeout_seconds).result()
+    else:
+        return method(request_pb, timeout_seconds)
+
+
+def _wait_for_mutate_row(data_stub, request_pb, future, sent_time,
+                         timeout_seconds, retry_policy):
+    """Waits for a ``MutateRow`` request, retrying it if it failed.
+
+    :type data_stub: :class:`grpc.early_adopter.implementations._Stub`
+    :param data_stub: The stub used to send the request.
+
+    :type request_pb: :class:`messages_pb2.MutateRowRequest`
+    :param request_pb: The request which was sent.
+
+    :type future: :class:`grpc.framework.alpha._reexport._Future`
+    :param future: The future returned when the request was sent.
+
+    :type sent_time: float
+    :param sent_time: The time (in seconds since the epoch) at which the
+                      request was sent. The request counts as the first
+                      attempt of the retry policy.
+
+    :type timeout_seconds: int
+    :param timeout_seconds: Number of seconds for the time-out of retries.
+
+    :type retry_policy: :class:`.RetryPolicy`
+    :param retry_policy: (Optional) The policy used to retry the request,
+                         if its mutations are idempotent.
+
+    :rtype: :class:`Exception <exceptions.Exception>`
+    :returns: The error raised by the request (or its last retry), or
+              :data:`None` if it succeeded.
+    """
+    try:
+        # We expect a `._generated.empty_pb2.Empty`.
+        future.result()
+        return None
+    except Exception as exc:  # pylint: disable=broad-except
+        if (retry_policy is None or
+                not _mutations_idempotent(request_pb.mutations)):
+            return exc
+        first_error = exc
+
+    try:
+        retry_policy.retry(first_error, sent_time, _call_data_method,
+                           data_stub.MutateRow, request_pb,
+                           timeout_seconds=timeout_seconds, async=True)
+    except Exception as exc:  # pylint: disable=broad-except
+        return exc
+    return None
+
+
+def _mutations_idempotent(mutations):
+    """Checks if a list of mutations can safely be applied more than once.
+
+    Only a ``SetCell`` with a server-assigned timestamp is not idempotent,
+    since re-applying it would create a second version of the cell.
+
+    :type mutations: list
+    :param mutations: List of :class:`data_pb2.Mutation`.
+
+    :rtype: bool
+    :returns: Boolean indicating if the mutations are idempotent.
+    """
+    for mutation_pb in mutations:
+        if (mutation_pb.HasField('set_cell') and
+                mutation_pb.set_cell.timestamp_micros == _SERVER_TIMESTAMP):
+            return False
+    return True
+
+
+def _coalesce_mutations(mutations):
+    """Drops mutations which don't change the result of a list of mutations.
+
+    Since mutations in a request are applied in order, the following can be
+    dropped without changing the resulting row:
+
+    * every mutation before a ``DeleteFromRow`` (including other
+      ``DeleteFromRow`` mutations)
+    * every mutation in a column family before a ``DeleteFromFamily`` for
+      that family
+    * a ``SetCell`` with a server-assigned timestamp, if a later ``SetCell``
+      with a server-assigned timestamp writes the same column (all
+      mutations in a request are given the same timestamp)
+    * a ``DeleteFromColumn`` identical to a later one
+
+    :type mutations: list
+    :param mutations: List of :class:`data_pb2.Mutation`.
+
+    :rtype: list
+    :returns: The mutations which were not dropped, in their original order.
+    """
+    result = []
+    deleted_families = set()
+    server_timestamp_columns = set()
+    column_deletes = set()
+    # Walk backwards, so later mutations are seen before the ones they mask.
+    for mutation_pb in reversed(mutations):
+        mutation_type = mutation_pb.WhichOneof('mutation')
+        if mutation_type == 'delete_from_row':
+            result.append(mutation_pb)
+            break
+        elif mutation_type == 'delete_from_family':
+            family_name = mutation_pb.delete_from_family.family_name
+            if family_name in deleted_families:
+                continue
+            deleted_families.add(family_name)
+        elif mutation_type == 'delete_from_column':
+            delete_pb = mutation_pb.delete_from_column
+            if delete_pb.family_name in deleted_families:
+                continue
+            delete_key = delete_pb.SerializeToString()
+            if delete_key in column_deletes:
+                continue
+            column_deletes.add(delete_key)
+        else:
+            set_cell_pb = mutation_pb.set_cell
+            if set_cell_pb.family_name in deleted_families:
+                continue
+            if set_cell_pb.timestamp_micros == _SERVER_TIMESTAMP:
+                column = (set_cell_pb.family_name,
+                          set_cell_pb.column_qualifier)
+                if column in server_timestamp_columns:
+                    continue
+                server_timestamp_columns.add(column)
+        result.append(mutation_pb)
+
+    result.reverse()
+    return result
@@ -20,6 +20,8 @@ import six
 
 from gcloud_bigtable._helpers import _microseconds_to_timestamp
 from gcloud_bigtable._helpers import _to_bytes
+from gcloud_bigtable.rate_limiter import INTERACTIVE
+from gcloud_bigtable.rate_limiter import READ
 
 
 class Cell(object):
@@ -246,11 +248,21 @@ class PartialRowsData(object):
         :class:`grpc.framework.alpha._reexport._CancellableIterator`
     :param response_iterator: A streaming iterator returned from a
                               ``ReadRows`` request.
+
+    :type rate_limiter: :class:`.RateLimiter`
+    :param rate_limiter: (Optional) A rate limiter which the size of each
+                         response consumed is counted against.
+
+    :type priority: str
+    :param priority: (Optional) The lane of ``rate_limiter`` used.
     """
 
-    def __init__(self, response_iterator):
+    def __init__(self, response_iterator, rate_limiter=None,
+                 priority=INTERACTIVE):
         # We expect an iterator of `data_messages_pb2.ReadRowsResponse`
         self._response_iterator = response_iterator
+        self._rate_limiter = rate_limiter
+        self._priority = priority
         self._rows = {}
 
     def __eq__(self, other):
@@ -286,6 +298,9 @@ class PartialRowsData(object):
                  response iterator has no more responses to stream.
         """
         read_rows_response = self._response_iterator.next()
+        if self._rate_limiter is not None:
+            self._rate_limiter.charge(READ, read_rows_response.ByteSize(),
+                                      priority=self._priority)
         row_key = read_rows_response.row_key
         partial_row = self._rows.get(row_key)
         if partial_row is None:
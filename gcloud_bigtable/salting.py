@@ -0,0 +1,254 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Salted row keys, to spread sequential writes across tablets."""
+
+
+import heapq
+import zlib
+
+from gcloud_bigtable._helpers import _to_bytes
+from gcloud_bigtable.rate_limiter import INTERACTIVE
+
+
+class KeySalter(object):
+    """Prefixes row keys with a deterministic hash bucket.
+
+    Monotonic row keys (e.g. timestamps) send all writes to the tablet
+    holding the end of the key space. Salting prefixes each key with one of
+    ``num_buckets`` fixed-width buckets (derived from a CRC-32 of the key),
+    so consecutive keys are written to different parts of the table.
+
+    A range of (unsalted) keys is then spread over every bucket, so
+    :meth:`read_rows` reads it with one ``ReadRows`` request per bucket and
+    merges the results back in key order.
+
+    :type num_buckets: int
+    :param num_buckets: The number of buckets. Changing it changes the
+                        salted key of most rows, so it must stay the same
+                        for the lifetime of the data.
+
+    :raises: :class:`ValueError <exceptions.ValueError>` if ``num_buckets``
+             is not positive.
+    """
+
+    def __init__(self, num_buckets):
+        if num_buckets <= 0:
+            raise ValueError('num_buckets must be positive')
+        self.num_buckets = num_buckets
+        self._prefix_length = len(str(num_buckets - 1))
+
+    def bucket(self, row_key):
+        """Gets the bucket of a row key.
+
+        :type row_key: bytes
+        :param row_key: The (unsalted) row key.
+
+        :rtype: int
+        :returns: The bucket of the row key.
+        """
+        row_key = _to_bytes(row_key)
+        return (zlib.crc32(row_key) & 0xffffffff) % self.num_buckets
+
+    def prefix(self, bucket):
+        """Gets the prefix of the keys in a bucket.
+
+        :type bucket: int
+        :param bucket: The bucket.
+
+        :rtype: bytes
+        :returns: The prefix of the salted keys in the bucket.
+        """
+        return _to_bytes('%0*d' % (self._prefix_length, bucket))
+
+    def salt(self, row_key):
+        """Salts a row key.
+
+        :type row_key: bytes
+        :param row_key: The (unsalted) row key.
+
+        :rtype: bytes
+        :returns: The row key, prefixed with its bucket.
+        """
+        row_key = _to_bytes(row_key)
+        return self.prefix(self.bucket(row_key)) + row_key
+
+    def unsalt(self, salted_key):
+        """Removes the salt of a row key.
+
+        :type salted_key: bytes
+        :param salted_key: A row key returned by :meth:`salt`.
+
+        :rtype: bytes
+        :returns: The (unsalted) row key.
+        """
+        return salted_key[self._prefix_length:]
+
+    def row(self, table, row_key, filter_=None):
+        """Creates a row of a table, with a salted key.
+
+        :type table: :class:`.table.Table`
+        :param table: The table holding the row.
+
+        :type row_key: bytes
+        :param row_key: The (unsalted) row key.
+
+        :type filter_: :class:`.row.RowFilter`
+        :param filter_: (Optional) Filter to be used for conditional mutations.
+                        See :class:`.row.Row` for more details.
+
+        :rtype: :class:`.row.Row`
+        :returns: A row owned by ``table``, with the salted key.
+        """
+        return table.row(self.salt(row_key), filter_=filter_)
+
+    def read_rows(self, table, start_key=None, end_key=None, filter_=None,
+                  limit=None, timeout_seconds=None, priority=INTERACTIVE):
+        """Reads a range of (unsalted) row keys from every bucket.
+
+        Sends a ``ReadRows`` request for the range in each bucket before
+        consuming any of them, so the buckets are read concurrently, and
+        merges the streamed rows in (unsalted) key order. The requests are
+        cancelled if the returned iterator is closed before the end.
+
+        :type table: :class:`.table.Table`
+        :param table: The table to read from.
+
+        :type start_key: bytes
+        :param start_key: (Optional) The beginning of the range of (unsalted)
+                          row keys to read. The range includes ``start_key``.
+
+        :type end_key: bytes
+        :param end_key: (Optional) The end of the range of (unsalted) row keys
+                        to read. The range does not include ``end_key``. If
+                        not passed, reads until the end of each bucket.
+
+        :type filter_: :class:`.row.RowFilter`, :class:`.row.RowFilterChain`,
+                       :class:`.row.RowFilterUnion` or
+                       :class:`.row.ConditionalRowFilter`
+        :param filter_: (Optional) The filter to apply to the contents of the
+                        rows read.
+
+        :type limit: int
+        :param limit: (Optional) The maximum number of rows to return.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: (Optional) Number of seconds for request
+                                time-out. If not passed, defaults to value
+                                set on table.
+
+        :type priority: str
+        :param priority: (Optional) The lane of the client's
+                         :class:`.RateLimiter` used for the requests.
+
+        :rtype: iterator
+        :returns: Iterator of pairs of the (unsalted) row key and the
+                  :class:`.PartialRowData` of each row, in key order.
+        """
+        start_key = _to_bytes(start_key or b'')
+        streams = []
+        for bucket in range(self.num_buckets):
+            prefix = self.prefix(bucket)
+            if end_key is None:
+                bucket_end_key = _prefix_successor(prefix)
+            else:
+                bucket_end_key = prefix + _to_bytes(end_key)
+            streams.append(table.read_rows(
+                start_key=prefix + start_key, end_key=bucket_end_key,
+                filter_=filter_, limit=limit,
+                timeout_seconds=timeout_seconds, priority=priority))
+        return self._merge(streams, limit)
+
+    def _merge(self, streams, limit):
+        """Merges the rows streamed from each bucket in key order.
+
+        :type streams: list
+        :param streams: The :class:`.PartialRowsData` of each bucket.
+
+        :type limit: int
+        :param limit: The maximum number of rows to return.
+
+        :rtype: iterator
+        :returns: Iterator of pairs of the (unsalted) row key and the
+                  :class:`.PartialRowData` of each row, in key order.
+        """
+        iterators = [self._keyed_rows(bucket, stream)
+                     for bucket, stream in enumerate(streams)]
+        num_rows = 0
+        try:
+            for row_key, _, row in heapq.merge(*iterators):
+                if limit and num_rows >= limit:
+                    break
+                num_rows += 1
+                yield row_key, row
+        finally:
+            for stream in streams:
+                stream.cancel()
+
+    def _keyed_rows(self, bucket, stream):
+        """Pairs the rows streamed from a bucket with their sort key.
+
+        Rows with equal (unsalted) keys are ordered by their bucket, so the
+        rows themselves are never compared.
+
+        :type bucket: int
+        :param bucket: The index of the bucket.
+
+        :type stream: :class:`.PartialRowsData`
+        :param stream: The rows streamed from the bucket.
+
+        :rtype: iterator
+        :returns: Iterator of triples of the (unsalted) row key, the bucket
+                  and the :class:`.PartialRowData` of each row.
+        """
+        for row in _iter_committed_rows(stream):
+            yield self.unsalt(row.row_key), bucket, row
+
+
+def _prefix_successor(prefix):
+    """Gets the smallest key greater than every key with a prefix.
+
+    :type prefix: bytes
+    :param prefix: A (non-empty) bucket prefix. Its last byte is a digit.
+
+    :rtype: bytes
+    :returns: The prefix with its last byte incremented.
+    """
+    return prefix[:-1] + _to_bytes(chr(ord(prefix[-1:]) + 1))
+
+
+def _iter_committed_rows(partial_rows_data):
+    """Consumes a stream, yielding each row once it is committed.
+
+    Committed rows are removed from ``partial_rows_data.rows``, so only the
+    row being streamed is kept in memory.
+
+    :type partial_rows_data: :class:`.PartialRowsData`
+    :param partial_rows_data: The stream of a ``ReadRows`` request (without
+                              row interleaving).
+
+    :rtype: iterator
+    :returns: Iterator of the committed :class:`.PartialRowData`, in the
+              order they were streamed.
+    """
+    rows = partial_rows_data.rows
+    while True:
+        try:
+            partial_rows_data.consume_next()
+        except StopIteration:
+            break
+        committed = [row_key for row_key, row in rows.items()
+                     if row.committed]
+        for row_key in sorted(committed):
+            yield rows.pop(row_key)
@@ -0,0 +1,400 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Durable local spool for writes which failed during backend outages."""
+
+
+import logging
+import os
+import struct
+import threading
+import zlib
+
+from gcloud_bigtable._generated import (
+    bigtable_service_messages_pb2 as messages_pb2)
+from gcloud_bigtable.retry import RetryPolicy
+from gcloud_bigtable.row import _call_data_method
+
+
+LOGGER = logging.getLogger('gcloud_bigtable.spool')
+DEFAULT_MAX_SEGMENT_BYTES = 16 * 1024 * 1024
+"""Default size (in bytes) after which a new segment file is started."""
+DEFAULT_REPLAY_INTERVAL = 1.0
+"""Default number of seconds between attempts of the replayer thread."""
+
+_SEGMENT_SUFFIX = '.spool'
+# Each record is the length and CRC-32 of a serialized request, followed
+# by the request.
+_HEADER = struct.Struct('>II')
+
+
+class WriteSpool(object):
+    """An append-only log of ``MutateRow`` requests to be sent later.
+
+    When a commit fails with a retryable error (e.g. the backend is
+    unavailable), the request can be appended to the spool instead of
+    failing or blocking the caller. The spooled requests are sent again
+    later, in order, by :meth:`replay` (or by a background thread started
+    with :meth:`start_replayer`), once the backend has recovered.
+
+    The spool is a directory of segment files. Requests are appended to the
+    newest segment and a segment is deleted once all of its requests have
+    been replayed. Segments left by a previous process are replayed too.
+
+    So that a replayed request can't overwrite a newer write of the same
+    cells, writers using the spool (:meth:`Row.commit
+    <gcloud_bigtable.row.Row.commit>` and :class:`.MutationBatcher`) append
+    new requests for a row which :meth:`has_pending` requests to the spool
+    instead of sending them. The writes to each row are then applied in
+    order, once the spooled requests have been replayed.
+
+    .. note::
+
+        Requests are delivered at least once: the failed attempt may have
+        been applied and a request can be sent again if the process stops
+        while replaying a segment. For this reason, writers only spool a
+        failed request if all of its ``SetCell`` mutations have explicit
+        timestamps. Requests queued behind pending ones were never sent, so
+        they are spooled regardless, but a ``SetCell`` with a
+        server-assigned timestamp may still create an additional version
+        of its cell if the process stops while replaying it.
+
+    :type directory: str
+    :param directory: The directory holding the segment files. Created if
+                      it does not exist.
+
+    :type max_segment_bytes: int
+    :param max_segment_bytes: (Optional) The size after which appends go to
+                              a new segment file.
+
+    :type sync: bool
+    :param sync: (Optional) Flag indicating if each append should be
+                 flushed to disk (with ``fsync``) before returning. Defaults
+                 to :data:`True`.
+
+    :type retry_policy: :class:`.RetryPolicy`
+    :param retry_policy: (Optional) The policy which determines the errors
+                         for which requests are spooled (and for which
+                         replaying is retried later). Defaults to a
+                         :class:`.RetryPolicy` with the default retryable
+                         codes, which the gRPC stub errors don't carry:
+                         without a policy listing the transport's
+                         transient exception classes (see
+                         :class:`.RetryPolicy`), **nothing is spooled**.
+
+    :type error_callback: callable
+    :param error_callback: (Optional) Called with a spooled request and the
+                           error if replaying the request fails with an
+                           error which is not retryable. The request is
+                           dropped from the spool.
+
+    :raises: :class:`ValueError <exceptions.ValueError>` if
+             ``max_segment_bytes`` is not positive.
+    """
+
+    def __init__(self, directory, max_segment_bytes=DEFAULT_MAX_SEGMENT_BYTES,
+                 sync=True, retry_policy=None, error_callback=None):
+        if max_segment_bytes <= 0:
+            raise ValueError('max_segment_bytes must be positive')
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.sync = sync
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.error_callback = error_callback
+
+        # Indices of the segment files (oldest first), including the one
+        # being appended to.
+        self._segments = sorted(
+            int(filename[:-len(_SEGMENT_SUFFIX)])
+            for filename in os.listdir(directory)
+            if filename.endswith(_SEGMENT_SUFFIX))
+        self._writer = None
+        self._writer_index = None
+        self._writer_bytes = 0
+        # Number of requests not yet replayed, for each row key.
+        self._row_counts = {}
+        for index in self._segments:
+            for data in _read_records(self._segment_path(index)):
+                self._add_row(
+                    messages_pb2.MutateRowRequest.FromString(data).row_key)
+        # Number of records of the oldest segment already replayed.
+        self._replay_offset = 0
+        # Guards the segments and the writer.
+        self._lock = threading.Lock()
+        # Makes sure a single caller replays at once.
+        self._replay_lock = threading.Lock()
+
+        self._replayer = None
+        self._replayer_stopped = threading.Event()
+
+    def _segment_path(self, index):
+        """Gets the path of a segment file.
+
+        :type index: int
+        :param index: The index of the segment.
+
+        :rtype: str
+        :returns: The path of the segment file.
+        """
+        return os.path.join(self.directory,
+                            '%020d%s' % (index, _SEGMENT_SUFFIX))
+
+    def _close_writer(self):
+        """Closes the segment being appended to (if any).
+
+        Assumes the lock is held.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._writer_index = None
+
+    def _add_row(self, row_key):
+        """Counts a spooled request for a row.
+
+        Assumes the lock is held (or the spool is being constructed).
+
+        :type row_key: bytes
+        :param row_key: The row key of the request.
+        """
+        self._row_counts[row_key] = self._row_counts.get(row_key, 0) + 1
+
+    def _remove_row(self, row_key):
+        """Stops counting a spooled request which has been replayed.
+
+        :type row_key: bytes
+        :param row_key: The row key of the request.
+        """
+        with self._lock:
+            count = self._row_counts.pop(row_key, 0) - 1
+            if count > 0:
+                self._row_counts[row_key] = count
+
+    def has_pending(self, row_key):
+        """Checks if the spool holds requests for a row.
+
+        New writes to such a row should be appended to the spool rather than
+        sent, so they are not overwritten when the spool is replayed.
+
+        :type row_key: bytes
+        :param row_key: The row key to check.
+
+        :rtype: bool
+        :returns: Boolean indicating if the spool holds requests for the row
+                  which have not been replayed yet.
+        """
+        with self._lock:
+            return row_key in self._row_counts
+
+    def is_retryable(self, exc):
+        """Checks if a failed request should be spooled.
+
+        :type exc: :class:`Exception <exceptions.Exception>`
+        :param exc: The error raised by the request.
+
+        :rtype: bool
+        :returns: Boolean indicating if the error is retryable.
+        """
+        return self.retry_policy.is_retryable(exc)
+
+    def append(self, request_pb):
+        """Appends a request to the spool.
+
+        :type request_pb: :class:`messages_pb2.MutateRowRequest`
+        :param request_pb: The request to send later.
+        """
+        data = request_pb.SerializeToString()
+        record = _HEADER.pack(len(data), zlib.crc32(data) & 0xffffffff) + data
+        with self._lock:
+            if (self._writer is None or
+                    self._writer_bytes >= self.max_segment_bytes):
+                self._close_writer()
+                index = self._segments[-1] + 1 if self._segments else 0
+                self._segments.append(index)
+                self._writer = open(self._segment_path(index), 'ab')
+                self._writer_index = index
+                self._writer_bytes = 0
+
+            self._writer.write(record)
+            self._writer.flush()
+            if self.sync:
+                os.fsync(self._writer.fileno())
+            self._writer_bytes += len(record)
+            self._add_row(request_pb.row_key)
+
+    def replay(self, data_stub, timeout_seconds):
+        """Sends the spooled requests, oldest first.
+
+        Stops at the first request which fails with a retryable error (the
+        backend is likely still unavailable), leaving it and the requests
+        after it in the spool. A request which fails with another error is
+        dropped from the spool before ``error_callback`` is called with it,
+        so if the callback raises, the next :meth:`replay` carries on with
+        the following request.
+
+        :type data_stub: :class:`grpc.early_adopter.implementations._Stub`
+        :param data_stub: The data API stub used to send the requests.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: Number of seconds for the time-out of each
+                                request.
+
+        :rtype: int
+        :returns: The number of requests which were sent successfully.
+        """
+        num_sent = 0
+        with self._replay_lock:
+            while True:
+                with self._lock:
+                    if not self._segments:
+                        return num_sent
+                    index = self._segments[0]
+                    if index == self._writer_index:
+                        # Later appends go to a new segment.
+                        self._close_writer()
+
+                path = self._segment_path(index)
+                records = _read_records(path)
+                while self._replay_offset < len(records):
+                    request_pb = messages_pb2.MutateRowRequest.FromString(
+                        records[self._replay_offset])
+                    try:
+                        _call_data_method(data_stub.MutateRow, request_pb,
+                                          timeout_seconds, True)
+                    except Exception as exc:  # pylint: disable=broad-except
+                        if self.is_retryable(exc):
+                            return num_sent
+                        # Dropped before the callback, so that an error in
+                        # the callback can't block the spool on it.
+                        self._replay_offset += 1
+                        self._remove_row(request_pb.row_key)
+                        if self.error_callback is not None:
+                            self.error_callback(request_pb, exc)
+                    else:
+                        num_sent += 1
+                        self._replay_offset += 1
+                        self._remove_row(request_pb.row_key)
+
+                with self._lock:
+                    os.remove(path)
+                    self._segments.pop(0)
+                self._replay_offset = 0
+
+    def _replay_loop(self, client, interval, timeout_seconds):
+        """Replays the spool periodically.
+
+        Runs in the replayer thread until :meth:`stop_replayer` is called,
+        or until the client is stopped. Errors while replaying are logged
+        and the spool is replayed again after ``interval``.
+
+        :type client: :class:`.client.Client`
+        :param client: The client used to send the requests.
+
+        :type interval: float
+        :param interval: The number of seconds between attempts.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: Number of seconds for the time-out of each
+                                request.
+        """
+        while not self._replayer_stopped.wait(interval):
+            try:
+                data_stub = client.data_stub
+            except ValueError:
+                LOGGER.warning('The client was stopped, the spool will no '
+                               'longer be replayed.')
+                return
+            try:
+                self.replay(data_stub, timeout_seconds)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception('Replaying the spool failed.')
+
+    def start_replayer(self, client, interval=DEFAULT_REPLAY_INTERVAL,
+                       timeout_seconds=None):
+        """Starts a daemon thread which replays the spool periodically.
+
+        :type client: :class:`.client.Client`
+        :param client: The (started) client used to send the requests.
+
+        :type interval: float
+        :param interval: (Optional) The number of seconds between attempts
+                         to replay the spool.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: (Optional) Number of seconds for the time-out
+                                of each request. If not passed, defaults to
+                                value set on the client.
+
+        :raises: :class:`ValueError <exceptions.ValueError>` if the replayer
+                 is already running or ``interval`` is not positive.
+        """
+        if self._replayer is not None:
+            raise ValueError('The replayer is already running')
+        if interval <= 0:
+            raise ValueError('interval must be positive')
+
+        timeout_seconds = timeout_seconds or client.timeout_seconds
+        self._replayer_stopped.clear()
+        self._replayer = threading.Thread(
+            target=self._replay_loop,
+            args=(client, interval, timeout_seconds))
+        self._replayer.daemon = True
+        self._replayer.start()
+
+    def stop_replayer(self):
+        """Stops the replayer thread (if one was started)."""
+        if self._replayer is not None:
+            self._replayer_stopped.set()
+            self._replayer.join()
+            self._replayer = None
+
+    def close(self):
+        """Stops the replayer thread and closes the segment being written.
+
+        Requests which have not been replayed are kept in the directory.
+        """
+        self.stop_replayer()
+        with self._lock:
+            self._close_writer()
+
+
+def _read_records(path):
+    """Reads the records of a segment file.
+
+    A truncated or corrupted record (e.g. from a process which stopped while
+    appending) ends the segment.
+
+    :type path: str
+    :param path: The path of the segment file.
+
+    :rtype: list
+    :returns: The serialized requests in the segment.
+    """
+    with open(path, 'rb') as file_obj:
+        contents = file_obj.read()
+
+    records = []
+    position = 0
+    while position + _HEADER.size <= len(contents):
+        length, crc = _HEADER.unpack_from(contents, position)
+        start = position + _HEADER.size
+        data = contents[start:start + length]
+        if len(data) < length or zlib.crc32(data) & 0xffffffff != crc:
+            break
+        records.append(data)
+        position = start + length
+    return records
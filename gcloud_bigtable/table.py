@@ -15,19 +15,75 @@
 """User friendly container for Google Cloud Bigtable Table."""
 
 
+import collections
+import six
+import struct
+
 from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
 from gcloud_bigtable._generated import (
     bigtable_service_messages_pb2 as data_messages_pb2)
-from gcloud_bigtable._generated import (
-    bigtable_table_service_messages_pb2 as messages_pb2)
+from gcloud_bigtable._helpers import _LazyImport
+from gcloud_bigtable._helpers import _timestamp_to_microseconds
 from gcloud_bigtable._helpers import _to_bytes
 from gcloud_bigtable.column_family import ColumnFamily
 from gcloud_bigtable.column_family import _gc_rule_from_pb
+from gcloud_bigtable.hotspot import _record_write
+from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_BYTES
+from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_INFLIGHT
+from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_MUTATIONS
+from gcloud_bigtable.mutation_batcher import MutationBatcher
+from gcloud_bigtable.rate_limiter import BATCH
+from gcloud_bigtable.rate_limiter import INTERACTIVE
+from gcloud_bigtable.rate_limiter import READ
+from gcloud_bigtable.rate_limiter import WRITE
+from gcloud_bigtable.rate_limiter import _acquire
 from gcloud_bigtable.row import Row
+from gcloud_bigtable.row import _PACK_I64
+from gcloud_bigtable.row import _SERVER_TIMESTAMP
+from gcloud_bigtable.row import _parse_rmw_row_response
 from gcloud_bigtable.row_data import PartialRowData
 from gcloud_bigtable.row_data import PartialRowsData
 
 
+# The Table Admin API protobufs are loaded when they are first used.
+messages_pb2 = _LazyImport(  # pylint: disable=invalid-name
+    'gcloud_bigtable._generated.bigtable_table_service_messages_pb2')
+
+
+class PartialCommitError(RuntimeError):
+    """Exception raised when some of the rows committed together failed.
+
+    The requests for the other rows have still been applied, and their
+    results are kept on the exception. Since the failed requests may also
+    have been applied, only the rows which were not sent are safe to send
+    again.
+
+    :type errors: list
+    :param errors: Pairs of the row key and the exception raised, for each
+                   row whose request failed.
+
+    :type results: list
+    :param results: The result of each row, in the same order as the rows
+                    which were committed. :data:`None` for each row whose
+                    request failed or was not sent.
+    """
+
+    def __init__(self, errors, results):
+        super(PartialCommitError, self).__init__(
+            '%d row(s) could not be committed' % (len(errors),))
+        self.errors = errors
+        self.results = results
+
+    @property
+    def row_keys(self):
+        """Getter for the keys of the rows whose request failed.
+
+        :rtype: list
+        :returns: The row keys, in the order the requests completed.
+        """
+        return [row_key for row_key, _ in self.errors]
+
+
 class Table(object):
     """Representation of a Google Cloud Bigtable Table.
 
@@ -55,11 +111,17 @@ class Table(object):
 
     :type cluster: :class:`.cluster.Cluster`
     :param cluster: The cluster that owns the table.
+
+    :type retry_policy: :class:`.RetryPolicy`
+    :param retry_policy: (Optional) The policy used to retry idempotent data
+                         requests. If not passed, defaults to the policy of
+                         the client.
     """
 
-    def __init__(self, table_id, cluster):
+    def __init__(self, table_id, cluster, retry_policy=None):
         self.table_id = table_id
         self._cluster = cluster
+        self._retry_policy = retry_policy
 
     @property
     def cluster(self):
@@ -88,6 +150,19 @@ class Table(object):
         """
         return self._cluster.timeout_seconds
 
+    @property
+    def retry_policy(self):
+        """Getter for table's retry policy for idempotent data requests.
+
+        :rtype: :class:`.RetryPolicy`
+        :returns: The retry policy stored on the table, or if not set, the
+                  one stored on the table's client (which may be
+                  :data:`None`).
+        """
+        if self._retry_policy is not None:
+            return self._retry_policy
+        return self.client.retry_policy
+
     @property
     def name(self):
         """Table name used in requests.
@@ -132,8 +207,9 @@ class Table(object):
 
         :type filter_: :class:`.RowFilter`,
                        :class:`.RowFilterChain`,
-                       :class:`.RowFilterUnion`, or
-                       :class:`.ConditionalRowFilter`
+                       :class:`.RowFilterUnion`,
+                       :class:`.ConditionalRowFilter` or
+                       :class:`.FrozenRowFilter`
         :param filter_: (Optional) Filter to be used for conditional mutations.
                         See :class:`.Row` for more details.
 
@@ -142,6 +218,65 @@ class Table(object):
         """
         return Row(row_key, self, filter_=filter_)
 
+    def mutation_batcher(self, max_mutations=DEFAULT_MAX_MUTATIONS,
+                         max_bytes=DEFAULT_MAX_BYTES,
+                         max_inflight=DEFAULT_MAX_INFLIGHT,
+                         timeout_seconds=None, retry_policy=None,
+                         coalesce=False, priority=BATCH, controller=None,
+                         spool=None):
+        """Factory to create a mutation batcher associated with this table.
+
+        :type max_mutations: int
+        :param max_mutations: (Optional) The number of buffered mutations
+                              that triggers sending requests.
+
+        :type max_bytes: int
+        :param max_bytes: (Optional) The (serialized) size of buffered
+                          mutations that triggers sending requests.
+
+        :type max_inflight: int
+        :param max_inflight: (Optional) The maximum number of ``MutateRow``
+                             requests in flight at once.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: (Optional) Number of seconds for request
+                                time-out. If not passed, defaults to value
+                                set on table.
+
+        :type retry_policy: :class:`.RetryPolicy`
+        :param retry_policy: (Optional) The policy used to retry failed
+                             requests. If not passed, defaults to the policy
+                             of the table.
+
+        :type coalesce: bool
+        :param coalesce: (Optional) Flag indicating if masked and redundant
+                         mutations for each row should be dropped before
+                         sending.
+
+        :type priority: str
+        :param priority: (Optional) The lane of the client's
+                         :class:`.RateLimiter` used for requests. Defaults
+                         to :data:`.rate_limiter.BATCH`.
+
+        :type controller: :class:`.AdaptiveController`
+        :param controller: (Optional) Adapts the batch size and the number of
+                           requests in flight to the observed latency.
+
+        :type spool: :class:`.WriteSpool`
+        :param spool: (Optional) Holds requests which fail with a retryable
+                      error, to be replayed later.
+
+        :rtype: :class:`.MutationBatcher`
+        :returns: A mutation batcher owned by this table.
+        """
+        return MutationBatcher(self, max_mutations=max_mutations,
+                               max_bytes=max_bytes,
+                               max_inflight=max_inflight,
+                               timeout_seconds=timeout_seconds,
+                               retry_policy=retry_policy,
+                               coalesce=coalesce, priority=priority,
+                               controller=controller, spool=spool)
+
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
@@ -277,15 +412,17 @@ class Table(object):
             result[column_family_id] = column_family
         return result
 
-    def read_row(self, row_key, filter_=None, timeout_seconds=None):
+    def read_row(self, row_key, filter_=None, timeout_seconds=None,
+                 retry_policy=None):
         """Read a single row from this table.
 
         :type row_key: bytes
         :param row_key: The key of the row to read from.
 
         :type filter_: :class:`.row.RowFilter`, :class:`.row.RowFilterChain`,
-                       :class:`.row.RowFilterUnion` or
-                       :class:`.row.ConditionalRowFilter`
+                       :class:`.row.RowFilterUnion`,
+                       :class:`.row.ConditionalRowFilter` or
+                       :class:`.row.FrozenRowFilter`
         :param filter_: (Optional) The filter to apply to the contents of the
                         row. If unset, returns the entire row.
 
@@ -293,6 +430,11 @@ class Table(object):
         :param timeout_seconds: Number of seconds for request time-out.
                                 If not passed, defaults to value set on table.
 
+        :type retry_policy: :class:`.RetryPolicy`
+        :param retry_policy: (Optional) The policy used to retry the request.
+                             If not passed, defaults to the policy of the
+                             table.
+
         :rtype: :class:`.PartialRowData`, :data:`NoneType <types.NoneType>`
         :returns: The contents of the row if any chunks were returned in
                   the response, otherwise :data:`None`.
@@ -301,13 +443,51 @@ class Table(object):
         """
         request_pb = _create_row_request(self.name, row_key=row_key,
                                          filter_=filter_)
+        return self._read_row_from_request(row_key, request_pb,
+                                           timeout_seconds=timeout_seconds,
+                                           retry_policy=retry_policy)
+
+    def _read_row_from_request(self, row_key, request_pb,
+                               timeout_seconds=None, retry_policy=None):
+        """Read a single row from this table, given an already built request.
+
+        Helper for :meth:`read_row` and :meth:`PreparedRead.read_row`.
+
+        :type row_key: bytes
+        :param row_key: The key of the row to read from.
+
+        :type request_pb: :class:`data_messages_pb2.ReadRowsRequest`
+        :param request_pb: The request to read ``row_key``.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: Number of seconds for request time-out.
+                                If not passed, defaults to value set on table.
+
+        :type retry_policy: :class:`.RetryPolicy`
+        :param retry_policy: (Optional) The policy used to retry the request.
+                             If not passed, defaults to the policy of the
+                             table.
+
+        :rtype: :class:`.PartialRowData`, :data:`NoneType <types.NoneType>`
+        :returns: The contents of the row if any chunks were returned in
+                  the response, otherwise :data:`None`.
+        :raises: :class:`ValueError <exceptions.ValueError>` if a commit row
+                 chunk is never encountered.
+        """
         timeout_seconds = timeout_seconds or self.timeout_seconds
-        response_iterator = self.client.data_stub.ReadRows(request_pb,
-                                                           timeout_seconds)
-        # We expect an iterator of `data_messages_pb2.ReadRowsResponse`
-        result = PartialRowData(row_key)
-        for read_rows_response in response_iterator:
-            result.update_from_read_rows(read_rows_response)
+        retry_policy = retry_policy or self.retry_policy
+        args = (self.client.data_stub, row_key, request_pb)
+        kwargs = {
+            'timeout_seconds': timeout_seconds,
+            'rate_limiter': self.client.rate_limiter,
+        }
+        if retry_policy is None:
+            result = _consume_row_response(*args, **kwargs)
+        else:
+            # The whole stream is consumed in each attempt, so a failure
+            # part way through is retried from the start.
+            result = retry_policy.call(_consume_row_response, *args,
+                                       **kwargs)
 
         # Make sure the result actually contains data.
         if not result._chunks_encountered:
@@ -319,7 +499,7 @@ class Table(object):
 
     def read_rows(self, start_key=None, end_key=None,
                   allow_row_interleaving=None, limit=None, filter_=None,
-                  timeout_seconds=None):
+                  timeout_seconds=None, priority=INTERACTIVE):
         """Read rows from this table.
 
         :type start_key: bytes
@@ -333,8 +513,9 @@ class Table(object):
                         will be interpreted as an infinite string.
 
         :type filter_: :class:`.row.RowFilter`, :class:`.row.RowFilterChain`,
-                       :class:`.row.RowFilterUnion` or
-                       :class:`.row.ConditionalRowFilter`
+                       :class:`.row.RowFilterUnion`,
+                       :class:`.row.ConditionalRowFilter` or
+                       :class:`.row.FrozenRowFilter`
         :param filter_: (Optional) The filter to apply to the contents of the
                         specified row(s). If unset, reads every column in
                         each row.
@@ -364,6 +545,13 @@ class Table(object):
         :param timeout_seconds: Number of seconds for request time-out.
                                 If not passed, defaults to value set on table.
 
+        :type priority: str
+        :param priority: (Optional) The lane of the client's
+                         :class:`.RateLimiter` used for the request (and the
+                         streamed response). Defaults to
+                         :data:`.rate_limiter.INTERACTIVE`; large scans
+                         should use :data:`.rate_limiter.BATCH`.
+
         :rtype: :class:`.PartialRowsData`
         :returns: A :class:`.PartialRowsData` convenience wrapper for consuming
                   the streamed results.
@@ -371,11 +559,76 @@ class Table(object):
         request_pb = _create_row_request(
             self.name, start_key=start_key, end_key=end_key, filter_=filter_,
             allow_row_interleaving=allow_row_interleaving, limit=limit)
+        return self._read_rows_from_request(request_pb,
+                                            timeout_seconds=timeout_seconds,
+                                            priority=priority)
+
+    def _read_rows_from_request(self, request_pb, timeout_seconds=None,
+                                priority=INTERACTIVE):
+        """Read rows from this table, given an already built request.
+
+        Helper for :meth:`read_rows` and :meth:`PreparedRead.read_rows`.
+
+        :type request_pb: :class:`data_messages_pb2.ReadRowsRequest`
+        :param request_pb: The request to read rows with.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: Number of seconds for request time-out.
+                                If not passed, defaults to value set on table.
+
+        :type priority: str
+        :param priority: (Optional) The lane of the client's
+                         :class:`.RateLimiter` used for the request.
+
+        :rtype: :class:`.PartialRowsData`
+        :returns: A :class:`.PartialRowsData` convenience wrapper for consuming
+                  the streamed results.
+        """
         timeout_seconds = timeout_seconds or self.timeout_seconds
+        rate_limiter = self.client.rate_limiter
+        _acquire(rate_limiter, READ, priority=priority)
         response_iterator = self.client.data_stub.ReadRows(request_pb,
                                                            timeout_seconds)
         # We expect an iterator of `data_messages_pb2.ReadRowsResponse`
-        return PartialRowsData(response_iterator)
+        return PartialRowsData(response_iterator, rate_limiter=rate_limiter,
+                               priority=priority)
+
+    def prepare_read(self, filter_=None, allow_row_interleaving=None,
+                     limit=None):
+        """Prepare a reusable read request for this table.
+
+        Building a read request computes the table :attr:`name` and converts
+        ``filter_`` to a protobuf. When many reads of the same shape are
+        issued (e.g. point reads with a fixed filter), the returned
+        :class:`PreparedRead` does this work once and each read only copies
+        the prepared request and sets the row key or row range on it.
+
+        .. note::
+
+            The table name is captured when the read is prepared, so a
+            :class:`PreparedRead` should not be used after the table has
+            been :meth:`rename`-d.
+
+        :type filter_: :class:`.row.RowFilter`, :class:`.row.RowFilterChain`,
+                       :class:`.row.RowFilterUnion`,
+                       :class:`.row.ConditionalRowFilter` or
+                       :class:`.row.FrozenRowFilter`
+        :param filter_: (Optional) The filter to apply to the contents of the
+                        row(s) read.
+
+        :type allow_row_interleaving: bool
+        :param allow_row_interleaving: (Optional) See :meth:`read_rows`.
+
+        :type limit: int
+        :param limit: (Optional) See :meth:`read_rows`.
+
+        :rtype: :class:`PreparedRead`
+        :returns: A prepared read bound to this table.
+        """
+        request_pb = _create_row_request(
+            self.name, filter_=filter_,
+            allow_row_interleaving=allow_row_interleaving, limit=limit)
+        return PreparedRead(self, request_pb)
 
     def sample_row_keys(self, timeout_seconds=None):
         """Read a sample of row keys in the table.
@@ -415,10 +668,376 @@ class Table(object):
         request_pb = data_messages_pb2.SampleRowKeysRequest(
             table_name=self.name)
         timeout_seconds = timeout_seconds or self.timeout_seconds
+        _acquire(self.client.rate_limiter, READ)
         response_iterator = self.client.data_stub.SampleRowKeys(
             request_pb, timeout_seconds)
         return response_iterator
 
+    def put_columns(self, row_keys, family, qualifiers, values,
+                    timestamps=None, max_inflight=DEFAULT_MAX_INFLIGHT,
+                    timeout_seconds=None, retry_policy=None):
+        """Sets cells in many rows from columnar data.
+
+        Row ``row_keys[i]`` gets the value ``values[j][i]`` in the column
+        ``qualifiers[j]``. Each column of values is converted to bytes in a
+        single pass (as in :meth:`Row.set_cell <.row.Row.set_cell>`,
+        integers are packed as 64-bit big-endian signed integers) and the
+        mutations are built directly in the requests, which are sent
+        concurrently by a :class:`.MutationBatcher`.
+
+        The sequences can also be NumPy arrays (or any other object with a
+        ``tolist()`` method), which are converted to Python values without
+        iterating over their elements.
+
+        :type row_keys: sequence
+        :param row_keys: The keys of the rows to write.
+
+        :type family: str
+        :param family: The column family that contains the columns.
+
+        :type qualifiers: sequence
+        :param qualifiers: The columns (within ``family``) to set.
+
+        :type values: sequence
+        :param values: One column of values per qualifier, each with one
+                       value (bytes or :class:`int`) per row key.
+
+        :type timestamps: sequence
+        :param timestamps: (Optional) One :class:`datetime.datetime` per
+                           row key, used as the timestamp of the cells in
+                           the row. If not passed, the server time is used.
+
+        :type max_inflight: int
+        :param max_inflight: (Optional) The maximum number of ``MutateRow``
+                             requests in flight at once.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: (Optional) Number of seconds for request
+                                time-out. If not passed, defaults to value
+                                set on table.
+
+        :type retry_policy: :class:`.RetryPolicy`
+        :param retry_policy: (Optional) The policy used to retry failed
+                             requests. If not passed, defaults to the policy
+                             of the table.
+
+        :rtype: list
+        :returns: Pairs of the row key and the error for each row which
+                  could not be written (see :meth:`.MutationBatcher.flush`).
+        :raises: :class:`ValueError <exceptions.ValueError>` if the number
+                 of columns of values does not match the number of
+                 qualifiers or if the length of a column (or of
+                 ``timestamps``) does not match the number of row keys.
+        """
+        row_keys = _as_list(row_keys)
+        num_rows = len(row_keys)
+        qualifiers = [_to_bytes(qualifier)
+                      for qualifier in _as_list(qualifiers)]
+        columns = [_column_to_bytes(column) for column in _as_list(values)]
+        if len(columns) != len(qualifiers):
+            raise ValueError('Expected one column of values per qualifier',
+                             len(columns), len(qualifiers))
+        for column in columns:
+            if len(column) != num_rows:
+                raise ValueError('Expected one value per row key',
+                                 len(column), num_rows)
+        if timestamps is None:
+            timestamps_micros = [_SERVER_TIMESTAMP] * num_rows
+        else:
+            timestamps_micros = [_timestamp_to_microseconds(timestamp)
+                                 for timestamp in _as_list(timestamps)]
+            if len(timestamps_micros) != num_rows:
+                raise ValueError('Expected one timestamp per row key',
+                                 len(timestamps_micros), num_rows)
+
+        cells = list(zip(qualifiers, columns))
+        batcher = self.mutation_batcher(max_inflight=max_inflight,
+                                        timeout_seconds=timeout_seconds,
+                                        retry_policy=retry_policy)
+        for index, row_key in enumerate(row_keys):
+            row = self.row(row_key)
+            mutations = row._get_mutations(None)
+            timestamp_micros = timestamps_micros[index]
+            for qualifier, column in cells:
+                set_cell_pb = mutations.add().set_cell
+                set_cell_pb.family_name = family
+                set_cell_pb.column_qualifier = qualifier
+                set_cell_pb.timestamp_micros = timestamp_micros
+                set_cell_pb.value = column[index]
+            batcher.mutate(row)
+        return batcher.flush()
+
+    def read_modify_write_many(self, rows, max_inflight=DEFAULT_MAX_INFLIGHT,
+                               timeout_seconds=None):
+        """Commits the modification rules of many rows concurrently.
+
+        Sends one ``ReadModifyWriteRow`` request per row, holding all the
+        rules added to the row with
+        :meth:`Row.append_cell_value <.row.Row.append_cell_value>` and
+        :meth:`Row.increment_cell_value <.row.Row.increment_cell_value>`.
+        Up to ``max_inflight`` requests are in flight at once. A row
+        without rules is skipped (as in
+        :meth:`Row.commit_modifications <.row.Row.commit_modifications>`).
+
+        The rules of a row are cleared once its request succeeds. If a
+        request fails, no more requests are sent and the rows which were not
+        committed keep their rules. Since ``ReadModifyWriteRow`` requests
+        are not idempotent, a failed row should not be committed again
+        blindly: its request may have been applied.
+
+        :type rows: iterable
+        :param rows: The :class:`.Row` objects (of this table) to commit.
+
+        :type max_inflight: int
+        :param max_inflight: (Optional) The maximum number of
+                             ``ReadModifyWriteRow`` requests in flight at
+                             once.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: (Optional) Number of seconds for request
+                                time-out. If not passed, defaults to value
+                                set on table.
+
+        :rtype: list
+        :returns: The new contents of the modified cells of each row, in the
+                  same order as ``rows`` (see
+                  :meth:`Row.commit_modifications
+                  <.row.Row.commit_modifications>`).
+        :raises: :class:`ValueError <exceptions.ValueError>` if
+                 ``max_inflight`` is not positive.
+                 :class:`PartialCommitError` if any request fails, holding
+                 the results of the rows which were committed (and
+                 :data:`None` for the other rows).
+        """
+        if max_inflight <= 0:
+            raise ValueError('max_inflight must be positive')
+
+        rows = list(rows)
+        request_pbs = []
+        for row in rows:
+            request_pb = None
+            if row._rule_pb_list:
+                request_pb = data_messages_pb2.ReadModifyWriteRowRequest(
+                    table_name=self.name,
+                    row_key=row.row_key,
+                    rules=row._rule_pb_list,
+                )
+            request_pbs.append(request_pb)
+
+        # We expect `.data_pb2.Row` responses.
+        responses, errors = _send_concurrently(
+            self.client, 'ReadModifyWriteRow',
+            request_pbs, max_inflight,
+            timeout_seconds or self.timeout_seconds)
+        results = []
+        for row, request_pb, row_response in zip(rows, request_pbs,
+                                                 responses):
+            if request_pb is None:
+                results.append({})
+            elif row_response is None:
+                # The request failed or was not sent.
+                results.append(None)
+            else:
+                row.clear_modification_rules()
+                results.append(_parse_rmw_row_response(row_response))
+
+        if errors:
+            raise PartialCommitError(
+                [(rows[index].row_key, exc) for index, exc in errors],
+                results)
+        return results
+
+    def check_and_mutate_many(self, rows, max_inflight=DEFAULT_MAX_INFLIGHT,
+                              timeout_seconds=None):
+        """Commits many conditional rows concurrently.
+
+        Sends one ``CheckAndMutateRow`` request per row (as in
+        :meth:`Row.commit <.row.Row.commit>`), keeping up to
+        ``max_inflight`` requests in flight at once. A row without mutations
+        is skipped.
+
+        The mutations of a row are cleared once its request succeeds. If a
+        request fails, no more requests are sent and the rows which were not
+        committed keep their mutations.
+
+        :type rows: iterable
+        :param rows: The :class:`.Row` objects (of this table) to commit.
+                     Each row must have a filter.
+
+        :type max_inflight: int
+        :param max_inflight: (Optional) The maximum number of
+                             ``CheckAndMutateRow`` requests in flight at
+                             once.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: (Optional) Number of seconds for request
+                                time-out. If not passed, defaults to value
+                                set on table.
+
+        :rtype: list
+        :returns: For each row (in the same order as ``rows``), a flag
+                  indicating if the filter was matched (which also indicates
+                  which set of mutations were applied by the server), or
+                  :data:`None` if the row had no mutations.
+        :raises: :class:`ValueError <exceptions.ValueError>` if
+                 ``max_inflight`` is not positive, if a row has no filter or
+                 if a row has too many mutations (before any request is
+                 sent).
+                 :class:`PartialCommitError` if any request fails, holding
+                 the flags of the rows which were committed (and
+                 :data:`None` for the other rows).
+        """
+        if max_inflight <= 0:
+            raise ValueError('max_inflight must be positive')
+
+        rows = list(rows)
+        request_pbs = []
+        for row in rows:
+            if row.filter is None:
+                raise ValueError('Each row must have a filter.', row.row_key)
+            request_pbs.append(row._check_and_mutate_request())
+
+        # We expect `.messages_pb2.CheckAndMutateRowResponse` responses.
+        responses, errors = _send_concurrently(
+            self.client, 'CheckAndMutateRow',
+            request_pbs, max_inflight,
+            timeout_seconds or self.timeout_seconds)
+        results = []
+        for row, response in zip(rows, responses):
+            if response is None:
+                results.append(None)
+            else:
+                row.clear_mutations()
+                results.append(response.predicate_matched)
+
+        if errors:
+            raise PartialCommitError(
+                [(rows[index].row_key, exc) for index, exc in errors],
+                results)
+        return results
+
+
+class PreparedRead(object):
+    """Reusable template for read requests against a table.
+
+    Should be created via :meth:`Table.prepare_read` rather than directly.
+
+    :type table: :class:`Table`
+    :param table: The table to read from.
+
+    :type request_pb: :class:`data_messages_pb2.ReadRowsRequest`
+    :param request_pb: The base request, with neither a row key nor a row
+                       range set.
+    """
+
+    def __init__(self, table, request_pb):
+        self._table = table
+        self._request_pb = request_pb
+
+    @property
+    def table(self):
+        """Getter for prepared read's table.
+
+        :rtype: :class:`Table`
+        :returns: The table stored on the prepared read.
+        """
+        return self._table
+
+    def _copy_request(self):
+        """Make a copy of the base request.
+
+        :rtype: :class:`data_messages_pb2.ReadRowsRequest`
+        :returns: A copy of the base request which can be modified.
+        """
+        request_pb = data_messages_pb2.ReadRowsRequest()
+        request_pb.CopyFrom(self._request_pb)
+        return request_pb
+
+    def row_request(self, row_key):
+        """Create a request to read a single row.
+
+        :type row_key: bytes
+        :param row_key: The key of the row to read.
+
+        :rtype: :class:`data_messages_pb2.ReadRowsRequest`
+        :returns: The ``ReadRowsRequest`` protobuf for ``row_key``.
+        """
+        request_pb = self._copy_request()
+        request_pb.row_key = _to_bytes(row_key)
+        return request_pb
+
+    def range_request(self, start_key=None, end_key=None):
+        """Create a request to read a range of rows.
+
+        :type start_key: bytes
+        :param start_key: (Optional) The beginning of a range of row keys to
+                          read from. The range will include ``start_key``.
+
+        :type end_key: bytes
+        :param end_key: (Optional) The end of a range of row keys to read
+                        from. The range will not include ``end_key``.
+
+        :rtype: :class:`data_messages_pb2.ReadRowsRequest`
+        :returns: The ``ReadRowsRequest`` protobuf for the row range.
+        """
+        request_pb = self._copy_request()
+        if start_key is not None:
+            request_pb.row_range.start_key = _to_bytes(start_key)
+        if end_key is not None:
+            request_pb.row_range.end_key = _to_bytes(end_key)
+        return request_pb
+
+    def read_row(self, row_key, timeout_seconds=None, retry_policy=None):
+        """Read a single row using the prepared request.
+
+        :type row_key: bytes
+        :param row_key: The key of the row to read from.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: Number of seconds for request time-out.
+                                If not passed, defaults to value set on table.
+
+        :type retry_policy: :class:`.RetryPolicy`
+        :param retry_policy: (Optional) The policy used to retry the request.
+                             If not passed, defaults to the policy of the
+                             table.
+
+        :rtype: :class:`.PartialRowData`, :data:`NoneType <types.NoneType>`
+        :returns: The contents of the row if any chunks were returned in
+                  the response, otherwise :data:`None`.
+        """
+        request_pb = self.row_request(row_key)
+        return self._table._read_row_from_request(
+            row_key, request_pb, timeout_seconds=timeout_seconds,
+            retry_policy=retry_policy)
+
+    def read_rows(self, start_key=None, end_key=None, timeout_seconds=None,
+                  priority=INTERACTIVE):
+        """Read a range of rows using the prepared request.
+
+        :type start_key: bytes
+        :param start_key: (Optional) The beginning of a range of row keys to
+                          read from. The range will include ``start_key``.
+
+        :type end_key: bytes
+        :param end_key: (Optional) The end of a range of row keys to read
+                        from. The range will not include ``end_key``.
+
+        :type timeout_seconds: int
+        :param timeout_seconds: Number of seconds for request time-out.
+                                If not passed, defaults to value set on table.
+
+        :type priority: str
+        :param priority: (Optional) See :meth:`Table.read_rows`.
+
+        :rtype: :class:`.PartialRowsData`
+        :returns: A :class:`.PartialRowsData` convenience wrapper for consuming
+                  the streamed results.
+        """
+        request_pb = self.range_request(start_key=start_key, end_key=end_key)
+        return self._table._read_rows_from_request(
+            request_pb, timeout_seconds=timeout_seconds, priority=priority)
+
 
 def _create_row_request(table_name, row_key=None, start_key=None, end_key=None,
                         filter_=None, allow_row_interleaving=None, limit=None):
@@ -441,8 +1060,9 @@ def _create_row_request(table_name, row_key=None, start_key=None, end_key=None,
                     will be interpreted as an infinite string.
 
     :type filter_: :class:`.row.RowFilter`, :class:`.row.RowFilterChain`,
-                   :class:`.row.RowFilterUnion` or
-                   :class:`.row.ConditionalRowFilter`
+                   :class:`.row.RowFilterUnion`,
+                   :class:`.row.ConditionalRowFilter` or
+                   :class:`.row.FrozenRowFilter`
     :param filter_: (Optional) The filter to apply to the contents of the
                     specified row(s). If unset, reads the entire table.
 
@@ -495,3 +1115,139 @@ def _create_row_request(table_name, row_key=None, start_key=None, end_key=None,
         request_kwargs['num_rows_limit'] = limit
 
     return data_messages_pb2.ReadRowsRequest(**request_kwargs)
+
+
+def _consume_row_response(data_stub, row_key, request_pb, timeout_seconds,
+                          rate_limiter=None):
+    """Sends a ``ReadRows`` request for a single row and consumes the stream.
+
+    :type data_stub: :class:`grpc.early_adopter.implementations._Stub`
+    :param data_stub: The data API stub used to make the request.
+
+    :type row_key: bytes
+    :param row_key: The key of the row to read from.
+
+    :type request_pb: :class:`data_messages_pb2.ReadRowsRequest`
+    :param request_pb: The request to read ``row_key``.
+
+    :type timeout_seconds: int
+    :param timeout_seconds: Number of seconds for request time-out.
+
+    :type rate_limiter: :class:`.RateLimiter`
+    :param rate_limiter: (Optional) The rate limiter of the client. The
+                         request waits for it and the bytes received are
+                         counted against it.
+
+    :rtype: :class:`.PartialRowData`
+    :returns: The (possibly empty) contents of the row.
+    """
+    _acquire(rate_limiter, READ)
+    response_iterator = data_stub.ReadRows(request_pb, timeout_seconds)
+    # We expect an iterator of `data_messages_pb2.ReadRowsResponse`
+    result = PartialRowData(row_key)
+    for read_rows_response in response_iterator:
+        if rate_limiter is not None:
+            rate_limiter.charge(READ, read_rows_response.ByteSize())
+        result.update_from_read_rows(read_rows_response)
+    return result
+
+
+def _send_concurrently(client, method_name, request_pbs, max_inflight,
+                       timeout_seconds):
+    """Sends many requests, with a bounded number in flight at once.
+
+    Requests are sent in order. Once a request fails, no more requests are
+    sent, but the ones already in flight are waited for.
+
+    :type client: :class:`.client.Client`
+    :param client: The client whose data stub(s), rate limiter and hotspot
+                   detector are used for the requests.
+
+    :type method_name: str
+    :param method_name: The name of the Data API method used to send each
+                        request.
+
+    :type request_pbs: list
+    :param request_pbs: The requests to send. :data:`None` entries are
+                        skipped.
+
+    :type max_inflight: int
+    :param max_inflight: The maximum number of requests in flight at once.
+
+    :type timeout_seconds: int
+    :param timeout_seconds: Number of seconds for request time-out.
+
+    :rtype: tuple
+    :returns: Pair of the responses (:data:`None` for each request which was
+              skipped, not sent or failed) and pairs of the index and the
+              error of each failed request (in the order the requests
+              completed).
+    """
+    responses = [None] * len(request_pbs)
+    inflight = collections.deque()
+    errors = []
+    next_index = 0
+    while next_index < len(request_pbs) or inflight:
+        if (not errors and next_index < len(request_pbs) and
+                len(inflight) < max_inflight):
+            index = next_index
+            next_index += 1
+            request_pb = request_pbs[index]
+            if request_pb is None:
+                continue
+            _acquire(client.rate_limiter, WRITE, request_pb.ByteSize())
+            _record_write(client.hotspot_detector, request_pb.row_key)
+            # Each request may use a different stub (of the client's pool).
+            method = getattr(client.data_stub, method_name)
+            inflight.append(
+                (index, method.async(request_pb, timeout_seconds)))
+            continue
+
+        if not inflight:
+            # A request failed, so the remaining requests are not sent.
+            break
+        index, future = inflight.popleft()
+        try:
+            responses[index] = future.result()
+        except Exception as exc:  # pylint: disable=broad-except
+            errors.append((index, exc))
+    return responses, errors
+
+
+def _as_list(values):
+    """Converts a sequence (or array) to a list.
+
+    :type values: sequence
+    :param values: A sequence, or an array with a ``tolist()`` method (e.g.
+                   a NumPy array), which converts its elements to Python
+                   values in a single call.
+
+    :rtype: list
+    :returns: The values, as a list.
+    """
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return list(values)
+
+
+def _column_to_bytes(column):
+    """Converts a column of cell values to bytes.
+
+    Integers are packed as 64-bit big-endian signed integers. If every value
+    is an integer, the whole column is packed in a single call.
+
+    :type column: sequence
+    :param column: The values (bytes or :class:`int`) of the column.
+
+    :rtype: list
+    :returns: The values, converted to bytes.
+    :raises: :class:`TypeError <exceptions.TypeError>` if a value can't be
+             converted to bytes.
+    """
+    column = _as_list(column)
+    if all(isinstance(value, six.integer_types) for value in column):
+        packed = struct.pack('>%dq' % (len(column),), *column)
+        return [packed[start:start + 8]
+                for start in six.moves.range(0, len(packed), 8)]
+    return [_PACK_I64(value) if isinstance(value, six.integer_types)
+            else _to_bytes(value) for value in column]
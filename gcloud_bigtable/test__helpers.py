@@ -16,6 +16,36 @@
 import unittest2
 
 
+class Test_LazyImport(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable._helpers import _LazyImport
+        return _LazyImport
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def test_module(self):
+        from gcloud_bigtable._generated import bigtable_table_data_pb2
+
+        lazy_module = self._makeOne(
+            'gcloud_bigtable._generated.bigtable_table_data_pb2')
+        self.assertEqual(lazy_module._value, None)
+        self.assertTrue(lazy_module.GcRule is bigtable_table_data_pb2.GcRule)
+        self.assertTrue(lazy_module._value is bigtable_table_data_pb2)
+
+    def test_attribute(self):
+        lazy_attr = self._makeOne('gcloud_bigtable._helpers', '_to_bytes')
+        self.assertEqual(lazy_attr(u'abc'), b'abc')
+        self.assertEqual(lazy_attr.__name__, '_to_bytes')
+
+    def test_missing_module(self):
+        lazy_module = self._makeOne('gcloud_bigtable._not_a_module')
+        with self.assertRaises(ImportError):
+            getattr(lazy_module, 'attr')
+        self.assertEqual(lazy_module._value, None)
+
+
 class TestMetadataTransformer(unittest2.TestCase):
 
     def _getTargetClass(self):
@@ -53,6 +83,7 @@ class TestMetadataTransformer(unittest2.TestCase):
 
         class _ReturnVal(object):
             access_token = access_token_expected
+            expires_in = None
 
         scoped_creds = _MockWithAttachedMethods(_ReturnVal)
         credentials = _MockWithAttachedMethods(scoped_creds)
@@ -72,6 +103,156 @@ class TestMetadataTransformer(unittest2.TestCase):
         ])
         self.assertEqual(scoped_creds._called, [('get_access_token', (), {})])
 
+    def _makeCached(self, tokens, now=1000.0):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import _helpers as MUT
+
+        credentials = _Credentials(tokens)
+        fake_time = _Time(now)
+        transformer = self._makeOne(_Client(credentials))
+        return transformer, credentials, fake_time, _Monkey(MUT,
+                                                            time=fake_time)
+
+    def test_constructor_defaults(self):
+        from gcloud_bigtable._helpers import DEFAULT_REFRESH_MARGIN
+
+        transformer = self._makeOne(_Client(_Credentials([])))
+        self.assertEqual(transformer.refresh_margin, DEFAULT_REFRESH_MARGIN)
+        self.assertEqual(transformer._metadata, None)
+        self.assertEqual(transformer._expires_at, None)
+        self.assertEqual(transformer._refresher, None)
+
+    def test___call___cached(self):
+        from gcloud_bigtable._helpers import _EXPIRY_SAFETY_SECONDS
+
+        transformer, credentials, fake_time, monkey = self._makeCached(
+            [('token1', 3600), ('token2', 3600)])
+        with monkey:
+            result1 = transformer(None)
+            fake_time.now += 3000
+            result2 = transformer(None)
+        self.assertEqual(result1, [
+            ('Authorization', 'Bearer token1'),
+            ('User-agent', 'USER_AGENT'),
+        ])
+        # The pre-built metadata is re-used.
+        self.assertTrue(result2 is result1)
+        self.assertEqual(credentials.get_access_token_calls, 1)
+        self.assertEqual(credentials.refresh_calls, [])
+        self.assertEqual(transformer._expires_at,
+                         1000.0 + 3600 - _EXPIRY_SAFETY_SECONDS)
+
+    def test___call___expired(self):
+        import httplib2
+
+        transformer, credentials, fake_time, monkey = self._makeCached(
+            [('token1', 3600), ('token2', 3600)])
+        with monkey:
+            transformer(None)
+            fake_time.now += 3600
+            result = transformer(None)
+        self.assertEqual(result[0], ('Authorization', 'Bearer token2'))
+        # The credentials still consider the token valid, so a new one is
+        # requested explicitly.
+        self.assertEqual(len(credentials.refresh_calls), 1)
+        self.assertTrue(isinstance(credentials.refresh_calls[0],
+                                   httplib2.Http))
+        self.assertEqual(credentials.get_access_token_calls, 2)
+
+    def test___call___refreshed_while_waiting(self):
+        transformer, credentials, _, monkey = self._makeCached([])
+        metadata = [('Authorization', 'Bearer token1')]
+        # Another thread refreshes the token while the lock is waited for.
+        transformer._lock = _RefreshingLock(transformer, metadata, 5000.0)
+        with monkey:
+            self.assertTrue(transformer(None) is metadata)
+        self.assertEqual(credentials.get_access_token_calls, 0)
+
+    def test___call___unknown_expiry(self):
+        from gcloud_bigtable._helpers import _UNKNOWN_EXPIRY_SECONDS
+
+        transformer, credentials, fake_time, monkey = self._makeCached(
+            [('token1', None), ('token2', None)])
+        with monkey:
+            transformer(None)
+            self.assertEqual(transformer._expires_at,
+                             1000.0 + _UNKNOWN_EXPIRY_SECONDS)
+            fake_time.now += _UNKNOWN_EXPIRY_SECONDS
+            result = transformer(None)
+        self.assertEqual(result[0], ('Authorization', 'Bearer token2'))
+        # The token is read again, but never refreshed explicitly.
+        self.assertEqual(credentials.get_access_token_calls, 2)
+        self.assertEqual(credentials.refresh_calls, [])
+
+    def test__seconds_until_refresh(self):
+        transformer, _, fake_time, monkey = self._makeCached(
+            [('token1', 3600)])
+        transformer.refresh_margin = 600
+        with monkey:
+            self.assertEqual(transformer._seconds_until_refresh(), 0)
+            transformer(None)
+            self.assertEqual(transformer._seconds_until_refresh(), 3000)
+            fake_time.now += 3500
+            self.assertEqual(transformer._seconds_until_refresh(), 1.0)
+
+    def test__seconds_until_refresh_short_lived_token(self):
+        transformer, _, _, monkey = self._makeCached([('token1', 100)])
+        with monkey:
+            transformer(None)
+            # The margin is capped to half the lifetime of the token.
+            self.assertEqual(transformer._seconds_until_refresh(), 50.0)
+        self.assertEqual(transformer._expires_at, 1000.0 + 100 - 10)
+
+    def test__refresh_loop(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import _helpers as MUT
+
+        transformer, credentials, _, monkey = self._makeCached(
+            [('token1', 3600), ValueError('Failed'), ValueError('Failed'),
+             ('token4', 3600)])
+        transformer._refresher_stopped = _Event([False] * 4 + [True])
+        logger = _Logger()
+        with monkey:
+            with _Monkey(MUT, LOGGER=logger):
+                transformer._refresh_loop()
+        # Failed refreshes are retried with exponential backoff.
+        self.assertEqual(transformer._refresher_stopped.waits,
+                         [0, 3300.0, 2.0, 4.0, 3300.0])
+        self.assertEqual(logger.exceptions,
+                         ['Failed to refresh the access token.'])
+        self.assertEqual(logger.warnings, [
+            'Failed to refresh the access token (2 attempts): Failed'])
+        # The first token is requested, the following ones refreshed.
+        self.assertEqual(len(credentials.refresh_calls), 3)
+        self.assertEqual(transformer._metadata[0],
+                         ('Authorization', 'Bearer token4'))
+
+    def test__refresh_loop_unknown_expiry(self):
+        transformer, credentials, _, monkey = self._makeCached(
+            [('token1', None), ('token2', None)])
+        transformer._refresher_stopped = _Event([False, False, True])
+        with monkey:
+            transformer._refresh_loop()
+        self.assertEqual(transformer._refresher_stopped.waits,
+                         [0, 30.0, 30.0])
+        self.assertEqual(credentials.refresh_calls, [])
+        self.assertEqual(credentials.get_access_token_calls, 2)
+
+    def test_start_and_stop_refresher(self):
+        transformer = self._makeOne(_Client(_Credentials([])))
+        transformer._refresh_loop = loop_calls = _LoopRecorder()
+        transformer.start_refresher()
+        self.assertTrue(transformer._refresher is not None)
+        self.assertTrue(transformer._refresher.daemon)
+        with self.assertRaises(ValueError):
+            transformer.start_refresher()
+        transformer.stop_refresher()
+        self.assertEqual(transformer._refresher, None)
+        self.assertTrue(transformer._refresher_stopped.is_set())
+        self.assertEqual(loop_calls.calls, [()])
+        # Stopping again does nothing.
+        transformer.stop_refresher()
+
 
 class Test__pb_timestamp_to_datetime(unittest2.TestCase):
 
@@ -443,6 +624,22 @@ class Test_make_stub(unittest2.TestCase):
         transformer.check_called(self, [(client,)])
         self.assertEqual(client._called, [])
 
+    def test_shared_metadata_transformer(self):
+        from gcloud_bigtable._testing import _MockCalled
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import _helpers as MUT
+
+        from gcloud_bigtable._helpers import make_stub
+
+        custom_factory = _MockCalled(object())
+        transformer = object()
+        with _Monkey(MUT, get_certs=lambda: 'FOOBAR'):
+            make_stub(object(), custom_factory, 'HOST', 1025,
+                      metadata_transformer=transformer)
+        self.assertTrue(
+            custom_factory.called_kwargs[0]['metadata_transformer']
+            is transformer)
+
 
 class Test__parse_family_pb(unittest2.TestCase):
 
@@ -528,3 +725,93 @@ class Test__to_bytes(unittest2.TestCase):
     def test_with_nonstring_type(self):
         value = object()
         self.assertRaises(TypeError, self._callFUT, value)
+
+
+class _TokenInfo(object):
+
+    def __init__(self, access_token, expires_in):
+        self.access_token = access_token
+        self.expires_in = expires_in
+
+
+class _Credentials(object):
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.get_access_token_calls = 0
+        self.refresh_calls = []
+
+    def refresh(self, http):
+        self.refresh_calls.append(http)
+
+    def get_access_token(self):
+        self.get_access_token_calls += 1
+        token = self.tokens.pop(0)
+        if isinstance(token, Exception):
+            raise token
+        return _TokenInfo(*token)
+
+
+class _RefreshingLock(object):
+
+    def __init__(self, transformer, metadata, expires_at):
+        self.transformer = transformer
+        self.metadata = metadata
+        self.expires_at = expires_at
+
+    def __enter__(self):
+        self.transformer._metadata = self.metadata
+        self.transformer._expires_at = self.expires_at
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class _Client(object):
+
+    user_agent = 'USER_AGENT'
+
+    def __init__(self, credentials):
+        self.credentials = credentials
+
+
+class _Time(object):
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class _Event(object):
+
+    def __init__(self, results):
+        self.results = results
+        self.waits = []
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        return self.results.pop(0)
+
+
+class _LoopRecorder(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *args):
+        self.calls.append(args)
+
+
+class _Logger(object):
+
+    def __init__(self):
+        self.exceptions = []
+        self.warnings = []
+
+    def exception(self, message, *args):
+        self.exceptions.append(message % args)
+
+    def warning(self, message, *args):
+        self.warnings.append(message % args)
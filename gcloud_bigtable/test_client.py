@@ -47,10 +47,12 @@ class Test__project_id_from_app_engine(unittest2.TestCase):
         return _project_id_from_app_engine()
 
     def test_without_app_engine(self):
+        from gcloud_bigtable._helpers import _LazyImport
         from gcloud_bigtable._testing import _Monkey
         from gcloud_bigtable import client as MUT
 
-        with _Monkey(MUT, app_identity=None):
+        app_identity = _LazyImport('gcloud_bigtable._not_a_module')
+        with _Monkey(MUT, app_identity=app_identity):
             result = self._callFUT()
 
         self.assertEqual(result, None)
@@ -233,7 +235,8 @@ class TestClient(unittest2.TestCase):
 
     def _constructor_test_helper(self, expected_scopes, project_id=None,
                                  read_only=False, admin=False,
-                                 user_agent=None):
+                                 user_agent=None, retry_policy=None,
+                                 rate_limiter=None, hotspot_detector=None):
         from gcloud_bigtable._testing import _MockCalled
         from gcloud_bigtable._testing import _MockWithAttachedMethods
         from gcloud_bigtable._testing import _Monkey
@@ -246,7 +249,10 @@ class TestClient(unittest2.TestCase):
         with _Monkey(MUT, _determine_project_id=mock_determine_project_id):
             client = self._makeOne(credentials, project_id=project_id,
                                    read_only=read_only, admin=admin,
-                                   user_agent=user_agent)
+                                   user_agent=user_agent,
+                                   retry_policy=retry_policy,
+                                   rate_limiter=rate_limiter,
+                                   hotspot_detector=hotspot_detector)
 
         self.assertTrue(client._credentials is scoped_creds)
         self.assertEqual(credentials._called, [
@@ -255,6 +261,9 @@ class TestClient(unittest2.TestCase):
         self.assertTrue(client._project_id is determined_project_id)
         self.assertEqual(client.timeout_seconds, MUT.DEFAULT_TIMEOUT_SECONDS)
         self.assertEqual(client.user_agent, user_agent)
+        self.assertTrue(client.retry_policy is retry_policy)
+        self.assertTrue(client.rate_limiter is rate_limiter)
+        self.assertTrue(client.hotspot_detector is hotspot_detector)
         mock_determine_project_id.check_called(self, [(project_id,)])
 
     def test_constructor_default(self):
@@ -295,6 +304,24 @@ class TestClient(unittest2.TestCase):
         expected_scopes = [MUT.DATA_SCOPE]
         self._constructor_test_helper(expected_scopes, user_agent=user_agent)
 
+    def test_constructor_with_retry_policy(self):
+        from gcloud_bigtable import client as MUT
+        expected_scopes = [MUT.DATA_SCOPE]
+        self._constructor_test_helper(expected_scopes,
+                                      retry_policy=object())
+
+    def test_constructor_with_rate_limiter(self):
+        from gcloud_bigtable import client as MUT
+        expected_scopes = [MUT.DATA_SCOPE]
+        self._constructor_test_helper(expected_scopes,
+                                      rate_limiter=object())
+
+    def test_constructor_with_hotspot_detector(self):
+        from gcloud_bigtable import client as MUT
+        expected_scopes = [MUT.DATA_SCOPE]
+        self._constructor_test_helper(expected_scopes,
+                                      hotspot_detector=object())
+
     def test_constructor_with_admin(self):
         from gcloud_bigtable import client as MUT
         expected_scopes = [MUT.DATA_SCOPE, MUT.ADMIN_SCOPE]
@@ -309,6 +336,22 @@ class TestClient(unittest2.TestCase):
         with self.assertRaises(ValueError):
             self._makeOne(None, admin=True, read_only=True)
 
+    def test_constructor_with_channel_pool_size(self):
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+
+        scoped_creds = object()
+        credentials = _MockWithAttachedMethods(scoped_creds, scoped_creds)
+        client = self._makeOne(credentials, project_id=PROJECT_ID)
+        self.assertEqual(client.channel_pool_size, 1)
+        client = self._makeOne(credentials, project_id=PROJECT_ID,
+                               channel_pool_size=4)
+        self.assertEqual(client.channel_pool_size, 4)
+        self.assertEqual(client._data_stubs, [])
+
+    def test_constructor_bad_channel_pool_size(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(None, channel_pool_size=0)
+
     def test_from_service_account_json(self):
         from gcloud_bigtable._testing import _MockCalled
         from gcloud_bigtable._testing import _MockWithAttachedMethods
@@ -389,9 +432,11 @@ class TestClient(unittest2.TestCase):
         # Put some fake stubs in place so that we can verify they
         # don't get copied.
         client._data_stub = object()
+        client._data_stubs = [client._data_stub, object()]
         client._cluster_stub = object()
         client._operations_stub = object()
         client._table_stub = object()
+        client._metadata_transformer = object()
 
         new_client = client.copy()
         self.assertEqual(new_client._admin, client._admin)
@@ -404,9 +449,41 @@ class TestClient(unittest2.TestCase):
         self.assertEqual(new_client.timeout_seconds, client.timeout_seconds)
         # Make sure stubs are not preserved.
         self.assertEqual(new_client._data_stub, None)
+        self.assertEqual(new_client._data_stubs, [])
         self.assertEqual(new_client._cluster_stub, None)
         self.assertEqual(new_client._operations_stub, None)
         self.assertEqual(new_client._table_stub, None)
+        self.assertEqual(new_client._metadata_transformer, None)
+        self.assertFalse(new_client._stub_lock is client._stub_lock)
+        self.assertTrue(client._metadata_transformer is not None)
+
+    def test_copy_shares_rate_limiter(self):
+        import threading
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+
+        scoped_creds = object()
+        credentials = _MockWithAttachedMethods(scoped_creds)
+        client = self._makeOne(credentials, project_id=PROJECT_ID)
+        # Make sure a rate limiter which can't be deep-copied (e.g. one
+        # holding a lock) is shared instead.
+        client.rate_limiter = rate_limiter = threading.Lock()
+
+        new_client = client.copy()
+        self.assertTrue(new_client.rate_limiter is rate_limiter)
+        self.assertTrue(client.rate_limiter is rate_limiter)
+
+    def test_copy_shares_hotspot_detector(self):
+        import threading
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+
+        scoped_creds = object()
+        credentials = _MockWithAttachedMethods(scoped_creds)
+        client = self._makeOne(credentials, project_id=PROJECT_ID)
+        client.hotspot_detector = hotspot_detector = threading.Lock()
+
+        new_client = client.copy()
+        self.assertTrue(new_client.hotspot_detector is hotspot_detector)
+        self.assertTrue(client.hotspot_detector is hotspot_detector)
 
     def test_copy_partial_failure(self):
         from gcloud_bigtable._testing import _MockWithAttachedMethods
@@ -446,6 +523,29 @@ class TestClient(unittest2.TestCase):
         self.assertEqual(client._cluster_stub, cluster_stub)
         self.assertEqual(client._operations_stub, operations_stub)
         self.assertEqual(client._table_stub, table_stub)
+        self.assertEqual(client.rate_limiter, None)
+        self.assertEqual(client.hotspot_detector, None)
+
+    def test_hot_keys(self):
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+
+        scoped_creds = object()
+        credentials = _MockWithAttachedMethods(scoped_creds)
+        client = self._makeOne(credentials, project_id=PROJECT_ID)
+        report = object()
+        client.hotspot_detector = _MockWithAttachedMethods(report)
+        self.assertTrue(client.hot_keys(limit=5, prefixes=True) is report)
+        self.assertEqual(client.hotspot_detector._called, [
+            ('hot_keys', (), {'limit': 5, 'prefixes': True}),
+        ])
+
+    def test_hot_keys_without_hotspot_detector(self):
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+
+        scoped_creds = object()
+        credentials = _MockWithAttachedMethods(scoped_creds)
+        client = self._makeOne(credentials, project_id=PROJECT_ID)
+        self.assertEqual(client.hot_keys(), [])
 
     def test_credentials_getter(self):
         from gcloud_bigtable._testing import _MockWithAttachedMethods
@@ -480,6 +580,18 @@ class TestClient(unittest2.TestCase):
         client._data_stub = object()
         self.assertTrue(client.data_stub is client._data_stub)
 
+    def test_data_stub_getter_with_pool(self):
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+        scoped_creds = object()
+        credentials = _MockWithAttachedMethods(scoped_creds)
+        client = self._makeOne(credentials, project_id=PROJECT_ID)
+        stubs = [object(), object(), object()]
+        client._data_stub = stubs[0]
+        client._data_stubs = stubs
+        # The stubs are used in round-robin order.
+        self.assertEqual([client.data_stub for _ in range(7)],
+                         stubs + stubs + stubs[:1])
+
     def test_data_stub_failure(self):
         from gcloud_bigtable._testing import _MockWithAttachedMethods
         scoped_creds = object()
@@ -572,6 +684,7 @@ class TestClient(unittest2.TestCase):
         scoped_creds = object()
         credentials = _MockWithAttachedMethods(scoped_creds)
         client = self._makeOne(credentials, project_id=PROJECT_ID)
+        client._metadata_transformer = transformer = object()
         expected_result = object()
         mock_make_stub = _MockCalled(expected_result)
         with _Monkey(MUT, make_stub=mock_make_stub):
@@ -586,7 +699,9 @@ class TestClient(unittest2.TestCase):
                 DATA_API_PORT,
             ),
         ]
-        mock_make_stub.check_called(self, make_stub_args)
+        mock_make_stub.check_called(self, make_stub_args, [{
+            'metadata_transformer': transformer,
+        }])
 
     def test__make_cluster_stub(self):
         from gcloud_bigtable._testing import _MockCalled
@@ -600,6 +715,7 @@ class TestClient(unittest2.TestCase):
         scoped_creds = object()
         credentials = _MockWithAttachedMethods(scoped_creds)
         client = self._makeOne(credentials, project_id=PROJECT_ID)
+        client._metadata_transformer = transformer = object()
         expected_result = object()
         mock_make_stub = _MockCalled(expected_result)
         with _Monkey(MUT, make_stub=mock_make_stub):
@@ -614,7 +730,9 @@ class TestClient(unittest2.TestCase):
                 CLUSTER_ADMIN_PORT,
             ),
         ]
-        mock_make_stub.check_called(self, make_stub_args)
+        mock_make_stub.check_called(self, make_stub_args, [{
+            'metadata_transformer': transformer,
+        }])
 
     def test__make_operations_stub(self):
         from gcloud_bigtable._testing import _MockCalled
@@ -628,6 +746,7 @@ class TestClient(unittest2.TestCase):
         scoped_creds = object()
         credentials = _MockWithAttachedMethods(scoped_creds)
         client = self._makeOne(credentials, project_id=PROJECT_ID)
+        client._metadata_transformer = transformer = object()
         expected_result = object()
         mock_make_stub = _MockCalled(expected_result)
         with _Monkey(MUT, make_stub=mock_make_stub):
@@ -642,7 +761,9 @@ class TestClient(unittest2.TestCase):
                 CLUSTER_ADMIN_PORT,
             ),
         ]
-        mock_make_stub.check_called(self, make_stub_args)
+        mock_make_stub.check_called(self, make_stub_args, [{
+            'metadata_transformer': transformer,
+        }])
 
     def test__make_table_stub(self):
         from gcloud_bigtable._testing import _MockCalled
@@ -656,6 +777,7 @@ class TestClient(unittest2.TestCase):
         scoped_creds = object()
         credentials = _MockWithAttachedMethods(scoped_creds)
         client = self._makeOne(credentials, project_id=PROJECT_ID)
+        client._metadata_transformer = transformer = object()
         expected_result = object()
         mock_make_stub = _MockCalled(expected_result)
         with _Monkey(MUT, make_stub=mock_make_stub):
@@ -670,7 +792,9 @@ class TestClient(unittest2.TestCase):
                 TABLE_ADMIN_PORT,
             ),
         ]
-        mock_make_stub.check_called(self, make_stub_args)
+        mock_make_stub.check_called(self, make_stub_args, [{
+            'metadata_transformer': transformer,
+        }])
 
     def test_is_started(self):
         from gcloud_bigtable._testing import _MockWithAttachedMethods
@@ -695,20 +819,19 @@ class TestClient(unittest2.TestCase):
         client = self._makeOne(credentials, project_id=PROJECT_ID, admin=admin)
         stub = _FakeStub()
         mock_make_stub = _MockCalled(stub)
-        with _Monkey(MUT, make_stub=mock_make_stub):
+        with _Monkey(MUT, make_stub=mock_make_stub,
+                     MetadataTransformer=_MetadataTransformer):
             client.start()
 
         self.assertTrue(client._data_stub is stub)
-        if admin:
-            self.assertTrue(client._cluster_stub is stub)
-            self.assertTrue(client._operations_stub is stub)
-            self.assertTrue(client._table_stub is stub)
-            self.assertEqual(stub._entered, 4)
-        else:
-            self.assertTrue(client._cluster_stub is None)
-            self.assertTrue(client._operations_stub is None)
-            self.assertTrue(client._table_stub is None)
-            self.assertEqual(stub._entered, 1)
+        transformer = client._metadata_transformer
+        self.assertTrue(transformer.client is client)
+        self.assertTrue(transformer.refreshing)
+        # Admin stubs are only created when they are used.
+        self.assertTrue(client._cluster_stub is None)
+        self.assertTrue(client._operations_stub is None)
+        self.assertTrue(client._table_stub is None)
+        self.assertEqual(stub._entered, 1)
         self.assertEqual(stub._exited, [])
 
     def test_start_non_admin(self):
@@ -717,6 +840,80 @@ class TestClient(unittest2.TestCase):
     def test_start_with_admin(self):
         self._start_method_helper(admin=True)
 
+    def test_start_with_channel_pool(self):
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import client as MUT
+
+        scoped_creds = object()
+        credentials = _MockWithAttachedMethods(scoped_creds)
+        client = self._makeOne(credentials, project_id=PROJECT_ID,
+                               channel_pool_size=3)
+        stubs = []
+
+        def mock_make_stub(*args, **kwargs):
+            stubs.append(_FakeStub())
+            return stubs[-1]
+
+        with _Monkey(MUT, make_stub=mock_make_stub,
+                     MetadataTransformer=_MetadataTransformer):
+            client.start()
+
+        self.assertEqual(len(stubs), 3)
+        self.assertTrue(client._data_stub is stubs[0])
+        self.assertEqual(client._data_stubs, stubs)
+        for stub in stubs:
+            self.assertEqual(stub._entered, 1)
+
+        client.stop()
+        self.assertEqual(client._data_stubs, [])
+        for stub in stubs:
+            self.assertEqual(stub._exited, [(None, None, None)])
+
+    def test_admin_stubs_created_on_first_use(self):
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import client as MUT
+
+        scoped_creds = object()
+        credentials = _MockWithAttachedMethods(scoped_creds)
+        client = self._makeOne(credentials, project_id=PROJECT_ID, admin=True)
+        stubs = []
+
+        def mock_make_stub(*args, **kwargs):
+            stubs.append(_FakeStub())
+            return stubs[-1]
+
+        with _Monkey(MUT, make_stub=mock_make_stub,
+                     MetadataTransformer=_MetadataTransformer):
+            client.start()
+            table_stub = client.table_stub
+            self.assertTrue(client.table_stub is table_stub)
+
+        self.assertEqual(len(stubs), 2)
+        data_stub = stubs[0]
+        self.assertTrue(table_stub is stubs[1])
+        self.assertEqual(table_stub._entered, 1)
+        self.assertTrue(client._cluster_stub is None)
+        self.assertTrue(client._operations_stub is None)
+
+        # Only the stubs which were opened are closed.
+        client.stop()
+        self.assertEqual(data_stub._exited, [(None, None, None)])
+        self.assertEqual(table_stub._exited, [(None, None, None)])
+        self.assertTrue(client._table_stub is None)
+
+    def test_admin_stub_created_while_waiting(self):
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+
+        scoped_creds = object()
+        credentials = _MockWithAttachedMethods(scoped_creds)
+        client = self._makeOne(credentials, project_id=PROJECT_ID, admin=True)
+        stub = object()
+        # Another thread creates the stub while the lock is waited for.
+        client._stub_lock = _SettingLock(client, '_cluster_stub', stub)
+        self.assertTrue(client.cluster_stub is stub)
+
     def test_start_while_started(self):
         from gcloud_bigtable._testing import _MockWithAttachedMethods
 
@@ -739,10 +936,16 @@ class TestClient(unittest2.TestCase):
         stub1 = _FakeStub()
         stub2 = _FakeStub()
         client._data_stub = stub1
-        client._cluster_stub = stub2
-        client._operations_stub = stub2
-        client._table_stub = stub2
+        if admin:
+            client._cluster_stub = stub2
+            client._operations_stub = stub2
+            client._table_stub = stub2
+        client._metadata_transformer = transformer = _MetadataTransformer(
+            client)
+        transformer.refreshing = True
         client.stop()
+        self.assertFalse(transformer.refreshing)
+        self.assertTrue(client._metadata_transformer is None)
         self.assertTrue(client._data_stub is None)
         self.assertTrue(client._cluster_stub is None)
         self.assertTrue(client._operations_stub is None)
@@ -931,6 +1134,33 @@ class Test__get_contents(unittest2.TestCase):
         self.assertEqual(self._callFUT(filename), contents)
 
 
+class _MetadataTransformer(object):
+
+    def __init__(self, client):
+        self.client = client
+        self.refreshing = False
+
+    def start_refresher(self):
+        self.refreshing = True
+
+    def stop_refresher(self):
+        self.refreshing = False
+
+
+class _SettingLock(object):
+
+    def __init__(self, client, attr_name, value):
+        self.client = client
+        self.attr_name = attr_name
+        self.value = value
+
+    def __enter__(self):
+        setattr(self.client, self.attr_name, self.value)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
 class _FakeStub(object):
 
     def __init__(self):
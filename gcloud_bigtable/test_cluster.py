@@ -193,6 +193,13 @@ class TestCluster(unittest2.TestCase):
         self.assertTrue(isinstance(table, Table))
         self.assertEqual(table.table_id, table_id)
         self.assertEqual(table._cluster, cluster)
+        self.assertEqual(table._retry_policy, None)
+
+    def test_table_factory_with_retry_policy(self):
+        cluster = self._makeOne(ZONE, CLUSTER_ID, None)
+        retry_policy = object()
+        table = cluster.table('table_id', retry_policy=retry_policy)
+        self.assertTrue(table._retry_policy is retry_policy)
 
     def test_from_pb_success(self):
         from gcloud_bigtable._generated import (
@@ -0,0 +1,265 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest2
+
+
+class TestHotKeyDetector(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.hotspot import HotKeyDetector
+        return HotKeyDetector
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def _record(self, detector, *row_keys):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import hotspot as MUT
+
+        logger = _Logger()
+        with _Monkey(MUT, LOGGER=logger):
+            for row_key in row_keys:
+                detector.record(row_key)
+        return logger.warnings
+
+    def test_constructor_defaults(self):
+        from gcloud_bigtable.hotspot import DEFAULT_DECAY_INTERVAL
+        from gcloud_bigtable.hotspot import DEFAULT_DEPTH
+        from gcloud_bigtable.hotspot import DEFAULT_MIN_WRITES
+        from gcloud_bigtable.hotspot import DEFAULT_NUM_KEYS
+        from gcloud_bigtable.hotspot import DEFAULT_THRESHOLD
+        from gcloud_bigtable.hotspot import DEFAULT_WIDTH
+
+        detector = self._makeOne()
+        self.assertEqual(detector.width, DEFAULT_WIDTH)
+        self.assertEqual(detector.depth, DEFAULT_DEPTH)
+        self.assertEqual(detector.num_keys, DEFAULT_NUM_KEYS)
+        self.assertEqual(detector.prefix_length, None)
+        self.assertEqual(detector.threshold, DEFAULT_THRESHOLD)
+        self.assertEqual(detector.min_writes, DEFAULT_MIN_WRITES)
+        self.assertEqual(detector.decay_interval, DEFAULT_DECAY_INTERVAL)
+        self.assertEqual(len(detector._sketch), DEFAULT_DEPTH)
+        self.assertEqual(len(detector._sketch[0]), DEFAULT_WIDTH)
+        self.assertEqual(detector.total, 0)
+
+    def test_constructor_explicit(self):
+        detector = self._makeOne(width=10, depth=2, num_keys=3,
+                                 prefix_length=4, threshold=None,
+                                 min_writes=5, decay_interval=None)
+        self.assertEqual(detector._sketch, [[0] * 10, [0] * 10])
+        self.assertEqual(detector.num_keys, 3)
+        self.assertEqual(detector.prefix_length, 4)
+        self.assertEqual(detector.threshold, None)
+        self.assertEqual(detector.min_writes, 5)
+        self.assertEqual(detector.decay_interval, None)
+
+    def test_constructor_bad_sizes(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(width=0)
+        with self.assertRaises(ValueError):
+            self._makeOne(depth=0)
+        with self.assertRaises(ValueError):
+            self._makeOne(num_keys=0)
+
+    def test_constructor_bad_prefix_length(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(prefix_length=0)
+
+    def test_constructor_bad_decay_interval(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(decay_interval=0)
+
+    def test_constructor_bad_threshold(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(threshold=0)
+        with self.assertRaises(ValueError):
+            self._makeOne(threshold=1.5)
+
+    def test_hot_keys(self):
+        detector = self._makeOne()
+        self._record(detector, b'a', b'b', b'a', b'c', b'a', b'b')
+        self.assertEqual(detector.total, 6)
+        self.assertEqual(detector.hot_keys(), [
+            (b'a', 3, 0.5),
+            (b'b', 2, 2.0 / 6),
+            (b'c', 1, 1.0 / 6),
+        ])
+        self.assertEqual(detector.hot_keys(limit=1), [(b'a', 3, 0.5)])
+
+    def test_hot_keys_empty(self):
+        detector = self._makeOne()
+        self.assertEqual(detector.hot_keys(), [])
+
+    def test_hot_keys_overestimate(self):
+        # With a single counter per row, every key collides.
+        detector = self._makeOne(width=1, depth=2)
+        self._record(detector, b'a', b'b')
+        self.assertEqual(detector.hot_keys(), [
+            (b'b', 2, 1.0),
+            (b'a', 1, 0.5),
+        ])
+
+    def test_hot_keys_evicts_coldest_candidate(self):
+        detector = self._makeOne(num_keys=2)
+        self._record(detector, b'a', b'a', b'a', b'b', b'b', b'c')
+        # The new key is not hotter than the tracked ones.
+        self.assertEqual([key for key, _, _ in detector.hot_keys()],
+                         [b'a', b'b'])
+        self._record(detector, b'c', b'c')
+        self.assertEqual([key for key, _, _ in detector.hot_keys()],
+                         [b'a', b'c'])
+
+    def test_hot_keys_prefixes(self):
+        detector = self._makeOne(prefix_length=3)
+        self._record(detector, b'abc1', b'abc2', b'xyz1', b'abc', b'ab')
+        # A key as long as the prefix is its own prefix, shorter keys
+        # have none.
+        self.assertEqual(detector.hot_keys(prefixes=True), [
+            (b'abc', 3, 0.6),
+            (b'xyz', 1, 0.2),
+        ])
+        # Keys and prefixes are tracked separately.
+        self.assertEqual(len(detector.hot_keys()), 5)
+
+    def test_record_logs_hot_key_once(self):
+        detector = self._makeOne(threshold=0.5, min_writes=2)
+        # Not enough writes yet.
+        self.assertEqual(self._record(detector, b'a'), [])
+        warnings = self._record(detector, b'a', b'a', b'b')
+        self.assertEqual(warnings, [(
+            'Hot row %s %r: about %d of %d writes (%.1f%%).',
+            ('key', b'a', 2, 2, 100.0),
+        )])
+
+    def test_record_logs_hot_prefix(self):
+        detector = self._makeOne(prefix_length=1, threshold=0.75,
+                                 min_writes=4)
+        warnings = self._record(detector, b'a1', b'a2', b'a3', b'a4')
+        self.assertEqual(warnings, [(
+            'Hot row %s %r: about %d of %d writes (%.1f%%).',
+            ('key prefix', b'a', 4, 4, 100.0),
+        )])
+
+    def test_record_without_threshold(self):
+        detector = self._makeOne(threshold=None, min_writes=0)
+        self.assertEqual(self._record(detector, b'a', b'a'), [])
+
+    def test_decay(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import hotspot as MUT
+
+        fake_time = _FakeTime()
+        with _Monkey(MUT, time=fake_time):
+            detector = self._makeOne(decay_interval=10.0)
+            self._record(detector, *([b'a'] * 8 + [b'b'] * 3 + [b'c']))
+            fake_time.now = 9.0
+            self.assertEqual(detector.hot_keys(), [
+                (b'a', 8, 8.0 / 12),
+                (b'b', 3, 0.25),
+                (b'c', 1, 1.0 / 12),
+            ])
+            # Two intervals have passed: all counts are divided by 4 and
+            # the keys with no writes left are forgotten.
+            fake_time.now = 25.0
+            self.assertEqual(detector.hot_keys(), [(b'a', 2, 2.0 / 3)])
+            self.assertEqual(detector.total, 3)
+            self.assertEqual(max(max(row) for row in detector._sketch), 2)
+            # The next interval starts at 20.0, not at 25.0.
+            fake_time.now = 30.0
+            self._record(detector, b'b')
+            self.assertEqual(detector.total, 2)
+            self.assertEqual(detector.hot_keys(), [
+                (b'a', 1, 0.5),
+                (b'b', 1, 0.5),
+            ])
+
+    def test_decay_disabled(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import hotspot as MUT
+
+        fake_time = _FakeTime()
+        with _Monkey(MUT, time=fake_time):
+            detector = self._makeOne(decay_interval=None)
+            self._record(detector, b'a', b'a')
+            fake_time.now = 3600.0
+            self.assertEqual(detector.hot_keys(), [(b'a', 2, 1.0)])
+
+    def test_decay_logs_hot_key_again(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import hotspot as MUT
+
+        fake_time = _FakeTime()
+        with _Monkey(MUT, time=fake_time):
+            detector = self._makeOne(threshold=0.5, min_writes=2,
+                                     decay_interval=10.0)
+            self.assertEqual(len(self._record(detector, b'a', b'a')), 1)
+            self._record(detector, b'b', b'b', b'b', b'b')
+            fake_time.now = 10.0
+            # Still hot: not logged again.
+            self._record(detector, b'c')
+            self.assertEqual(self._record(detector, b'b', b'b'), [])
+            fake_time.now = 20.0
+            # b'a' cooled down at 10.0, so it is logged again once it is
+            # hot again.
+            warnings = self._record(detector, b'a', b'a', b'a', b'a', b'a')
+            self.assertEqual(len(warnings), 1)
+            self.assertEqual(warnings[0][1][:2], ('key', b'a'))
+
+    def test_reset(self):
+        detector = self._makeOne(threshold=0.5, min_writes=1)
+        self.assertEqual(len(self._record(detector, b'a')), 1)
+        detector.reset()
+        self.assertEqual(detector.total, 0)
+        self.assertEqual(detector.hot_keys(), [])
+        # Hot keys are logged again after a reset.
+        self.assertEqual(len(self._record(detector, b'a')), 1)
+
+
+class Test__record_write(unittest2.TestCase):
+
+    def _callFUT(self, detector, row_key):
+        from gcloud_bigtable.hotspot import _record_write
+        return _record_write(detector, row_key)
+
+    def test_without_detector(self):
+        self.assertEqual(self._callFUT(None, b'row-key'), None)
+
+    def test_with_detector(self):
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+
+        detector = _MockWithAttachedMethods(None)
+        self._callFUT(detector, b'row-key')
+        self.assertEqual(detector._called, [
+            ('record', (b'row-key',), {}),
+        ])
+
+
+class _FakeTime(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+
+class _Logger(object):
+
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, message, *args):
+        self.warnings.append((message, args))
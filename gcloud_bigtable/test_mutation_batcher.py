@@ -0,0 +1,855 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest2
+
+
+TABLE_NAME = 'table_name'
+ROW_KEY1 = b'row_key1'
+ROW_KEY2 = b'row_key2'
+COLUMN_FAMILY_ID = u'column_family_id'
+COLUMN = b'column'
+VALUE = b'value'
+
+
+class Test__now(unittest2.TestCase):
+
+    def _callFUT(self):
+        from gcloud_bigtable.mutation_batcher import _now
+        return _now()
+
+    def test_it(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import mutation_batcher as MUT
+
+        now = 1234.5
+        with _Monkey(MUT.time, time=lambda: now):
+            self.assertEqual(self._callFUT(), now)
+
+
+class TestAdaptiveController(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.mutation_batcher import AdaptiveController
+        return AdaptiveController
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def _record(self, controller, sent_time, latency, success):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import mutation_batcher as MUT
+
+        now = sent_time + latency
+        with _Monkey(MUT, _now=lambda: now):
+            controller.record(sent_time, latency, success)
+
+    def test_constructor_defaults(self):
+        from gcloud_bigtable.mutation_batcher import DEFAULT_DECREASE_FACTOR
+        from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_INFLIGHT
+        from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_MUTATIONS
+
+        controller = self._makeOne(0.25)
+        self.assertEqual(controller.target_latency, 0.25)
+        self.assertEqual(controller.decrease_factor, DEFAULT_DECREASE_FACTOR)
+        self.assertEqual(controller.inflight_limit, DEFAULT_MAX_INFLIGHT)
+        self.assertEqual(controller.mutation_limit, DEFAULT_MAX_MUTATIONS)
+        self.assertEqual(controller._last_decrease_time, None)
+
+    def test_constructor_explicit(self):
+        controller = self._makeOne(1.0, min_inflight=20, max_inflight=50,
+                                   min_mutations=10, max_mutations=500,
+                                   inflight_increment=2,
+                                   mutations_increment=50,
+                                   decrease_factor=0.75)
+        self.assertEqual(controller.min_inflight, 20)
+        self.assertEqual(controller.max_inflight, 50)
+        self.assertEqual(controller.min_mutations, 10)
+        self.assertEqual(controller.max_mutations, 500)
+        self.assertEqual(controller.inflight_increment, 2)
+        self.assertEqual(controller.mutations_increment, 50)
+        self.assertEqual(controller.decrease_factor, 0.75)
+        # The initial limits are kept within the bounds.
+        self.assertEqual(controller.inflight_limit, 20)
+        self.assertEqual(controller.mutation_limit, 500)
+
+    def test_constructor_bad_values(self):
+        bad_kwargs = [
+            {'target_latency': 0},
+            {'min_inflight': 0},
+            {'min_inflight': 5, 'max_inflight': 4},
+            {'min_mutations': 0},
+            {'min_mutations': 5, 'max_mutations': 4},
+            {'inflight_increment': 0},
+            {'mutations_increment': 0},
+            {'decrease_factor': 1},
+        ]
+        for kwargs in bad_kwargs:
+            kwargs.setdefault('target_latency', 1.0)
+            with self.assertRaises(ValueError):
+                self._makeOne(**kwargs)
+
+    def test_record_additive_increase(self):
+        controller = self._makeOne(1.0, max_inflight=11, max_mutations=1200)
+        # One round of requests (as many as the limit) grows each limit by
+        # about one increment.
+        for _ in range(10):
+            self._record(controller, 0.0, 0.5, True)
+        self.assertEqual(controller.inflight_limit, 10)
+        self.assertTrue(10.9 < controller._inflight_limit < 11)
+        self.assertTrue(1090 < controller._mutation_limit < 1100)
+        # The limits don't exceed the upper bounds.
+        for _ in range(100):
+            self._record(controller, 0.0, 0.5, True)
+        self.assertEqual(controller.inflight_limit, 11)
+        self.assertEqual(controller.mutation_limit, 1200)
+
+    def test_record_latency_spike(self):
+        controller = self._makeOne(1.0)
+        self._record(controller, 10.0, 1.5, True)
+        self.assertEqual(controller.inflight_limit, 5)
+        self.assertEqual(controller.mutation_limit, 500)
+        self.assertEqual(controller._last_decrease_time, 11.5)
+
+    def test_record_failure(self):
+        controller = self._makeOne(1.0, min_inflight=8, min_mutations=600)
+        self._record(controller, 10.0, 0.1, False)
+        # The limits don't go below the lower bounds.
+        self.assertEqual(controller.inflight_limit, 8)
+        self.assertEqual(controller.mutation_limit, 600)
+
+    def test_record_one_decrease_per_round(self):
+        controller = self._makeOne(1.0)
+        self._record(controller, 10.0, 0.1, False)
+        self.assertEqual(controller.inflight_limit, 5)
+        # Requests sent before the decrease don't decrease the limits again.
+        self._record(controller, 9.5, 0.7, False)
+        self.assertEqual(controller.inflight_limit, 5)
+        self._record(controller, 10.5, 0.1, False)
+        self.assertEqual(controller.inflight_limit, 2)
+
+
+class TestMutationBatcher(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.mutation_batcher import MutationBatcher
+        return MutationBatcher
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def _makeRow(self, row_key, table, num_cells=1, timestamp=None):
+        from gcloud_bigtable.row import Row
+
+        row = Row(row_key, table)
+        for _ in range(num_cells):
+            row.set_cell(COLUMN_FAMILY_ID, COLUMN, VALUE,
+                         timestamp=timestamp)
+        return row
+
+    def _makeRequest(self, row_key, num_cells=1):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+
+        mutation = data_pb2.Mutation(
+            set_cell=data_pb2.Mutation.SetCell(
+                family_name=COLUMN_FAMILY_ID,
+                column_qualifier=COLUMN,
+                timestamp_micros=-1,  # Default value.
+                value=VALUE,
+            ),
+        )
+        return messages_pb2.MutateRowRequest(
+            table_name=TABLE_NAME,
+            row_key=row_key,
+            mutations=[mutation] * num_cells,
+        )
+
+    def test_constructor_defaults(self):
+        from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_BYTES
+        from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_INFLIGHT
+        from gcloud_bigtable.mutation_batcher import DEFAULT_MAX_MUTATIONS
+
+        timeout_seconds = 7
+        table = _Table(TABLE_NAME, timeout_seconds=timeout_seconds)
+        batcher = self._makeOne(table)
+        self.assertTrue(batcher._table is table)
+        self.assertEqual(batcher._table_name, TABLE_NAME)
+        self.assertEqual(batcher._max_mutations, DEFAULT_MAX_MUTATIONS)
+        self.assertEqual(batcher._max_bytes, DEFAULT_MAX_BYTES)
+        self.assertEqual(batcher._max_inflight, DEFAULT_MAX_INFLIGHT)
+        self.assertEqual(batcher._timeout_seconds, timeout_seconds)
+        self.assertEqual(batcher._retry_policy, None)
+        self.assertEqual(batcher._coalesce, False)
+        self.assertEqual(batcher._priority, 'batch')
+        self.assertEqual(batcher._controller, None)
+        self.assertEqual(batcher._spool, None)
+        self.assertEqual(batcher._row_mutations, {})
+        self.assertEqual(batcher._mutation_count, 0)
+        self.assertEqual(batcher._byte_count, 0)
+        self.assertEqual(list(batcher._inflight), [])
+        self.assertEqual(batcher._errors, [])
+
+    def test_constructor_explicit(self):
+        table = _Table(TABLE_NAME, timeout_seconds=7)
+        max_mutations = 10
+        max_bytes = 1000
+        max_inflight = 4
+        timeout_seconds = 11
+        retry_policy = object()
+        batcher = self._makeOne(table, max_mutations=max_mutations,
+                                max_bytes=max_bytes,
+                                max_inflight=max_inflight,
+                                timeout_seconds=timeout_seconds,
+                                retry_policy=retry_policy,
+                                coalesce=True, priority='interactive')
+        self.assertTrue(batcher._retry_policy is retry_policy)
+        self.assertEqual(batcher._coalesce, True)
+        self.assertEqual(batcher._priority, 'interactive')
+        self.assertEqual(batcher._max_mutations, max_mutations)
+        self.assertEqual(batcher._max_bytes, max_bytes)
+        self.assertEqual(batcher._max_inflight, max_inflight)
+        self.assertEqual(batcher._timeout_seconds, timeout_seconds)
+
+    def test_constructor_bad_max_mutations(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(None, max_mutations=0)
+
+    def test_constructor_bad_max_bytes(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(None, max_bytes=0)
+
+    def test_constructor_bad_max_inflight(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(None, max_inflight=0)
+
+    def test_constructor_table_retry_policy(self):
+        retry_policy = object()
+        table = _Table(TABLE_NAME, retry_policy=retry_policy)
+        batcher = self._makeOne(table)
+        self.assertTrue(batcher._retry_policy is retry_policy)
+
+    def test_table_getter(self):
+        table = _Table(TABLE_NAME)
+        batcher = self._makeOne(table)
+        self.assertTrue(batcher.table is table)
+
+    def test_mutate_empty_row(self):
+        table = _Table(TABLE_NAME)
+        batcher = self._makeOne(table)
+        row = self._makeRow(ROW_KEY1, table, num_cells=0)
+        batcher.mutate(row)
+        self.assertEqual(batcher._row_mutations, {})
+        self.assertEqual(batcher._mutation_count, 0)
+
+    def test_mutate_row_with_filter(self):
+        from gcloud_bigtable.row import Row
+
+        table = _Table(TABLE_NAME)
+        batcher = self._makeOne(table)
+        row = Row(ROW_KEY1, table, filter_=object())
+        with self.assertRaises(ValueError):
+            batcher.mutate(row)
+
+    def test_mutate_too_many_mutations(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import mutation_batcher as MUT
+
+        table = _Table(TABLE_NAME)
+        batcher = self._makeOne(table)
+        row = self._makeRow(ROW_KEY1, table, num_cells=2)
+        with _Monkey(MUT, _MAX_MUTATIONS=1):
+            with self.assertRaises(ValueError):
+                batcher.mutate(row)
+
+    def test_mutate_buffers(self):
+        table = _Table(TABLE_NAME)
+        batcher = self._makeOne(table)
+        row1 = self._makeRow(ROW_KEY1, table)
+        row2 = self._makeRow(ROW_KEY2, table)
+        mutation1, = row1._pb_mutations
+        mutation2, = row2._pb_mutations
+
+        batcher.mutate(row1)
+        batcher.mutate(row2)
+        batcher.mutate(row2)  # No mutations the second time.
+
+        self.assertEqual(list(batcher._row_mutations.items()), [
+            (ROW_KEY1, [mutation1]),
+            (ROW_KEY2, [mutation2]),
+        ])
+        self.assertEqual(batcher._mutation_count, 2)
+        self.assertEqual(batcher._byte_count,
+                         mutation1.ByteSize() + mutation2.ByteSize())
+        self.assertEqual(list(row1._pb_mutations), [])
+        self.assertEqual(list(row2._pb_mutations), [])
+        self.assertEqual(list(batcher._inflight), [])
+
+    def test_mutate_same_row_key(self):
+        table = _Table(TABLE_NAME)
+        batcher = self._makeOne(table)
+        row1 = self._makeRow(ROW_KEY1, table)
+        row2 = self._makeRow(ROW_KEY1, table)
+        mutation1, = row1._pb_mutations
+        mutation2, = row2._pb_mutations
+
+        batcher.mutate(row1)
+        batcher.mutate(row2)
+        self.assertEqual(list(batcher._row_mutations.items()), [
+            (ROW_KEY1, [mutation1, mutation2]),
+        ])
+
+    def test_mutate_row_key_would_exceed_max(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import mutation_batcher as MUT
+
+        client = _Client()
+        client.data_stub = stub = StubMock(empty_pb2.Empty())
+        timeout_seconds = 13
+        table = _Table(TABLE_NAME, client=client,
+                       timeout_seconds=timeout_seconds)
+        batcher = self._makeOne(table)
+
+        row = self._makeRow(ROW_KEY1, table)
+        batcher.mutate(row)
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, VALUE)
+        with _Monkey(MUT, _MAX_MUTATIONS=1):
+            batcher.mutate(row)
+
+        request_pb = self._makeRequest(ROW_KEY1)
+        self.assertEqual(stub.method_calls, [(
+            'MutateRow',
+            (request_pb, timeout_seconds),
+            {},
+        )])
+        self.assertEqual(len(batcher._row_mutations[ROW_KEY1]), 1)
+        self.assertEqual(batcher._mutation_count, 1)
+
+    def _mutate_send_helper(self, **kwargs):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        response_pb = empty_pb2.Empty()
+        client.data_stub = stub = StubMock(response_pb, response_pb)
+        timeout_seconds = 13
+        table = _Table(TABLE_NAME, client=client,
+                       timeout_seconds=timeout_seconds)
+        batcher = self._makeOne(table, **kwargs)
+
+        batcher.mutate(self._makeRow(ROW_KEY1, table))
+        self.assertEqual(stub.method_calls, [])
+        batcher.mutate(self._makeRow(ROW_KEY2, table))
+
+        expected_calls = [(
+            'MutateRow',
+            (self._makeRequest(row_key), timeout_seconds),
+            {},
+        ) for row_key in (ROW_KEY1, ROW_KEY2)]
+        self.assertEqual(stub.method_calls, expected_calls)
+        self.assertEqual(batcher._row_mutations, {})
+        self.assertEqual(batcher._mutation_count, 0)
+        self.assertEqual(batcher._byte_count, 0)
+        self.assertEqual(len(batcher._inflight), 2)
+
+    def test_mutate_max_mutations(self):
+        self._mutate_send_helper(max_mutations=2)
+
+    def test_mutate_max_bytes(self):
+        row = self._makeRow(ROW_KEY1, None)
+        mutation, = row._pb_mutations
+        max_bytes = 2 * mutation.ByteSize()
+        self._mutate_send_helper(max_bytes=max_bytes)
+
+    def test_send_max_inflight(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        error = RuntimeError('Failed')
+        client.data_stub = stub = StubMock(error, empty_pb2.Empty())
+        table = _Table(TABLE_NAME, client=client)
+        batcher = self._makeOne(table, max_inflight=1)
+
+        batcher.mutate(self._makeRow(ROW_KEY1, table))
+        batcher.mutate(self._makeRow(ROW_KEY2, table))
+        batcher._send()
+        self.assertEqual(len(stub.method_calls), 2)
+        # The first request was waited on before the second was sent.
+        self.assertEqual(len(batcher._inflight), 1)
+        self.assertEqual(batcher._errors, [(ROW_KEY1, error)])
+
+    def test_flush(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        error = RuntimeError('Failed')
+        client.data_stub = stub = StubMock(empty_pb2.Empty(), error)
+        table = _Table(TABLE_NAME, client=client)
+        batcher = self._makeOne(table)
+
+        batcher.mutate(self._makeRow(ROW_KEY1, table))
+        batcher.mutate(self._makeRow(ROW_KEY2, table))
+        self.assertEqual(stub.method_calls, [])
+
+        result = batcher.flush()
+        self.assertEqual(result, [(ROW_KEY2, error)])
+        self.assertEqual(len(stub.method_calls), 2)
+        self.assertEqual(list(batcher._inflight), [])
+        self.assertEqual(batcher._errors, [])
+        # Errors are only reported once.
+        self.assertEqual(batcher.flush(), [])
+
+    def test_flush_coalesce(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = stub = StubMock(empty_pb2.Empty())
+        timeout_seconds = 13
+        table = _Table(TABLE_NAME, client=client,
+                       timeout_seconds=timeout_seconds)
+        batcher = self._makeOne(table, coalesce=True)
+
+        # Server-timestamp writes of the same column collapse to the last.
+        batcher.mutate(self._makeRow(ROW_KEY1, table, num_cells=3))
+        self.assertEqual(batcher._mutation_count, 3)
+        self.assertEqual(batcher.flush(), [])
+        self.assertEqual(stub.method_calls, [(
+            'MutateRow',
+            (self._makeRequest(ROW_KEY1), timeout_seconds),
+            {},
+        )])
+
+    def test_flush_with_rate_limiter(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = StubMock(empty_pb2.Empty())
+        client.rate_limiter = rate_limiter = _RateLimiter()
+        table = _Table(TABLE_NAME, client=client)
+        batcher = self._makeOne(table)
+
+        batcher.mutate(self._makeRow(ROW_KEY1, table))
+        self.assertEqual(batcher.flush(), [])
+        request_pb = self._makeRequest(ROW_KEY1)
+        self.assertEqual(rate_limiter.acquires,
+                         [('write', request_pb.ByteSize(), 'batch')])
+
+    def test_flush_with_hotspot_detector(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = StubMock(empty_pb2.Empty(), empty_pb2.Empty())
+        client.hotspot_detector = hotspot_detector = _HotspotDetector()
+        table = _Table(TABLE_NAME, client=client)
+        batcher = self._makeOne(table)
+
+        batcher.mutate(self._makeRow(ROW_KEY1, table))
+        batcher.mutate(self._makeRow(ROW_KEY2, table))
+        self.assertEqual(batcher.flush(), [])
+        self.assertEqual(sorted(hotspot_detector.row_keys),
+                         [ROW_KEY1, ROW_KEY2])
+
+    def test_mutate_with_controller(self):
+        controller = _MockController(mutation_limit=2, inflight_limit=2)
+        self._mutate_send_helper(max_mutations=100, controller=controller)
+
+    def test_flush_with_controller(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import mutation_batcher as MUT
+
+        client = _Client()
+        error = RuntimeError('Failed')
+        client.data_stub = stub = StubMock(empty_pb2.Empty(), error)
+        table = _Table(TABLE_NAME, client=client)
+        controller = _MockController(mutation_limit=100, inflight_limit=1)
+        batcher = self._makeOne(table, max_inflight=100,
+                                controller=controller)
+
+        batcher.mutate(self._makeRow(ROW_KEY1, table))
+        batcher.mutate(self._makeRow(ROW_KEY2, table))
+        times = [1.0, 1.5, 2.0, 4.0]
+        with _Monkey(MUT, _now=lambda: times.pop(0)):
+            self.assertEqual(batcher.flush(), [(ROW_KEY2, error)])
+        self.assertEqual(len(stub.method_calls), 2)
+        # The first request was waited on before the second was sent.
+        self.assertEqual(controller.records,
+                         [(1.0, 0.5, True), (2.0, 2.0, False)])
+
+    def test_flush_with_controller_excludes_idle_time(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import mutation_batcher as MUT
+
+        client = _Client()
+        client.data_stub = StubMock(empty_pb2.Empty(), empty_pb2.Empty())
+        table = _Table(TABLE_NAME, client=client)
+        controller = _MockController(mutation_limit=100, inflight_limit=10)
+        batcher = self._makeOne(table, controller=controller)
+
+        batcher.mutate(self._makeRow(ROW_KEY1, table))
+        batcher.mutate(self._makeRow(ROW_KEY2, table))
+        # Both requests complete right away, but are only waited on later.
+        times = [1.0, 1.25, 2.0, 2.5]
+        with _Monkey(MUT, _now=lambda: times.pop(0)):
+            batcher._send()
+        self.assertEqual(times, [])
+        self.assertEqual(batcher.flush(), [])
+        self.assertEqual(controller.records,
+                         [(1.0, 0.25, True), (2.0, 0.5, True)])
+
+    def test_flush_with_controller_callbacks_after_send(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import mutation_batcher as MUT
+
+        client = _Client()
+        client.data_stub = stub = _DeferredStub()
+        table = _Table(TABLE_NAME, client=client)
+        controller = _MockController(mutation_limit=100, inflight_limit=10)
+        batcher = self._makeOne(table, controller=controller)
+
+        row_keys = [ROW_KEY1, ROW_KEY2, b'row_key3']
+        for row_key in row_keys:
+            batcher.mutate(self._makeRow(row_key, table))
+        times = [1.0, 2.0, 3.0]
+        with _Monkey(MUT, _now=lambda: times.pop(0)):
+            batcher._send()
+        futures = {future.request_pb.row_key: future
+                   for future in stub.futures}
+        self.assertEqual(sorted(futures), sorted(row_keys))
+
+        # The requests complete (in reverse order) after every row was
+        # sent, so each completion time must go to its own request.
+        times = [10.0, 20.0, 30.0]
+        with _Monkey(MUT, _now=lambda: times.pop(0)):
+            for row_key in reversed(row_keys):
+                futures[row_key].complete()
+        self.assertEqual(batcher.flush(), [])
+        done_times = dict(zip(reversed(row_keys), [10.0, 20.0, 30.0]))
+        # Requests are waited on (and recorded) in the order sent.
+        expected_records = [
+            (sent_time, done_times[future.request_pb.row_key] - sent_time,
+             True)
+            for sent_time, future in zip([1.0, 2.0, 3.0], stub.futures)]
+        self.assertEqual(controller.records, expected_records)
+
+    def test__wait_for_oldest_before_done_callback(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import AsyncResult
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import mutation_batcher as MUT
+
+        client = _Client()
+        table = _Table(TABLE_NAME, client=client)
+        controller = _MockController(mutation_limit=100, inflight_limit=10)
+        batcher = self._makeOne(table, controller=controller)
+        request_pb = self._makeRequest(ROW_KEY1)
+        future = AsyncResult(empty_pb2.Empty())
+        batcher._inflight.append((ROW_KEY1, request_pb, future, 1.0, []))
+
+        with _Monkey(MUT, _now=lambda: 3.0):
+            batcher._wait_for_oldest()
+        # The completion time is not known yet, so it is now.
+        self.assertEqual(controller.records, [(1.0, 2.0, True)])
+
+    def _flush_retry_helper(self, results, retryable=True,
+                            explicit_timestamp=True):
+        import datetime
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable._helpers import EPOCH
+
+        timestamp = None
+        if explicit_timestamp:
+            timestamp = EPOCH + datetime.timedelta(seconds=1)
+        client = _Client()
+        client.data_stub = stub = StubMock(*results)
+        table = _Table(TABLE_NAME, client=client)
+        retry_policy = _RetryPolicy(retryable)
+        batcher = self._makeOne(table, retry_policy=retry_policy)
+
+        batcher.mutate(self._makeRow(ROW_KEY1, table, timestamp=timestamp))
+        errors = batcher.flush()
+        return errors, stub, retry_policy
+
+    def test_flush_retry_success(self):
+        from gcloud_bigtable._generated import empty_pb2
+
+        results = [RuntimeError('Failed'), empty_pb2.Empty()]
+        errors, stub, retry_policy = self._flush_retry_helper(results)
+        self.assertEqual(errors, [])
+        self.assertEqual(len(stub.method_calls), 2)
+        self.assertEqual(stub.method_calls[0], stub.method_calls[1])
+        self.assertEqual(retry_policy.calls, 1)
+
+    def test_flush_retry_failure(self):
+        error = RuntimeError('Failed again')
+        results = [RuntimeError('Failed'), error]
+        errors, stub, retry_policy = self._flush_retry_helper(results)
+        self.assertEqual(errors, [(ROW_KEY1, error)])
+        self.assertEqual(len(stub.method_calls), 2)
+        self.assertEqual(retry_policy.calls, 1)
+
+    def test_flush_not_retryable(self):
+        error = RuntimeError('Failed')
+        errors, stub, retry_policy = self._flush_retry_helper(
+            [error], retryable=False)
+        self.assertEqual(errors, [(ROW_KEY1, error)])
+        self.assertEqual(len(stub.method_calls), 1)
+        self.assertEqual(retry_policy.calls, 0)
+
+    def test_flush_not_idempotent(self):
+        error = RuntimeError('Failed')
+        errors, stub, retry_policy = self._flush_retry_helper(
+            [error], explicit_timestamp=False)
+        self.assertEqual(errors, [(ROW_KEY1, error)])
+        self.assertEqual(len(stub.method_calls), 1)
+        self.assertEqual(retry_policy.calls, 0)
+
+    def _flush_spool_helper(self, retryable, explicit_timestamp=True):
+        import datetime
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable._helpers import EPOCH
+
+        client = _Client()
+        error = RuntimeError('Failed')
+        client.data_stub = StubMock(error)
+        table = _Table(TABLE_NAME, client=client)
+        spool = _Spool(retryable=retryable)
+        batcher = self._makeOne(table, spool=spool)
+        self.assertTrue(batcher._spool is spool)
+
+        timestamp = None
+        if explicit_timestamp:
+            timestamp = EPOCH + datetime.timedelta(seconds=1)
+        row = self._makeRow(ROW_KEY1, table, timestamp=timestamp)
+        self.request_pb = self._makeRequest(ROW_KEY1)
+        self.request_pb.mutations[0].CopyFrom(row._pb_mutations[0])
+        batcher.mutate(row)
+        return batcher.flush(), error, spool
+
+    def test_flush_spool(self):
+        errors, _, spool = self._flush_spool_helper(True)
+        self.assertEqual(errors, [])
+        self.assertEqual(spool.requests, [self.request_pb])
+
+    def test_flush_spool_not_idempotent(self):
+        errors, error, spool = self._flush_spool_helper(
+            True, explicit_timestamp=False)
+        self.assertEqual(errors, [(ROW_KEY1, error)])
+        self.assertEqual(spool.requests, [])
+
+    def test_flush_spool_not_retryable(self):
+        errors, error, spool = self._flush_spool_helper(False)
+        self.assertEqual(errors, [(ROW_KEY1, error)])
+        self.assertEqual(spool.requests, [])
+
+    def test_flush_spool_pending_row(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = stub = StubMock(empty_pb2.Empty())
+        table = _Table(TABLE_NAME, client=client)
+        spool = _Spool(pending_rows=[ROW_KEY1])
+        batcher = self._makeOne(table, spool=spool)
+
+        batcher.mutate(self._makeRow(ROW_KEY1, table))
+        batcher.mutate(self._makeRow(ROW_KEY2, table))
+        self.assertEqual(batcher.flush(), [])
+        # The row with spooled requests is queued behind them.
+        self.assertEqual(spool.requests, [self._makeRequest(ROW_KEY1)])
+        self.assertEqual(stub.method_calls, [
+            ('MutateRow', (self._makeRequest(ROW_KEY2), None), {}),
+        ])
+
+    def test_context_manager(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = stub = StubMock(empty_pb2.Empty())
+        timeout_seconds = 13
+        table = _Table(TABLE_NAME, client=client,
+                       timeout_seconds=timeout_seconds)
+        batcher = self._makeOne(table)
+
+        with batcher as entered:
+            self.assertTrue(entered is batcher)
+            batcher.mutate(self._makeRow(ROW_KEY1, table))
+            self.assertEqual(stub.method_calls, [])
+
+        self.assertEqual(stub.method_calls, [(
+            'MutateRow',
+            (self._makeRequest(ROW_KEY1), timeout_seconds),
+            {},
+        )])
+        self.assertEqual(list(batcher._inflight), [])
+
+    def test_context_manager_failure(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable.mutation_batcher import MutationBatchError
+
+        client = _Client()
+        error = RuntimeError('Failed')
+        client.data_stub = StubMock(empty_pb2.Empty(), error)
+        table = _Table(TABLE_NAME, client=client)
+
+        with self.assertRaises(MutationBatchError) as exc_info:
+            with self._makeOne(table) as batcher:
+                batcher.mutate(self._makeRow(ROW_KEY1, table))
+                batcher.mutate(self._makeRow(ROW_KEY2, table))
+        self.assertEqual(exc_info.exception.errors, [(ROW_KEY2, error)])
+        self.assertEqual(exc_info.exception.row_keys, [ROW_KEY2])
+
+    def test_context_manager_failure_with_exception(self):
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = stub = StubMock(RuntimeError('Failed'))
+        table = _Table(TABLE_NAME, client=client)
+
+        # The propagating exception is not replaced by the failed rows.
+        with self.assertRaises(KeyError):
+            with self._makeOne(table) as batcher:
+                batcher.mutate(self._makeRow(ROW_KEY1, table))
+                raise KeyError(ROW_KEY1)
+        self.assertEqual(len(stub.method_calls), 1)
+
+
+class _RetryPolicy(object):
+
+    def __init__(self, retryable):
+        self.retryable = retryable
+        self.calls = 0
+
+    def call(self, func, *args, **kwargs):
+        self.calls += 1
+        return func(*args, **kwargs)
+
+    def retry(self, exc, start, func, *args, **kwargs):
+        if not self.retryable:
+            raise exc
+        return self.call(func, *args, **kwargs)
+
+
+class _Client(object):
+
+    data_stub = None
+    rate_limiter = None
+    hotspot_detector = None
+
+
+class _Table(object):
+
+    def __init__(self, name, client=None, timeout_seconds=None,
+                 retry_policy=None):
+        self.name = name
+        self.client = client
+        self.timeout_seconds = timeout_seconds
+        self.retry_policy = retry_policy
+
+
+class _RateLimiter(object):
+
+    def __init__(self):
+        self.acquires = []
+
+    def acquire(self, kind, num_bytes=0, priority=None):
+        self.acquires.append((kind, num_bytes, priority))
+
+
+class _MockController(object):
+
+    def __init__(self, mutation_limit, inflight_limit=1):
+        self.mutation_limit = mutation_limit
+        self.inflight_limit = inflight_limit
+        self.records = []
+
+    def record(self, sent_time, latency, success):
+        self.records.append((sent_time, latency, success))
+
+
+class _Spool(object):
+
+    def __init__(self, retryable=True, pending_rows=()):
+        self.retryable = retryable
+        self.pending_rows = pending_rows
+        self.requests = []
+
+    def has_pending(self, row_key):
+        return row_key in self.pending_rows
+
+    def is_retryable(self, exc):
+        return self.retryable
+
+    def append(self, request_pb):
+        self.requests.append(request_pb)
+
+
+class _DeferredFuture(object):
+
+    def __init__(self, request_pb):
+        from gcloud_bigtable._generated import empty_pb2
+        self.request_pb = request_pb
+        self.response_pb = empty_pb2.Empty()
+        self.callbacks = []
+
+    def add_done_callback(self, func):
+        self.callbacks.append(func)
+
+    def complete(self):
+        for func in self.callbacks:
+            func(self)
+
+    def result(self):
+        return self.response_pb
+
+
+class _DeferredMethod(object):
+
+    def __init__(self, stub):
+        self.stub = stub
+
+    def async(self, request_pb, timeout_seconds):
+        future = _DeferredFuture(request_pb)
+        self.stub.futures.append(future)
+        return future
+
+
+class _DeferredStub(object):
+
+    def __init__(self):
+        self.futures = []
+        self.MutateRow = _DeferredMethod(self)
+
+
+class _HotspotDetector(object):
+
+    def __init__(self):
+        self.row_keys = []
+
+    def record(self, row_key):
+        self.row_keys.append(row_key)
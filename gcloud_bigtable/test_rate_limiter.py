@@ -0,0 +1,270 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest2
+
+
+class TestTokenBucket(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.rate_limiter import TokenBucket
+        return TokenBucket
+
+    def _makeOne(self, *args, **kwargs):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import rate_limiter as MUT
+
+        self.fake_time = _FakeTime()
+        with _Monkey(MUT, time=self.fake_time):
+            return self._getTargetClass()(*args, **kwargs)
+
+    def _reserve(self, bucket, tokens):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import rate_limiter as MUT
+
+        with _Monkey(MUT, time=self.fake_time):
+            return bucket.reserve(tokens)
+
+    def test_constructor_defaults(self):
+        rate = 10.0
+        bucket = self._makeOne(rate)
+        self.assertEqual(bucket.rate, rate)
+        self.assertEqual(bucket.capacity, rate)
+        self.assertEqual(bucket._tokens, rate)
+        self.assertEqual(bucket._last_refill, self.fake_time.now)
+
+    def test_constructor_explicit(self):
+        rate = 10.0
+        capacity = 25.0
+        bucket = self._makeOne(rate, capacity=capacity)
+        self.assertEqual(bucket.rate, rate)
+        self.assertEqual(bucket.capacity, capacity)
+        self.assertEqual(bucket._tokens, capacity)
+
+    def test_constructor_bad_rate(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(0)
+
+    def test_constructor_bad_capacity(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(1.0, capacity=0)
+
+    def test_reserve_available(self):
+        bucket = self._makeOne(10.0)
+        self.assertEqual(self._reserve(bucket, 4), 0.0)
+        self.assertEqual(self._reserve(bucket, 6), 0.0)
+        self.assertEqual(bucket._tokens, 0.0)
+
+    def test_reserve_wait(self):
+        bucket = self._makeOne(10.0)
+        self.assertEqual(self._reserve(bucket, 10), 0.0)
+        # The bucket is empty, so 5 tokens take half a second.
+        self.assertEqual(self._reserve(bucket, 5), 0.5)
+        # Later callers wait for earlier ones.
+        self.assertEqual(self._reserve(bucket, 5), 1.0)
+        self.assertEqual(bucket._tokens, -10.0)
+
+    def test_reserve_refill(self):
+        bucket = self._makeOne(10.0)
+        self.assertEqual(self._reserve(bucket, 10), 0.0)
+        self.fake_time.now += 0.5
+        self.assertEqual(self._reserve(bucket, 5), 0.0)
+        # The bucket never holds more than its capacity.
+        self.fake_time.now += 100.0
+        self.assertEqual(self._reserve(bucket, 0), 0.0)
+        self.assertEqual(bucket._tokens, 10.0)
+
+    def test_reserve_more_than_capacity(self):
+        bucket = self._makeOne(10.0)
+        # A full bucket allows a single large request.
+        self.assertEqual(self._reserve(bucket, 30), 0.0)
+        self.assertEqual(bucket._tokens, -20.0)
+        self.assertEqual(self._reserve(bucket, 1), 2.1)
+
+
+class TestRateLimiter(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.rate_limiter import RateLimiter
+        return RateLimiter
+
+    def _makeOne(self, *args, **kwargs):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import rate_limiter as MUT
+
+        self.fake_time = _FakeTime()
+        with _Monkey(MUT, time=self.fake_time):
+            return self._getTargetClass()(*args, **kwargs)
+
+    def _acquire(self, rate_limiter, *args, **kwargs):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import rate_limiter as MUT
+
+        with _Monkey(MUT, time=self.fake_time):
+            rate_limiter.acquire(*args, **kwargs)
+
+    def test_constructor_defaults(self):
+        from gcloud_bigtable.rate_limiter import DEFAULT_BATCH_SHARE
+
+        rate_limiter = self._makeOne()
+        self.assertEqual(rate_limiter.batch_share, DEFAULT_BATCH_SHARE)
+        self.assertEqual(rate_limiter._buckets, {})
+
+    def test_constructor_explicit(self):
+        rate_limiter = self._makeOne(read_qps=100, read_bytes_per_second=1000,
+                                     write_qps=10, write_bytes_per_second=500,
+                                     batch_share=0.25)
+        self.assertEqual(rate_limiter.batch_share, 0.25)
+        rates = dict((key, (all_bucket.rate, batch_bucket.rate))
+                     for key, (all_bucket, batch_bucket)
+                     in rate_limiter._buckets.items())
+        self.assertEqual(rates, {
+            ('read', 'requests'): (100, 25),
+            ('read', 'bytes'): (1000, 250),
+            ('write', 'requests'): (10, 2.5),
+            ('write', 'bytes'): (500, 125),
+        })
+
+    def test_constructor_bad_batch_share(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(batch_share=0)
+        with self.assertRaises(ValueError):
+            self._makeOne(batch_share=1.5)
+
+    def test_constructor_bad_budget(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(write_qps=0)
+
+    def test_acquire_unlimited(self):
+        rate_limiter = self._makeOne()
+        for _ in range(100):
+            self._acquire(rate_limiter, 'write', num_bytes=1000)
+        self.assertEqual(self.fake_time.sleeps, [])
+
+    def test_acquire_qps(self):
+        rate_limiter = self._makeOne(read_qps=2)
+        for _ in range(3):
+            self._acquire(rate_limiter, 'read')
+        self.assertEqual(self.fake_time.sleeps, [0.5])
+        # Writes are budgeted separately.
+        self._acquire(rate_limiter, 'write')
+        self.assertEqual(self.fake_time.sleeps, [0.5])
+
+    def test_acquire_bytes(self):
+        rate_limiter = self._makeOne(write_bytes_per_second=100)
+        self._acquire(rate_limiter, 'write', num_bytes=100)
+        self._acquire(rate_limiter, 'write', num_bytes=50)
+        self.assertEqual(self.fake_time.sleeps, [0.5])
+
+    def test_acquire_batch_lane(self):
+        rate_limiter = self._makeOne(write_qps=4, batch_share=0.5)
+        # The batch lane gets half of the budget.
+        self._acquire(rate_limiter, 'write', priority='batch')
+        self._acquire(rate_limiter, 'write', priority='batch')
+        self.assertEqual(self.fake_time.sleeps, [])
+        self._acquire(rate_limiter, 'write', priority='batch')
+        self.assertEqual(self.fake_time.sleeps, [0.5])
+
+    def test_acquire_batch_lane_waits_before_taking_from_all(self):
+        rate_limiter = self._makeOne(write_qps=4, batch_share=0.5)
+        all_bucket, _ = rate_limiter._buckets['write', 'requests']
+        for _ in range(3):
+            self._acquire(rate_limiter, 'write', priority='batch')
+        self.assertEqual(self.fake_time.sleeps, [0.5])
+        # The third request only took from the budget for all requests once
+        # its lane had the tokens (after the budget was refilled), so the
+        # batch lane never puts that budget into debt.
+        self.assertEqual(all_bucket._tokens, 3.0)
+
+    def test_acquire_interactive_lane(self):
+        rate_limiter = self._makeOne(write_qps=4, batch_share=0.5)
+        self._acquire(rate_limiter, 'write', priority='batch')
+        self._acquire(rate_limiter, 'write', priority='batch')
+        # The rest of the budget is still available to interactive requests.
+        self._acquire(rate_limiter, 'write')
+        self._acquire(rate_limiter, 'write')
+        self.assertEqual(self.fake_time.sleeps, [])
+
+    def test_acquire_bad_kind(self):
+        rate_limiter = self._makeOne()
+        with self.assertRaises(ValueError):
+            self._acquire(rate_limiter, 'delete')
+
+    def test_acquire_bad_priority(self):
+        rate_limiter = self._makeOne()
+        with self.assertRaises(ValueError):
+            self._acquire(rate_limiter, 'read', priority='urgent')
+
+    def test_charge(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import rate_limiter as MUT
+
+        rate_limiter = self._makeOne(read_bytes_per_second=100)
+        with _Monkey(MUT, time=self.fake_time):
+            rate_limiter.charge('read', 300)
+        # Charging never waits, but later requests wait for the debt.
+        self.assertEqual(self.fake_time.sleeps, [])
+        self._acquire(rate_limiter, 'read')
+        self.assertEqual(self.fake_time.sleeps, [2.0])
+
+    def test_charge_batch_lane(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import rate_limiter as MUT
+
+        rate_limiter = self._makeOne(read_bytes_per_second=100,
+                                     batch_share=0.5)
+        with _Monkey(MUT, time=self.fake_time):
+            rate_limiter.charge('read', 100, priority='batch')
+        all_bucket, batch_bucket = rate_limiter._buckets['read', 'bytes']
+        self.assertEqual(all_bucket._tokens, 0.0)
+        self.assertEqual(batch_bucket._tokens, -50.0)
+
+    def test_charge_bad_kind(self):
+        rate_limiter = self._makeOne()
+        with self.assertRaises(ValueError):
+            rate_limiter.charge('delete', 10)
+
+
+class Test__acquire(unittest2.TestCase):
+
+    def _callFUT(self, *args, **kwargs):
+        from gcloud_bigtable.rate_limiter import _acquire
+        return _acquire(*args, **kwargs)
+
+    def test_without_rate_limiter(self):
+        self.assertEqual(self._callFUT(None, 'read'), None)
+
+    def test_with_rate_limiter(self):
+        from gcloud_bigtable._testing import _MockWithAttachedMethods
+
+        rate_limiter = _MockWithAttachedMethods(None)
+        self._callFUT(rate_limiter, 'write', num_bytes=10, priority='batch')
+        self.assertEqual(rate_limiter._called, [
+            ('acquire', ('write',), {'num_bytes': 10, 'priority': 'batch'}),
+        ])
+
+
+class _FakeTime(object):
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
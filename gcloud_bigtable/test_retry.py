@@ -0,0 +1,349 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest2
+
+
+class Test__get_status_code(unittest2.TestCase):
+
+    def _callFUT(self, exc):
+        from gcloud_bigtable.retry import _get_status_code
+        return _get_status_code(exc)
+
+    def test_without_code(self):
+        self.assertEqual(self._callFUT(ValueError('Bad')), None)
+
+    def test_code_attribute(self):
+        exc = _Error(code='UNAVAILABLE')
+        self.assertEqual(self._callFUT(exc), 'UNAVAILABLE')
+
+    def test_code_method(self):
+        exc = _Error(code=lambda: 'ABORTED')
+        self.assertEqual(self._callFUT(exc), 'ABORTED')
+
+    def test_code_enum(self):
+        exc = _Error(code=_StatusCode('DEADLINE_EXCEEDED'))
+        self.assertEqual(self._callFUT(exc), 'DEADLINE_EXCEEDED')
+
+
+class TestRetryPolicy(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.retry import RetryPolicy
+        return RetryPolicy
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def test_constructor_defaults(self):
+        from gcloud_bigtable import retry as MUT
+
+        policy = self._makeOne()
+        self.assertEqual(policy.retryable_codes, MUT.DEFAULT_RETRYABLE_CODES)
+        self.assertEqual(policy.retryable_exceptions, ())
+        self.assertEqual(policy.max_attempts, MUT.DEFAULT_MAX_ATTEMPTS)
+        self.assertEqual(policy.initial_backoff, MUT.DEFAULT_INITIAL_BACKOFF)
+        self.assertEqual(policy.max_backoff, MUT.DEFAULT_MAX_BACKOFF)
+        self.assertEqual(policy.backoff_multiplier,
+                         MUT.DEFAULT_BACKOFF_MULTIPLIER)
+        self.assertEqual(policy.deadline, None)
+
+    def test_constructor_explicit(self):
+        retryable_codes = ['UNAVAILABLE']
+        retryable_exceptions = [IOError]
+        max_attempts = 3
+        initial_backoff = 1.0
+        max_backoff = 4.0
+        backoff_multiplier = 1.5
+        deadline = 30.0
+        policy = self._makeOne(retryable_codes=retryable_codes,
+                               retryable_exceptions=retryable_exceptions,
+                               max_attempts=max_attempts,
+                               initial_backoff=initial_backoff,
+                               max_backoff=max_backoff,
+                               backoff_multiplier=backoff_multiplier,
+                               deadline=deadline)
+        self.assertEqual(policy.retryable_codes, ('UNAVAILABLE',))
+        self.assertEqual(policy.retryable_exceptions, (IOError,))
+        self.assertEqual(policy.max_attempts, max_attempts)
+        self.assertEqual(policy.initial_backoff, initial_backoff)
+        self.assertEqual(policy.max_backoff, max_backoff)
+        self.assertEqual(policy.backoff_multiplier, backoff_multiplier)
+        self.assertEqual(policy.deadline, deadline)
+
+    def test_constructor_bad_max_attempts(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(max_attempts=0)
+
+    def test_constructor_negative_initial_backoff(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(initial_backoff=-1.0)
+
+    def test_constructor_negative_max_backoff(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(max_backoff=-1.0)
+
+    def test_constructor_bad_backoff_multiplier(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(backoff_multiplier=0.5)
+
+    def test_constructor_bad_deadline(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(deadline=0)
+
+    def test_is_retryable_by_code(self):
+        policy = self._makeOne(retryable_codes=['UNAVAILABLE'])
+        self.assertTrue(policy.is_retryable(_Error(code='UNAVAILABLE')))
+        self.assertFalse(policy.is_retryable(_Error(code='NOT_FOUND')))
+        self.assertFalse(policy.is_retryable(ValueError('Bad')))
+
+    def test_is_retryable_by_exception_class(self):
+        policy = self._makeOne(retryable_exceptions=[IOError])
+        self.assertTrue(policy.is_retryable(IOError('Transient')))
+        self.assertFalse(policy.is_retryable(ValueError('Bad')))
+
+    def test_backoff_seconds(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import retry as MUT
+
+        fake_random = _FakeRandom()
+        policy = self._makeOne(initial_backoff=1.0, max_backoff=5.0,
+                               backoff_multiplier=2.0)
+        with _Monkey(MUT, random=fake_random):
+            results = [policy.backoff_seconds(attempt)
+                       for attempt in (1, 2, 3, 4)]
+        # The fake returns the upper bound.
+        self.assertEqual(results, [1.0, 2.0, 4.0, 5.0])
+        self.assertEqual(fake_random.uniform_calls,
+                         [(0, 1.0), (0, 2.0), (0, 4.0), (0, 5.0)])
+
+    def _call_helper(self, outcomes, **kwargs):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import retry as MUT
+
+        calls = []
+
+        def func(*args, **kwargs):
+            calls.append((args, kwargs))
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        kwargs.setdefault('initial_backoff', 1.0)
+        policy = self._makeOne(**kwargs)
+        fake_time = _FakeTime()
+        with _Monkey(MUT, random=_FakeRandom(), time=fake_time):
+            try:
+                return policy.call(func, 1, key='value')
+            finally:
+                self.assertTrue(all(call == ((1,), {'key': 'value'})
+                                    for call in calls))
+                self.fake_time = fake_time
+
+    def test_call_success(self):
+        result = object()
+        self.assertTrue(self._call_helper([result]) is result)
+        self.assertEqual(self.fake_time.sleeps, [])
+
+    def test_call_retries_then_success(self):
+        result = object()
+        outcomes = [_Error(code='UNAVAILABLE'), _Error(code='ABORTED'),
+                    result]
+        self.assertTrue(self._call_helper(outcomes) is result)
+        self.assertEqual(self.fake_time.sleeps, [1.0, 2.0])
+
+    def test_call_not_retryable(self):
+        error = _Error(code='NOT_FOUND')
+        outcomes = [error, object()]
+        with self.assertRaises(_Error) as exc_info:
+            self._call_helper(outcomes)
+        self.assertTrue(exc_info.exception is error)
+        self.assertEqual(self.fake_time.sleeps, [])
+        self.assertEqual(len(outcomes), 1)
+
+    def test_call_max_attempts(self):
+        errors = [_Error(code='UNAVAILABLE') for _ in range(3)]
+        with self.assertRaises(_Error) as exc_info:
+            self._call_helper(list(errors), max_attempts=3)
+        self.assertTrue(exc_info.exception is errors[-1])
+        self.assertEqual(self.fake_time.sleeps, [1.0, 2.0])
+
+    def test_call_deadline(self):
+        errors = [_Error(code='UNAVAILABLE') for _ in range(3)]
+        with self.assertRaises(_Error) as exc_info:
+            # The first delay (1.0) fits, but the second (2.0) does not.
+            self._call_helper(list(errors), deadline=2.5)
+        self.assertTrue(exc_info.exception is errors[1])
+        self.assertEqual(self.fake_time.sleeps, [1.0])
+
+    def test_call_deadline_passed_during_sleep(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import retry as MUT
+
+        error = _Error(code='UNAVAILABLE')
+        calls = []
+
+        def func():
+            calls.append(None)
+            raise error
+
+        policy = self._makeOne(initial_backoff=1.0, deadline=1.5)
+        # The sleep takes longer than asked for.
+        fake_time = _FakeTime(oversleep=1.0)
+        with _Monkey(MUT, random=_FakeRandom(), time=fake_time):
+            with self.assertRaises(_Error) as exc_info:
+                policy.call(func)
+        self.assertTrue(exc_info.exception is error)
+        self.assertEqual(fake_time.sleeps, [1.0])
+        # Not retried after the sleep.
+        self.assertEqual(len(calls), 1)
+
+    def test_call_timeout_seconds_limited_by_deadline(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import retry as MUT
+
+        fake_time = _FakeTime()
+        result = object()
+        outcomes = [_Error(code='UNAVAILABLE'), _Error(code='UNAVAILABLE'),
+                    result]
+        timeouts = []
+
+        def func(timeout_seconds=None):
+            timeouts.append(timeout_seconds)
+            fake_time.now += 0.5
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        policy = self._makeOne(initial_backoff=1.0, deadline=5.0)
+        with _Monkey(MUT, random=_FakeRandom(), time=fake_time):
+            self.assertTrue(policy.call(func, timeout_seconds=3) is result)
+        self.assertEqual(fake_time.sleeps, [1.0, 2.0])
+        # Attempts start at 0.0, 1.5 and 4.0 seconds.
+        self.assertEqual(timeouts, [3, 3, 1.0])
+
+    def test_call_timeout_seconds_without_deadline(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import retry as MUT
+
+        timeouts = []
+
+        def func(timeout_seconds=None):
+            timeouts.append(timeout_seconds)
+
+        policy = self._makeOne()
+        with _Monkey(MUT, random=_FakeRandom(), time=_FakeTime()):
+            policy.call(func, timeout_seconds=3)
+        self.assertEqual(timeouts, [3])
+
+    def _retry_helper(self, outcomes, now=0.0, **kwargs):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import retry as MUT
+
+        calls = []
+
+        def func(*args, **kwargs):
+            calls.append((args, kwargs))
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        kwargs.setdefault('initial_backoff', 1.0)
+        policy = self._makeOne(**kwargs)
+        self.fake_time = _FakeTime()
+        self.fake_time.now = now
+        self.calls = calls
+        first_error = _Error(code='UNAVAILABLE')
+        with _Monkey(MUT, random=_FakeRandom(), time=self.fake_time):
+            return policy.retry(first_error, 0.0, func, 1, key='value')
+
+    def test_retry_success(self):
+        result = object()
+        outcomes = [_Error(code='UNAVAILABLE'), result]
+        self.assertTrue(self._retry_helper(outcomes) is result)
+        # The first delay comes before the first retry.
+        self.assertEqual(self.fake_time.sleeps, [1.0, 2.0])
+        self.assertEqual(self.calls, [((1,), {'key': 'value'})] * 2)
+
+    def test_retry_not_retryable(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import retry as MUT
+
+        policy = self._makeOne()
+        error = _Error(code='NOT_FOUND')
+        fake_time = _FakeTime()
+        with _Monkey(MUT, random=_FakeRandom(), time=fake_time):
+            with self.assertRaises(_Error) as exc_info:
+                policy.retry(error, 0.0, None)
+        self.assertTrue(exc_info.exception is error)
+        self.assertEqual(fake_time.sleeps, [])
+
+    def test_retry_max_attempts(self):
+        errors = [_Error(code='UNAVAILABLE') for _ in range(3)]
+        with self.assertRaises(_Error) as exc_info:
+            self._retry_helper(list(errors), max_attempts=3)
+        # The failed attempt counts, so only two more are made.
+        self.assertTrue(exc_info.exception is errors[1])
+        self.assertEqual(len(self.calls), 2)
+        self.assertEqual(self.fake_time.sleeps, [1.0, 2.0])
+
+    def test_retry_deadline_from_start(self):
+        with self.assertRaises(_Error) as exc_info:
+            # Only 0.5 seconds are left, less than the first delay.
+            self._retry_helper([object()], now=2.0, deadline=2.5)
+        self.assertEqual(exc_info.exception.code, 'UNAVAILABLE')
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.fake_time.sleeps, [])
+
+
+class _Error(Exception):
+
+    def __init__(self, code=None):
+        super(_Error, self).__init__(code)
+        self.code = code
+
+
+class _StatusCode(object):
+
+    def __init__(self, name):
+        self.name = name
+
+
+class _FakeRandom(object):
+
+    def __init__(self):
+        self.uniform_calls = []
+
+    def uniform(self, low, high):
+        self.uniform_calls.append((low, high))
+        return high
+
+
+class _FakeTime(object):
+
+    def __init__(self, oversleep=0.0):
+        self.now = 0.0
+        self.oversleep = oversleep
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds + self.oversleep
@@ -49,14 +49,20 @@ class TestRow(unittest2.TestCase):
         self.assertTrue(row._table is table)
         self.assertTrue(row._filter is filter_)
         self.assertEqual(row._rule_pb_list, [])
+        self.assertEqual(row._request_pb.row_key, row_key_val)
         if filter_ is None:
-            self.assertEqual(row._pb_mutations, [])
+            self.assertEqual(list(row._pb_mutations), [])
+            self.assertTrue(row._pb_mutations is row._request_pb.mutations)
             self.assertTrue(row._true_pb_mutations is None)
             self.assertTrue(row._false_pb_mutations is None)
         else:
             self.assertTrue(row._pb_mutations is None)
-            self.assertEqual(row._true_pb_mutations, [])
-            self.assertEqual(row._false_pb_mutations, [])
+            self.assertEqual(list(row._true_pb_mutations), [])
+            self.assertEqual(list(row._false_pb_mutations), [])
+            self.assertTrue(
+                row._true_pb_mutations is row._request_pb.true_mutations)
+            self.assertTrue(
+                row._false_pb_mutations is row._request_pb.false_mutations)
 
     def test_constructor(self):
         self._constructor_helper(ROW_KEY)
@@ -174,7 +180,7 @@ class TestRow(unittest2.TestCase):
 
         table = object()
         row = self._makeOne(ROW_KEY, table)
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
         row.set_cell(COLUMN_FAMILY_ID, column,
                      value, timestamp=timestamp)
 
@@ -188,7 +194,7 @@ class TestRow(unittest2.TestCase):
                 value=value,
             ),
         )
-        self.assertEqual(row._pb_mutations, [expected_pb])
+        self.assertEqual(list(row._pb_mutations), [expected_pb])
 
     def test_set_cell(self):
         self._set_cell_helper(column=COLUMN)
@@ -207,6 +213,22 @@ class TestRow(unittest2.TestCase):
         with self.assertRaises(TypeError):
             row.set_cell(COLUMN_FAMILY_ID, COLUMN, value)
 
+    def test_set_cell_with_bad_column_family_id(self):
+        table = object()
+        row = self._makeOne(ROW_KEY, table)
+        with self.assertRaises(TypeError):
+            row.set_cell(None, COLUMN, b'value')
+        # The failed call doesn't leave an empty mutation behind.
+        self.assertEqual(list(row._pb_mutations), [])
+
+    def test_set_cell_with_bad_timestamp(self):
+        table = object()
+        row = self._makeOne(ROW_KEY, table)
+        with self.assertRaises(TypeError):
+            row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value',
+                         timestamp=object())
+        self.assertEqual(list(row._pb_mutations), [])
+
     def test_set_cell_with_non_null_timestamp(self):
         import datetime
         from gcloud_bigtable. _helpers import EPOCH
@@ -221,13 +243,13 @@ class TestRow(unittest2.TestCase):
         from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
 
         row = self._makeOne(ROW_KEY, object())
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
         row.delete()
 
         expected_pb = data_pb2.Mutation(
             delete_from_row=data_pb2.Mutation.DeleteFromRow(),
         )
-        self.assertEqual(row._pb_mutations, [expected_pb])
+        self.assertEqual(list(row._pb_mutations), [expected_pb])
 
     def test_delete_cell(self):
         klass = self._getTargetClass()
@@ -247,14 +269,14 @@ class TestRow(unittest2.TestCase):
         table = object()
         mock_row = MockRow(ROW_KEY, table)
         # Make sure no values are set before calling the method.
-        self.assertEqual(mock_row._pb_mutations, [])
+        self.assertEqual(list(mock_row._pb_mutations), [])
         self.assertEqual(mock_row._args, [])
         self.assertEqual(mock_row._kwargs, [])
 
         # Actually make the request against the mock class.
         time_range = object()
         mock_row.delete_cell(COLUMN_FAMILY_ID, COLUMN, time_range=time_range)
-        self.assertEqual(mock_row._pb_mutations, [])
+        self.assertEqual(list(mock_row._pb_mutations), [])
         self.assertEqual(mock_row._args, [(COLUMN_FAMILY_ID, [COLUMN])])
         self.assertEqual(mock_row._kwargs, [{
             'state': None,
@@ -274,7 +296,7 @@ class TestRow(unittest2.TestCase):
         table = object()
         row = self._makeOne(ROW_KEY, table)
         klass = self._getTargetClass()
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
         row.delete_cells(COLUMN_FAMILY_ID, klass.ALL_COLUMNS)
 
         expected_pb = data_pb2.Mutation(
@@ -282,15 +304,15 @@ class TestRow(unittest2.TestCase):
                 family_name=COLUMN_FAMILY_ID,
             ),
         )
-        self.assertEqual(row._pb_mutations, [expected_pb])
+        self.assertEqual(list(row._pb_mutations), [expected_pb])
 
     def test_delete_cells_no_columns(self):
         table = object()
         row = self._makeOne(ROW_KEY, table)
         columns = []
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
         row.delete_cells(COLUMN_FAMILY_ID, columns)
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
 
     def _delete_cells_helper(self, time_range=None):
         from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
@@ -298,7 +320,7 @@ class TestRow(unittest2.TestCase):
         table = object()
         row = self._makeOne(ROW_KEY, table)
         columns = [COLUMN]
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
         row.delete_cells(COLUMN_FAMILY_ID, columns, time_range=time_range)
 
         expected_pb = data_pb2.Mutation(
@@ -310,7 +332,7 @@ class TestRow(unittest2.TestCase):
         if time_range is not None:
             expected_pb.delete_from_column.time_range.CopyFrom(
                 time_range.to_pb())
-        self.assertEqual(row._pb_mutations, [expected_pb])
+        self.assertEqual(list(row._pb_mutations), [expected_pb])
 
     def test_delete_cells_no_time_range(self):
         self._delete_cells_helper()
@@ -331,10 +353,21 @@ class TestRow(unittest2.TestCase):
         table = object()
         row = self._makeOne(ROW_KEY, table)
         columns = [COLUMN, object()]
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
         with self.assertRaises(TypeError):
             row.delete_cells(COLUMN_FAMILY_ID, columns)
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
+
+    def test_delete_cells_with_bad_column_family_id(self):
+        table = object()
+        row = self._makeOne(ROW_KEY, table)
+        row.delete_cell(COLUMN_FAMILY_ID, COLUMN)
+        with self.assertRaises(TypeError):
+            row.delete_cells(None, [COLUMN, COLUMN])
+        with self.assertRaises(TypeError):
+            row.delete_cells(None, row.ALL_COLUMNS)
+        # Only the mutation added before the failed calls is kept.
+        self.assertEqual(len(row._pb_mutations), 1)
 
     def test_delete_cells_with_string_columns(self):
         from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
@@ -346,7 +379,7 @@ class TestRow(unittest2.TestCase):
         column2 = u'column2'
         column2_bytes = b'column2'
         columns = [column1, column2]
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
         row.delete_cells(COLUMN_FAMILY_ID, columns)
 
         expected_pb1 = data_pb2.Mutation(
@@ -361,7 +394,7 @@ class TestRow(unittest2.TestCase):
                 column_qualifier=column2_bytes,
             ),
         )
-        self.assertEqual(row._pb_mutations, [expected_pb1, expected_pb2])
+        self.assertEqual(list(row._pb_mutations), [expected_pb1, expected_pb2])
 
     def test_commit(self):
         from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
@@ -409,10 +442,381 @@ class TestRow(unittest2.TestCase):
             (request_pb, timeout_seconds),
             {},
         )])
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
         self.assertEqual(row._true_pb_mutations, None)
         self.assertEqual(row._false_pb_mutations, None)
 
+    def _commit_with_retry_helper(self, timestamp, retry_policy=None,
+                                  table_retry_policy=None):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        table = _Table(TABLE_NAME, client=client,
+                       retry_policy=table_retry_policy)
+        row = self._makeOne(ROW_KEY, table)
+        client.data_stub = stub = StubMock(empty_pb2.Empty())
+
+        timeout_seconds = 711
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value', timestamp=timestamp)
+        row.commit(timeout_seconds=timeout_seconds,
+                   retry_policy=retry_policy)
+        self.assertEqual(len(stub.method_calls), 1)
+        self.assertEqual(list(row._pb_mutations), [])
+
+    def test_commit_with_retry_policy(self):
+        import datetime
+        from gcloud_bigtable._helpers import EPOCH
+
+        retry_policy = _RetryPolicy()
+        timestamp = EPOCH + datetime.timedelta(seconds=1)
+        self._commit_with_retry_helper(timestamp, retry_policy=retry_policy)
+        self.assertEqual(retry_policy.calls, 1)
+
+    def test_commit_with_table_retry_policy(self):
+        import datetime
+        from gcloud_bigtable._helpers import EPOCH
+
+        retry_policy = _RetryPolicy()
+        timestamp = EPOCH + datetime.timedelta(seconds=1)
+        self._commit_with_retry_helper(timestamp,
+                                       table_retry_policy=retry_policy)
+        self.assertEqual(retry_policy.calls, 1)
+
+    def test_commit_with_retry_policy_not_idempotent(self):
+        retry_policy = _RetryPolicy()
+        self._commit_with_retry_helper(None, retry_policy=retry_policy)
+        self.assertEqual(retry_policy.calls, 0)
+
+    def _commit_with_spool_helper(self, retryable, explicit_timestamp=True):
+        import datetime
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable._helpers import EPOCH
+
+        client = _Client()
+        table = _Table(TABLE_NAME, client=client)
+        row = self._makeOne(ROW_KEY, table)
+        error = RuntimeError('Unavailable')
+        client.data_stub = StubMock(error)
+        spool = _Spool(retryable=retryable)
+
+        timestamp = None
+        if explicit_timestamp:
+            timestamp = EPOCH + datetime.timedelta(seconds=1)
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value', timestamp=timestamp)
+        request_pb = row._request_pb
+        try:
+            row.commit(spool=spool)
+        finally:
+            self.assertEqual(request_pb.table_name, TABLE_NAME)
+            self.spool, self.request_pb = spool, request_pb
+        return row
+
+    def test_commit_with_spool(self):
+        row = self._commit_with_spool_helper(True)
+        self.assertEqual(len(self.spool.requests), 1)
+        self.assertTrue(self.spool.requests[0] is self.request_pb)
+        # The spooled mutations are no longer on the row.
+        self.assertEqual(list(row._pb_mutations), [])
+
+    def test_commit_with_spool_not_retryable(self):
+        with self.assertRaises(RuntimeError):
+            self._commit_with_spool_helper(False)
+        self.assertEqual(self.spool.requests, [])
+
+    def test_commit_with_spool_not_idempotent(self):
+        # The failed write may have been applied, so replaying a
+        # server-timestamp write could create a second version.
+        with self.assertRaises(RuntimeError):
+            self._commit_with_spool_helper(True, explicit_timestamp=False)
+        self.assertEqual(self.spool.requests, [])
+
+    def test_commit_with_spool_pending_row(self):
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        table = _Table(TABLE_NAME, client=client)
+        row = self._makeOne(ROW_KEY, table)
+        client.data_stub = stub = StubMock()
+        spool = _Spool(pending_rows=[ROW_KEY])
+
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value')
+        request_pb = row._request_pb
+        row.commit(spool=spool)
+        # The request is queued behind the spooled ones instead of sent.
+        self.assertEqual(stub.method_calls, [])
+        self.assertEqual(len(spool.requests), 1)
+        self.assertTrue(spool.requests[0] is request_pb)
+        self.assertEqual(request_pb.table_name, TABLE_NAME)
+        self.assertEqual(list(row._pb_mutations), [])
+
+    def test_commit_coalesce(self):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        table = _Table(TABLE_NAME, client=client)
+        row = self._makeOne(ROW_KEY, table)
+        client.data_stub = stub = StubMock(empty_pb2.Empty())
+
+        # Create request_pb
+        value = b'bytes-value'
+        mutation = data_pb2.Mutation(
+            set_cell=data_pb2.Mutation.SetCell(
+                family_name=COLUMN_FAMILY_ID,
+                column_qualifier=COLUMN,
+                timestamp_micros=-1,  # Default value.
+                value=value,
+            ),
+        )
+        request_pb = messages_pb2.MutateRowRequest(
+            table_name=TABLE_NAME,
+            row_key=ROW_KEY,
+            mutations=[mutation],
+        )
+
+        # Perform the method and check the result.
+        timeout_seconds = 711
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'overwritten')
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, value)
+        row.commit(timeout_seconds=timeout_seconds, coalesce=True)
+        self.assertEqual(stub.method_calls, [(
+            'MutateRow',
+            (request_pb, timeout_seconds),
+            {},
+        )])
+        self.assertEqual(list(row._pb_mutations), [])
+
+    def _commit_chunks_helper(self, results, num_cells, **kwargs):
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = stub = StubMock(*results)
+        timeout_seconds = 17
+        table = _Table(TABLE_NAME, client=client,
+                       timeout_seconds=timeout_seconds)
+        self.row = row = self._makeOne(ROW_KEY, table)
+        for i in range(num_cells):
+            row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'%d' % (i,))
+        mutations = list(row._pb_mutations)
+
+        progress = []
+        kwargs['progress_callback'] = lambda *args: progress.append(args)
+        try:
+            row.commit_chunks(**kwargs)
+        finally:
+            self.requests = [request_pb for _, (request_pb, timeout), _
+                             in stub.method_calls
+                             if timeout == timeout_seconds]
+            self.progress = progress
+            self.mutations = mutations
+        return row
+
+    def test_commit_chunks(self):
+        from gcloud_bigtable._generated import empty_pb2
+
+        results = [empty_pb2.Empty()] * 3
+        row = self._commit_chunks_helper(results, 5, chunk_size=2)
+        self.assertEqual([list(request_pb.mutations)
+                          for request_pb in self.requests],
+                         [self.mutations[:2], self.mutations[2:4],
+                          self.mutations[4:]])
+        self.assertTrue(all(request_pb.table_name == TABLE_NAME and
+                            request_pb.row_key == ROW_KEY
+                            for request_pb in self.requests))
+        self.assertEqual(self.progress, [(2, 5), (4, 5), (5, 5)])
+        self.assertEqual(list(row._pb_mutations), [])
+
+    def test_commit_chunks_default_chunk_size(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import row as MUT
+
+        results = [empty_pb2.Empty()] * 2
+        with _Monkey(MUT, _MAX_MUTATIONS=3):
+            row = self._commit_chunks_helper(results, 4)
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.progress, [(3, 4), (4, 4)])
+        self.assertEqual(list(row._pb_mutations), [])
+
+    def test_commit_chunks_no_mutations(self):
+        row = self._commit_chunks_helper([], 0)
+        self.assertEqual(self.requests, [])
+        self.assertEqual(self.progress, [])
+        self.assertEqual(list(row._pb_mutations), [])
+
+    def test_commit_chunks_failure(self):
+        from gcloud_bigtable._generated import empty_pb2
+
+        error = RuntimeError('Failed')
+        results = [empty_pb2.Empty(), error]
+        with self.assertRaises(RuntimeError) as exc_info:
+            self._commit_chunks_helper(results, 5, chunk_size=2)
+        self.assertTrue(exc_info.exception is error)
+        # No chunks are sent after the failure.
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(self.progress, [(2, 5)])
+        self.assertEqual(list(self.row._pb_mutations), self.mutations[2:])
+
+    def test_commit_chunks_pipelined_failure(self):
+        from gcloud_bigtable._generated import empty_pb2
+
+        error = RuntimeError('Failed')
+        results = [error, empty_pb2.Empty(), empty_pb2.Empty()]
+        with self.assertRaises(RuntimeError):
+            self._commit_chunks_helper(results, 7, chunk_size=2,
+                                       max_inflight=3)
+        # The second and third chunks were already in flight (and were
+        # committed) when the first one failed, but the fourth was never
+        # sent.
+        self.assertEqual(len(self.requests), 3)
+        self.assertEqual(self.progress, [(2, 7), (4, 7)])
+        self.assertEqual(list(self.row._pb_mutations),
+                         self.mutations[:2] + self.mutations[6:])
+
+    def test_commit_chunks_pipelined_failures(self):
+        from gcloud_bigtable._generated import empty_pb2
+
+        error1 = RuntimeError('Failed')
+        error2 = RuntimeError('Failed again')
+        results = [error1, error2, empty_pb2.Empty()]
+        with self.assertRaises(RuntimeError) as exc_info:
+            self._commit_chunks_helper(results, 7, chunk_size=2,
+                                       max_inflight=3)
+        # The first error is raised.
+        self.assertTrue(exc_info.exception is error1)
+        self.assertEqual(self.progress, [(2, 7)])
+        self.assertEqual(list(self.row._pb_mutations),
+                         self.mutations[:4] + self.mutations[6:])
+
+    def test_commit_chunks_retry(self):
+        import datetime
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable._helpers import EPOCH
+
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import row as MUT
+
+        client = _Client()
+        error = RuntimeError('Failed')
+        client.data_stub = stub = StubMock(error, empty_pb2.Empty())
+        table = _Table(TABLE_NAME, client=client)
+        row = self._makeOne(ROW_KEY, table)
+        timestamp = EPOCH + datetime.timedelta(seconds=1)
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value', timestamp=timestamp)
+        retry_policy = _RetryPolicy()
+        with _Monkey(MUT, time=_FakeTime(12.5)):
+            row.commit_chunks(retry_policy=retry_policy)
+        # The failed request is the first attempt, sent at 12.5.
+        self.assertEqual(retry_policy.retried, [(error, 12.5)])
+        self.assertEqual(retry_policy.calls, 1)
+        self.assertEqual(len(stub.method_calls), 2)
+        self.assertEqual(stub.method_calls[0], stub.method_calls[1])
+        self.assertEqual(list(row._pb_mutations), [])
+
+    def test_commit_chunks_with_filter(self):
+        row = self._makeOne(ROW_KEY, object(), filter_=object())
+        with self.assertRaises(ValueError):
+            row.commit_chunks()
+
+    def test_commit_chunks_bad_chunk_size(self):
+        from gcloud_bigtable.row import _MAX_MUTATIONS
+
+        row = self._makeOne(ROW_KEY, object())
+        with self.assertRaises(ValueError):
+            row.commit_chunks(chunk_size=0)
+        with self.assertRaises(ValueError):
+            row.commit_chunks(chunk_size=_MAX_MUTATIONS + 1)
+
+    def test_commit_chunks_bad_max_inflight(self):
+        row = self._makeOne(ROW_KEY, object())
+        with self.assertRaises(ValueError):
+            row.commit_chunks(max_inflight=0)
+
+    def test_commit_with_rate_limiter(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.rate_limiter = rate_limiter = _RateLimiter()
+        client.data_stub = stub = StubMock(empty_pb2.Empty())
+        table = _Table(TABLE_NAME, client=client)
+        row = self._makeOne(ROW_KEY, table)
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value')
+        row.commit()
+
+        (_, (request_pb, _), _), = stub.method_calls
+        self.assertEqual(rate_limiter.acquires,
+                         [('write', request_pb.ByteSize(), 'interactive')])
+
+    def test_commit_chunks_with_rate_limiter(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.rate_limiter = rate_limiter = _RateLimiter()
+        client.data_stub = stub = StubMock(empty_pb2.Empty())
+        table = _Table(TABLE_NAME, client=client)
+        row = self._makeOne(ROW_KEY, table)
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value')
+        row.commit_chunks()
+
+        (_, (request_pb, _), _), = stub.method_calls
+        self.assertEqual(rate_limiter.acquires,
+                         [('write', request_pb.ByteSize(), 'batch')])
+
+    def _hotspot_detector_helper(self, response, filter_=None):
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.hotspot_detector = _HotspotDetector()
+        client.data_stub = StubMock(response, response)
+        table = _Table(TABLE_NAME, client=client)
+        return self._makeOne(ROW_KEY, table, filter_=filter_)
+
+    def test_commit_with_hotspot_detector(self):
+        from gcloud_bigtable._generated import empty_pb2
+
+        row = self._hotspot_detector_helper(empty_pb2.Empty())
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value')
+        row.commit()
+        self.assertEqual(row.client.hotspot_detector.row_keys, [ROW_KEY])
+
+    def test_commit_with_filter_with_hotspot_detector(self):
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable.row import RowFilter
+
+        row = self._hotspot_detector_helper(
+            messages_pb2.CheckAndMutateRowResponse(),
+            filter_=RowFilter(row_sample_filter=0.33))
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value', state=True)
+        row.commit()
+        self.assertEqual(row.client.hotspot_detector.row_keys, [ROW_KEY])
+
+    def test_commit_chunks_with_hotspot_detector(self):
+        from gcloud_bigtable._generated import empty_pb2
+
+        row = self._hotspot_detector_helper(empty_pb2.Empty())
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value1')
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value2')
+        row.commit_chunks(chunk_size=1)
+        # Each chunk is a separate write of the row.
+        self.assertEqual(row.client.hotspot_detector.row_keys,
+                         [ROW_KEY, ROW_KEY])
+
+    def test_commit_modifications_with_hotspot_detector(self):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+
+        row = self._hotspot_detector_helper(data_pb2.Row())
+        row.increment_cell_value(COLUMN_FAMILY_ID, COLUMN, 1)
+        row.commit_modifications()
+        self.assertEqual(row.client.hotspot_detector.row_keys, [ROW_KEY])
+
     def test_commit_too_many_mutations(self):
         from gcloud_bigtable._testing import _Monkey
         from gcloud_bigtable import row as MUT
@@ -425,13 +829,34 @@ class TestRow(unittest2.TestCase):
             with self.assertRaises(ValueError):
                 row.commit()
 
+    def test_commit_sends_accumulated_request(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = stub = StubMock(empty_pb2.Empty())
+        table = _Table(TABLE_NAME, client=client)
+        row = self._makeOne(ROW_KEY, table)
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value')
+        request_pb = row._request_pb
+        row.commit()
+
+        # The request the mutations were built in is sent without a copy.
+        (_, (sent_pb, _), _), = stub.method_calls
+        self.assertTrue(sent_pb is request_pb)
+        self.assertEqual(sent_pb.table_name, TABLE_NAME)
+        self.assertEqual(len(sent_pb.mutations), 1)
+        # The row starts a new request, leaving the sent one unchanged.
+        self.assertFalse(row._request_pb is request_pb)
+        self.assertEqual(list(row._pb_mutations), [])
+
     def test_commit_no_mutations(self):
         from gcloud_bigtable._grpc_mocks import StubMock
 
         client = _Client()
         table = _Table(None, client=client)
         row = self._makeOne(ROW_KEY, table)
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
 
         # Patch the stub used by the API method.
         client.data_stub = stub = StubMock()
@@ -494,8 +919,86 @@ class TestRow(unittest2.TestCase):
             {},
         )])
         self.assertEqual(row._pb_mutations, None)
-        self.assertEqual(row._true_pb_mutations, [])
-        self.assertEqual(row._false_pb_mutations, [])
+        self.assertEqual(list(row._true_pb_mutations), [])
+        self.assertEqual(list(row._false_pb_mutations), [])
+
+    def test_commit_with_filter_frozen_once(self):
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        table = _Table(TABLE_NAME, client=client)
+        row_filter = _MockFilter()
+        row = self._makeOne(ROW_KEY, table, filter_=row_filter)
+
+        response_pb = messages_pb2.CheckAndMutateRowResponse(
+            predicate_matched=True)
+        client.data_stub = stub = StubMock(response_pb, response_pb)
+
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value1', state=True)
+        row.commit()
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value2', state=False)
+        row.commit()
+
+        # The filter is only converted on the first commit.
+        self.assertEqual(row_filter.to_pb_calls, 1)
+        (_, (request_pb1, _), _), (_, (request_pb2, _), _) = stub.method_calls
+        self.assertEqual(request_pb1.predicate_filter, row_filter.filter_pb)
+        self.assertEqual(request_pb2.predicate_filter, row_filter.filter_pb)
+
+    def test_commit_with_filter_coalesce(self):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable.row import RowFilter
+
+        client = _Client()
+        table = _Table(TABLE_NAME, client=client)
+        row_filter = RowFilter(row_sample_filter=0.33)
+        row = self._makeOne(ROW_KEY, table, filter_=row_filter)
+
+        # Create request_pb
+        set_pb = data_pb2.Mutation(
+            set_cell=data_pb2.Mutation.SetCell(
+                family_name=COLUMN_FAMILY_ID,
+                column_qualifier=COLUMN,
+                timestamp_micros=-1,  # Default value.
+                value=b'value',
+            ),
+        )
+        delete_pb = data_pb2.Mutation(
+            delete_from_row=data_pb2.Mutation.DeleteFromRow(),
+        )
+        request_pb = messages_pb2.CheckAndMutateRowRequest(
+            table_name=TABLE_NAME,
+            row_key=ROW_KEY,
+            predicate_filter=row_filter.to_pb(),
+            true_mutations=[set_pb],
+            false_mutations=[delete_pb],
+        )
+
+        # Patch the stub used by the API method.
+        response_pb = messages_pb2.CheckAndMutateRowResponse(
+            predicate_matched=False)
+        client.data_stub = stub = StubMock(response_pb)
+
+        # Perform the method and check the result.
+        timeout_seconds = 262
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value', state=True)
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value', state=True)
+        row.set_cell(COLUMN_FAMILY_ID, COLUMN, b'value', state=False)
+        row.delete(state=False)
+        result = row.commit(timeout_seconds=timeout_seconds, coalesce=True)
+        self.assertFalse(result)
+        self.assertEqual(stub.method_calls, [(
+            'CheckAndMutateRow',
+            (request_pb, timeout_seconds),
+            {},
+        )])
+        self.assertEqual(list(row._true_pb_mutations), [])
+        self.assertEqual(list(row._false_pb_mutations), [])
 
     def test_commit_with_filter_too_many_mutations(self):
         from gcloud_bigtable._testing import _Monkey
@@ -517,8 +1020,8 @@ class TestRow(unittest2.TestCase):
         table = _Table(None, client=client)
         filter_ = object()
         row = self._makeOne(ROW_KEY, table, filter_=filter_)
-        self.assertEqual(row._true_pb_mutations, [])
-        self.assertEqual(row._false_pb_mutations, [])
+        self.assertEqual(list(row._true_pb_mutations), [])
+        self.assertEqual(list(row._false_pb_mutations), [])
 
         # Patch the stub used by the API method.
         client.data_stub = stub = StubMock()
@@ -580,7 +1083,7 @@ class TestRow(unittest2.TestCase):
             (request_pb, timeout_seconds),
             {},
         )])
-        self.assertEqual(row._pb_mutations, [])
+        self.assertEqual(list(row._pb_mutations), [])
         self.assertEqual(row._true_pb_mutations, None)
         self.assertEqual(row._false_pb_mutations, None)
 
@@ -1481,14 +1984,339 @@ class TestConditionalRowFilter(unittest2.TestCase):
         self.assertEqual(filter_pb, expected_pb)
 
 
+class TestFrozenRowFilter(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.row import FrozenRowFilter
+        return FrozenRowFilter
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def test_constructor(self):
+        row_filter = _MockFilter()
+        frozen_filter = self._makeOne(row_filter)
+        self.assertEqual(row_filter.to_pb_calls, 1)
+        self.assertEqual(frozen_filter._filter_pb, row_filter.filter_pb)
+        self.assertEqual(frozen_filter._serialized_pb,
+                         row_filter.filter_pb.SerializeToString())
+
+    def test_to_pb_memoized(self):
+        row_filter = _MockFilter()
+        frozen_filter = self._makeOne(row_filter)
+        filter_pb1 = frozen_filter.to_pb()
+        filter_pb2 = frozen_filter.to_pb()
+        self.assertTrue(filter_pb1 is filter_pb2)
+        self.assertEqual(filter_pb1, row_filter.filter_pb)
+        # Only converted once, at construction.
+        self.assertEqual(row_filter.to_pb_calls, 1)
+
+    def test_to_pb_nested(self):
+        from gcloud_bigtable.row import RowFilter
+        from gcloud_bigtable.row import RowFilterChain
+
+        row_filter1 = RowFilter(strip_value_transformer=True)
+        row_filter2 = RowFilter(row_sample_filter=0.25)
+        row_filter3 = RowFilterChain(filters=[row_filter1, row_filter2])
+        frozen_filter = self._makeOne(row_filter3)
+        self.assertEqual(frozen_filter.to_pb(), row_filter3.to_pb())
+
+        # Changes to the original filter are not reflected.
+        row_filter3.filters.pop()
+        self.assertNotEqual(frozen_filter.to_pb(), row_filter3.to_pb())
+
+    def test___eq__(self):
+        from gcloud_bigtable.row import RowFilter
+
+        frozen_filter1 = self._makeOne(RowFilter(row_sample_filter=0.25))
+        frozen_filter2 = self._makeOne(RowFilter(row_sample_filter=0.25))
+        self.assertEqual(frozen_filter1, frozen_filter2)
+
+    def test___eq__type_differ(self):
+        from gcloud_bigtable.row import RowFilter
+
+        row_filter = RowFilter(row_sample_filter=0.25)
+        frozen_filter = self._makeOne(row_filter)
+        self.assertNotEqual(frozen_filter, row_filter)
+
+    def test___ne__(self):
+        from gcloud_bigtable.row import RowFilter
+
+        frozen_filter1 = self._makeOne(RowFilter(row_sample_filter=0.25))
+        frozen_filter2 = self._makeOne(RowFilter(row_sample_filter=0.5))
+        self.assertNotEqual(frozen_filter1, frozen_filter2)
+
+    def test___hash__(self):
+        from gcloud_bigtable.row import RowFilter
+
+        frozen_filter1 = self._makeOne(RowFilter(row_sample_filter=0.25))
+        frozen_filter2 = self._makeOne(RowFilter(row_sample_filter=0.25))
+        self.assertEqual(hash(frozen_filter1), hash(frozen_filter2))
+        self.assertEqual(len(set([frozen_filter1, frozen_filter2])), 1)
+
+    def test_freeze_frozen_filter(self):
+        from gcloud_bigtable.row import RowFilter
+
+        frozen_filter1 = self._makeOne(RowFilter(row_sample_filter=0.25))
+        frozen_filter2 = self._makeOne(frozen_filter1)
+        self.assertEqual(frozen_filter1, frozen_filter2)
+
+
+class Test__call_data_method(unittest2.TestCase):
+
+    def _callFUT(self, *args, **kwargs):
+        from gcloud_bigtable.row import _call_data_method
+        return _call_data_method(*args, **kwargs)
+
+    def _call_helper(self, async):
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        response_pb = object()
+        stub = StubMock(response_pb)
+        request_pb = object()
+        timeout_seconds = 10
+        result = self._callFUT(stub.MutateRow, request_pb, timeout_seconds,
+                               async)
+        self.assertTrue(result is response_pb)
+        self.assertEqual(stub.method_calls, [(
+            'MutateRow',
+            (request_pb, timeout_seconds),
+            {},
+        )])
+
+    def test_async(self):
+        self._call_helper(True)
+
+    def test_sync(self):
+        self._call_helper(False)
+
+
+class Test__mutations_idempotent(unittest2.TestCase):
+
+    def _callFUT(self, mutations):
+        from gcloud_bigtable.row import _mutations_idempotent
+        return _mutations_idempotent(mutations)
+
+    def _set_cell_pb(self, timestamp_micros):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+        return data_pb2.Mutation(
+            set_cell=data_pb2.Mutation.SetCell(
+                family_name=COLUMN_FAMILY_ID,
+                column_qualifier=COLUMN,
+                timestamp_micros=timestamp_micros,
+            ),
+        )
+
+    def test_empty(self):
+        self.assertTrue(self._callFUT([]))
+
+    def test_explicit_timestamps(self):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+
+        delete_pb = data_pb2.Mutation(
+            delete_from_row=data_pb2.Mutation.DeleteFromRow())
+        mutations = [self._set_cell_pb(0), delete_pb,
+                     self._set_cell_pb(1000)]
+        self.assertTrue(self._callFUT(mutations))
+
+    def test_server_timestamp(self):
+        mutations = [self._set_cell_pb(1000), self._set_cell_pb(-1)]
+        self.assertFalse(self._callFUT(mutations))
+
+
+class Test__coalesce_mutations(unittest2.TestCase):
+
+    def _callFUT(self, mutations):
+        from gcloud_bigtable.row import _coalesce_mutations
+        return _coalesce_mutations(mutations)
+
+    def _set_cell_pb(self, family_name=COLUMN_FAMILY_ID, qualifier=COLUMN,
+                     timestamp_micros=-1, value=b''):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+        return data_pb2.Mutation(
+            set_cell=data_pb2.Mutation.SetCell(
+                family_name=family_name,
+                column_qualifier=qualifier,
+                timestamp_micros=timestamp_micros,
+                value=value,
+            ),
+        )
+
+    def _delete_column_pb(self, family_name=COLUMN_FAMILY_ID,
+                          qualifier=COLUMN):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+        return data_pb2.Mutation(
+            delete_from_column=data_pb2.Mutation.DeleteFromColumn(
+                family_name=family_name,
+                column_qualifier=qualifier,
+            ),
+        )
+
+    def _delete_family_pb(self, family_name=COLUMN_FAMILY_ID):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+        return data_pb2.Mutation(
+            delete_from_family=data_pb2.Mutation.DeleteFromFamily(
+                family_name=family_name,
+            ),
+        )
+
+    def _delete_row_pb(self):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+        return data_pb2.Mutation(
+            delete_from_row=data_pb2.Mutation.DeleteFromRow(),
+        )
+
+    def test_empty(self):
+        self.assertEqual(self._callFUT([]), [])
+
+    def test_nothing_to_drop(self):
+        mutations = [
+            self._set_cell_pb(qualifier=b'a'),
+            self._set_cell_pb(qualifier=b'b'),
+            self._delete_column_pb(qualifier=b'c'),
+        ]
+        self.assertEqual(self._callFUT(mutations), mutations)
+
+    def test_delete_from_row(self):
+        delete_pb = self._delete_row_pb()
+        set_pb = self._set_cell_pb(value=b'after')
+        mutations = [
+            self._set_cell_pb(value=b'before'),
+            self._delete_family_pb(),
+            self._delete_row_pb(),
+            delete_pb,
+            set_pb,
+        ]
+        self.assertEqual(self._callFUT(mutations), [delete_pb, set_pb])
+
+    def test_delete_from_family(self):
+        other_pb = self._set_cell_pb(family_name=b'other')
+        delete_pb = self._delete_family_pb()
+        set_pb = self._set_cell_pb(value=b'after')
+        mutations = [
+            self._set_cell_pb(value=b'before', timestamp_micros=1000),
+            self._delete_column_pb(),
+            other_pb,
+            self._delete_family_pb(),
+            delete_pb,
+            set_pb,
+        ]
+        self.assertEqual(self._callFUT(mutations),
+                         [other_pb, delete_pb, set_pb])
+
+    def test_server_timestamp_set_cell(self):
+        set_pb1 = self._set_cell_pb(value=b'1', timestamp_micros=1000)
+        set_pb2 = self._set_cell_pb(value=b'2', timestamp_micros=1000)
+        set_pb3 = self._set_cell_pb(value=b'3')
+        mutations = [
+            self._set_cell_pb(value=b'0'),
+            set_pb1,
+            set_pb2,
+            set_pb3,
+        ]
+        # Cells with explicit timestamps are kept (they may be in
+        # different versions), but only the last write of a
+        # server-timestamped cell matters.
+        self.assertEqual(self._callFUT(mutations),
+                         [set_pb1, set_pb2, set_pb3])
+
+    def test_duplicate_delete_from_column(self):
+        other_pb = self._delete_column_pb(qualifier=b'other')
+        set_pb = self._set_cell_pb(timestamp_micros=1000)
+        delete_pb = self._delete_column_pb()
+        mutations = [
+            self._delete_column_pb(),
+            other_pb,
+            set_pb,
+            delete_pb,
+        ]
+        self.assertEqual(self._callFUT(mutations),
+                         [other_pb, set_pb, delete_pb])
+
+
+class _RetryPolicy(object):
+
+    def __init__(self):
+        self.calls = 0
+        self.retried = []
+
+    def call(self, func, *args, **kwargs):
+        self.calls += 1
+        return func(*args, **kwargs)
+
+    def retry(self, exc, start, func, *args, **kwargs):
+        self.retried.append((exc, start))
+        return self.call(func, *args, **kwargs)
+
+
+class _FakeTime(object):
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class _MockFilter(object):
+
+    def __init__(self):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+        self.filter_pb = data_pb2.RowFilter(row_sample_filter=0.5)
+        self.to_pb_calls = 0
+
+    def to_pb(self):
+        self.to_pb_calls += 1
+        return self.filter_pb
+
+
 class _Client(object):
 
     data_stub = None
+    rate_limiter = None
+    hotspot_detector = None
 
 
 class _Table(object):
 
-    def __init__(self, name, client=None, timeout_seconds=None):
+    def __init__(self, name, client=None, timeout_seconds=None,
+                 retry_policy=None):
         self.name = name
         self.client = client
         self.timeout_seconds = timeout_seconds
+        self.retry_policy = retry_policy
+
+
+class _RateLimiter(object):
+
+    def __init__(self):
+        self.acquires = []
+
+    def acquire(self, kind, num_bytes=0, priority=None):
+        self.acquires.append((kind, num_bytes, priority))
+
+
+class _HotspotDetector(object):
+
+    def __init__(self):
+        self.row_keys = []
+
+    def record(self, row_key):
+        self.row_keys.append(row_key)
+
+
+class _Spool(object):
+
+    def __init__(self, retryable=True, pending_rows=()):
+        self.retryable = retryable
+        self.pending_rows = pending_rows
+        self.requests = []
+
+    def has_pending(self, row_key):
+        return row_key in self.pending_rows
+
+    def is_retryable(self, exc):
+        return self.retryable
+
+    def append(self, request_pb):
+        self.requests.append(request_pb)
@@ -399,6 +399,8 @@ class TestPartialRowsData(unittest2.TestCase):
         self.assertTrue(partial_rows_data._response_iterator
                         is response_iterator)
         self.assertEqual(partial_rows_data._rows, {})
+        self.assertEqual(partial_rows_data._rate_limiter, None)
+        self.assertEqual(partial_rows_data._priority, 'interactive')
 
     def test_rows_getter(self):
         partial_rows_data = self._makeOne(None)
@@ -451,6 +453,22 @@ class TestPartialRowsData(unittest2.TestCase):
         expected_rows = {row_key: PartialRowData(row_key)}
         self.assertEqual(partial_rows_data.rows, expected_rows)
 
+    def test_consume_next_with_rate_limiter(self):
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable.rate_limiter import BATCH
+
+        row_key = b'row-key'
+        value_pb = messages_pb2.ReadRowsResponse(row_key=row_key)
+        response_iterator = _MockCancellableIterator(value_pb)
+        rate_limiter = _RateLimiter()
+        partial_rows_data = self._makeOne(response_iterator,
+                                          rate_limiter=rate_limiter,
+                                          priority=BATCH)
+        partial_rows_data.consume_next()
+        self.assertEqual(rate_limiter.charges,
+                         [('read', value_pb.ByteSize(), BATCH)])
+
     def test_consume_next_row_exists(self):
         from gcloud_bigtable._generated import (
             bigtable_service_messages_pb2 as messages_pb2)
@@ -510,3 +528,12 @@ class _MockCancellableIterator(object):
 
     def next(self):
         return next(self.iter_values)
+
+
+class _RateLimiter(object):
+
+    def __init__(self):
+        self.charges = []
+
+    def charge(self, kind, num_bytes, priority):
+        self.charges.append((kind, num_bytes, priority))
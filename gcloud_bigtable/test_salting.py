@@ -0,0 +1,207 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest2
+
+
+class TestKeySalter(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.salting import KeySalter
+        return KeySalter
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def test_constructor(self):
+        salter = self._makeOne(16)
+        self.assertEqual(salter.num_buckets, 16)
+        self.assertEqual(salter._prefix_length, 2)
+
+    def test_constructor_bad_num_buckets(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(0)
+
+    def test_prefix(self):
+        self.assertEqual(self._makeOne(1).prefix(0), b'0')
+        self.assertEqual(self._makeOne(10).prefix(3), b'3')
+        self.assertEqual(self._makeOne(11).prefix(3), b'03')
+        self.assertEqual(self._makeOne(100).prefix(42), b'42')
+
+    def test_bucket(self):
+        import zlib
+
+        salter = self._makeOne(7)
+        row_key = b'2015-11-05T10:00:00'
+        expected = (zlib.crc32(row_key) & 0xffffffff) % 7
+        self.assertEqual(salter.bucket(row_key), expected)
+        self.assertEqual(salter.bucket(row_key.decode('ascii')), expected)
+
+    def test_salt_and_unsalt(self):
+        salter = self._makeOne(16)
+        row_key = b'row-key'
+        salted_key = salter.salt(row_key)
+        self.assertEqual(salted_key,
+                         salter.prefix(salter.bucket(row_key)) + row_key)
+        self.assertEqual(salter.salt(u'row-key'), salted_key)
+        self.assertEqual(salter.unsalt(salted_key), row_key)
+
+    def test_row(self):
+        salter = self._makeOne(16)
+        table = _Table()
+        filter_ = object()
+        row = salter.row(table, b'row-key', filter_=filter_)
+        self.assertEqual(row, (salter.salt(b'row-key'), filter_))
+
+    def _makeTable(self, salter, row_keys):
+        buckets = {}
+        for row_key in sorted(row_keys):
+            salted_key = salter.salt(row_key)
+            buckets.setdefault(salted_key[:salter._prefix_length],
+                               []).append(salted_key)
+        return _Table(buckets)
+
+    def test_read_rows(self):
+        from gcloud_bigtable.rate_limiter import INTERACTIVE
+
+        salter = self._makeOne(3)
+        row_keys = [b'key%d' % (index,) for index in range(10)]
+        table = self._makeTable(salter, row_keys)
+
+        result = salter.read_rows(table, start_key=b'key')
+        # Every request is sent before any row is consumed.
+        self.assertEqual(table.read_rows_calls, [{
+            'start_key': prefix + b'key',
+            'end_key': end_key,
+            'filter_': None,
+            'limit': None,
+            'timeout_seconds': None,
+            'priority': INTERACTIVE,
+        } for prefix, end_key in [(b'0', b'1'), (b'1', b'2'), (b'2', b'3')]])
+        self.assertEqual(table.streams[0].consume_next_calls, 0)
+
+        rows = list(result)
+        self.assertEqual([row_key for row_key, _ in rows], row_keys)
+        for row_key, row in rows:
+            self.assertEqual(row.row_key, salter.salt(row_key))
+        for stream in table.streams:
+            self.assertTrue(stream.cancelled)
+
+    def test_read_rows_with_end_key_and_limit(self):
+        salter = self._makeOne(2)
+        row_keys = [b'key%d' % (index,) for index in range(6)]
+        table = self._makeTable(salter, row_keys)
+        filter_ = object()
+
+        result = salter.read_rows(table, end_key=u'key9', filter_=filter_,
+                                  limit=3, timeout_seconds=5,
+                                  priority='batch')
+        self.assertEqual(table.read_rows_calls, [{
+            'start_key': prefix,
+            'end_key': prefix + b'key9',
+            'filter_': filter_,
+            'limit': 3,
+            'timeout_seconds': 5,
+            'priority': 'batch',
+        } for prefix in (b'0', b'1')])
+        self.assertEqual([row_key for row_key, _ in result], row_keys[:3])
+        for stream in table.streams:
+            self.assertTrue(stream.cancelled)
+
+    def test_read_rows_equal_keys(self):
+        salter = self._makeOne(2)
+        # The same key in both buckets: ordered by bucket, without
+        # comparing the rows.
+        table = _Table({b'0': [b'0key'], b'1': [b'1key']})
+        rows = list(salter.read_rows(table))
+        self.assertEqual([(row_key, row.row_key) for row_key, row in rows],
+                         [(b'key', b'0key'), (b'key', b'1key')])
+
+
+class Test__prefix_successor(unittest2.TestCase):
+
+    def _callFUT(self, prefix):
+        from gcloud_bigtable.salting import _prefix_successor
+        return _prefix_successor(prefix)
+
+    def test_it(self):
+        self.assertEqual(self._callFUT(b'0'), b'1')
+        self.assertEqual(self._callFUT(b'19'), b'1:')
+
+
+class Test__iter_committed_rows(unittest2.TestCase):
+
+    def _callFUT(self, partial_rows_data):
+        from gcloud_bigtable.salting import _iter_committed_rows
+        return _iter_committed_rows(partial_rows_data)
+
+    def test_it(self):
+        # The first row is streamed in two responses.
+        stream = _Stream([b'row-key1', b'row-key2'], split_rows=True)
+        rows = self._callFUT(stream)
+        self.assertEqual(next(rows).row_key, b'row-key1')
+        self.assertEqual(stream.consume_next_calls, 2)
+        # Committed rows are not kept.
+        self.assertEqual(stream.rows, {})
+        self.assertEqual([row.row_key for row in rows], [b'row-key2'])
+
+
+class _Row(object):
+
+    def __init__(self, row_key):
+        self.row_key = row_key
+        self.committed = False
+
+
+class _Stream(object):
+
+    def __init__(self, row_keys, split_rows=False):
+        self.responses = []
+        for row_key in row_keys:
+            if split_rows:
+                self.responses.append((row_key, False))
+            self.responses.append((row_key, True))
+        self.rows = {}
+        self.consume_next_calls = 0
+        self.cancelled = False
+
+    def consume_next(self):
+        self.consume_next_calls += 1
+        if not self.responses:
+            raise StopIteration
+        row_key, commit = self.responses.pop(0)
+        row = self.rows.setdefault(row_key, _Row(row_key))
+        row.committed = commit
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _Table(object):
+
+    def __init__(self, buckets=None):
+        self.buckets = buckets or {}
+        self.read_rows_calls = []
+        self.streams = []
+
+    def row(self, row_key, filter_=None):
+        return row_key, filter_
+
+    def read_rows(self, **kwargs):
+        self.read_rows_calls.append(kwargs)
+        start_key = kwargs['start_key']
+        stream = _Stream(self.buckets.get(start_key[:1], []))
+        self.streams.append(stream)
+        return stream
@@ -0,0 +1,426 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import unittest2
+
+
+TABLE_NAME = 'projects/project/zones/zone/clusters/cluster/tables/table'
+
+
+class TestWriteSpool(unittest2.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.spool import WriteSpool
+        return WriteSpool
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def _segment_files(self):
+        import os
+        return sorted(os.listdir(self.temp_dir))
+
+    def test_constructor_defaults(self):
+        import os
+        from gcloud_bigtable.retry import RetryPolicy
+        from gcloud_bigtable.spool import DEFAULT_MAX_SEGMENT_BYTES
+
+        directory = os.path.join(self.temp_dir, 'sub', 'dir')
+        spool = self._makeOne(directory)
+        self.assertTrue(os.path.isdir(directory))
+        self.assertEqual(spool.directory, directory)
+        self.assertEqual(spool.max_segment_bytes, DEFAULT_MAX_SEGMENT_BYTES)
+        self.assertTrue(spool.sync)
+        self.assertTrue(isinstance(spool.retry_policy, RetryPolicy))
+        self.assertEqual(spool.error_callback, None)
+        self.assertEqual(spool._segments, [])
+        self.assertEqual(spool._writer, None)
+        self.assertEqual(spool._replayer, None)
+
+    def test_constructor_explicit(self):
+        retry_policy = _RetryPolicy()
+        error_callback = object()
+        spool = self._makeOne(self.temp_dir, max_segment_bytes=10,
+                              sync=False, retry_policy=retry_policy,
+                              error_callback=error_callback)
+        self.assertEqual(spool.max_segment_bytes, 10)
+        self.assertFalse(spool.sync)
+        self.assertTrue(spool.retry_policy is retry_policy)
+        self.assertTrue(spool.error_callback is error_callback)
+
+    def test_constructor_bad_max_segment_bytes(self):
+        with self.assertRaises(ValueError):
+            self._makeOne(self.temp_dir, max_segment_bytes=0)
+
+    def test_constructor_existing_segments(self):
+        import os
+
+        for filename in ('%020d.spool' % 3, '%020d.spool' % 1, 'other'):
+            with open(os.path.join(self.temp_dir, filename), 'wb'):
+                pass
+        spool = self._makeOne(self.temp_dir)
+        self.assertEqual(spool._segments, [1, 3])
+        self.assertEqual(spool._row_counts, {})
+        # New requests are appended after the existing segments.
+        spool.append(_makeRequest(b'row-key'))
+        self.assertEqual(spool._segments, [1, 3, 4])
+        spool.close()
+
+    def test_constructor_existing_requests(self):
+        spool = self._makeOne(self.temp_dir, max_segment_bytes=1)
+        for row_key in (b'row-key1', b'row-key2', b'row-key1'):
+            spool.append(_makeRequest(row_key))
+        spool.close()
+
+        spool = self._makeOne(self.temp_dir)
+        self.assertEqual(spool._row_counts,
+                         {b'row-key1': 2, b'row-key2': 1})
+        self.assertTrue(spool.has_pending(b'row-key1'))
+        self.assertFalse(spool.has_pending(b'row-key3'))
+
+    def test_is_retryable(self):
+        spool = self._makeOne(self.temp_dir,
+                              retry_policy=_RetryPolicy(retryable=False))
+        self.assertFalse(spool.is_retryable(RuntimeError('Failed')))
+
+    def test_append(self):
+        from gcloud_bigtable.spool import _read_records
+
+        spool = self._makeOne(self.temp_dir)
+        request1 = _makeRequest(b'row-key1')
+        request2 = _makeRequest(b'row-key2')
+        spool.append(request1)
+        spool.append(request2)
+        spool.close()
+        self.assertEqual(self._segment_files(), ['%020d.spool' % 0])
+        records = _read_records(spool._segment_path(0))
+        self.assertEqual(records, [request1.SerializeToString(),
+                                   request2.SerializeToString()])
+
+    def test_append_new_segment(self):
+        spool = self._makeOne(self.temp_dir, max_segment_bytes=1, sync=False)
+        for row_key in (b'row-key1', b'row-key2'):
+            spool.append(_makeRequest(row_key))
+        spool.close()
+        self.assertEqual(spool._segments, [0, 1])
+        self.assertEqual(self._segment_files(),
+                         ['%020d.spool' % 0, '%020d.spool' % 1])
+
+    def test_replay(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        spool = self._makeOne(self.temp_dir, max_segment_bytes=1)
+        requests = [_makeRequest(b'row-key1'), _makeRequest(b'row-key2')]
+        for request_pb in requests:
+            spool.append(request_pb)
+        spool.append(requests[0])
+        self.assertTrue(spool.has_pending(b'row-key1'))
+        self.assertTrue(spool.has_pending(b'row-key2'))
+        stub = StubMock(empty_pb2.Empty(), empty_pb2.Empty(),
+                        empty_pb2.Empty())
+        timeout_seconds = 11
+        self.assertEqual(spool.replay(stub, timeout_seconds), 3)
+        requests.append(requests[0])
+        self.assertFalse(spool.has_pending(b'row-key1'))
+        self.assertFalse(spool.has_pending(b'row-key2'))
+        self.assertEqual(spool._row_counts, {})
+        self.assertEqual(stub.method_calls, [
+            ('MutateRow', (request_pb, timeout_seconds), {})
+            for request_pb in requests])
+        self.assertEqual(spool._segments, [])
+        self.assertEqual(self._segment_files(), [])
+        self.assertEqual(spool._writer, None)
+        # Nothing left to replay.
+        self.assertEqual(spool.replay(stub, timeout_seconds), 0)
+
+    def test_replay_retryable_failure(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        spool = self._makeOne(self.temp_dir, retry_policy=_RetryPolicy())
+        requests = [_makeRequest(b'row-key1'), _makeRequest(b'row-key2')]
+        for request_pb in requests:
+            spool.append(request_pb)
+        stub = StubMock(empty_pb2.Empty(), RuntimeError('Unavailable'))
+        self.assertEqual(spool.replay(stub, 11), 1)
+        self.assertEqual(spool._segments, [0])
+        self.assertEqual(spool._replay_offset, 1)
+
+        # New requests go to a new segment, after the one being replayed.
+        request3 = _makeRequest(b'row-key3')
+        spool.append(request3)
+        self.assertEqual(spool._segments, [0, 1])
+
+        # Replaying resumes with the request which failed.
+        stub = StubMock(empty_pb2.Empty(), empty_pb2.Empty())
+        self.assertEqual(spool.replay(stub, 11), 2)
+        sent = [args[0] for _, args, _ in stub.method_calls]
+        self.assertEqual(sent, [requests[1], request3])
+        self.assertEqual(spool._segments, [])
+        self.assertEqual(spool._replay_offset, 0)
+
+    def _replay_not_retryable_helper(self, error_callback=None):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        spool = self._makeOne(self.temp_dir,
+                              retry_policy=_RetryPolicy(retryable=False),
+                              error_callback=error_callback)
+        requests = [_makeRequest(b'row-key1'), _makeRequest(b'row-key2')]
+        for request_pb in requests:
+            spool.append(request_pb)
+        error = RuntimeError('Not found')
+        stub = StubMock(error, empty_pb2.Empty())
+        # The request which failed is dropped.
+        self.assertEqual(spool.replay(stub, 11), 1)
+        self.assertEqual(len(stub.method_calls), 2)
+        self.assertEqual(spool._segments, [])
+        return requests, error
+
+    def test_replay_not_retryable(self):
+        self._replay_not_retryable_helper()
+
+    def test_replay_not_retryable_with_callback(self):
+        dropped = []
+
+        def error_callback(request_pb, exc):
+            dropped.append((request_pb, exc))
+
+        requests, error = self._replay_not_retryable_helper(
+            error_callback=error_callback)
+        self.assertEqual(dropped, [(requests[0], error)])
+
+    def test_replay_error_callback_fails(self):
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        def error_callback(request_pb, exc):
+            raise ValueError('Callback failed')
+
+        spool = self._makeOne(self.temp_dir,
+                              retry_policy=_RetryPolicy(retryable=False),
+                              error_callback=error_callback)
+        requests = [_makeRequest(b'row-key1'), _makeRequest(b'row-key2')]
+        for request_pb in requests:
+            spool.append(request_pb)
+        stub = StubMock(RuntimeError('Not found'))
+        with self.assertRaises(ValueError):
+            spool.replay(stub, 11)
+        # The failed request was dropped before the callback raised.
+        self.assertEqual(spool._replay_offset, 1)
+        self.assertFalse(spool.has_pending(b'row-key1'))
+
+        # The next replay carries on with the following request.
+        stub = StubMock(empty_pb2.Empty())
+        self.assertEqual(spool.replay(stub, 11), 1)
+        self.assertEqual(stub.method_calls, [
+            ('MutateRow', (requests[1], 11), {}),
+        ])
+        self.assertEqual(spool._segments, [])
+
+    def test__replay_loop(self):
+        spool = self._makeOne(self.temp_dir)
+        spool._replayer_stopped = _Event([False, False, True])
+        calls = []
+        spool.replay = lambda *args: calls.append(args)
+        client = _Client()
+        spool._replay_loop(client, 2.5, 11)
+        self.assertEqual(calls, [(client.data_stub, 11)] * 2)
+        self.assertEqual(spool._replayer_stopped.waits, [2.5] * 3)
+
+    def test__replay_loop_failure(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import spool as MUT
+
+        spool = self._makeOne(self.temp_dir)
+        spool._replayer_stopped = _Event([False, False, True])
+        calls = []
+
+        def replay(*args):
+            calls.append(args)
+            raise IOError('Failed')
+
+        spool.replay = replay
+        logger = _Logger()
+        with _Monkey(MUT, LOGGER=logger):
+            spool._replay_loop(_Client(), 2.5, 11)
+        # The errors are logged and the thread keeps going.
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(len(logger.exceptions), 2)
+
+    def test__replay_loop_client_stopped(self):
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable import spool as MUT
+
+        spool = self._makeOne(self.temp_dir)
+        spool._replayer_stopped = _Event([False, False, True])
+        spool.replay = replay_calls = _LoopRecorder()
+        logger = _Logger()
+        with _Monkey(MUT, LOGGER=logger):
+            spool._replay_loop(_StoppedClient(), 2.5, 11)
+        # The thread exits once the client is stopped.
+        self.assertEqual(replay_calls.calls, [])
+        self.assertEqual(spool._replayer_stopped.waits, [2.5])
+        self.assertEqual(len(logger.warnings), 1)
+
+    def test_start_and_stop_replayer(self):
+        spool = self._makeOne(self.temp_dir)
+        spool._replay_loop = loop_calls = _LoopRecorder()
+        client = _Client()
+        spool.start_replayer(client, interval=0.5)
+        self.assertTrue(spool._replayer is not None)
+        self.assertTrue(spool._replayer.daemon)
+        with self.assertRaises(ValueError):
+            spool.start_replayer(client)
+        spool.stop_replayer()
+        self.assertEqual(spool._replayer, None)
+        self.assertTrue(spool._replayer_stopped.is_set())
+        self.assertEqual(loop_calls.calls,
+                         [(client, 0.5, client.timeout_seconds)])
+        # Stopping again does nothing.
+        spool.stop_replayer()
+
+    def test_start_replayer_bad_interval(self):
+        spool = self._makeOne(self.temp_dir)
+        with self.assertRaises(ValueError):
+            spool.start_replayer(_Client(), interval=0)
+
+    def test_close(self):
+        spool = self._makeOne(self.temp_dir)
+        spool.append(_makeRequest(b'row-key'))
+        writer = spool._writer
+        spool.close()
+        self.assertTrue(writer.closed)
+        self.assertEqual(spool._writer, None)
+        # The spooled request is kept.
+        self.assertEqual(self._segment_files(), ['%020d.spool' % 0])
+
+
+class Test__read_records(unittest2.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.filename = tempfile.mktemp()
+
+    def tearDown(self):
+        import os
+        os.remove(self.filename)
+
+    def _callFUT(self, contents):
+        from gcloud_bigtable.spool import _read_records
+
+        with open(self.filename, 'wb') as file_obj:
+            file_obj.write(contents)
+        return _read_records(self.filename)
+
+    def _makeRecord(self, data):
+        import zlib
+        from gcloud_bigtable.spool import _HEADER
+        return _HEADER.pack(len(data), zlib.crc32(data) & 0xffffffff) + data
+
+    def test_records(self):
+        contents = self._makeRecord(b'abc') + self._makeRecord(b'')
+        self.assertEqual(self._callFUT(contents), [b'abc', b''])
+
+    def test_truncated_header(self):
+        contents = self._makeRecord(b'abc') + b'\x00\x00'
+        self.assertEqual(self._callFUT(contents), [b'abc'])
+
+    def test_truncated_data(self):
+        contents = self._makeRecord(b'abc') + self._makeRecord(b'def')[:-1]
+        self.assertEqual(self._callFUT(contents), [b'abc'])
+
+    def test_corrupted_data(self):
+        record = self._makeRecord(b'def')
+        contents = record[:-1] + b'x' + self._makeRecord(b'ghi')
+        self.assertEqual(self._callFUT(contents), [])
+
+
+def _makeRequest(row_key):
+    from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+    from gcloud_bigtable._generated import (
+        bigtable_service_messages_pb2 as messages_pb2)
+
+    mutation = data_pb2.Mutation(
+        delete_from_row=data_pb2.Mutation.DeleteFromRow())
+    return messages_pb2.MutateRowRequest(table_name=TABLE_NAME,
+                                         row_key=row_key,
+                                         mutations=[mutation])
+
+
+class _RetryPolicy(object):
+
+    def __init__(self, retryable=True):
+        self.retryable = retryable
+
+    def is_retryable(self, exc):
+        return self.retryable
+
+
+class _Client(object):
+
+    data_stub = object()
+    timeout_seconds = 10
+
+
+class _StoppedClient(object):
+
+    timeout_seconds = 10
+
+    @property
+    def data_stub(self):
+        raise ValueError('Client has not been started.')
+
+
+class _Logger(object):
+
+    def __init__(self):
+        self.exceptions = []
+        self.warnings = []
+
+    def exception(self, msg, *args):
+        self.exceptions.append(msg % args)
+
+    def warning(self, msg, *args):
+        self.warnings.append(msg % args)
+
+
+class _Event(object):
+
+    def __init__(self, results):
+        self.results = results
+        self.waits = []
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        return self.results.pop(0)
+
+
+class _LoopRecorder(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, *args):
+        self.calls.append(args)
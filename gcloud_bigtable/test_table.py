@@ -36,6 +36,13 @@ class TestTable(unittest2.TestCase):
         table = self._makeOne(TABLE_ID, cluster)
         self.assertEqual(table.table_id, TABLE_ID)
         self.assertTrue(table._cluster is cluster)
+        self.assertEqual(table._retry_policy, None)
+
+    def test_constructor_with_retry_policy(self):
+        cluster = object()
+        retry_policy = object()
+        table = self._makeOne(TABLE_ID, cluster, retry_policy=retry_policy)
+        self.assertTrue(table._retry_policy is retry_policy)
 
     def test_cluster_getter(self):
         cluster = object()
@@ -54,6 +61,18 @@ class TestTable(unittest2.TestCase):
         table = self._makeOne(TABLE_ID, cluster)
         self.assertEqual(table.timeout_seconds, timeout_seconds)
 
+    def test_retry_policy_getter(self):
+        retry_policy = object()
+        table = self._makeOne(TABLE_ID, None, retry_policy=retry_policy)
+        self.assertTrue(table.retry_policy is retry_policy)
+
+    def test_retry_policy_getter_from_client(self):
+        client = _Client()
+        client.retry_policy = retry_policy = object()
+        cluster = _Cluster(None, client=client)
+        table = self._makeOne(TABLE_ID, cluster)
+        self.assertTrue(table.retry_policy is retry_policy)
+
     def test_name_property(self):
         cluster_name = 'cluster_name'
         cluster = _Cluster(cluster_name)
@@ -85,6 +104,33 @@ class TestTable(unittest2.TestCase):
         self.assertEqual(row._table, table)
         self.assertEqual(row._filter, filter_)
 
+    def test_mutation_batcher_factory(self):
+        from gcloud_bigtable.mutation_batcher import MutationBatcher
+
+        timeout_seconds = 9
+        cluster = _Cluster('cluster_name', client=_Client(),
+                           timeout_seconds=timeout_seconds)
+        table = self._makeOne(TABLE_ID, cluster)
+        max_mutations = 10
+        max_bytes = 100
+        max_inflight = 3
+        batcher = table.mutation_batcher(max_mutations=max_mutations,
+                                         max_bytes=max_bytes,
+                                         max_inflight=max_inflight,
+                                         coalesce=True)
+        self.assertTrue(isinstance(batcher, MutationBatcher))
+        self.assertTrue(batcher.table is table)
+        self.assertEqual(batcher._table_name, table.name)
+        self.assertEqual(batcher._max_mutations, max_mutations)
+        self.assertEqual(batcher._max_bytes, max_bytes)
+        self.assertEqual(batcher._max_inflight, max_inflight)
+        self.assertEqual(batcher._timeout_seconds, timeout_seconds)
+        self.assertEqual(batcher._retry_policy, None)
+        self.assertEqual(batcher._coalesce, True)
+        self.assertEqual(batcher._priority, 'batch')
+        self.assertEqual(batcher._controller, None)
+        self.assertEqual(batcher._spool, None)
+
     def test___eq__(self):
         table_id = 'table_id'
         cluster = object()
@@ -289,7 +335,7 @@ class TestTable(unittest2.TestCase):
             self._list_column_families_helper(
                 column_family_name=column_family_name)
 
-    def _read_row_helper(self, chunks):
+    def _read_row_helper(self, chunks, retry_policy=None, rate_limiter=None):
         from gcloud_bigtable._generated import (
             bigtable_service_messages_pb2 as messages_pb2)
         from gcloud_bigtable._grpc_mocks import StubMock
@@ -299,6 +345,7 @@ class TestTable(unittest2.TestCase):
         from gcloud_bigtable import table as MUT
 
         client = _Client()
+        client.rate_limiter = rate_limiter
         cluster_name = ('projects/' + PROJECT_ID + '/zones/' + ZONE +
                         '/clusters/' + CLUSTER_ID)
         cluster = _Cluster(cluster_name, client=client)
@@ -330,7 +377,8 @@ class TestTable(unittest2.TestCase):
         timeout_seconds = 596
         with _Monkey(MUT, _create_row_request=mock_create_row_request):
             result = table.read_row(row_key, filter_=filter_obj,
-                                    timeout_seconds=timeout_seconds)
+                                    timeout_seconds=timeout_seconds,
+                                    retry_policy=retry_policy)
 
         self.assertEqual(result, expected_result)
         self.assertEqual(stub.method_calls, [(
@@ -341,6 +389,7 @@ class TestTable(unittest2.TestCase):
         mock_create_row_request.check_called(
             self, [(table.name,)],
             [{'row_key': row_key, 'filter_': filter_obj}])
+        return response_pb
 
     def test_read_row(self):
         from gcloud_bigtable._generated import (
@@ -350,6 +399,27 @@ class TestTable(unittest2.TestCase):
         chunks = [chunk]
         self._read_row_helper(chunks)
 
+    def test_read_row_with_retry_policy(self):
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+
+        chunk = messages_pb2.ReadRowsResponse.Chunk(commit_row=True)
+        retry_policy = _RetryPolicy()
+        self._read_row_helper([chunk], retry_policy=retry_policy)
+        self.assertEqual(retry_policy.calls, 1)
+
+    def test_read_row_with_rate_limiter(self):
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+
+        chunk = messages_pb2.ReadRowsResponse.Chunk(commit_row=True)
+        rate_limiter = _RateLimiter()
+        response_pb = self._read_row_helper([chunk],
+                                            rate_limiter=rate_limiter)
+        self.assertEqual(rate_limiter.acquires, [('read', 0, 'interactive')])
+        self.assertEqual(rate_limiter.charges,
+                         [('read', response_pb.ByteSize())])
+
     def test_read_empty_row(self):
         chunks = []
         self._read_row_helper(chunks)
@@ -419,6 +489,22 @@ class TestTable(unittest2.TestCase):
         mock_create_row_request.check_called(self, [(table.name,)],
                                              [created_kwargs])
 
+    def test_read_rows_with_rate_limiter(self):
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable.rate_limiter import BATCH
+
+        client = _Client()
+        client.rate_limiter = rate_limiter = _RateLimiter()
+        cluster = _Cluster('cluster_name', client=client)
+        table = self._makeOne(TABLE_ID, cluster)
+        client.data_stub = StubMock(object())
+
+        result = table.read_rows(priority=BATCH)
+        self.assertEqual(rate_limiter.acquires, [('read', 0, BATCH)])
+        # The streamed responses are charged as they are consumed.
+        self.assertTrue(result._rate_limiter is rate_limiter)
+        self.assertEqual(result._priority, BATCH)
+
     def test_sample_row_keys(self):
         from gcloud_bigtable._generated import (
             bigtable_service_messages_pb2 as messages_pb2)
@@ -453,6 +539,517 @@ class TestTable(unittest2.TestCase):
             {},
         )])
 
+    def test_prepare_read(self):
+        from gcloud_bigtable._testing import _MockCalled
+        from gcloud_bigtable._testing import _Monkey
+        from gcloud_bigtable.table import PreparedRead
+        from gcloud_bigtable import table as MUT
+
+        cluster_name = ('projects/' + PROJECT_ID + '/zones/' + ZONE +
+                        '/clusters/' + CLUSTER_ID)
+        cluster = _Cluster(cluster_name)
+        table = self._makeOne(TABLE_ID, cluster)
+
+        request_pb = object()  # Returned by our mock.
+        mock_create_row_request = _MockCalled(request_pb)
+
+        filter_obj = object()
+        allow_row_interleaving = True
+        limit = 10
+        with _Monkey(MUT, _create_row_request=mock_create_row_request):
+            result = table.prepare_read(
+                filter_=filter_obj,
+                allow_row_interleaving=allow_row_interleaving, limit=limit)
+
+        self.assertTrue(isinstance(result, PreparedRead))
+        self.assertTrue(result.table is table)
+        self.assertTrue(result._request_pb is request_pb)
+        created_kwargs = {
+            'filter_': filter_obj,
+            'allow_row_interleaving': allow_row_interleaving,
+            'limit': limit,
+        }
+        mock_create_row_request.check_called(self, [(table.name,)],
+                                             [created_kwargs])
+
+    def _put_columns_helper(self, values, expected_values, timestamps=None,
+                            timestamp_micros=-1, responses=None):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable._generated import empty_pb2
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        if responses is None:
+            responses = [empty_pb2.Empty(), empty_pb2.Empty()]
+        client.data_stub = stub = StubMock(*responses)
+        timeout_seconds = 17
+        cluster = _Cluster('cluster_name', client=client,
+                           timeout_seconds=timeout_seconds)
+        table = self._makeOne(TABLE_ID, cluster)
+        row_keys = _Array([b'row-key1', u'row-key2'])
+        qualifiers = [b'col1', u'col2']
+        result = table.put_columns(row_keys, 'cf', qualifiers, values,
+                                   timestamps=timestamps)
+
+        expected_calls = []
+        for index, row_key in enumerate([b'row-key1', b'row-key2']):
+            mutations = [
+                data_pb2.Mutation(set_cell=data_pb2.Mutation.SetCell(
+                    family_name='cf',
+                    column_qualifier=qualifier,
+                    timestamp_micros=timestamp_micros,
+                    value=column[index],
+                ))
+                for qualifier, column in zip([b'col1', b'col2'],
+                                             expected_values)]
+            request_pb = messages_pb2.MutateRowRequest(
+                table_name=table.name, row_key=row_key, mutations=mutations)
+            expected_calls.append(
+                ('MutateRow', (request_pb, timeout_seconds), {}))
+        self.assertEqual(stub.method_calls, expected_calls)
+        return result
+
+    def test_put_columns(self):
+        values = [[b'a', u'b'], _Array([1, -1])]
+        expected_values = [
+            [b'a', b'b'],
+            [b'\x00' * 7 + b'\x01', b'\xff' * 8],
+        ]
+        result = self._put_columns_helper(values, expected_values)
+        self.assertEqual(result, [])
+
+    def test_put_columns_with_timestamps(self):
+        import datetime
+        from gcloud_bigtable._helpers import EPOCH
+
+        timestamp = EPOCH + datetime.timedelta(seconds=1)
+        values = [[b'a', b'b'], [b'c', b'd']]
+        self._put_columns_helper(values, values,
+                                 timestamps=[timestamp, timestamp],
+                                 timestamp_micros=1000000)
+
+    def test_put_columns_failure(self):
+        from gcloud_bigtable._generated import empty_pb2
+
+        error = RuntimeError('Failed')
+        values = [[b'a', b'b'], [b'c', b'd']]
+        result = self._put_columns_helper(
+            values, values, responses=[empty_pb2.Empty(), error])
+        self.assertEqual(result, [(b'row-key2', error)])
+
+    def _put_columns_bad_lengths_helper(self, qualifiers, values,
+                                        timestamps=None):
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = stub = StubMock()
+        cluster = _Cluster('cluster_name', client=client)
+        table = self._makeOne(TABLE_ID, cluster)
+        with self.assertRaises(ValueError):
+            table.put_columns([b'row-key1', b'row-key2'], 'cf', qualifiers,
+                              values, timestamps=timestamps)
+        self.assertEqual(stub.method_calls, [])
+
+    def test_put_columns_too_few_columns(self):
+        self._put_columns_bad_lengths_helper([b'col1', b'col2'],
+                                             [[b'a', b'b']])
+
+    def test_put_columns_column_too_short(self):
+        self._put_columns_bad_lengths_helper([b'col1'], [[b'a']])
+
+    def test_put_columns_too_few_timestamps(self):
+        from gcloud_bigtable._helpers import EPOCH
+
+        self._put_columns_bad_lengths_helper([b'col1'], [[b'a', b'b']],
+                                             timestamps=[EPOCH])
+
+    def test_read_modify_write_many(self):
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable._helpers import EPOCH
+
+        client = _Client()
+        client.data_stub = stub = StubMock(
+            self._makeResponse(b'row-key1', b'col1', b'one'),
+            self._makeResponse(b'row-key3', b'col1', b'three'))
+        client.rate_limiter = rate_limiter = _RateLimiter()
+        timeout_seconds = 19
+        cluster = _Cluster('cluster_name', client=client,
+                           timeout_seconds=timeout_seconds)
+        table = self._makeOne(TABLE_ID, cluster)
+        row1 = table.row(b'row-key1')
+        row1.increment_cell_value('cf', b'col1', 1)
+        row1.append_cell_value('cf', b'col2', b'x')
+        row2 = table.row(b'row-key2')
+        row3 = table.row(b'row-key3')
+        row3.increment_cell_value('cf', b'col1', -2)
+        rows = [row1, row2, row3]
+        request_pbs = [
+            messages_pb2.ReadModifyWriteRowRequest(
+                table_name=table.name, row_key=row.row_key,
+                rules=row._rule_pb_list)
+            for row in (row1, row3)]
+
+        result = table.read_modify_write_many(iter(rows))
+        self.assertEqual(result, [
+            {u'cf': {b'col1': [(b'one', EPOCH)]}},
+            {},
+            {u'cf': {b'col1': [(b'three', EPOCH)]}},
+        ])
+        # The row without rules is skipped.
+        self.assertEqual(stub.method_calls, [
+            ('ReadModifyWriteRow', (request_pb, timeout_seconds), {})
+            for request_pb in request_pbs])
+        self.assertEqual(rate_limiter.acquires, [
+            ('write', request_pb.ByteSize(), 'interactive')
+            for request_pb in request_pbs])
+        for row in rows:
+            self.assertEqual(row._rule_pb_list, [])
+
+    def _makeResponse(self, row_key, qualifier, value):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+
+        return data_pb2.Row(key=row_key, families=[
+            data_pb2.Family(name='cf', columns=[
+                data_pb2.Column(qualifier=qualifier, cells=[
+                    data_pb2.Cell(value=value, timestamp_micros=0),
+                ]),
+            ]),
+        ])
+
+    def test_read_modify_write_many_failure_keeps_rules(self):
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable._helpers import EPOCH
+        from gcloud_bigtable.table import PartialCommitError
+
+        client = _Client()
+        client.data_stub = StubMock(
+            RuntimeError('Failed'),
+            self._makeResponse(b'row-key2', b'col1', b'two'))
+        cluster = _Cluster('cluster_name', client=client)
+        table = self._makeOne(TABLE_ID, cluster)
+        row1 = table.row(b'row-key1')
+        row1.increment_cell_value('cf', b'col1', 1)
+        row2 = table.row(b'row-key2')
+        row2.increment_cell_value('cf', b'col1', 1)
+
+        # The second request is sent before the first one fails.
+        with self.assertRaises(PartialCommitError) as exc_info:
+            table.read_modify_write_many([row1, row2], max_inflight=2)
+        self.assertEqual(exc_info.exception.row_keys, [b'row-key1'])
+        # The result of the committed row is not lost.
+        self.assertEqual(exc_info.exception.results, [
+            None,
+            {u'cf': {b'col1': [(b'two', EPOCH)]}},
+        ])
+        self.assertEqual(len(row1._rule_pb_list), 1)
+        self.assertEqual(row2._rule_pb_list, [])
+
+    def test_read_modify_write_many_not_sent_keeps_rules(self):
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable.table import PartialCommitError
+
+        client = _Client()
+        client.data_stub = stub = StubMock(RuntimeError('Failed'))
+        cluster = _Cluster('cluster_name', client=client)
+        table = self._makeOne(TABLE_ID, cluster)
+        row1 = table.row(b'row-key1')
+        row1.increment_cell_value('cf', b'col1', 1)
+        row2 = table.row(b'row-key2')
+        row2.increment_cell_value('cf', b'col1', 1)
+
+        with self.assertRaises(PartialCommitError) as exc_info:
+            table.read_modify_write_many([row1, row2, table.row(b'row-key3')],
+                                         max_inflight=1)
+        # The row which was not sent and the row without rules are told
+        # apart.
+        self.assertEqual(exc_info.exception.results, [None, None, {}])
+        self.assertEqual(len(stub.method_calls), 1)
+        self.assertEqual(len(row1._rule_pb_list), 1)
+        self.assertEqual(len(row2._rule_pb_list), 1)
+
+    def test_read_modify_write_many_all_errors(self):
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable.table import PartialCommitError
+
+        client = _Client()
+        error1 = RuntimeError('Failed 1')
+        error2 = RuntimeError('Failed 2')
+        client.data_stub = StubMock(error1, error2)
+        cluster = _Cluster('cluster_name', client=client)
+        table = self._makeOne(TABLE_ID, cluster)
+        rows = [table.row(b'row-key1'), table.row(b'row-key2')]
+        for row in rows:
+            row.increment_cell_value('cf', b'col1', 1)
+
+        with self.assertRaises(PartialCommitError) as exc_info:
+            table.read_modify_write_many(rows, max_inflight=2)
+        self.assertEqual(exc_info.exception.errors,
+                         [(b'row-key1', error1), (b'row-key2', error2)])
+        self.assertEqual(exc_info.exception.results, [None, None])
+
+    def test_read_modify_write_many_bad_max_inflight(self):
+        table = self._makeOne(TABLE_ID, None)
+        with self.assertRaises(ValueError):
+            table.read_modify_write_many([], max_inflight=0)
+
+    def _makeFilteredRows(self, table, row_keys):
+        from gcloud_bigtable.row import RowFilter
+
+        row_filter = RowFilter(row_key_regex_filter=b'.*')
+        return [table.row(row_key, filter_=row_filter)
+                for row_key in row_keys]
+
+    def test_check_and_mutate_many(self):
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = stub = StubMock(
+            messages_pb2.CheckAndMutateRowResponse(predicate_matched=True),
+            messages_pb2.CheckAndMutateRowResponse(predicate_matched=False))
+        client.rate_limiter = rate_limiter = _RateLimiter()
+        client.hotspot_detector = hotspot_detector = _HotspotDetector()
+        timeout_seconds = 23
+        cluster = _Cluster('cluster_name', client=client,
+                           timeout_seconds=timeout_seconds)
+        table = self._makeOne(TABLE_ID, cluster)
+        row1, row2, row3 = rows = self._makeFilteredRows(
+            table, [b'row-key1', b'row-key2', b'row-key3'])
+        row1.delete(state=True)
+        row3.set_cell('cf', b'col', b'value', state=False)
+        request_pbs = [row._check_and_mutate_request()
+                       for row in (row1, row3)]
+
+        result = table.check_and_mutate_many(iter(rows))
+        # The row without mutations is skipped.
+        self.assertEqual(result, [True, None, False])
+        self.assertEqual(hotspot_detector.row_keys,
+                         [b'row-key1', b'row-key3'])
+        self.assertEqual(stub.method_calls, [
+            ('CheckAndMutateRow', (request_pb, timeout_seconds), {})
+            for request_pb in request_pbs])
+        self.assertEqual(rate_limiter.acquires, [
+            ('write', request_pb.ByteSize(), 'interactive')
+            for request_pb in request_pbs])
+        for row in rows:
+            self.assertEqual(list(row._true_pb_mutations), [])
+            self.assertEqual(list(row._false_pb_mutations), [])
+
+    def test_check_and_mutate_many_failure(self):
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable.table import PartialCommitError
+
+        client = _Client()
+        error = RuntimeError('Failed')
+        client.data_stub = stub = StubMock(error)
+        cluster = _Cluster('cluster_name', client=client)
+        table = self._makeOne(TABLE_ID, cluster)
+        rows = self._makeFilteredRows(table, [b'row-key1', b'row-key2'])
+        for row in rows:
+            row.delete(state=True)
+
+        with self.assertRaises(PartialCommitError) as exc_info:
+            table.check_and_mutate_many(rows, max_inflight=1)
+        self.assertEqual(exc_info.exception.errors, [(b'row-key1', error)])
+        self.assertEqual(exc_info.exception.results, [None, None])
+        # The second row was not sent. Neither row is cleared.
+        self.assertEqual(len(stub.method_calls), 1)
+        for row in rows:
+            self.assertEqual(len(row._true_pb_mutations), 1)
+
+    def test_check_and_mutate_many_partial_failure(self):
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable.table import PartialCommitError
+
+        client = _Client()
+        error = RuntimeError('Failed')
+        client.data_stub = StubMock(
+            messages_pb2.CheckAndMutateRowResponse(predicate_matched=True),
+            error)
+        cluster = _Cluster('cluster_name', client=client)
+        table = self._makeOne(TABLE_ID, cluster)
+        row1, row2 = rows = self._makeFilteredRows(
+            table, [b'row-key1', b'row-key2'])
+        for row in rows:
+            row.delete(state=True)
+
+        with self.assertRaises(PartialCommitError) as exc_info:
+            table.check_and_mutate_many(rows, max_inflight=2)
+        self.assertEqual(exc_info.exception.row_keys, [b'row-key2'])
+        # The outcome of the committed row is not lost.
+        self.assertEqual(exc_info.exception.results, [True, None])
+        self.assertEqual(list(row1._true_pb_mutations), [])
+        self.assertEqual(len(row2._true_pb_mutations), 1)
+
+    def test_check_and_mutate_many_without_filter(self):
+        from gcloud_bigtable._grpc_mocks import StubMock
+
+        client = _Client()
+        client.data_stub = stub = StubMock()
+        cluster = _Cluster('cluster_name', client=client)
+        table = self._makeOne(TABLE_ID, cluster)
+        rows = self._makeFilteredRows(table, [b'row-key1'])
+        rows[0].delete(state=True)
+        rows.append(table.row(b'row-key2'))
+        rows[1].delete()
+
+        with self.assertRaises(ValueError):
+            table.check_and_mutate_many(rows)
+        self.assertEqual(stub.method_calls, [])
+
+    def test_check_and_mutate_many_bad_max_inflight(self):
+        table = self._makeOne(TABLE_ID, None)
+        with self.assertRaises(ValueError):
+            table.check_and_mutate_many([], max_inflight=0)
+
+
+class TestPreparedRead(unittest2.TestCase):
+
+    def _getTargetClass(self):
+        from gcloud_bigtable.table import PreparedRead
+        return PreparedRead
+
+    def _makeOne(self, *args, **kwargs):
+        return self._getTargetClass()(*args, **kwargs)
+
+    def _makeTable(self, client=None):
+        from gcloud_bigtable.table import Table
+
+        cluster_name = ('projects/' + PROJECT_ID + '/zones/' + ZONE +
+                        '/clusters/' + CLUSTER_ID)
+        cluster = _Cluster(cluster_name, client=client)
+        return Table(TABLE_ID, cluster)
+
+    def _makeRequest(self, table_name):
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable.row import RowFilter
+
+        row_filter = RowFilter(row_sample_filter=0.33)
+        return messages_pb2.ReadRowsRequest(table_name=table_name,
+                                            filter=row_filter.to_pb())
+
+    def test_constructor(self):
+        table = object()
+        request_pb = object()
+        prepared_read = self._makeOne(table, request_pb)
+        self.assertTrue(prepared_read.table is table)
+        self.assertTrue(prepared_read._request_pb is request_pb)
+
+    def test_row_request(self):
+        table_name = 'table_name'
+        base_request_pb = self._makeRequest(table_name)
+        prepared_read = self._makeOne(None, base_request_pb)
+
+        row_key = u'row_key'
+        result = prepared_read.row_request(row_key)
+
+        expected_result = self._makeRequest(table_name)
+        expected_result.row_key = b'row_key'
+        self.assertEqual(result, expected_result)
+        # Make sure the template is unchanged.
+        self.assertEqual(base_request_pb, self._makeRequest(table_name))
+
+    def test_range_request_no_keys(self):
+        table_name = 'table_name'
+        base_request_pb = self._makeRequest(table_name)
+        prepared_read = self._makeOne(None, base_request_pb)
+
+        result = prepared_read.range_request()
+        self.assertEqual(result, base_request_pb)
+        self.assertFalse(result is base_request_pb)
+
+    def test_range_request_both_keys(self):
+        from gcloud_bigtable._generated import bigtable_data_pb2 as data_pb2
+
+        table_name = 'table_name'
+        base_request_pb = self._makeRequest(table_name)
+        prepared_read = self._makeOne(None, base_request_pb)
+
+        start_key = b'start_key'
+        end_key = b'end_key'
+        result = prepared_read.range_request(start_key=start_key,
+                                             end_key=end_key)
+
+        expected_result = self._makeRequest(table_name)
+        expected_result.row_range.CopyFrom(
+            data_pb2.RowRange(start_key=start_key, end_key=end_key))
+        self.assertEqual(result, expected_result)
+        # Make sure the template is unchanged.
+        self.assertEqual(base_request_pb, self._makeRequest(table_name))
+
+    def test_read_row(self):
+        from gcloud_bigtable._generated import (
+            bigtable_service_messages_pb2 as messages_pb2)
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable.row_data import PartialRowData
+
+        client = _Client()
+        table = self._makeTable(client=client)
+        prepared_read = self._makeOne(table, self._makeRequest(table.name))
+
+        # Create response_iterator
+        row_key = b'row-key'
+        chunk = messages_pb2.ReadRowsResponse.Chunk(commit_row=True)
+        response_pb = messages_pb2.ReadRowsResponse(row_key=row_key,
+                                                    chunks=[chunk])
+        response_iterator = [response_pb]
+
+        # Patch the stub used by the API method.
+        client.data_stub = stub = StubMock(response_iterator)
+
+        # Create expected_result.
+        expected_result = PartialRowData(row_key)
+        expected_result._committed = True
+        expected_result._chunks_encountered = True
+
+        # Perform the method and check the result.
+        timeout_seconds = 97
+        result = prepared_read.read_row(row_key,
+                                        timeout_seconds=timeout_seconds)
+        self.assertEqual(result, expected_result)
+        request_pb = prepared_read.row_request(row_key)
+        self.assertEqual(stub.method_calls, [(
+            'ReadRows',
+            (request_pb, timeout_seconds),
+            {},
+        )])
+
+    def test_read_rows(self):
+        from gcloud_bigtable._grpc_mocks import StubMock
+        from gcloud_bigtable.row_data import PartialRowsData
+
+        client = _Client()
+        table = self._makeTable(client=client)
+        prepared_read = self._makeOne(table, self._makeRequest(table.name))
+
+        # Patch the stub used by the API method.
+        response_iterator = object()
+        client.data_stub = stub = StubMock(response_iterator)
+
+        # Perform the method and check the result.
+        start_key = b'start-key'
+        end_key = b'end-key'
+        timeout_seconds = 98
+        result = prepared_read.read_rows(start_key=start_key,
+                                         end_key=end_key,
+                                         timeout_seconds=timeout_seconds)
+        self.assertEqual(result, PartialRowsData(response_iterator))
+        request_pb = prepared_read.range_request(start_key=start_key,
+                                                 end_key=end_key)
+        self.assertEqual(stub.method_calls, [(
+            'ReadRows',
+            (request_pb, timeout_seconds),
+            {},
+        )])
+
 
 class Test__create_row_request(unittest2.TestCase):
 
@@ -576,9 +1173,61 @@ class Test__create_row_request(unittest2.TestCase):
         self.assertEqual(result, expected_result)
 
 
+class Test__as_list(unittest2.TestCase):
+
+    def _callFUT(self, values):
+        from gcloud_bigtable.table import _as_list
+        return _as_list(values)
+
+    def test_sequence(self):
+        self.assertEqual(self._callFUT((1, 2)), [1, 2])
+
+    def test_array(self):
+        self.assertEqual(self._callFUT(_Array([1, 2])), [1, 2])
+
+
+class Test__column_to_bytes(unittest2.TestCase):
+
+    def _callFUT(self, column):
+        from gcloud_bigtable.table import _column_to_bytes
+        return _column_to_bytes(column)
+
+    def test_integers(self):
+        result = self._callFUT(_Array([0, 1, -2]))
+        self.assertEqual(result, [
+            b'\x00' * 8,
+            b'\x00' * 7 + b'\x01',
+            b'\xff' * 7 + b'\xfe',
+        ])
+
+    def test_empty(self):
+        self.assertEqual(self._callFUT([]), [])
+
+    def test_mixed(self):
+        result = self._callFUT([b'a', u'b', 1])
+        self.assertEqual(result, [b'a', b'b', b'\x00' * 7 + b'\x01'])
+
+    def test_bad_value(self):
+        with self.assertRaises(TypeError):
+            self._callFUT([b'a', 1.5])
+
+
+class _RetryPolicy(object):
+
+    def __init__(self):
+        self.calls = 0
+
+    def call(self, func, *args, **kwargs):
+        self.calls += 1
+        return func(*args, **kwargs)
+
+
 class _Client(object):
 
     data_stub = None
+    retry_policy = None
+    rate_limiter = None
+    hotspot_detector = None
     cluster_stub = None
     operations_stub = None
     table_stub = None
@@ -590,3 +1239,34 @@ class _Cluster(object):
         self.name = name
         self.client = client
         self.timeout_seconds = timeout_seconds
+
+
+class _RateLimiter(object):
+
+    def __init__(self):
+        self.acquires = []
+        self.charges = []
+
+    def acquire(self, kind, num_bytes=0, priority=None):
+        self.acquires.append((kind, num_bytes, priority))
+
+    def charge(self, kind, num_bytes):
+        self.charges.append((kind, num_bytes))
+
+
+class _HotspotDetector(object):
+
+    def __init__(self):
+        self.row_keys = []
+
+    def record(self, row_key):
+        self.row_keys.append(row_key)
+
+
+class _Array(object):
+
+    def __init__(self, values):
+        self._values = values
+
+    def tolist(self):
+        return list(self._values)
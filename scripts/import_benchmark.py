@@ -0,0 +1,123 @@
+# Copyright 2015 Google Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarking the import time of the data-only entry points.
+
+Each module is imported in fresh interpreters. The script fails if one of
+them loads a module which only the Admin APIs or optional credentials
+need, or (with ``--max-seconds``) if its median import time is too long.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import subprocess
+import sys
+
+
+MODULES = (
+    'gcloud_bigtable.client',
+    'gcloud_bigtable.happybase',
+)
+# Loaded lazily, on first use of the Admin APIs or of some credentials.
+FORBIDDEN_MODULES = (
+    'gcloud_bigtable._generated.bigtable_cluster_data_pb2',
+    'gcloud_bigtable._generated.bigtable_cluster_service_messages_pb2',
+    'gcloud_bigtable._generated.bigtable_cluster_service_pb2',
+    'gcloud_bigtable._generated.bigtable_table_data_pb2',
+    'gcloud_bigtable._generated.bigtable_table_service_messages_pb2',
+    'gcloud_bigtable._generated.bigtable_table_service_pb2',
+    'gcloud_bigtable._generated.operations_pb2',
+    'google.appengine',
+    'oauth2client.client',
+    'oauth2client.crypt',
+)
+_IMPORT_SCRIPT = """
+import json
+import sys
+import time
+
+start = time.time()
+import %s
+elapsed = time.time() - start
+print(json.dumps([elapsed, [name for name, module in sys.modules.items()
+                            if module is not None]]))
+"""
+
+
+def _is_forbidden(module_name):
+    """Checks if a module should not be loaded by the data-only imports.
+
+    :type module_name: str
+    :param module_name: The name of a loaded module.
+
+    :rtype: bool
+    :returns: Flag indicating if the module (or its package) is in
+              :data:`FORBIDDEN_MODULES`.
+    """
+    return any(module_name == forbidden or
+               module_name.startswith(forbidden + '.')
+               for forbidden in FORBIDDEN_MODULES)
+
+
+def _time_import(module_name):
+    """Imports a module in a fresh interpreter.
+
+    :type module_name: str
+    :param module_name: The module to import.
+
+    :rtype: tuple
+    :returns: The number of seconds the import took and the names of the
+              modules loaded.
+    """
+    output = subprocess.check_output(
+        [sys.executable, '-c', _IMPORT_SCRIPT % (module_name,)])
+    elapsed, loaded = json.loads(output.decode('utf-8'))
+    return elapsed, loaded
+
+
+def main():
+    """Time the imports and check the modules they load."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Number of imports of each module.')
+    parser.add_argument('--max-seconds', type=float, default=None,
+                        help='Fail if the median import time is longer.')
+    args = parser.parse_args()
+
+    failed = False
+    for module_name in MODULES:
+        timings = []
+        for _ in range(args.runs):
+            elapsed, loaded = _time_import(module_name)
+            timings.append(elapsed)
+        median = sorted(timings)[len(timings) // 2]
+        print('>>> import %s: %.1f ms (median of %d)' % (
+            module_name, 1000 * median, args.runs))
+
+        unwanted = sorted(name for name in loaded if _is_forbidden(name))
+        if unwanted:
+            failed = True
+            print('    loads ' + ', '.join(unwanted))
+        if args.max_seconds is not None and median > args.max_seconds:
+            failed = True
+            print('    takes longer than %.1f ms' % (1000 * args.max_seconds,))
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()